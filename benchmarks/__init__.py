@@ -0,0 +1,6 @@
+"""
+SkyMission Builder 성능 벤치마크 (합성 데이터)
+
+    python -m pytest benchmarks/bench_stages.py      # pytest-benchmark 설치 시
+    python -m benchmarks.run                          # 단독 실행기
+"""
@@ -0,0 +1,278 @@
+"""
+SkyMission Builder - Benchmark Baselines
+합성 데이터 배치(기본 10,000 미션)의 성능을 기준 파일(JSON)로 기록하고, 변경 후 다시 재어 비교합니다.
+
+    python -m benchmarks.baseline record --out benchmarks/baselines/main.json
+    python -m benchmarks.baseline compare benchmarks/baselines/main.json --tolerance 0.1
+
+기록하는 지표
+    - batch.missions_per_s, batch.elapsed_s: batch_process_inputs 전체 (repeat번 중앙값)
+    - stage.<단계>.total_s: 실행 프로필의 단계별 처리 시간 합 (timings 모듈)
+    - case.<케이스>.per_unit_ms: cases.CASES의 함수 단위 벤치마크 (배치 케이스 제외)
+    - memory.peak_traced_mb: 별도 한 번의 실행에서 tracemalloc으로 잰 최대 추적 메모리
+
+기계 속도 차이는 보정 루프(calibrate)로 맞춥니다. 기록할 때와 비교할 때 같은 고정 연산의 시간을 재어
+그 비율로 현재 시간 지표를 기준 기계 기준으로 환산한 뒤 비교합니다. (메모리는 보정하지 않음)
+비교는 기준 파일의 데이터셋 설정으로 다시 실행하며, 허용 오차(tolerance)를 넘어 나빠진 지표가 있으면
+종료 코드 1을 반환합니다.
+"""
+
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .cases import CASES, ROOT, BenchContext, case_batch_process_inputs
+from .run import add_dataset_arguments, dataset_spec, run_cases
+
+BASELINE_VERSION = 1
+DEFAULT_FEATURES = 10_000
+DEFAULT_TOLERANCE = 0.10
+DEFAULT_OUT = ROOT / 'benchmarks' / 'baselines' / 'baseline.json'
+# 이보다 짧은 단계/케이스 시간은 잡음이 커서 표에만 표시하고 판정하지 않음
+MIN_GATED_SECONDS = 0.05
+CALIBRATION_ROUNDS = 7
+
+
+def calibrate(rounds: int = CALIBRATION_ROUNDS) -> float:
+    """
+    고정 연산(파이썬 루프, 좌표 문자열 포맷, numpy 정렬)의 최소 소요 시간(초).
+    배치가 쓰는 연산과 비슷한 비율로 섞어 기계/인터프리터 속도 차이를 가늠합니다.
+    """
+    values = np.random.default_rng(0).random(300_000)
+    coords = np.linspace(127.0, 128.0, 20_000)
+    best = float('inf')
+    for _ in range(max(1, rounds)):
+        t0 = time.perf_counter()
+        acc = 0
+        for i in range(150_000):
+            acc += (i * i) % 7
+        ' '.join(f'{x:.9f},{x:.9f},0' for x in coords)
+        np.sort(values)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _metric(value: float, unit: str, better: str, gate: bool = True) -> Dict:
+    return {'value': round(float(value), 6), 'unit': unit, 'better': better, 'gate': bool(gate)}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                             timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def measure(spec: Dict, repeat: int = 3, case_repeat: int = 5, memory: bool = True,
+            work_dir: Optional[Path] = None, log=print) -> Dict[str, Dict]:
+    """
+    spec(synthetic.make_dataset 인자) 데이터셋으로 지표를 잽니다.
+
+    Returns:
+        Dict: {지표 이름: {'value', 'unit', 'better': 'lower'|'higher', 'gate'}}
+    """
+    ctx = BenchContext(work_dir, **spec)
+    try:
+        metrics: Dict[str, Dict] = {}
+        log(f"micro cases (repeat {case_repeat})...")
+        micro = [n for n in CASES if n != 'batch_process_inputs']
+        for r in run_cases(ctx, micro, repeat=case_repeat):
+            metrics[f"case.{r['case']}.per_unit_ms"] = _metric(r['per_unit_ms'], 'ms', 'lower',
+                                                               gate=r['median_s'] >= MIN_GATED_SECONDS)
+
+        run, _ = case_batch_process_inputs(ctx)
+        profiles = []
+        for i in range(max(1, repeat)):
+            log(f"batch {i + 1}/{repeat} ({spec['features']} missions)...")
+            profiles.append(run()['profile'])
+        metrics['batch.missions_per_s'] = _metric(statistics.median(p['missions_per_s'] for p in profiles),
+                                                  'missions/s', 'higher')
+        metrics['batch.elapsed_s'] = _metric(statistics.median(p['elapsed_s'] for p in profiles), 's', 'lower')
+        for stage in profiles[0]['batch']:
+            if '.' in stage:
+                continue    # 세부 구간(geometry.union 등)은 단계 시간에 포함됨
+            total = statistics.median(p['batch'].get(stage, {}).get('total_s', 0.0) for p in profiles)
+            metrics[f'stage.{stage}.total_s'] = _metric(total, 's', 'lower', gate=total >= MIN_GATED_SECONDS)
+
+        if memory:
+            log('memory run (tracemalloc)...')
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            try:
+                run()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                if started:
+                    tracemalloc.stop()
+            metrics['memory.peak_traced_mb'] = _metric(peak / 2 ** 20, 'MiB', 'lower')
+        return metrics
+    finally:
+        ctx.close()
+
+
+def record(spec: Dict, repeat: int = 3, case_repeat: int = 5, memory: bool = True,
+           work_dir: Optional[Path] = None, log=print) -> Dict:
+    """기준 파일에 저장할 dict (버전, 환경, 데이터셋, 보정 시간, 지표)"""
+    calibration = calibrate()
+    metrics = measure(spec, repeat, case_repeat, memory, work_dir, log)
+    return {
+        'version': BASELINE_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'dataset': spec,
+        'repeat': repeat,
+        'case_repeat': case_repeat,
+        'calibration_s': round(calibration, 6),
+        'metrics': metrics,
+    }
+
+
+def load_baseline(path: Path) -> Dict:
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    if data.get('version') != BASELINE_VERSION:
+        raise ValueError(f"기준 파일 버전이 다릅니다: {data.get('version')} (지원: {BASELINE_VERSION}). "
+                         "record로 다시 기록하세요.")
+    return data
+
+
+def _tolerance_for(name: str, default: float, overrides: Dict[str, float]) -> float:
+    for pattern, value in overrides.items():
+        if fnmatch.fnmatch(name, pattern):
+            return value
+    return default
+
+
+def compare(baseline: Dict, current: Dict, tolerance: float = DEFAULT_TOLERANCE,
+            tolerances: Optional[Dict[str, float]] = None) -> List[Dict]:
+    """
+    기준과 현재 기록을 비교합니다. 시간/처리량 지표는 보정 비율로 기준 기계 기준 값으로 환산합니다.
+
+    Returns:
+        List[Dict]: 지표별 {'metric', 'baseline', 'current', 'normalized', 'change', 'tolerance', 'status'}
+            status는 'regression', 'improved', 'ok', 'noise'(판정 제외), 'new', 'missing'
+    """
+    tolerances = tolerances or {}
+    speed = baseline['calibration_s'] / current['calibration_s']    # >1 이면 현재 기계가 빠름
+    rows = []
+    base_metrics, cur_metrics = baseline['metrics'], current['metrics']
+    for name in list(base_metrics) + [n for n in cur_metrics if n not in base_metrics]:
+        base, cur = base_metrics.get(name), cur_metrics.get(name)
+        row = {'metric': name, 'baseline': base and base['value'], 'current': cur and cur['value'],
+               'normalized': None, 'change': None, 'tolerance': None}
+        if base is None or cur is None:
+            row['status'] = 'new' if base is None else 'missing'
+            rows.append(row)
+            continue
+        value = cur['value']
+        if base['unit'] != 'MiB':
+            # 시간은 빠른 기계일수록 작게 나오므로 느린 쪽으로, 처리량은 반대로 환산
+            value = value * speed if base['better'] == 'lower' else value / speed
+        tol = _tolerance_for(name, tolerance, tolerances)
+        change = (value - base['value']) / base['value'] if base['value'] else 0.0
+        worse = change if base['better'] == 'lower' else -change
+        if not (base['gate'] and cur['gate']):
+            status = 'noise'
+        elif worse > tol:
+            status = 'regression'
+        elif worse < -tol:
+            status = 'improved'
+        else:
+            status = 'ok'
+        row.update(normalized=round(value, 6), change=round(change, 4), tolerance=tol, status=status)
+        rows.append(row)
+    return rows
+
+
+def format_diff(rows: List[Dict], baseline: Dict, current: Dict) -> str:
+    def num(v):
+        return '-' if v is None else f'{v:,.3f}'
+
+    lines = [f"calibration: baseline {baseline['calibration_s'] * 1000:.1f} ms, current "
+             f"{current['calibration_s'] * 1000:.1f} ms (speed x{baseline['calibration_s'] / current['calibration_s']:.2f})"]
+    header = f"{'metric':<56} {'baseline':>12} {'current':>12} {'normalized':>12} {'change':>8}  status"
+    lines += [header, '-' * len(header)]
+    for r in rows:
+        change = '-' if r['change'] is None else f"{r['change'] * 100:+.1f}%"
+        status = r['status'].upper() if r['status'] == 'regression' else r['status']
+        lines.append(f"{r['metric']:<56} {num(r['baseline']):>12} {num(r['current']):>12} "
+                     f"{num(r['normalized']):>12} {change:>8}  {status}")
+    return '\n'.join(lines)
+
+
+def _parse_tolerances(items: Optional[Sequence[str]]) -> Dict[str, float]:
+    out = {}
+    for item in items or ():
+        pattern, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f'허용 오차 형식은 PATTERN=VALUE 입니다: {item}')
+        out[pattern.strip()] = float(value)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='벤치마크 기준 기록/비교 (성능 회귀 검사)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help='현재 코드로 기준 파일 기록')
+    add_dataset_arguments(rec)
+    rec.set_defaults(features=DEFAULT_FEATURES)
+    rec.add_argument('--out', type=str, default=str(DEFAULT_OUT), help='기준 JSON 경로')
+
+    cmp_ = sub.add_parser('compare', help='기준 파일과 같은 데이터셋으로 다시 재어 비교')
+    cmp_.add_argument('baseline', type=str, help='기준 JSON 경로')
+    cmp_.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='허용 악화 비율 (기본 0.1 = 10%%)')
+    cmp_.add_argument('--tolerance-for', type=str, action='append', default=None, metavar='PATTERN=VALUE',
+                      help='지표별 허용 오차 (예: memory.*=0.2, 여러 번 지정 가능)')
+    cmp_.add_argument('--save', type=str, default=None, help='이번 측정 결과를 JSON으로 저장할 경로')
+
+    for p in (rec, cmp_):
+        p.add_argument('--repeat', type=int, default=3, help='배치 측정 반복 횟수 (중앙값 사용)')
+        p.add_argument('--case-repeat', type=int, default=5, help='함수 단위 케이스 반복 횟수')
+        p.add_argument('--no-memory', action='store_true', help='tracemalloc 메모리 측정 생략')
+        p.add_argument('--work-dir', type=str, default=None, help='데이터셋/출력 폴더 (기본: 임시 폴더)')
+
+    args = parser.parse_args(argv)
+    work_dir = Path(args.work_dir) if args.work_dir else None
+    log = lambda msg: print(msg, file=sys.stderr)   # noqa: E731
+
+    if args.command == 'record':
+        data = record(dataset_spec(args), args.repeat, args.case_repeat, not args.no_memory, work_dir, log)
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding='utf-8')
+        print(f"기준 기록 완료: {out} ({data['metrics']['batch.missions_per_s']['value']} missions/s)")
+        return 0
+
+    baseline = load_baseline(Path(args.baseline))
+    current = record(baseline['dataset'], args.repeat, args.case_repeat,
+                     not args.no_memory and 'memory.peak_traced_mb' in baseline['metrics'], work_dir, log)
+    if args.save:
+        Path(args.save).write_text(json.dumps(current, ensure_ascii=False, indent=1), encoding='utf-8')
+    rows = compare(baseline, current, args.tolerance, _parse_tolerances(args.tolerance_for))
+    print(format_diff(rows, baseline, current))
+    regressions = [r['metric'] for r in rows if r['status'] == 'regression']
+    if regressions:
+        print(f"성능 회귀 {len(regressions)}건: {', '.join(regressions)}")
+        return 1
+    print('성능 회귀 없음')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
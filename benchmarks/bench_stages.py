@@ -0,0 +1,37 @@
+"""
+pytest-benchmark 벤치마크. 기본 테스트 수집(test_*.py)에는 포함되지 않으므로 파일을 직접 지정합니다.
+
+    python -m pytest benchmarks/bench_stages.py
+    SKYMISSION_BENCH_FEATURES=2000 SKYMISSION_BENCH_CRS=EPSG:5186 python -m pytest benchmarks/bench_stages.py
+
+데이터셋 크기는 환경 변수 SKYMISSION_BENCH_FEATURES / _VERTICES / _CRS / _MULTIPOLYGON_SHARE로 바꿉니다.
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip('pytest_benchmark', reason="'pip install pytest-benchmark' 설치 후 실행하세요 (또는 python -m benchmarks.run)")
+
+from benchmarks.cases import CASES, BenchContext  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def ctx(tmp_path_factory):
+    env = os.environ.get
+    context = BenchContext(tmp_path_factory.mktemp('bench'),
+                           features=int(env('SKYMISSION_BENCH_FEATURES', 200)),
+                           vertices=int(env('SKYMISSION_BENCH_VERTICES', 64)),
+                           crs=env('SKYMISSION_BENCH_CRS', 'EPSG:4326'),
+                           multipolygon_share=float(env('SKYMISSION_BENCH_MULTIPOLYGON_SHARE', 0.0)))
+    yield context
+    context.close()
+
+
+@pytest.mark.parametrize('name', list(CASES))
+def test_stage(benchmark, ctx, name):
+    fn, units = CASES[name](ctx)
+    benchmark.group = name
+    benchmark.extra_info.update(units=units, **ctx.spec)
+    rounds = 3 if name == 'batch_process_inputs' else 5
+    benchmark.pedantic(fn, rounds=rounds, warmup_rounds=1)
@@ -0,0 +1,130 @@
+"""
+SkyMission Builder - Benchmark Cases
+pytest-benchmark(bench_stages.py)와 단독 실행기(run.py)가 함께 쓰는 벤치마크 목록입니다.
+
+각 케이스는 준비된 BenchContext를 받아 (인자 없는 측정 함수, 처리 단위 수)를 돌려줍니다.
+처리 단위(피처, 파일 등) 수로 나누어 단위당 시간과 처리량을 비교합니다.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from src.core import generator
+
+from . import synthetic
+
+ROOT = Path(__file__).resolve().parent.parent
+TEMPLATES = ROOT / 'src' / 'templates'
+# 피처 단위 케이스에서 한 번에 처리할 최대 피처 수
+SAMPLE_FEATURES = 100
+BENCH_OVERRIDES = {'altitude': 100.0, 'auto_flight_speed': 10, 'overlap_camera_h': 80, 'overlap_camera_w': 70}
+
+
+class BenchContext:
+    """
+    합성 데이터셋과 케이스 사이에 재사용하는 중간 결과(GeoDataFrame, 좌표, KML 바이트).
+
+    Args:
+        root (Path): 데이터셋과 출력 파일을 둘 폴더 (None이면 임시 폴더, close()에서 삭제)
+        **spec: synthetic.make_dataset 인자 (features, vertices, crs, multipolygon_share, files, seed)
+    """
+
+    def __init__(self, root: Optional[Path] = None, **spec):
+        self._tmp = None
+        if root is None:
+            self._tmp = tempfile.mkdtemp(prefix='skymission_bench_')
+            root = self._tmp
+        self.root = Path(root)
+        self.template = TEMPLATES / 'template.kml'
+        self.waylines = TEMPLATES / 'waylines.wpml'
+        self.data = synthetic.make_dataset(self.root / 'input', **spec)
+        self.spec = self.data['spec']
+        self._cache: Dict[str, object] = {}
+
+    def cached(self, key: str, build: Callable):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def feature_frames(self):
+        """피처 하나씩 자른 GeoDataFrame 리스트 (최대 SAMPLE_FEATURES개)"""
+        def build():
+            gdf = generator.read_gpkg_to_gdf(self.data['gpkg'][0])
+            return [gdf.iloc[[i]] for i in range(min(SAMPLE_FEATURES, len(gdf)))]
+        return self.cached('frames', build)
+
+    def lonlats(self):
+        return self.cached('lonlats', lambda: [generator.parse_polygon_coords_from_gpkg_direct(f)[0]
+                                               for f in self.feature_frames()])
+
+    def kml_payloads(self):
+        return self.cached('kml', lambda: [generator.generate_kml_bytes(self.template, ll, overrides=BENCH_OVERRIDES)
+                                           for ll in self.lonlats()])
+
+    def scratch(self, name: str) -> Path:
+        """케이스 출력용 빈 폴더"""
+        path = self.root / 'scratch' / name
+        shutil.rmtree(path, ignore_errors=True)
+        path.mkdir(parents=True)
+        return path
+
+    def close(self):
+        if self._tmp is not None:
+            shutil.rmtree(self._tmp, ignore_errors=True)
+
+
+def case_read_gpkg_to_gdf(ctx: BenchContext) -> Tuple[Callable, int]:
+    paths = ctx.data['gpkg']
+    return (lambda: [generator.read_gpkg_to_gdf(p) for p in paths]), ctx.spec['features']
+
+
+def case_parse_polygon_coords_from_gpkg_direct(ctx: BenchContext) -> Tuple[Callable, int]:
+    frames = ctx.feature_frames()
+    return (lambda: [generator.parse_polygon_coords_from_gpkg_direct(f) for f in frames]), len(frames)
+
+
+def case_generate_kml_bytes(ctx: BenchContext) -> Tuple[Callable, int]:
+    lonlats = ctx.lonlats()
+    return (lambda: [generator.generate_kml_bytes(ctx.template, ll, overrides=BENCH_OVERRIDES)
+                     for ll in lonlats]), len(lonlats)
+
+
+def case_load_wpml_bytes_with_overrides(ctx: BenchContext) -> Tuple[Callable, int]:
+    return (lambda: generator.load_wpml_bytes_with_overrides(ctx.waylines, BENCH_OVERRIDES)), 1
+
+
+def case_make_kmz_from_bytes(ctx: BenchContext) -> Tuple[Callable, int]:
+    payloads = ctx.kml_payloads()
+    out = ctx.scratch('kmz')
+
+    def run():
+        for i, data in enumerate(payloads):
+            generator.make_kmz_from_bytes(data, ctx.waylines, out / f'{i}.kmz', overrides=BENCH_OVERRIDES)
+    return run, len(payloads)
+
+
+def case_batch_process_inputs(ctx: BenchContext) -> Tuple[Callable, int]:
+    src = ctx.data['gpkg_dir']
+
+    def run():
+        # 매번 빈 출력 폴더와 새 엔진으로 (저널/캐시 재사용 없이) 끝까지 실행
+        out = ctx.scratch('batch')
+        summary = generator.batch_process_inputs(src, ctx.template, ctx.waylines, out, input_format='gpkg',
+                                                 overrides=BENCH_OVERRIDES, progress_interval=0)
+        if summary['failed']:
+            raise RuntimeError(f"벤치마크 배치 실패 {summary['failed']}건")
+        return summary
+    return run, ctx.spec['features']
+
+
+# 이름 → 케이스 (실행 순서)
+CASES = {
+    'read_gpkg_to_gdf': case_read_gpkg_to_gdf,
+    'parse_polygon_coords_from_gpkg_direct': case_parse_polygon_coords_from_gpkg_direct,
+    'generate_kml_bytes': case_generate_kml_bytes,
+    'load_wpml_bytes_with_overrides': case_load_wpml_bytes_with_overrides,
+    'make_kmz_from_bytes': case_make_kmz_from_bytes,
+    'batch_process_inputs': case_batch_process_inputs,
+}
@@ -0,0 +1,108 @@
+"""
+SkyMission Builder - Standalone Benchmark Runner
+pytest-benchmark 없이 cases.CASES를 측정합니다. 케이스마다 한 번 예열한 뒤 repeat번 재어
+최소/중앙값과 단위당 시간, 처리량을 표로 출력합니다.
+
+    python -m benchmarks.run --features 500 --vertices 64 --crs EPSG:5186 --multipolygon-share 0.2
+    python -m benchmarks.run --only batch_process_inputs --repeat 3 --json bench.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .cases import CASES, BenchContext
+
+DEFAULT_REPEAT = 5
+
+
+def time_case(fn, repeat: int = DEFAULT_REPEAT, warmup: int = 1) -> List[float]:
+    """fn을 warmup번 실행한 뒤 repeat번의 소요 시간(초)"""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def run_cases(ctx: BenchContext, names: Optional[Sequence[str]] = None, repeat: int = DEFAULT_REPEAT,
+              warmup: int = 1) -> List[Dict]:
+    """케이스별 결과 dict 리스트: {'case', 'units', 'times_s', 'min_s', 'median_s', 'per_unit_ms', 'units_per_s'}"""
+    names = list(names or CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        raise ValueError(f"알 수 없는 벤치마크: {', '.join(unknown)} ({', '.join(CASES)})")
+    results = []
+    for name in names:
+        fn, units = CASES[name](ctx)
+        times = time_case(fn, repeat, warmup)
+        median = statistics.median(times)
+        results.append({
+            'case': name,
+            'units': units,
+            'times_s': [round(t, 6) for t in times],
+            'min_s': round(min(times), 6),
+            'median_s': round(median, 6),
+            'per_unit_ms': round(median / units * 1000, 4) if units else None,
+            'units_per_s': round(units / median, 2) if median > 0 else None,
+        })
+    return results
+
+
+def format_table(results: List[Dict]) -> str:
+    header = f"{'case':<40} {'units':>7} {'min':>10} {'median':>10} {'per unit':>12} {'units/s':>10}"
+    lines = [header, '-' * len(header)]
+    for r in results:
+        lines.append(f"{r['case']:<40} {r['units']:>7} {r['min_s'] * 1000:>8.1f}ms {r['median_s'] * 1000:>8.1f}ms "
+                     f"{r['per_unit_ms']:>10.3f}ms {r['units_per_s']:>10.1f}")
+    return '\n'.join(lines)
+
+
+def add_dataset_arguments(parser: argparse.ArgumentParser):
+    """합성 데이터셋 인자 (baseline 실행기와 공유)"""
+    parser.add_argument('--features', type=int, default=200, help='합성 피처 수')
+    parser.add_argument('--vertices', type=int, default=64, help='폴리곤 꼭짓점 수')
+    parser.add_argument('--crs', type=str, default='EPSG:4326', help='합성 데이터 좌표계')
+    parser.add_argument('--multipolygon-share', type=float, default=0.0, help='MultiPolygon 피처 비율 (0~1)')
+    parser.add_argument('--files', type=int, default=1, help='GPKG 파일 수')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+
+
+def dataset_spec(args) -> Dict:
+    return {'features': args.features, 'vertices': args.vertices, 'crs': args.crs,
+            'multipolygon_share': args.multipolygon_share, 'files': args.files, 'seed': args.seed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='SkyMission Builder 벤치마크 (합성 데이터)')
+    add_dataset_arguments(parser)
+    parser.add_argument('--only', type=str, default=None, help=f"쉼표로 구분한 케이스 ({', '.join(CASES)})")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='측정 반복 횟수')
+    parser.add_argument('--warmup', type=int, default=1, help='측정 전 예열 횟수')
+    parser.add_argument('--work-dir', type=str, default=None, help='데이터셋/출력 폴더 (기본: 임시 폴더)')
+    parser.add_argument('--json', type=str, default=None, help='결과를 JSON으로 저장할 경로')
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.only.split(',') if n.strip()] if args.only else None
+    ctx = BenchContext(Path(args.work_dir) if args.work_dir else None, **dataset_spec(args))
+    try:
+        results = run_cases(ctx, names, repeat=args.repeat, warmup=args.warmup)
+    finally:
+        ctx.close()
+    print(f"dataset: {json.dumps(ctx.spec, ensure_ascii=False)}")
+    print(format_table(results))
+    if args.json:
+        Path(args.json).write_text(json.dumps({'dataset': ctx.spec, 'results': results}, ensure_ascii=False, indent=1),
+                                   encoding='utf-8')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+SkyMission Builder - Synthetic Benchmark Datasets
+벤치마크용 가짜 미션 폴리곤(GPKG/KML)을 만듭니다. 네트워크나 실제 현장 데이터 없이 재현 가능하도록
+seed로 고정된 난수만 사용합니다.
+
+    - features: 피처 수 (격자로 배치하여 서로 겹치지 않음)
+    - vertices: 폴리곤 외곽 꼭짓점 수 (중심 기준 각도 순서라 항상 단순 폴리곤)
+    - crs: 저장 좌표계 (예: EPSG:4326, EPSG:5186)
+    - multipolygon_share: MultiPolygon(두 조각)으로 만들 피처 비율 (0~1)
+
+    python -m benchmarks.synthetic bench_input --features 1000 --vertices 64 --crs EPSG:5186
+"""
+
+import argparse
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# 피처 배치 기준점(경위도)과 격자 간격/반지름(도, 약 400 m / 110 m)
+ORIGIN = (127.0, 36.5)
+GRID_STEP_DEG = 0.004
+RADIUS_DEG = 0.001
+NAME_FIELD = 'NAME'
+LAYER = 'missions'
+
+
+def _rings(centers: np.ndarray, vertices: int, radius: float, rng: np.random.Generator) -> np.ndarray:
+    """중심점마다 반지름을 흔든 별 모양 외곽선 (n, vertices + 1, 2), 첫 점으로 닫힘"""
+    n = len(centers)
+    angles = np.linspace(0.0, 2 * np.pi, vertices, endpoint=False)
+    radii = radius * (0.7 + 0.3 * rng.random((n, vertices)))
+    ring = np.empty((n, vertices + 1, 2))
+    ring[:, :-1, 0] = centers[:, None, 0] + radii * np.cos(angles)
+    ring[:, :-1, 1] = centers[:, None, 1] + radii * np.sin(angles) * 0.8
+    ring[:, -1] = ring[:, 0]
+    return ring
+
+
+def synthetic_polygons(features: int = 1000, vertices: int = 32, crs: str = 'EPSG:4326',
+                       multipolygon_share: float = 0.0, seed: int = 0):
+    """
+    격자로 배치한 합성 폴리곤 GeoDataFrame (NAME, ALT_M 열 포함).
+
+    Returns:
+        GeoDataFrame: crs 좌표계의 피처 features개
+    """
+    import geopandas as gpd
+    import shapely
+
+    if features < 1 or vertices < 3:
+        raise ValueError('피처는 1개 이상, 꼭짓점은 3개 이상이어야 합니다.')
+    rng = np.random.default_rng(seed)
+    cols = int(np.ceil(np.sqrt(features)))
+    idx = np.arange(features)
+    centers = np.column_stack([ORIGIN[0] + (idx % cols) * GRID_STEP_DEG, ORIGIN[1] + (idx // cols) * GRID_STEP_DEG])
+
+    geoms = shapely.polygons(_rings(centers, vertices, RADIUS_DEG, rng))
+    multi = rng.random(features) < float(multipolygon_share)
+    if multi.any():
+        # 두 번째 조각: 격자 칸 안쪽으로 비켜 놓은 작은 폴리곤
+        parts = shapely.polygons(_rings(centers[multi] + RADIUS_DEG * 1.6, max(3, vertices // 2),
+                                        RADIUS_DEG * 0.35, rng))
+        geoms = geoms.astype(object)
+        geoms[multi] = [shapely.MultiPolygon([a, b]) for a, b in zip(geoms[multi], parts)]
+
+    gdf = gpd.GeoDataFrame({NAME_FIELD: [f'F{i:06d}' for i in idx],
+                            'ALT_M': 80.0 + (idx % 5) * 10.0},
+                           geometry=list(geoms), crs='EPSG:4326')
+    return gdf if crs in (None, 'EPSG:4326') else gdf.to_crs(crs)
+
+
+def write_gpkg(gdf, path: Path, layer: str = LAYER) -> Path:
+    path = Path(path)
+    gdf.to_file(path, layer=layer, driver='GPKG')
+    return path
+
+
+_KML_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2">
+<Document><Placemark>
+<ExtendedData><SchemaData><SimpleData name="DYNM">{name}</SimpleData></SchemaData></ExtendedData>
+<Polygon><outerBoundaryIs><LinearRing><coordinates>{coords}</coordinates></LinearRing></outerBoundaryIs></Polygon>
+</Placemark></Document>
+</kml>
+"""
+
+
+def write_kml_files(gdf, out_dir: Path, name_field: str = NAME_FIELD) -> List[Path]:
+    """피처마다 KML 파일 하나 (WGS84, MultiPolygon은 가장 큰 조각)"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    wgs84 = gdf.to_crs(epsg=4326) if gdf.crs is not None and gdf.crs.to_epsg() != 4326 else gdf
+    paths = []
+    for name, geom in zip(wgs84[name_field], wgs84.geometry):
+        if geom.geom_type == 'MultiPolygon':
+            geom = max(geom.geoms, key=lambda g: g.area)
+        coords = ' '.join(f'{x:.9f},{y:.9f},0' for x, y in geom.exterior.coords)
+        path = out_dir / f'{name}.kml'
+        path.write_text(_KML_TEMPLATE.format(name=name, coords=coords), encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+def make_dataset(root: Path, features: int = 1000, vertices: int = 32, crs: str = 'EPSG:4326',
+                 multipolygon_share: float = 0.0, formats: Sequence[str] = ('gpkg',), files: int = 1,
+                 seed: int = 0) -> Dict:
+    """
+    root 아래에 합성 입력 폴더를 만듭니다. GPKG는 root/gpkg/에 files개로 나누어, KML은 root/kml/에
+    피처마다 하나씩 저장합니다.
+
+    Returns:
+        Dict: {'gdf', 'spec', 'gpkg': [경로], 'kml': [경로], 'gpkg_dir', 'kml_dir'}
+    """
+    root = Path(root)
+    gdf = synthetic_polygons(features, vertices, crs, multipolygon_share, seed)
+    out = {'gdf': gdf, 'gpkg': [], 'kml': [], 'gpkg_dir': root / 'gpkg', 'kml_dir': root / 'kml',
+           'spec': {'features': features, 'vertices': vertices, 'crs': crs,
+                    'multipolygon_share': multipolygon_share, 'files': files, 'seed': seed}}
+    if 'gpkg' in formats:
+        out['gpkg_dir'].mkdir(parents=True, exist_ok=True)
+        for i, chunk in enumerate(np.array_split(np.arange(features), max(1, min(files, features)))):
+            out['gpkg'].append(write_gpkg(gdf.iloc[chunk], out['gpkg_dir'] / f'synthetic_{i:03d}.gpkg'))
+    if 'kml' in formats:
+        out['kml'] = write_kml_files(gdf, out['kml_dir'])
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='벤치마크용 합성 GPKG/KML 입력 생성')
+    parser.add_argument('out_dir', type=str, help='출력 폴더 (gpkg/, kml/ 하위 폴더 생성)')
+    parser.add_argument('--features', type=int, default=1000, help='피처 수')
+    parser.add_argument('--vertices', type=int, default=32, help='폴리곤 꼭짓점 수')
+    parser.add_argument('--crs', type=str, default='EPSG:4326', help='저장 좌표계')
+    parser.add_argument('--multipolygon-share', type=float, default=0.0, help='MultiPolygon 피처 비율 (0~1)')
+    parser.add_argument('--files', type=int, default=1, help='GPKG 파일 수')
+    parser.add_argument('--format', type=str, default='gpkg', help='gpkg, kml 또는 gpkg,kml')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    args = parser.parse_args()
+    data = make_dataset(Path(args.out_dir), args.features, args.vertices, args.crs, args.multipolygon_share,
+                        formats=[f.strip() for f in args.format.split(',')], files=args.files, seed=args.seed)
+    print(f"GPKG {len(data['gpkg'])}개, KML {len(data['kml'])}개 생성: {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
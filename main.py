@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from pathlib import Path
 
 # 프로젝트 루트를 sys.path에 추가하여 src 패키지를 찾을 수 있게 함
@@ -9,5 +10,7 @@ if str(BASE_DIR) not in sys.path:
 from src.gui.app import App
 
 if __name__ == "__main__":
+    # 피처 제한 시간용 자식 프로세스(spawn)가 패키징된 실행 파일에서도 동작하도록
+    multiprocessing.freeze_support()
     app = App()
     app.mainloop()
@@ -0,0 +1,218 @@
+"""
+SkyMission Builder - Run Diagnostics Module
+배치 실행을 함수 단위로 깊게 들여다볼 때 켜는 선택 기능입니다. 끄면(기본) 아무 객체도 만들지
+않으며, 파이프라인은 hooks가 None인지 한 번 확인하는 것 외에 하는 일이 없습니다.
+
+    - cprofile: 호출 스레드와 파이프라인 워커 스레드마다 cProfile.Profile을 켜고, 끝나면 합쳐서
+      out_dir/<stem>.pstats와 상위 N개 요약(<stem>_profile_top.txt, 누적/자체 시간 순 + 단계별)을 저장
+    - trace_memory: tracemalloc을 켜고 단계 항목이 끝날 때마다 추적 중인 메모리를 확인하여
+      그 단계에서 본 최대치를 넘으면(MEMORY_GROWTH 비율 이상) 스냅샷을 다시 찍습니다.
+      단계별 최대 시점 스냅샷을 out_dir/<stem>_memory_<단계>.snapshot(tracemalloc.Snapshot.load로
+      읽기)과 상위 N개 할당 위치 요약(.txt)으로 저장
+
+tracemalloc은 프로세스 전체 할당을 추적하므로 스냅샷은 "그 단계 항목이 끝난 시점의 전체 메모리"이며,
+feature_timeout의 자식 프로세스에서 일어난 할당은 포함되지 않습니다.
+Python 3.12부터는 프로파일러가 동시에 하나만 켜질 수 있으며, 호출 스레드의 프로파일러가
+모든 스레드를 함께 기록하므로 워커 스레드용 프로파일러는 만들지 않습니다.
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROFILE_TOP_N = 30
+# 스냅샷을 다시 찍는 메모리 증가 비율 (단계별 직전 최대치 대비)
+MEMORY_GROWTH = 1.1
+# tracemalloc이 기록할 호출 스택 깊이
+TRACE_FRAMES = 10
+
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+class _WorkerScope:
+    """워커 스레드 하나의 프로파일 구간 (with 블록)"""
+
+    __slots__ = ('_diag', '_stage', '_prof')
+
+    def __init__(self, diag: 'RunDiagnostics', stage: str):
+        self._diag = diag
+        self._stage = stage
+        self._prof = None
+
+    def __enter__(self):
+        if self._diag.cprofile and not self._diag._shared_profiler:
+            self._prof = cProfile.Profile()
+            self._prof.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self._prof is not None:
+            self._prof.disable()
+            self._diag._add_profile(self._stage, self._prof)
+        return False
+
+
+class RunDiagnostics:
+    """
+    배치 한 번의 cProfile/tracemalloc 수집기. StagedPipeline의 hooks로 넘깁니다.
+
+        diag = RunDiagnostics(out_dir, stem, cprofile=True, trace_memory=True)
+        diag.start()
+        pipeline = StagedPipeline(stages, hooks=diag)
+        pipeline.run(...)
+        paths = diag.finish()
+
+    Args:
+        out_dir (Path): 결과 파일을 저장할 폴더
+        stem (str): 파일 이름 앞부분 (리포트와 같은 report_<시각>)
+        cprofile (bool): 함수 단위 프로파일 수집
+        trace_memory (bool): 단계별 최대 메모리 스냅샷 수집
+        top_n (int): 요약 파일에 남길 상위 항목 수
+    """
+
+    def __init__(self, out_dir: Path, stem: str, cprofile: bool = False, trace_memory: bool = False,
+                 top_n: int = PROFILE_TOP_N):
+        self.out_dir = Path(out_dir)
+        self.stem = stem
+        self.cprofile = bool(cprofile)
+        self.trace_memory = bool(trace_memory)
+        self.top_n = max(1, int(top_n))
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, List[cProfile.Profile]] = {}
+        self._main: Optional[cProfile.Profile] = None
+        # Python 3.12+: 프로파일러는 동시에 하나만 켤 수 있고, 켜진 하나가 모든 스레드를 기록
+        self._shared_profiler = sys.version_info >= (3, 12)
+        self._mem_peaks: Dict[str, int] = {}
+        self._snapshots: Dict[str, tracemalloc.Snapshot] = {}
+        self._started_tracing = False
+        self.peak_bytes = 0
+
+    def __bool__(self):
+        return self.cprofile or self.trace_memory
+
+    # ------------------------------------------------------------------
+    # 수집
+    # ------------------------------------------------------------------
+    def start(self):
+        """호출 스레드의 프로파일러와 tracemalloc을 켭니다."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started_tracing = True
+        if self.cprofile:
+            self._main = cProfile.Profile()
+            self._main.enable()
+
+    def worker(self, stage: str) -> _WorkerScope:
+        """파이프라인 워커 스레드 전체를 감싸는 프로파일 구간"""
+        return _WorkerScope(self, stage)
+
+    def item_done(self, stage: str):
+        """단계 항목 하나가 끝났을 때 호출. 추적 메모리가 단계 최대치를 넘으면 스냅샷을 찍습니다."""
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if current <= self._mem_peaks.get(stage, 0) * MEMORY_GROWTH:
+            return
+        with self._lock:
+            if current <= self._mem_peaks.get(stage, 0) * MEMORY_GROWTH:
+                return
+            self._mem_peaks[stage] = current
+            self.peak_bytes = max(self.peak_bytes, peak)
+            # 필터링은 저장할 때 한 번만 (항목마다 하면 느림)
+            self._snapshots[stage] = tracemalloc.take_snapshot()
+
+    def _add_profile(self, stage: str, prof: cProfile.Profile):
+        with self._lock:
+            self._profiles.setdefault(stage, []).append(prof)
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+    def finish(self) -> Dict[str, Path]:
+        """수집을 멈추고 결과 파일을 저장합니다. {종류: 경로} 반환"""
+        if self._main is not None:
+            self._main.disable()
+        paths: Dict[str, Path] = {}
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+            if self._started_tracing:
+                tracemalloc.stop()
+        if self.cprofile:
+            paths.update(self._write_profile())
+        if self.trace_memory:
+            paths.update(self._write_memory())
+        return paths
+
+    def _stats(self, profiles) -> Optional[pstats.Stats]:
+        stats = None
+        for prof in profiles:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(prof)
+                else:
+                    stats.add(prof)
+            except TypeError:
+                # 한 번도 호출을 기록하지 못한 프로파일러
+                continue
+        return stats
+
+    def _format_stats(self, stats: pstats.Stats, sort: str, limit: int) -> str:
+        buf = io.StringIO()
+        stats.stream = buf
+        stats.sort_stats(sort).print_stats(limit)
+        return buf.getvalue()
+
+    def _write_profile(self) -> Dict[str, Path]:
+        with self._lock:
+            by_stage = {k: list(v) for k, v in self._profiles.items()}
+        everything = ([self._main] if self._main is not None else []) + [p for ps in by_stage.values() for p in ps]
+        merged = self._stats(everything)
+        if merged is None:
+            return {}
+        pstats_path = self.out_dir / f'{self.stem}.pstats'
+        merged.dump_stats(str(pstats_path))
+
+        parts = [f'# {self.stem} - cProfile 상위 {self.top_n}개 (pstats: {pstats_path.name})\n',
+                 '## 누적 시간(cumulative) 순\n', self._format_stats(merged, 'cumulative', self.top_n),
+                 '## 자체 시간(tottime) 순\n', self._format_stats(merged, 'tottime', self.top_n)]
+        if self._shared_profiler:
+            parts.append('## 단계별 구분 없음 (이 Python에서는 프로파일러 하나가 모든 스레드를 기록)\n')
+        for stage, profs in by_stage.items():
+            stats = self._stats(profs)
+            if stats is not None:
+                parts += [f'## 단계 {stage} (워커 {len(profs)}개, 자체 시간 순)\n',
+                          self._format_stats(stats, 'tottime', min(self.top_n, 10))]
+        top_path = self.out_dir / f'{self.stem}_profile_top.txt'
+        top_path.write_text('\n'.join(parts), encoding='utf-8')
+        return {'pstats': pstats_path, 'profile_top': top_path}
+
+    def _write_memory(self) -> Dict[str, Path]:
+        with self._lock:
+            snapshots = dict(self._snapshots)
+            peaks = dict(self._mem_peaks)
+        paths: Dict[str, Path] = {}
+        lines = [f'# {self.stem} - tracemalloc 단계별 최대 시점 상위 {self.top_n}개 할당 위치',
+                 f'# 추적 메모리 최대치: {self.peak_bytes / 2 ** 20:.1f} MiB', '']
+        for stage, snap in snapshots.items():
+            snap = snap.filter_traces(_TRACE_FILTERS)
+            snap_path = self.out_dir / f'{self.stem}_memory_{stage}.snapshot'
+            snap.dump(str(snap_path))
+            paths[f'memory_{stage}'] = snap_path
+            lines.append(f'## 단계 {stage}: 항목 완료 시점 {peaks[stage] / 2 ** 20:.1f} MiB')
+            for stat in snap.statistics('lineno')[:self.top_n]:
+                lines.append(str(stat))
+            lines.append('')
+        top_path = self.out_dir / f'{self.stem}_memory_top.txt'
+        top_path.write_text('\n'.join(lines), encoding='utf-8')
+        paths['memory_top'] = top_path
+        return paths
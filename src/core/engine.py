@@ -0,0 +1,227 @@
+"""
+SkyMission Builder - Mission Batch Engine
+여러 번의 배치 실행 사이에 컴파일된 템플릿, WPML 페이로드, 읽어 둔 GPKG,
+피처별 지오메트리 결과를 보관하여 설정만 바뀐 재실행은 렌더링 단계만 다시 수행합니다.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, Optional
+
+from . import generator
+
+
+def file_signature(path: Path):
+    """(경로, 크기, 수정 시각) 서명. 파일이 바뀌면 캐시 키가 달라집니다."""
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+def _freeze(value) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class LRUCache:
+    """스레드 안전한 크기 제한 LRU 캐시 (적중/미스 횟수 기록)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, int(max_entries))
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def peek(self, key: Hashable, default=None):
+        """적중/미스 통계와 LRU 순서를 건드리지 않고 조회"""
+        with self._lock:
+            return self._data.get(key, default)
+
+    def put(self, key: Hashable, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class MissionBatchEngine:
+    """
+    장기 실행용 배치 엔진. GUI(App)는 하나를 만들어 계속 재사용하고,
+    CLI와 테스트에서도 batch_process_inputs 대신 run()을 호출할 수 있습니다.
+
+    보관하는 캐시:
+        - templates: (템플릿 서명, 오버라이드, 옵션) → CompiledKmlTemplate
+        - wpml: (WPML 서명, 오버라이드) → WPML bytes
+        - packers: (WPML 서명, 오버라이드, KMZ 내부 이름) → WPML을 미리 압축한 KmzPacker
+        - datasets: (GPKG 서명, 레이어) → GeoDataFrame
+        - geometries: (GPKG 서명, 레이어, 피처, 단순화/버퍼) → WGS84 좌표 리스트
+        - dem_samplers / dem_blocks: DEM 핸들과 디코딩된 DEM 블록 (terrain 모듈)
+        - zones: (레이어 서명, 레이어, 이름 열) → 제한구역 STRtree 색인 (zones 모듈)
+                 제외 레이어 묶음(ExclusionLayers)도 같은 캐시에 보관합니다.
+        (CRS Transformer는 generator.get_transformer에서 프로세스 전역으로 캐시)
+    """
+
+    def __init__(self, template_path: Optional[Path] = None, waylines_path: Optional[Path] = None,
+                 max_datasets: int = 16, max_geometries: int = 200_000, max_templates: int = 64,
+                 max_dem_blocks: int = 256):
+        self.template_path = Path(template_path) if template_path else None
+        self.waylines_path = Path(waylines_path) if waylines_path else None
+        self.templates = LRUCache(max_templates)
+        self.wpml = LRUCache(max_templates)
+        self.packers = LRUCache(max_templates)
+        self.datasets = LRUCache(max_datasets)
+        self.geometries = LRUCache(max_geometries)
+        self.dem_samplers = LRUCache(4)
+        self.dem_blocks = LRUCache(max_dem_blocks)
+        self.zones = LRUCache(4)
+        self._compile_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def run(self, missions_dir: Path, out_dir: Optional[Path] = None, template_path: Optional[Path] = None,
+            waylines_path: Optional[Path] = None, **options) -> Dict:
+        """batch_process_inputs를 이 엔진의 캐시로 실행합니다."""
+        template_path = template_path or self.template_path
+        waylines_path = waylines_path or self.waylines_path
+        if template_path is None or waylines_path is None:
+            raise ValueError('템플릿(template.kml)과 waylines.wpml 경로가 필요합니다.')
+        return generator.batch_process_inputs(missions_dir, template_path, waylines_path, out_dir,
+                                              engine=self, **options)
+
+    # ------------------------------------------------------------------
+    # 캐시 접근
+    # ------------------------------------------------------------------
+    def compiled_template(self, template_path: Path, set_times: bool, set_takeoff_ref_point: bool,
+                          overrides: Optional[Dict]) -> 'generator.CompiledKmlTemplate':
+        key = (file_signature(template_path), bool(set_times), bool(set_takeoff_ref_point), _freeze(overrides))
+        compiled = self.templates.get(key)
+        if compiled is None:
+            with self._compile_lock:
+                compiled = self.templates.peek(key)
+                if compiled is None:
+                    compiled = generator.compile_kml_template(template_path, set_times=set_times,
+                                                              set_takeoff_ref_point=set_takeoff_ref_point,
+                                                              overrides=overrides)
+                    self.templates.put(key, compiled)
+        return compiled
+
+    def wpml_bytes(self, waylines_path: Path, overrides: Optional[Dict]) -> bytes:
+        key = (file_signature(waylines_path), _freeze(overrides))
+        data = self.wpml.get(key)
+        if data is None:
+            if overrides:
+                data = generator.load_wpml_bytes_with_overrides(waylines_path, overrides)
+            else:
+                data = Path(waylines_path).read_bytes()
+            self.wpml.put(key, data)
+        return data
+
+    def kmz_packer(self, waylines_path: Path, overrides: Optional[Dict],
+                   arcnames=('template.kml', 'waylines.wpml')) -> 'generator.KmzPacker':
+        key = (file_signature(waylines_path), _freeze(overrides), tuple(arcnames))
+        packer = self.packers.get(key)
+        if packer is None:
+            packer = generator.KmzPacker(self.wpml_bytes(waylines_path, overrides), *arcnames)
+            self.packers.put(key, packer)
+        return packer
+
+    def load_dataset(self, path: Path, layer: Optional[str] = None):
+        """GPKG를 읽어 캐시합니다. 파일이 수정되면(크기/mtime 변경) 다시 읽습니다."""
+        key = (file_signature(path), layer)
+        gdf = self.datasets.get(key)
+        if gdf is None:
+            gdf = generator.read_gpkg_to_gdf(Path(path), layer=layer)
+            self.datasets.put(key, gdf)
+        return gdf
+
+    def dem_sampler(self, path: Path) -> 'terrain.DemSampler':
+        """DEM을 열어 캐시합니다. 블록 캐시는 엔진의 dem_blocks를 공유합니다."""
+        from . import terrain
+        key = file_signature(path)
+        sampler = self.dem_samplers.get(key)
+        if sampler is None:
+            with self._compile_lock:
+                sampler = self.dem_samplers.peek(key)
+                if sampler is None:
+                    sampler = terrain.DemSampler(Path(path), cache=self.dem_blocks)
+                    self.dem_samplers.put(key, sampler)
+        return sampler
+
+    def zone_index(self, path: Path, layer: Optional[str] = None,
+                   name_field: Optional[str] = None) -> 'zones.ZoneIndex':
+        """제한구역 레이어의 STRtree 색인. 레이어 파일이 바뀌지 않으면 실행 사이에 재사용합니다."""
+        from . import zones
+        key = (file_signature(path), layer, name_field)
+        index = self.zones.get(key)
+        if index is None:
+            index = zones.ZoneIndex.from_file(Path(path), layer=layer, name_field=name_field)
+            self.zones.put(key, index)
+        return index
+
+    def exclusion_key(self, specs) -> tuple:
+        """제외 레이어 목록의 서명 ((파일 서명, 레이어), ...)"""
+        from . import zones
+        if isinstance(specs, (str, Path)):
+            specs = [specs]
+        return tuple((file_signature(path), layer) for path, layer in map(zones.parse_exclusion_spec, specs))
+
+    def exclusion_layers(self, specs) -> 'zones.ExclusionLayers':
+        """제외 레이어(들)를 읽어 캐시합니다. 좌표계별 색인도 함께 재사용됩니다."""
+        from . import zones
+        key = ('exclude',) + self.exclusion_key(specs)
+        layers = self.zones.get(key)
+        if layers is None:
+            layers = zones.ExclusionLayers.from_files(specs)
+            self.zones.put(key, layers)
+        return layers
+
+    def geometry_key(self, path: Path, layer: Optional[str], feature_id, simplify_tolerance: float,
+                     geometry_buffer_m: float, extra=None):
+        """path가 리스트이면(그룹 모드) 모든 입력 파일의 서명을 키에 넣습니다."""
+        sig = tuple(map(file_signature, path)) if isinstance(path, list) else file_signature(path)
+        return (sig, layer, str(feature_id), float(simplify_tolerance or 0.0),
+                float(geometry_buffer_m or 0.0), extra)
+
+    def cache_stats(self) -> Dict[str, Dict]:
+        return {
+            'templates': self.templates.stats(),
+            'wpml': self.wpml.stats(),
+            'packers': self.packers.stats(),
+            'datasets': self.datasets.stats(),
+            'geometries': self.geometries.stats(),
+            'dem_blocks': self.dem_blocks.stats(),
+        }
+
+    def clear(self):
+        for cache in (self.templates, self.wpml, self.packers, self.datasets, self.geometries,
+                      self.dem_samplers, self.dem_blocks, self.zones):
+            cache.clear()
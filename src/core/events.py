@@ -0,0 +1,214 @@
+"""
+SkyMission Builder - Progress Event Module
+배치 진행 상황을 print 대신 타입이 있는 이벤트로 전달합니다.
+CLI와 GUI는 같은 이벤트를 각자의 방식으로 표시합니다.
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, ClassVar, Dict, List, Optional
+
+
+@dataclass
+class ProgressEvent:
+    kind: ClassVar[str] = 'event'
+    # True이면 ProgressEmitter가 min_interval 간격으로 솎아냅니다.
+    throttled: ClassVar[bool] = False
+    ts: float = field(default_factory=time.time, kw_only=True)
+
+    def to_dict(self) -> Dict:
+        d = asdict(self)
+        d['kind'] = self.kind
+        return d
+
+
+@dataclass
+class BatchStarted(ProgressEvent):
+    kind: ClassVar[str] = 'batch_started'
+    total_files: int
+    out_dir: str
+
+
+@dataclass
+class FileStarted(ProgressEvent):
+    kind: ClassVar[str] = 'file_started'
+    src_name: str
+    index: int
+    total_files: int
+
+
+@dataclass
+class FileSkipped(ProgressEvent):
+    kind: ClassVar[str] = 'file_skipped'
+    src_name: str
+    reason: str           # 'no_polygons', 'shard', 'duplicate', 'resumed' (여러 개면 쉼표로 구분)
+
+
+@dataclass
+class FeatureDone(ProgressEvent):
+    kind: ClassVar[str] = 'feature_done'
+    throttled: ClassVar[bool] = True
+    name: str
+    src_name: str
+    out_name: str
+    resumed: bool = False
+
+
+@dataclass
+class FeatureFailed(ProgressEvent):
+    kind: ClassVar[str] = 'feature_failed'
+    name: str
+    src_name: str
+    message: str
+
+
+@dataclass
+class Progress(ProgressEvent):
+    kind: ClassVar[str] = 'progress'
+    throttled: ClassVar[bool] = True
+    done: int
+    failed: int
+    discovered: int       # 지금까지 읽기 단계에서 발견된 미션 수
+    elapsed_s: float
+    rate: float           # 미션/초
+    eta_s: Optional[float]
+
+
+@dataclass
+class StageTimings(ProgressEvent):
+    kind: ClassVar[str] = 'stage_timings'
+    stages: List[Dict]
+
+
+@dataclass
+class Notice(ProgressEvent):
+    kind: ClassVar[str] = 'notice'
+    message: str
+    level: str = 'info'
+
+
+@dataclass
+class BatchFinished(ProgressEvent):
+    kind: ClassVar[str] = 'batch_finished'
+    ok: int
+    failed: int
+    skipped: int
+    elapsed_s: float
+    report_path: Optional[str] = None
+    cancelled: bool = False
+
+
+ProgressSink = Callable[[ProgressEvent], None]
+
+
+class ProgressEmitter:
+    """
+    이벤트를 sink로 전달하며 처리량/ETA를 계산합니다.
+    throttled 이벤트(FeatureDone, Progress)는 종류별로 min_interval에 한 번만 보냅니다.
+    워커 스레드 여러 곳에서 동시에 호출해도 안전합니다.
+    """
+
+    def __init__(self, sink: Optional[ProgressSink] = None, min_interval: float = 0.2):
+        self.sink = sink
+        self.min_interval = max(0.0, float(min_interval))
+        self.started = time.monotonic()
+        self.done = 0
+        self.failed = 0
+        self.discovered = 0
+        self._last_emit: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, event: ProgressEvent, force: bool = False):
+        if self.sink is None:
+            return
+        if event.throttled and not force and self.min_interval > 0:
+            now = time.monotonic()
+            with self._lock:
+                last = self._last_emit.get(event.kind)
+                if last is not None and now - last < self.min_interval:
+                    return
+                self._last_emit[event.kind] = now
+        try:
+            self.sink(event)
+        except Exception:
+            # 표시 쪽 오류가 배치를 멈추지 않도록 무시
+            pass
+
+    # ------------------------------------------------------------------
+    # 카운터 갱신 헬퍼
+    # ------------------------------------------------------------------
+    def discover(self, n: int = 1):
+        with self._lock:
+            self.discovered += n
+
+    def feature_done(self, name: str, src_name: str, out_name: str, resumed: bool = False):
+        with self._lock:
+            self.done += 1
+        self.emit(FeatureDone(name=name, src_name=src_name, out_name=out_name, resumed=resumed))
+        self.emit(self.progress())
+
+    def feature_failed(self, name: str, src_name: str, message: str):
+        with self._lock:
+            self.failed += 1
+        self.emit(FeatureFailed(name=name, src_name=src_name, message=message))
+        self.emit(self.progress())
+
+    def progress(self) -> Progress:
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            finished = self.done + self.failed
+            rate = finished / elapsed if elapsed > 0 else 0.0
+            remaining = max(0, self.discovered - finished)
+            eta = remaining / rate if rate > 0 else None
+            return Progress(done=self.done, failed=self.failed, discovered=self.discovered,
+                            elapsed_s=round(elapsed, 3), rate=round(rate, 2),
+                            eta_s=round(eta, 1) if eta is not None else None)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+# -----------------------------
+# 기본 텍스트 표현 (CLI/GUI 공용)
+# -----------------------------
+
+def _fmt_seconds(sec: Optional[float]) -> str:
+    if sec is None:
+        return '--:--'
+    sec = int(sec)
+    return f'{sec // 60:02d}:{sec % 60:02d}'
+
+
+def format_event(event: ProgressEvent) -> Optional[str]:
+    """이벤트를 한 줄 한국어 메시지로 변환합니다. 표시할 필요가 없으면 None."""
+    if isinstance(event, BatchStarted):
+        return f'배치 시작: 입력 파일 {event.total_files}개 -> {event.out_dir}'
+    if isinstance(event, FileStarted):
+        return f'읽는 중 ({event.index + 1}/{event.total_files}): {event.src_name}'
+    if isinstance(event, FileSkipped):
+        return f'건너뜀({event.reason}): {event.src_name}'
+    if isinstance(event, FeatureDone):
+        prefix = '재개(이미 완료)' if event.resumed else '완료'
+        return f'{prefix}: {event.src_name} -> {event.out_name}'
+    if isinstance(event, FeatureFailed):
+        return event.message
+    if isinstance(event, Progress):
+        return (f'진행: {event.done + event.failed}/{event.discovered} '
+                f'({event.rate:.1f}건/초, 남은 시간 {_fmt_seconds(event.eta_s)})')
+    if isinstance(event, StageTimings):
+        from .pipeline import format_stage_stats
+        return f'단계 통계: {format_stage_stats(event.stages)}'
+    if isinstance(event, Notice):
+        return event.message
+    if isinstance(event, BatchFinished):
+        suffix = ', 취소됨' if event.cancelled else ''
+        return f'총 처리: {event.ok} 성공, {event.failed} 실패 ({_fmt_seconds(event.elapsed_s)}{suffix})'
+    return None
+
+
+def print_event(event: ProgressEvent):
+    """CLI용 sink: 이벤트를 표준 출력에 한 줄씩 출력합니다."""
+    text = format_event(event)
+    if text:
+        print(text, flush=True)
@@ -1,12 +1,21 @@
 import xml.etree.ElementTree as ET
+import functools
+import hashlib
+import io
+import json
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 from zipfile import ZipFile, ZIP_DEFLATED
 import time
 import re
-from typing import List, Tuple, Optional, Dict
+import numpy as np
+from typing import Callable, List, Tuple, Optional, Dict
 from . import enums as dji_enums
 from . import validator
 from . import reporter
+from .metrics import compute_flight_metrics, polygon_measures, resolve_flight_params
+from .timings import section
 
 NS = {
     'kml': 'http://www.opengis.net/kml/2.2',
@@ -144,72 +153,137 @@ def read_gpkg_to_gdf(src_gpkg_path: Path, layer: Optional[str] = None):
 def parse_polygon_coords_from_gpkg(src_gpkg_path: Path, layer: Optional[str] = None,
                                    to_epsg: int = 4326,
                                    simplify_tolerance: float = 0.0,
-                                   geometry_buffer_m: float = 0.0) -> Tuple[List[Tuple[str, str]], 'object']:
+                                   geometry_buffer_m: float = 0.0, exclusions=None,
+                                   min_part_area_m2: float = 0.0) -> Tuple[List[Tuple[str, str]], 'object']:
     """
     GPKG 파일을 읽어 WGS84 좌표 리스트를 반환하는 래퍼 함수.
     """
     gdf = read_gpkg_to_gdf(src_gpkg_path, layer=layer)
-    return parse_polygon_coords_from_gpkg_direct(gdf, to_epsg=to_epsg, simplify_tolerance=simplify_tolerance, geometry_buffer_m=geometry_buffer_m)
+    return parse_polygon_coords_from_gpkg_direct(gdf, to_epsg=to_epsg, simplify_tolerance=simplify_tolerance, geometry_buffer_m=geometry_buffer_m,
+                                                 exclusions=exclusions, min_part_area_m2=min_part_area_m2)
 
 
 def parse_polygon_coords_from_gpkg_direct(gdf, to_epsg: int = 4326,
                                           simplify_tolerance: float = 0.0,
-                                          geometry_buffer_m: float = 0.0) -> Tuple[List[Tuple[str, str]], 'object']:
+                                          geometry_buffer_m: float = 0.0, exclusions=None,
+                                          min_part_area_m2: float = 0.0) -> Tuple[List[Tuple[str, str]], 'object']:
     """
     이미 로드된 GeoDataFrame에서 폴리곤을 추출하고 변환/단순화 수행.
+
+    exclusions(zones.ExclusionLayers 또는 gdf 좌표계의 ZoneIndex)를 지정하면 버퍼 다음,
+    단순화 전에 제외 영역을 빼고 min_part_area_m2(m²)보다 작은 조각은 버립니다.
     """
+    if exclusions is not None and hasattr(exclusions, 'for_crs'):
+        exclusions = exclusions.for_crs(gdf.crs)
+
     # 1. 폴리곤 계열 선택 및 병합
     geom_type = gdf.geometry.geom_type
     gdf = gdf[geom_type.isin(['Polygon', 'MultiPolygon'])].copy()
     if gdf.empty:
         raise ValueError('폴리곤/멀티폴리곤 지오메트리가 없습니다.')
 
-    try:
-        from shapely.ops import unary_union as sh_unary_union
-        u = sh_unary_union(gdf.geometry)
-    except Exception:
-        u = gdf.geometry.unary_union
+    with section('geometry.union'):
+        try:
+            from shapely.ops import unary_union as sh_unary_union
+            u = sh_unary_union(gdf.geometry)
+        except Exception:
+            u = gdf.geometry.unary_union
 
-    from shapely.geometry import Polygon, MultiPolygon
-    if u.geom_type == 'MultiPolygon':
-        poly = max(u.geoms, key=lambda p: p.area)
-    elif u.geom_type == 'Polygon':
-        poly = u
+    lonlat = polygon_to_lonlat(u, crs=gdf.crs, to_epsg=to_epsg,
+                               simplify_tolerance=simplify_tolerance,
+                               geometry_buffer_m=geometry_buffer_m,
+                               exclusions=exclusions, min_part_area_m2=min_part_area_m2)
+    return lonlat, gdf
+
+
+def polygon_to_lonlat(geom, crs=None, to_epsg: int = 4326, simplify_tolerance: float = 0.0,
+                      geometry_buffer_m: float = 0.0, geographic: Optional[bool] = None,
+                      exclusions=None, min_part_area_m2: float = 0.0) -> List[Tuple[str, str]]:
+    """
+    shapely 폴리곤(멀티폴리곤이면 가장 큰 조각)에 버퍼/단순화/좌표 변환을 적용하여
+    템플릿에 넣을 (lon, lat) 문자열 리스트를 반환합니다. GeoDataFrame 없이 동작합니다.
+
+    Args:
+        crs: 입력 좌표계 (pyproj CRS). None이면 변환하지 않습니다.
+        geographic (bool): 입력이 도 단위인지 여부. None이면 crs로 판단합니다.
+            도 단위이면 미터 단위 버퍼/허용 오차를 도 단위로 대략 변환합니다.
+        exclusions (zones.ZoneIndex): 입력 좌표계의 제외 영역 색인. 버퍼 다음에 빼며,
+            남은 조각이 여러 개면 가장 큰 조각만 씁니다. 매핑 폴리곤은 구멍을 가질 수 없으므로
+            폴리곤 안쪽에 완전히 들어간 제외 영역은 빠지지 않습니다.
+        min_part_area_m2 (float): 제외 후 버릴 작은 조각의 면적 기준(m²)
+    """
+    if geom.geom_type == 'MultiPolygon':
+        poly = max(geom.geoms, key=lambda p: p.area)
+    elif geom.geom_type == 'Polygon':
+        poly = geom
     else:
-        raise ValueError(f'지원하지 않는 지오메트리 타입: {u.geom_type}')
+        raise ValueError(f'지원하지 않는 지오메트리 타입: {geom.geom_type}')
+    if geographic is None:
+        geographic = bool(crs is not None and crs.is_geographic)
 
-    # 2. 지오메트리 버퍼 (Buffer)
+    # 1. 지오메트리 버퍼 (Buffer)
     if geometry_buffer_m != 0:
         actual_buf = geometry_buffer_m
         # 만약 지리 좌표계(도 단위)라면 미터 단위를 도 단위로 대략적 변환
-        if gdf.crs and gdf.crs.is_geographic:
+        if geographic:
             actual_buf = geometry_buffer_m / 111111.0
-        poly = poly.buffer(actual_buf)
+        with section('geometry.buffer'):
+            poly = poly.buffer(actual_buf)
+
+    # 2. 제외 영역 빼기 (STRtree 후보만, 작은 조각 제거)
+    if exclusions is not None and len(exclusions):
+        from .zones import subtract_exclusions
+        min_area = min_part_area_m2 / (111111.0 ** 2) if geographic else min_part_area_m2
+        with section('geometry.exclude'):
+            poly = subtract_exclusions(poly, exclusions, min_area)
+        if poly.geom_type == 'MultiPolygon':
+            poly = max(poly.geoms, key=lambda p: p.area)
 
     # 3. 지오메트리 단순화 (Simplify)
     if simplify_tolerance > 0:
         actual_tol = simplify_tolerance
         # 만약 지리 좌표계(도 단위)라면 미터 단위 오차를 도 단위로 대략적 변환
-        if gdf.crs and gdf.crs.is_geographic:
+        if geographic:
             actual_tol = simplify_tolerance / 111111.0
-        poly = poly.simplify(actual_tol, preserve_topology=True)
-
-    # 4. 좌표계 변환 (WGS84로 변환하기 위해 임시 GeoSeries 사용)
-    import geopandas as gpd
-    from shapely.geometry import mapping, shape
-    gs = gpd.GeoSeries([poly], crs=gdf.crs)
-    if gdf.crs and gdf.crs.to_epsg() != to_epsg:
-        gs = gs.to_crs(epsg=to_epsg)
-    
-    final_poly = gs.iloc[0]
+        with section('geometry.simplify'):
+            poly = poly.simplify(actual_tol, preserve_topology=True)
+
+    # 4. 좌표계 변환 (CRS별 Transformer를 캐시하여 재사용)
+    final_poly = poly
+    transformer = get_transformer(crs, to_epsg) if crs else None
+    if transformer is not None:
+        import shapely
+        with section('geometry.transform'):
+            final_poly = shapely.transform(
+                poly, lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1])))
+
     coords = list(final_poly.exterior.coords)
     lonlat = [(f"{x:.9f}", f"{y:.9f}") for (x, y) in coords]
-    
+
     # 폴리곤 폐합 보장
     if lonlat[0] != lonlat[-1]:
         lonlat.append(lonlat[0])
-        
-    return lonlat, gdf
+    return lonlat
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_transformer(src_srs: str, to_epsg: int):
+    from pyproj import CRS, Transformer
+    src = CRS.from_user_input(src_srs)
+    if src.to_epsg() == to_epsg:
+        return None
+    return Transformer.from_crs(src, CRS.from_epsg(to_epsg), always_xy=True)
+
+
+def get_transformer(crs, to_epsg: int = 4326):
+    """
+    crs → EPSG:to_epsg 변환용 pyproj Transformer를 반환합니다 (이미 같은 좌표계면 None).
+    CRS 식별/Transformer 생성 비용이 크므로 CRS 문자열 단위로 캐시합니다.
+    """
+    if crs is None:
+        return None
+    srs = getattr(crs, 'srs', None) or crs.to_wkt()
+    return _cached_transformer(srs, to_epsg)
 
 
 def get_naming_value_from_gdf(gdf, naming_field: Optional[str], fallback_stem: str) -> str:
@@ -392,6 +466,118 @@ def generate_kml_bytes(template_kml_path: Path, lonlat: List[Tuple[str, str]],
     return ET.tostring(root, encoding='UTF-8', xml_declaration=True)
 
 
+# -----------------------------
+# 컴파일된 템플릿 (미션마다 XML을 다시 파싱하지 않음)
+# -----------------------------
+
+_SLOT_COORDS = '@@SMB_COORDS@@'
+_SLOT_TIME = '@@SMB_TIME@@'
+_SLOT_TAKEOFF = '@@SMB_TAKEOFF@@'
+
+
+class CompiledKmlTemplate:
+    """
+    오버라이드를 적용한 템플릿을 한 번만 직렬화해 두고, 미션마다 바뀌는 값
+    (좌표, 생성/수정 시각, 이륙 기준점)만 문자열 조각 사이에 끼워 넣어 렌더링합니다.
+    결과는 generate_kml_bytes와 바이트 단위로 동일합니다.
+    flight_params에는 오버라이드를 적용한 템플릿의 고도/속도/측면 중첩률/마진이 담깁니다.
+    """
+
+    def __init__(self, chunks: List[bytes], slots: List[str], takeoff_default: Optional[str],
+                 flight_params: Optional[Dict] = None):
+        self.chunks = chunks
+        self.slots = slots
+        self.takeoff_default = takeoff_default
+        self.flight_params = flight_params or {}
+
+    def render(self, lonlat: List[Tuple[str, str]], now_ms: Optional[int] = None) -> bytes:
+        values = {}
+        for slot in self.slots:
+            if slot in values:
+                continue
+            if slot == _SLOT_COORDS:
+                indent = '\n                '
+                values[slot] = (indent + indent.join([f'{lon},{lat},0' for lon, lat in lonlat]) + indent).encode('utf-8')
+            elif slot == _SLOT_TIME:
+                values[slot] = str(now_ms if now_ms is not None else int(time.time() * 1000)).encode('ascii')
+            elif slot == _SLOT_TAKEOFF:
+                values[slot] = _takeoff_ref_text(lonlat, self.takeoff_default).encode('utf-8')
+        out = [self.chunks[0]]
+        for slot, chunk in zip(self.slots, self.chunks[1:]):
+            out.append(values[slot])
+            out.append(chunk)
+        return b''.join(out)
+
+
+def _takeoff_ref_text(lonlat: List[Tuple[str, str]], default: Optional[str]) -> str:
+    """폴리곤 중심값 기반 이륙 기준점 텍스트 (계산 실패 시 템플릿 값 유지)"""
+    try:
+        lons = [float(lon) for lon, _ in lonlat]
+        lats = [float(lat) for _, lat in lonlat]
+        if lons and lats:
+            return f'{sum(lats) / len(lats):.6f},{sum(lons) / len(lons):.6f},0.000000'
+    except Exception:
+        pass
+    return default or ''
+
+
+def compile_kml_template(template_path: Path, set_times: bool = False, set_takeoff_ref_point: bool = False,
+                         overrides: Optional[Dict] = None) -> CompiledKmlTemplate:
+    """템플릿을 파싱하고 오버라이드를 적용한 뒤 미션별 값 자리만 비워 둔 형태로 컴파일합니다."""
+    tree = ET.parse(template_path)
+    root = tree.getroot()
+    coords_elem = root.find('.//kml:Folder/kml:Placemark/kml:Polygon/kml:outerBoundaryIs/kml:LinearRing/kml:coordinates', NS)
+    if coords_elem is None:
+        coords_elem = root.find('.//kml:coordinates', NS)
+    if coords_elem is None:
+        raise ValueError('템플릿에서 <coordinates>를 찾지 못했습니다.')
+    coords_elem.text = _SLOT_COORDS
+
+    if set_times:
+        for xpath in ('.//wpml:createTime', './/wpml:updateTime'):
+            elem = root.find(xpath, NS)
+            if elem is not None:
+                elem.text = _SLOT_TIME
+
+    takeoff_default = None
+    if set_takeoff_ref_point:
+        tk_elem = root.find('.//wpml:takeOffRefPoint', NS)
+        if tk_elem is not None:
+            takeoff_default = tk_elem.text
+            tk_elem.text = _SLOT_TAKEOFF
+
+    apply_template_overrides(root, overrides)
+    flight_params = _template_flight_params(root)
+
+    raw = ET.tostring(root, encoding='UTF-8', xml_declaration=True)
+    pattern = re.compile('|'.join(re.escape(t) for t in (_SLOT_COORDS, _SLOT_TIME, _SLOT_TAKEOFF)).encode('ascii'))
+    chunks, slots, pos = [], [], 0
+    for m in pattern.finditer(raw):
+        chunks.append(raw[pos:m.start()])
+        slots.append(m.group(0).decode('ascii'))
+        pos = m.end()
+    chunks.append(raw[pos:])
+    return CompiledKmlTemplate(chunks, slots, takeoff_default, flight_params)
+
+
+def _template_flight_params(root: ET.Element) -> Dict:
+    """경로 추정에 쓰는 템플릿 값(고도, 속도, 측면 중첩률, 마진)을 읽습니다. 없는 값은 빠집니다."""
+    xpaths = {
+        'altitude': './/kml:Folder/wpml:waylineCoordinateSysParam/wpml:globalShootHeight',
+        'speed': './/kml:Folder/wpml:autoFlightSpeed',
+        'side_overlap': './/kml:Folder/kml:Placemark/wpml:overlap/wpml:orthoCameraOverlapW',
+        'margin': './/kml:Folder/kml:Placemark/wpml:margin',
+    }
+    params = {}
+    for key, xpath in xpaths.items():
+        elem = root.find(xpath, NS)
+        try:
+            params[key] = float(elem.text)
+        except (AttributeError, TypeError, ValueError):
+            pass
+    return params
+
+
 def make_kmz(kml_path: Path, wpml_path: Path, kmz_path: Path, arcname_kml: str = 'template.kml', arcname_wpml: str = 'waylines.wpml'):
     with ZipFile(kmz_path, 'w', compression=ZIP_DEFLATED) as z:
         # 루트에 정확한 파일명으로 저장되도록 arcname 지정
@@ -399,6 +585,129 @@ def make_kmz(kml_path: Path, wpml_path: Path, kmz_path: Path, arcname_kml: str =
         z.write(wpml_path, arcname=arcname_wpml)
 
 
+def pack_kmz_bytes(kml_bytes: bytes, wpml_bytes: bytes, arcname_kml: str = 'template.kml', arcname_wpml: str = 'waylines.wpml') -> bytes:
+    """KML/WPML 바이트를 메모리에서 KMZ(zip) 바이트로 압축합니다."""
+    buf = io.BytesIO()
+    with ZipFile(buf, 'w', compression=ZIP_DEFLATED) as z:
+        z.writestr(arcname_kml, kml_bytes)
+        z.writestr(arcname_wpml, wpml_bytes)
+    return buf.getvalue()
+
+
+_WPML_FLIGHT_PATTERN = re.compile(rb'(<wpml:(distance|duration)>)[^<]*(</wpml:\2>)')
+
+
+class KmzPacker:
+    """
+    배치에서 공유하는 WPML로 미션별 KMZ를 만듭니다. zip 안의 항목 순서는
+    pack_kmz_bytes와 같이 template.kml → waylines.wpml 입니다.
+
+    pack()에 flight(metrics.compute_flight_metrics 결과)를 넘기면 WPML의
+    <wpml:distance>/<wpml:duration>을 미션별 추정값으로 바꿔 압축합니다. 값 자리는
+    생성할 때 한 번만 찾아 두므로 미션마다 WPML을 다시 파싱하지 않습니다.
+    """
+
+    def __init__(self, wpml_bytes: bytes, arcname_kml: str = 'template.kml',
+                 arcname_wpml: str = 'waylines.wpml'):
+        self.arcname_kml = arcname_kml
+        self.arcname_wpml = arcname_wpml
+        self._wpml = wpml_bytes
+
+        # 거리/시간 값 자리를 비워 둔 WPML 조각 (값이 없는 WPML이면 미션별 렌더링 불필요)
+        self._wpml_chunks, self._wpml_slots, pos = [], [], 0
+        for m in _WPML_FLIGHT_PATTERN.finditer(wpml_bytes):
+            self._wpml_chunks.append(wpml_bytes[pos:m.end(1)])
+            self._wpml_slots.append(m.group(2).decode('ascii'))
+            pos = m.start(3)
+        self._wpml_chunks.append(wpml_bytes[pos:])
+
+    def render_wpml(self, flight: Dict) -> bytes:
+        values = {
+            'distance': flight.get('distance_m'),
+            'duration': flight.get('duration_s'),
+        }
+        out = [self._wpml_chunks[0]]
+        for slot, chunk in zip(self._wpml_slots, self._wpml_chunks[1:]):
+            out.append(str(values[slot] if values[slot] is not None else 0).encode('ascii'))
+            out.append(chunk)
+        return b''.join(out)
+
+    def pack(self, kml_bytes: bytes, flight: Optional[Dict] = None) -> bytes:
+        wpml = self.render_wpml(flight) if flight and self._wpml_slots else self._wpml
+        return pack_kmz_bytes(kml_bytes, wpml, arcname_kml=self.arcname_kml, arcname_wpml=self.arcname_wpml)
+
+
+# KMZ 내부 파일 배치: flat은 기존 배치 출력과 동일, wpmz는 DJI Pilot 2가 내보내는 구조
+KMZ_LAYOUTS = {
+    'flat': ('template.kml', 'waylines.wpml'),
+    'wpmz': ('wpmz/template.kml', 'wpmz/waylines.wpml'),
+}
+
+DEFAULT_TEMPLATE_DIR = Path(__file__).resolve().parent.parent / 'templates'
+
+_default_engine = None
+_default_engine_lock = threading.Lock()
+
+
+def _as_shapely(geometry):
+    """shapely 지오메트리, GeoJSON(dict/Feature), 또는 (x, y) 좌표 리스트를 shapely 지오메트리로 변환"""
+    if hasattr(geometry, 'geom_type'):
+        return geometry
+    if isinstance(geometry, dict):
+        from shapely.geometry import shape
+        if geometry.get('type') == 'Feature':
+            geometry = geometry.get('geometry') or {}
+        return shape(geometry)
+    from shapely.geometry import Polygon
+    return Polygon([(float(x), float(y)) for x, y, *_ in geometry])
+
+
+def build_mission_kmz(geometry, overrides: Optional[Dict] = None, naming='flat',
+                      template_path: Optional[Path] = None, waylines_path: Optional[Path] = None,
+                      crs=None, simplify_tolerance: float = 0.0, set_times: bool = True,
+                      set_takeoff_ref_point: bool = False, engine=None) -> bytes:
+    """
+    폴리곤 하나를 디스크를 거치지 않고 KMZ 바이트로 만듭니다 (서비스/노트북 임베딩용).
+    컴파일된 템플릿과 미리 압축된 WPML(KmzPacker)은 엔진 캐시에서 가져오므로 두 번째
+    호출부터는 지오메트리 처리, 좌표 치환, KML 압축만 수행합니다.
+
+    Args:
+        geometry: shapely Polygon/MultiPolygon, GeoJSON dict(Feature 포함) 또는 (lon, lat) 리스트
+        overrides (Dict): 템플릿 오버라이드 (geometry_buffer_m 포함)
+        naming: KMZ 내부 파일 배치. 'flat', 'wpmz' 또는 (kml 이름, wpml 이름) 튜플
+        crs: 입력 좌표계 (None이면 WGS84 경위도로 간주)
+        engine (MissionBatchEngine): 캐시를 보관할 엔진. None이면 모듈 기본 엔진 사용
+    """
+    global _default_engine
+    if isinstance(naming, str):
+        if naming not in KMZ_LAYOUTS:
+            raise ValueError(f"naming은 {sorted(KMZ_LAYOUTS)} 중 하나이거나 (kml, wpml) 튜플이어야 합니다: {naming}")
+        naming = KMZ_LAYOUTS[naming]
+
+    if engine is None:
+        with _default_engine_lock:
+            if _default_engine is None:
+                from .engine import MissionBatchEngine
+                _default_engine = MissionBatchEngine(DEFAULT_TEMPLATE_DIR / 'template.kml',
+                                                     DEFAULT_TEMPLATE_DIR / 'waylines.wpml')
+            engine = _default_engine
+    template_path = template_path or engine.template_path
+    waylines_path = waylines_path or engine.waylines_path
+
+    geom = _as_shapely(geometry)
+    if crs is not None:
+        from pyproj import CRS
+        crs = CRS.from_user_input(crs)
+    geo_buf = (overrides.get('geometry_buffer_m') or 0.0) if overrides else 0.0
+    lonlat = polygon_to_lonlat(geom, crs=crs, simplify_tolerance=simplify_tolerance,
+                               geometry_buffer_m=geo_buf, geographic=True if crs is None else None)
+
+    compiled = engine.compiled_template(template_path, set_times, set_takeoff_ref_point, overrides)
+    packer = engine.kmz_packer(waylines_path, overrides, tuple(naming))
+    flight = compute_flight_metrics([lonlat], [resolve_flight_params(compiled.flight_params, overrides)])[0]
+    return packer.pack(compiled.render(lonlat), flight=flight)
+
+
 def make_kmz_from_bytes(kml_bytes: bytes, wpml_path: Path, kmz_path: Path, arcname_kml: str = 'template.kml', arcname_wpml: str = 'waylines.wpml', overrides: Optional[Dict] = None):
     with ZipFile(kmz_path, 'w', compression=ZIP_DEFLATED) as z:
         # KML 파일을 디스크에 저장하지 않고 바로 KMZ에 추가
@@ -463,10 +772,874 @@ def load_wpml_bytes_with_overrides(wpml_path: Path, overrides: Optional[Dict] =
 # 배치 처리 (KML/GPKG 지원)
 # -----------------------------
 
+# 단계별 기본 워커 수 (I/O 단계는 1, GIL을 놓는 GEOS/zlib 단계는 2)
+DEFAULT_STAGE_WORKERS = {
+    'read': 1,
+    'geometry': 2,
+    'analyze': 1,
+    'terrain': 1,
+    'render': 1,
+    'pack': 2,
+    'write': 1,
+}
+
+
+# 결과 레코드와 저널에 붙는 미션별 검사 결과 키
+MISSION_CHECK_KEYS = ('flight', 'terrain', 'zones', 'overlap')
+
+
+def _polygon_lonlat_task(gdf, simplify_tolerance: float, geometry_buffer_m: float,
+                         exclusions=None, min_part_area_m2: float = 0.0) -> List[Tuple[str, str]]:
+    """피처 하나의 지오메트리 처리 (제한 시간 적용 시 자식 프로세스에서 실행되므로 모듈 수준 함수)"""
+    lonlat, _ = parse_polygon_coords_from_gpkg_direct(
+        gdf, to_epsg=4326,
+        simplify_tolerance=simplify_tolerance,
+        geometry_buffer_m=geometry_buffer_m,
+        exclusions=exclusions, min_part_area_m2=min_part_area_m2
+    )
+    return lonlat
+
+
+def _file_signature(path: Path):
+    """파일 변경 감지용 (크기, 수정 시각) 서명"""
+    try:
+        st = Path(path).stat()
+        return [st.st_size, st.st_mtime_ns]
+    except OSError:
+        return None
+
+
+def _source_hash(*parts) -> str:
+    """피처 원본(지오메트리 WKB, 이름 등)의 짧은 해시. 입력이 바뀐 피처만 다시 생성하는 데 사용"""
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()[:16]
+
+
+def collect_input_files(missions_dir: Path, input_format: str = 'auto') -> List[Path]:
+    """입력 폴더에서 처리 대상 파일 목록을 정렬하여 반환합니다."""
+    missions_dir = Path(missions_dir)
+    if input_format == 'gpkg':
+        return sorted(missions_dir.glob('*.gpkg'))
+    if input_format == 'kml':
+        return sorted(missions_dir.glob('*.kml'))
+    return sorted(list(missions_dir.glob('*.gpkg')) + list(missions_dir.glob('*.kml')))
+
+
+def _check_batch_args(shard, route: bool, route_start, route_format: str, report_formats):
+    """
+    out_dir(저널, 리포트)을 만들기 전에 route/리포트 인자를 검사합니다.
+
+    Returns:
+        (route_on, 출발점 (경도, 위도) 또는 None, 리포트 형식 목록)
+    """
+    from .report_sinks import parse_report_formats
+    from .route import ROUTE_FORMATS, parse_start
+
+    route_on = bool(route or route_start is not None)
+    if route_on and shard is not None:
+        # 순번은 한 실행의 미션 전체로 매기므로 샤드마다 따로 매기면 서로 겹침
+        raise ValueError('route(방문 순서)는 shard와 함께 사용할 수 없습니다.')
+    if route_on and route_format not in ROUTE_FORMATS:
+        raise ValueError(f'지원하지 않는 경로 형식: {route_format} (gpkg, kml)')
+    return route_on, parse_start(route_start) if route_on else None, parse_report_formats(report_formats)
+
+
+def _prepare_variants(variants, overrides: Optional[Dict], out_dir: Path) -> List[Dict]:
+    """변형 목록에 출력 접두어('이름/')를 붙이고 변형별 출력 폴더를 만듭니다. 없으면 이름 없는 기본 변형 하나"""
+    if variants:
+        from .variants import load_variants
+        variant_list = load_variants(variants, overrides)
+    else:
+        variant_list = [{'name': None, 'overrides': overrides, 'diff': {}}]
+    for v in variant_list:
+        v['prefix'] = f"{v['name']}/" if v['name'] else ''
+        if v['name']:
+            (out_dir / v['name']).mkdir(exist_ok=True)
+    return variant_list
+
+
+def _terrain_setup(engine, dem: Optional[Path], min_clearance: Optional[float]):
+    """terrain 단계용 (DEM 샘플러, 최소 여유고). dem이 없으면 샘플러는 None"""
+    if not dem:
+        return None, min_clearance
+    from .terrain import TERRAIN_MIN_CLEARANCE_M
+    return engine.dem_sampler(Path(dem)), TERRAIN_MIN_CLEARANCE_M if min_clearance is None else min_clearance
+
+
+def _exclusion_setup(engine, exclusions, min_area: float):
+    """geometry 단계용 (제외 레이어, 지오메트리 키/저널에 넣을 서명). exclusions가 없으면 (None, None)"""
+    if not exclusions:
+        return None, None
+    return engine.exclusion_layers(exclusions), (engine.exclusion_key(exclusions), float(min_area or 0.0))
+
+
+def _journal_config(template_path: Path, waylines_path: Path, settings: Dict, checks: Dict) -> Dict:
+    """
+    저널 설정 지문의 기준 dict. checks(dem, zones 등 선택 검사)는 값이 None이면 넣지 않으므로
+    검사를 켜지 않은 실행은 이전 저널과 같은 지문을 유지합니다.
+    """
+    cfg = {'template': _file_signature(template_path), 'waylines': _file_signature(waylines_path), **settings}
+    cfg.update({k: v for k, v in checks.items() if v is not None})
+    return cfg
+
+
+def _read_layer(engine, file_path, layer: Optional[str], naming_field: Optional[str], group_by: Optional[str],
+                group_label: str, merge_distance: Optional[float], merge_max_area: Optional[float]):
+    """
+    read 단계의 GPKG 입력을 읽습니다. file_path가 리스트(그룹 모드)이면 여러 GPKG의 피처를 키로 합치고
+    근접한 작은 그룹을 병합합니다. (grouping 모듈 참고)
+
+    Returns:
+        (GeoDataFrame, 대체 이름 접두어, 명명 필드, 지오메트리 캐시 키의 레이어 값)
+    """
+    if isinstance(file_path, list):
+        from .grouping import group_features
+        gdf = group_features([engine.load_dataset(p, layer=layer) for p in file_path], group_by,
+                             merge_distance=merge_distance, merge_max_area=merge_max_area)
+        return gdf, group_label, naming_field or group_by, (layer, group_by, merge_distance, merge_max_area)
+    with section('read.gpkg'):
+        gdf = engine.load_dataset(file_path, layer=layer)
+    return gdf, file_path.stem, naming_field, layer
+
+
+def _lonlat_polygon(lonlat: List[Tuple[str, str]]):
+    """KML 좌표 문자열 목록 → WGS84 Polygon"""
+    from shapely.geometry import Polygon
+    return Polygon([(float(x), float(y)) for x, y in lonlat])
+
+
+def _batch_input_files(missions_dir: Path, files: Optional[List[Path]], input_format: str, grouping: bool) -> List:
+    """처리할 입력 목록. 그룹 모드이면 모든 GPKG를 하나의 입력(리스트)으로 묶고 KML은 파일별로 처리"""
+    files = [Path(f) for f in (collect_input_files(missions_dir, input_format) if files is None else files)]
+    if not grouping:
+        return files
+    gpkg_files = [f for f in files if f.suffix.lower() == '.gpkg']
+    return ([gpkg_files] if gpkg_files else []) + [f for f in files if f.suffix.lower() != '.gpkg']
+
+
+@dataclass(eq=False)
+class _BatchRun:
+    """
+    batch_process_inputs 한 번의 실행 상태(변형별 프로필, 결과, 저널, 진행 이벤트)와 파이프라인 단계 함수.
+
+    설정 필드는 batch_process_inputs가 검사/정리한 값입니다. stage_* 메서드는 StagedPipeline의
+    워커 스레드에서 호출되므로 결과 목록과 카운터는 results_lock, 프로필은 profiles_lock으로 보호합니다.
+    """
+    engine: object
+    template_path: Path
+    waylines_path: Path
+    out_dir: Path
+    variant_list: List[Dict]
+    cfg_base: Dict
+    emitter: object
+    naming_field: Optional[str]
+    layer: Optional[str]
+    set_times: bool
+    set_takeoff_ref_point: bool
+    pack_kmz: bool
+    simplify_tolerance: float
+    geo_buf: float
+    column_map: Dict
+    shard: Optional[Tuple[int, int]]
+    skip_duplicates: bool
+    overlap_ratio: Optional[float]
+    route_on: bool
+    group_by: Optional[str]
+    group_label: str
+    merge_distance: Optional[float]
+    merge_max_area: Optional[float]
+    exclusion_layers: object
+    exclusion_sig: Optional[Tuple]
+    exclusion_min_area: float
+    zone_index: object
+    clip_zones: bool
+    sampler: object
+    min_clearance: Optional[float]
+    feature_timeout: Optional[float]
+    cancel: object
+
+    def __post_init__(self):
+        from .overlaps import DuplicateTracker
+
+        # 리포트용 결과 (워커 스레드에서 추가되므로 lock 사용)
+        self.results = []
+        self.manifest_outputs = []
+        self.results_lock = threading.Lock()
+        # skipped는 저널 재개로 건너뛴 미션만, duplicates는 skip_duplicates로 생략한 중복 피처
+        self.counts = {'ok': 0, 'failed': 0, 'skipped': 0, 'duplicates': 0}
+        # 실효 오버라이드(배치 < 속성 열 < 변형)가 같은 미션은 검증 결과, 컴파일된 템플릿,
+        # WPML(KmzPacker)을 공유합니다. 속성 열이 없으면 변형마다 하나씩만 만들어집니다.
+        self.profiles = {}
+        self.profiles_lock = threading.Lock()
+        # validate_missions_batch로 미리 검증한 결과 (프로필을 만들 때 꺼내 씀)
+        self.validations = {}
+        # 중복/겹침 검사: 중복은 read 단계에서 해시로, 겹침은 실행 후 전체 폴리곤으로 한 번에
+        self.duplicates = DuplicateTracker()
+        self.footprints = []    # (seq, 이름, WGS84 폴리곤), overlap_ratio를 지정한 경우만
+        # 방문 순서: 피처 중심점(WGS84)과 출력별 저널 레코드 (route=True인 경우만)
+        self.route_centers = {}
+        self.route_records = {}
+        # start()에서 여는 출력과 batch_process_inputs가 채우는 값
+        self.journal = None
+        self.completed = {}
+        self.sinks = None
+        self.worker_pool = None
+        self.run_metrics = None     # node_exporter textfile 지표 (metrics_file을 지정한 경우만)
+        self.total_files = 0
+
+        # 배치 시작 시 기본 프로필을 미리 만들어 템플릿/WPML 오류를 바로 드러냄 (출력을 열기 전)
+        self.prevalidate([{}])
+        self.base_profiles = [self.profile(vi, {}) for vi in range(len(self.variant_list))]
+        self.base = self.base_profiles[0]
+
+    # ------------------------------------------------------------------
+    # 실행 준비/정리
+    # ------------------------------------------------------------------
+    def start(self, formats, stem: str, resume: bool):
+        """리포트 싱크(CSV/JSONL/Parquet)와 저널을 열고, 제한 시간을 쓰면 지오메트리 작업 프로세스를 준비합니다."""
+        from .journal import BatchJournal
+        from .report_sinks import open_report_sinks
+
+        self.sinks = open_report_sinks(self.out_dir, formats, stem)
+        self.journal = BatchJournal(self.out_dir)
+        self.completed = self.journal.completed(self.out_dir) if resume else {}
+        self.journal.open(resume=resume)
+        if self.feature_timeout:
+            from .timelimit import KillableWorkerPool
+            # 자식 프로세스가 무거운 모듈을 임포트한 뒤부터 제한 시간을 잼
+            self.worker_pool = KillableWorkerPool(preload=('geopandas', 'shapely', __name__))
+
+    def close(self):
+        self.journal.close()
+        if self.worker_pool is not None:
+            self.worker_pool.close()
+        if self.sinks is not None:
+            self.sinks.close()
+
+    def stages(self, workers: Dict[str, int], analyze_batch: int) -> List:
+        from .pipeline import Stage
+
+        stages = [
+            Stage('read', self.stage_read, workers['read'], fan_out=True),
+            Stage('geometry', self.stage_geometry, workers['geometry']),
+            Stage('analyze', self.stage_analyze, workers['analyze'], batch_size=analyze_batch),
+        ]
+        if self.sampler is not None:
+            stages.append(Stage('terrain', self.stage_terrain, workers['terrain']))
+        stages += [
+            Stage('render', self.stage_render, workers['render'], fan_out=True),
+            Stage('pack', self.stage_pack, workers['pack']),
+            Stage('write', self.stage_write, workers['write']),
+        ]
+        return stages
+
+    # ------------------------------------------------------------------
+    # 프로필 (변형, 속성 열 오버라이드별 검증/템플릿/WPML)
+    # ------------------------------------------------------------------
+    def effective_overrides(self, vi: int, col: Dict) -> Optional[Dict]:
+        v = self.variant_list[vi]
+        return {**(v['overrides'] or {}), **col, **v['diff']} if col else v['overrides']
+
+    def prevalidate(self, cols) -> None:
+        # 아직 프로필이 없는 (변형, 속성 열) 조합을 한 번의 배열 연산으로 검증
+        with self.profiles_lock:
+            todo = {(vi, tuple(sorted(col.items()))) for col in cols for vi in range(len(self.variant_list))}
+            todo = [k for k in todo if k not in self.profiles and k not in self.validations]
+            effs = [self.effective_overrides(vi, dict(col)) for vi, col in todo]
+            # 오버라이드가 비어 있는 조합은 validate_mission_config의 경고를 그대로 사용
+            todo = [(k, e) for k, e in zip(todo, effs) if e]
+            if not todo:
+                return
+            try:
+                checked = validator.validate_missions_batch(
+                    altitude=[e.get('altitude') for _, e in todo], speed=[e.get('auto_flight_speed') for _, e in todo],
+                    drone_model=[e.get('drone_model') for _, e in todo])
+            except Exception:
+                # 숫자가 아닌 값 등은 프로필별 검증에서 해당 피처만 실패하도록 넘김
+                return
+            self.validations.update(zip((k for k, _ in todo), checked['records']))
+
+    def profile(self, vi: int, col: Dict) -> Dict:
+        from .journal import config_fingerprint
+
+        pkey = (vi, tuple(sorted(col.items())))
+        prof = self.profiles.get(pkey)
+        if prof is not None:
+            return prof
+        with self.profiles_lock:
+            prof = self.profiles.get(pkey)
+            if prof is None:
+                eff = self.effective_overrides(vi, col)
+                v_res = self.validations.pop(pkey, None)
+                engine = self.engine
+                prof = {
+                    'overrides': eff,
+                    'v_res': v_res if v_res is not None else validate_mission_config(eff),
+                    'altitude': eff.get('altitude') if eff else None,
+                    'speed': eff.get('auto_flight_speed') if eff else None,
+                    'packer': engine.kmz_packer(self.waylines_path, eff) if self.pack_kmz else None,
+                    'compiled': engine.compiled_template(self.template_path, self.set_times,
+                                                         self.set_takeoff_ref_point, eff),
+                    'cfg': config_fingerprint(dict(self.cfg_base, overrides=eff)),
+                }
+                prof['flight_params'] = resolve_flight_params(prof['compiled'].flight_params, eff)
+                self.profiles[pkey] = prof
+        return prof
+
+    # ------------------------------------------------------------------
+    # 결과 기록
+    # ------------------------------------------------------------------
+    def journal_key(self, key, vi):
+        name = self.variant_list[vi]['name']
+        return f'{key}@{name}' if name else key
+
+    def add_result(self, seq, record, ok, counter=None):
+        record['_seq'] = seq
+        with self.results_lock:
+            self.results.append(record)
+            self.counts[counter or ('ok' if ok else 'failed')] += 1
+        if self.sinks is not None:
+            self.sinks.write(record)
+
+    def add_success(self, job, vi, out_name, resumed=False, record=None, checks=None):
+        self.add_result(job['seq'] + (vi,), self.success_record(job, out_name, vi, checks or {}), ok=True)
+        if record is not None:
+            with self.results_lock:
+                self.manifest_outputs.append(dict({k: record.get(k) for k in ('key', 'name', 'out', 'size', 'sha256')},
+                                                  source=job['src_name']))
+                if self.route_on:
+                    self.route_records[out_name] = record
+        self.emitter.feature_done(job['name'], job['src_name'], out_name, resumed=resumed)
+
+    def success_record(self, job, out_name, vi, checks):
+        prof = self.profile(vi, job['col'])
+        record = {
+            'name': job['name'],
+            'source': job['src_name'],
+            'output': out_name,
+            'success': True,
+            'status': prof['v_res'].get('status'),
+            'messages': prof['v_res'].get('messages'),
+            'metrics': prof['v_res'].get('metrics'),
+            'altitude': prof['altitude'],
+            'speed': prof['speed']
+        }
+        # 미션별 검사 결과(비행 지표, 지형, 제한구역)를 붙이고 상태는 더 나쁜 쪽으로 합침
+        for key in MISSION_CHECK_KEYS:
+            check = checks.get(key)
+            if not check:
+                continue
+            record[key] = check
+            if check.get('messages'):
+                levels = validator.STATUS_LEVELS
+                record['status'] = levels[max(levels.index(record['status']), levels.index(check['status']))]
+                record['messages'] = [m for m in record['messages'] if m != validator.SAFE_MESSAGE]
+                record['messages'] += check['messages']
+        if self.variant_list[vi]['name']:
+            record['variant'] = self.variant_list[vi]['name']
+        return record
+
+    def pending_variants(self, job) -> List[int]:
+        # 이전 실행에서 완료된 (피처, 변형)은 건너뛰고 남은 변형 번호만 반환
+        pending = []
+        for vi in range(len(self.variant_list)):
+            rec = self.completed.get(self.journal_key(job['key'], vi))
+            if rec is None or rec.get('src') != job['src'] or rec.get('cfg') != self.profile(vi, job['col'])['cfg']:
+                pending.append(vi)
+                continue
+            with self.results_lock:
+                self.counts['skipped'] += 1
+            self.emitter.discover()
+            self.add_success(job, vi, rec.get('out', ''), resumed=True, record=rec,
+                             checks={k: rec.get(k) for k in MISSION_CHECK_KEYS})
+        return pending
+
+    def check_duplicate(self, job, dup) -> bool:
+        """duplicates.check 결과가 중복이면 job에 표시하고, 생성을 생략해야 하면 True"""
+        if dup is None:
+            return False
+        if not self.skip_duplicates:
+            job['overlap'] = {'status': 'warning', 'duplicate_of': dup[1],
+                              'messages': [f"주의: '{dup[1]}'와 지오메트리가 같은 중복 미션입니다."]}
+            return False
+        record = {
+            'name': job['name'],
+            'source': job['src_name'],
+            'success': True,
+            'status': 'warning',
+            'messages': [f"주의: '{dup[1]}'와 지오메트리가 같아 생성을 생략했습니다."],
+            'metrics': {},
+            'altitude': self.base['altitude'],
+            'speed': self.base['speed'],
+            'duplicate_of': dup[1],
+        }
+        self.add_result(job['seq'] + (0,), record, ok=True, counter='duplicates')
+        return True
+
+    def add_failure(self, seq, name, src_name, msg, stage='', reason='error'):
+        if self.run_metrics is not None:
+            self.run_metrics.failure(stage, reason)
+        self.add_result(seq, {
+            'name': name,
+            'source': src_name,
+            'success': False,
+            'status': 'danger',
+            'messages': [msg],
+            'metrics': {},
+            'altitude': self.base['altitude'],
+            'speed': self.base['speed']
+        }, ok=False)
+        self.emitter.feature_failed(name, src_name, msg)
+
+    def on_error(self, stage_name, item, exc):
+        # 지표의 실패 사유: 제한 시간 초과는 timeout, 그 밖에는 예외 클래스 이름
+        reason = 'timeout' if isinstance(exc, TimeoutError) else type(exc).__name__
+        if stage_name == 'read':
+            file_idx, file_path = item
+            label = self.source_label(file_path)
+            self.add_failure((file_idx, -1), label, label, f'오류: {label}: {exc}', stage_name, reason)
+        elif isinstance(item, dict):
+            self.add_failure(item['seq'], item['name'], item['src_name'],
+                             f"오류: {item['src_name']} ({item['name']}): {exc}", stage_name, reason)
+        else:
+            self.add_failure((-1, -1), stage_name, stage_name, f'오류: {stage_name}: {exc}', stage_name, reason)
+
+    # ------------------------------------------------------------------
+    # 1) read: 파일 하나를 읽어 피처 단위 작업으로 분할
+    # ------------------------------------------------------------------
+    def source_label(self, file_path) -> str:
+        return self.group_label if isinstance(file_path, list) else file_path.name
+
+    def source_of(self, item) -> str:
+        """단계 시간 집계용 입력 이름 (그룹 입력은 그룹 이름)"""
+        return item['src_name'] if isinstance(item, dict) else self.source_label(item[1])
+
+    def stage_read(self, item):
+        from .events import FileStarted
+
+        file_idx, file_path = item
+        src_name = self.source_label(file_path)
+        self.emitter.emit(FileStarted(src_name=src_name, index=file_idx, total_files=self.total_files))
+        if isinstance(file_path, list) or file_path.suffix.lower() == '.gpkg':
+            yield from self.read_gpkg(file_idx, file_path, src_name)
+        else:
+            yield from self.read_kml(file_idx, file_path, src_name)
+
+    def read_gpkg(self, file_idx, file_path, src_name):
+        import geopandas as gpd
+        from .events import FileSkipped
+        from .overlaps import geometry_hashes
+        from .pipeline import CancelledError
+
+        gdf_all, stem, name_field, key_layer = _read_layer(self.engine, file_path, self.layer, self.naming_field,
+                                                           self.group_by, self.group_label, self.merge_distance,
+                                                           self.merge_max_area)
+        # 폴리곤 계열만
+        gdf_poly = gdf_all[gdf_all.geometry.geom_type.isin(['Polygon', 'MultiPolygon'])]
+        if gdf_poly.empty:
+            # 파일 단위 실패도 결과 행으로 남겨 리포트 합계와 행 수를 맞춤
+            self.add_failure((file_idx, -1), src_name, src_name,
+                             f'오류: {src_name}: 폴리곤/멀티폴리곤 지오메트리가 없습니다.', 'read', 'no_polygons')
+            self.emitter.emit(FileSkipped(src_name=src_name, reason='no_polygons'))
+            return
+        # 속성 열 오버라이드는 레이어 단위로 한 번에 변환
+        col_rows = None
+        if self.column_map:
+            from .variants import column_overrides
+            col_rows = column_overrides(gdf_poly, self.column_map)
+        if col_rows:
+            self.prevalidate({tuple(sorted(c.items())): c for c in col_rows}.values())
+        # 중복 해시, 겹침, 방문 순서는 모두 WGS84 폴리곤으로 (KML 입력과 같은 기준)
+        wgs84 = gdf_poly.geometry.to_crs(epsg=4326).values if gdf_poly.crs else gdf_poly.geometry.values
+        hashes = geometry_hashes(wgs84)
+        centroids = None
+        if self.route_on:
+            import shapely
+            centroids = shapely.get_coordinates(shapely.centroid(wgs84)).tolist()
+
+        # 피처 하나 → 작업 (샤드 밖, 중복 생략, 재개로 모두 완료된 경우 None이고 사유를 skipped에 기록)
+        skipped = set()
+
+        def feature_job(pos, idx, row, dynm):
+            from .sharding import in_shard
+
+            job = {
+                'seq': (file_idx, pos),
+                'key': f'{src_name}#{idx}',
+                'src_name': src_name,
+                'name': dynm,
+                'src': _source_hash(row.geometry.wkb, dynm),
+                'col': col_rows[pos] if col_rows else {},
+            }
+            # 다른 샤드에 배정된 피처와의 중복도 찾도록 샤드 판정 전에 해시를 기록
+            dup = self.duplicates.check(hashes[pos], job['key'], job['name'])
+            if not in_shard(job['name'], self.shard):
+                skipped.add('shard')
+                return None
+            if self.check_duplicate(job, dup):
+                skipped.add('duplicate')
+                return None
+            if self.overlap_ratio is not None and 'overlap' not in job:
+                self.footprints.append((job['seq'], job['name'], wgs84[pos]))
+            if centroids is not None:
+                self.route_centers[job['seq']] = tuple(centroids[pos])
+            job['variants'] = self.pending_variants(job)
+            if not job['variants']:
+                skipped.add('resumed')
+                return None
+            # 같은 파일/설정으로 이미 계산한 지오메트리는 재사용 (렌더링만 다시 수행)
+            job['geom_key'] = self.engine.geometry_key(file_path, key_layer, idx, self.simplify_tolerance,
+                                                       self.geo_buf, self.exclusion_sig)
+            cached = self.engine.geometries.get(job['geom_key'])
+            if cached is not None:
+                job['lonlat'] = cached
+            else:
+                job['gdf'] = gpd.GeoDataFrame([row], crs=gdf_all.crs)
+            self.emitter.discover(len(job['variants']))
+            return job
+
+        produced = False
+        for pos, (idx, row) in enumerate(gdf_poly.iterrows()):
+            # 명명 필드 처리
+            dynm = fallback_name = f"{stem}_{idx}"
+            try:
+                if name_field and name_field in row:
+                    val = str(row[name_field]).strip()
+                    if val and val.lower() not in ('none', 'nan'):
+                        dynm = sanitize_filename(val) or fallback_name
+                job = feature_job(pos, idx, row, dynm)
+            except CancelledError:
+                raise
+            except Exception as e:
+                # 앞 피처는 이미 다음 단계로 넘어갔으므로 이 피처만 실패로 기록하고 계속 진행
+                self.add_failure((file_idx, pos), dynm, src_name, f'오류: {src_name} ({dynm}): {e}',
+                                 'read', type(e).__name__)
+                produced = True
+                continue
+            if job is not None:
+                produced = True
+                yield job
+        if not produced:
+            # 새로 생성할 미션이 하나도 없는 파일 (샤드 밖, 중복 생략, 재개로 모두 완료)
+            self.emitter.emit(FileSkipped(src_name=src_name, reason=','.join(sorted(skipped))))
+
+    def read_kml(self, file_idx, file_path, src_name):
+        from .events import FileSkipped
+        from .overlaps import geometry_hashes
+        from .sharding import in_shard
+
+        # KML은 기존대로 단일 파일 처리
+        job = {
+            'seq': (file_idx, 0),
+            'key': file_path.name,
+            'src_name': file_path.name,
+            'name': parse_name_value_from_kml(file_path, naming_field=self.naming_field),
+            'src': _source_hash(file_path.read_bytes()),
+            'col': {},
+        }
+        lonlat = parse_polygon_coords_from_kml(file_path)
+        # 샤드 판정 전에 (제외 영역을 빼기 전 좌표로) 해시를 기록하여 샤드 사이의 중복도 찾음.
+        # 좌표가 부족한 링은 폴리곤이 아니므로 중복 검사에서 제외
+        dup = None
+        if len(lonlat) >= 4:
+            dup = self.duplicates.check(geometry_hashes([_lonlat_polygon(lonlat)])[0], job['key'], job['name'])
+        if not in_shard(job['name'], self.shard):
+            self.emitter.emit(FileSkipped(src_name=src_name, reason='shard'))
+            return
+        if self.exclusion_layers is not None:
+            lonlat = polygon_to_lonlat(_lonlat_polygon(lonlat), geographic=True,
+                                       exclusions=self.exclusion_layers.for_crs(None),
+                                       min_part_area_m2=self.exclusion_min_area)
+        if self.check_duplicate(job, dup):
+            self.emitter.emit(FileSkipped(src_name=src_name, reason='duplicate'))
+            return
+        if (self.overlap_ratio is not None or self.route_on) and len(lonlat) >= 4:
+            footprint = _lonlat_polygon(lonlat)
+            if self.overlap_ratio is not None and 'overlap' not in job:
+                self.footprints.append((job['seq'], job['name'], footprint))
+            if self.route_on:
+                self.route_centers[job['seq']] = (footprint.centroid.x, footprint.centroid.y)
+        job['variants'] = self.pending_variants(job)
+        if not job['variants']:
+            self.emitter.emit(FileSkipped(src_name=src_name, reason='resumed'))
+            return
+        job['lonlat'] = lonlat
+        self.emitter.discover(len(job['variants']))
+        yield job
+
+    # ------------------------------------------------------------------
+    # 2) geometry: 폴리곤 병합/버퍼/단순화/좌표 변환
+    # ------------------------------------------------------------------
+    def stage_geometry(self, job):
+        gdf = job.pop('gdf', None)
+        if gdf is not None:
+            geo_buf = self.geo_buf
+            excl = self.exclusion_layers.for_crs(gdf.crs) if self.exclusion_layers is not None else None
+            if excl is not None and self.worker_pool is not None:
+                # 자식 프로세스에는 피처 주변 제외 영역만 전달 (버퍼만큼 넓힌 범위)
+                pad = abs(geo_buf) / 111111.0 if gdf.crs is not None and gdf.crs.is_geographic else abs(geo_buf)
+                minx, miny, maxx, maxy = gdf.total_bounds
+                excl = excl.subset((minx - pad, miny - pad, maxx + pad, maxy + pad))
+            task_args = (gdf, self.simplify_tolerance, geo_buf, excl, self.exclusion_min_area)
+            if self.worker_pool is not None:
+                job['lonlat'] = self.worker_pool.call(_polygon_lonlat_task, task_args,
+                                                      timeout=self.feature_timeout, cancel=self.cancel)
+            else:
+                job['lonlat'] = _polygon_lonlat_task(*task_args)
+            self.engine.geometries.put(job.pop('geom_key'), job['lonlat'])
+        return job
+
+    # ------------------------------------------------------------------
+    # 3) analyze: 묶음 단위 제한구역 검사와 비행 지표 계산 (폴리곤 측정은 피처당 한 번, 경로는 변형마다)
+    # ------------------------------------------------------------------
+    def screen_zones(self, jobs):
+        from .zones import lonlat_polygons
+
+        # 제한구역 색인에 묶음 전체를 한 번에 질의 (좌표가 부족한 폴리곤은 검사 제외)
+        idx = [i for i, job in enumerate(jobs) if len(job['lonlat']) >= 4]
+        if not idx:
+            return jobs
+        screened = self.zone_index.screen(lonlat_polygons([jobs[i]['lonlat'] for i in idx]), clip=self.clip_zones)
+        dropped = set()
+        for i, res in zip(idx, screened):
+            if res is None:
+                continue
+            job = jobs[i]
+            geom = res.pop('geometry')
+            if geom is not None and geom.is_empty:
+                self.add_failure(job['seq'], job['name'], job['src_name'],
+                                 f"오류: {job['src_name']} ({job['name']}): {res['messages'][0]}",
+                                 stage='analyze', reason='zone_clipped')
+                dropped.add(i)
+                continue
+            if geom is not None:
+                job['lonlat'] = [(f'{x:.9f}', f'{y:.9f}') for x, y in geom.exterior.coords]
+            job['zones'] = res
+        return [job for i, job in enumerate(jobs) if i not in dropped]
+
+    def stage_analyze(self, jobs):
+        if self.zone_index is not None:
+            with section('analyze.zones'):
+                jobs = self.screen_zones(jobs)
+            if not jobs:
+                return jobs
+        try:
+            measures = polygon_measures([job['lonlat'] for job in jobs])
+            rows, params = [], []
+            for i, job in enumerate(jobs):
+                for vi in job['variants']:
+                    rows.append(i)
+                    params.append(self.profile(vi, job['col'])['flight_params'])
+            rows = np.asarray(rows, dtype=np.int64)
+            flights = compute_flight_metrics([jobs[i]['lonlat'] for i in rows], params,
+                                             {k: v[rows] for k, v in measures.items()})
+        except Exception:
+            # 묶음 계산이 실패하면(좌표가 부족한 피처 등) 피처별로 나눠 계산 (지표 없이도 미션은 생성)
+            for job in jobs:
+                job['flight'] = {}
+                params = [self.profile(vi, job['col'])['flight_params'] for vi in job['variants']]
+                try:
+                    job_flights = compute_flight_metrics([job['lonlat']] * len(params), params)
+                except Exception:
+                    continue
+                job['flight'] = dict(zip(job['variants'], job_flights))
+            return jobs
+        flights = iter(flights)
+        for job in jobs:
+            job['flight'] = {vi: next(flights) for vi in job['variants']}
+        return jobs
+
+    # ------------------------------------------------------------------
+    # 3-1) terrain: DEM 지면 고도 샘플링 (피처당 한 번) 후 변형별 고도로 여유고 판정
+    # ------------------------------------------------------------------
+    def stage_terrain(self, job):
+        from .terrain import ground_profile, terrain_clearance
+
+        try:
+            ground = ground_profile(self.sampler, job['lonlat'])
+        except Exception as e:
+            # DEM 문제로 미션 생성을 막지는 않고 경고로만 남김
+            fail = {'status': 'warning', 'clearance_min': None, 'messages': [f'주의: 지형 검사 실패: {e}']}
+            job['terrain'] = {vi: fail for vi in job['variants']}
+            return job
+        job['terrain'] = {}
+        for vi in job['variants']:
+            prof = self.profile(vi, job['col'])
+            use_tf = bool((prof['overrides'] or {}).get('use_terrain_follow'))
+            job['terrain'][vi] = terrain_clearance(ground, prof['flight_params']['altitude'], use_tf,
+                                                   self.min_clearance)
+        return job
+
+    # ------------------------------------------------------------------
+    # 4) render: 템플릿에 좌표/오버라이드 주입 (변형마다 하나씩 분기)
+    # ------------------------------------------------------------------
+    def stage_render(self, job):
+        lonlat = job.pop('lonlat')
+        flight = job.pop('flight', None) or {}
+        terrain = job.pop('terrain', None) or {}
+        zones = job.pop('zones', None)
+        overlap = job.pop('overlap', None)
+        for vi in job.pop('variants'):
+            sub = dict(job, vi=vi, checks={'flight': flight.get(vi), 'terrain': terrain.get(vi), 'zones': zones,
+                                           'overlap': overlap})
+            sub['kml_bytes'] = self.profile(vi, job['col'])['compiled'].render(lonlat)
+            yield sub
+
+    # ------------------------------------------------------------------
+    # 5) pack: KMZ 압축 (메모리 내, WPML에 미션별 거리/시간 기록)
+    # ------------------------------------------------------------------
+    def stage_pack(self, job):
+        v = self.variant_list[job['vi']]
+        if self.pack_kmz:
+            job['payload'] = self.profile(job['vi'], job['col'])['packer'].pack(job.pop('kml_bytes'),
+                                                                                flight=job['checks']['flight'])
+            job['out_name'] = f"{v['prefix']}{job['name']}.kmz"
+        else:
+            job['payload'] = job.pop('kml_bytes')
+            job['out_name'] = f"{v['prefix']}{job['name']}.kml"
+        return job
+
+    # ------------------------------------------------------------------
+    # 6) write: 디스크 기록 및 결과 수집
+    # ------------------------------------------------------------------
+    def stage_write(self, job):
+        from .journal import atomic_write_bytes
+
+        vi = job['vi']
+        with section('write.file'):
+            atomic_write_bytes(self.out_dir / job['out_name'], job['payload'])
+        if self.run_metrics is not None:
+            self.run_metrics.add_bytes(len(job['payload']))
+        with section('write.journal'):
+            rec = self.journal.append(self.journal_key(job['key'], vi), self.profile(vi, job['col'])['cfg'],
+                                      job['name'], job['out_name'], job['payload'], src=job['src'],
+                                      **{k: v for k, v in job['checks'].items() if v})
+        self.add_success(job, vi, job['out_name'], record=rec, checks=job['checks'])
+
+
 def batch_process_inputs(missions_dir: Path, template_path: Path, waylines_path: Path, out_dir: Optional[Path] = None,
                          input_format: str = 'auto', naming_field: Optional[str] = None, layer: Optional[str] = None,
                          set_times: bool = True, set_takeoff_ref_point: bool = False, pack_kmz: bool = True,
-                         overrides: Optional[Dict] = None, simplify_tolerance: float = 0.0):
+                         overrides: Optional[Dict] = None, simplify_tolerance: float = 0.0,
+                         stage_workers: Optional[Dict[str, int]] = None, queue_size: int = 64,
+                         resume: bool = False, progress: Optional[Callable] = None,
+                         progress_interval: float = 0.2, cancel=None,
+                         feature_timeout: Optional[float] = None, engine=None,
+                         shard: Optional[Tuple[int, int]] = None, files: Optional[List[Path]] = None,
+                         variants=None, override_columns=None, analyze_batch: int = 64,
+                         dem: Optional[Path] = None, min_clearance: Optional[float] = None,
+                         zones: Optional[Path] = None, zones_layer: Optional[str] = None,
+                         zones_name_field: Optional[str] = None, clip_zones: bool = False,
+                         overlap_ratio: Optional[float] = None, skip_duplicates: bool = False,
+                         exclusions=None, exclusion_min_area: float = 0.0, group_by: Optional[str] = None,
+                         merge_distance: Optional[float] = None, merge_max_area: Optional[float] = None,
+                         route: bool = False, route_start=None, route_format: str = 'gpkg',
+                         report_formats=None, cprofile: bool = False, trace_memory: bool = False,
+                         metrics_file: Optional[Path] = None, metrics_interval: float = 15.0) -> Dict:
+    """
+    입력 폴더의 KML/GPKG를 미션 파일로 일괄 변환합니다.
+
+    처리는 read → geometry → analyze → render → pack → write 단계로 나뉘며 각 단계는
+    bounded queue로 연결된 별도 스레드 풀에서 실행됩니다. (pipeline 모듈 참고) 단계 함수와 실행 상태는
+    _BatchRun에 있고, 이 함수는 인자 검사와 단계별 자원 준비, 실행 후 정리(방문 순서, 리포트)를 맡습니다.
+    analyze 단계는 도착한 미션을 최대 analyze_batch개씩 묶어 면적, 비행 라인 수, 경로 길이,
+    예상 시간, 배터리 수를 한 번에 계산합니다. (metrics 모듈 참고) 결과는 리포트와
+    WPML의 <wpml:distance>/<wpml:duration>에 기록됩니다.
+
+    dem(GeoTIFF/VRT 또는 .npy DEM 경로)을 지정하면 analyze 다음에 terrain 단계가 추가되어
+    폴리곤 위 지면 고도(최소/최대)와 최소 지형 여유고를 검사합니다. 여유고가 min_clearance(m)보다
+    낮으면 주의, 없으면 위험으로 리포트 상태에 반영됩니다. (terrain 모듈 참고)
+
+    zones(제한구역/보호구역 GPKG 경로)를 지정하면 STRtree 색인을 한 번 만들고 analyze 단계에서
+    미션 묶음을 벌크 질의하여 겹치는 미션을 위험으로 표시합니다. clip_zones=True이면 겹친 부분을
+    잘라낸 폴리곤으로 미션을 만들고, 전부 잘리는 미션은 실패로 기록합니다. (zones 모듈 참고)
+
+    지오메트리가 완전히 같은 피처(WGS84 정규화 WKB 해시, GPKG와 KML 공통)는 중복으로 표시하고, skip_duplicates=True이면 처음
+    피처만 생성합니다(생략한 수는 'duplicates'). 해시는 샤드 판정 전에 기록하므로 다른 샤드에
+    배정된 피처와의 중복도 찾습니다. overlap_ratio(예: 0.5)를 지정하면 배치 전체 폴리곤으로 STRtree를 만들어
+    작은 쪽 면적 대비 그 비율 이상 겹치는 미션 쌍을 찾아 양쪽에 경고합니다. (overlaps 모듈 참고)
+
+    exclusions(제외 레이어 경로 또는 'path.gpkg::레이어' 리스트)를 지정하면 geometry 단계에서
+    버퍼 다음, 단순화 전에 건물/수계 등 제외 영역을 빼고 exclusion_min_area(m²)보다 작은 조각은
+    버립니다. 레이어는 피처 좌표계별로 한 번만 재투영하여 STRtree로 색인합니다. 남는 영역이 없는
+    피처는 실패로 기록합니다. (zones.subtract_exclusions 참고)
+
+    group_by(속성 열 이름)를 지정하면 입력 GPKG 전체에서 같은 키의 피처를 합쳐(dissolve) 키마다
+    미션 하나를 만듭니다. merge_distance(m)를 지정하면 그 거리 안의 그룹(merge_max_area m² 미만만)을
+    하나의 비행으로 병합하여 이륙 횟수를 줄입니다. 미션 이름은 naming_field가 없으면 그룹 키입니다.
+    (grouping 모듈 참고)
+
+    route=True(또는 route_start='경도,위도')이면 실행이 끝난 뒤 성공한 미션의 중심점으로
+    최근접 이웃 + 2-opt 방문 순서를 계산하여 출력 파일 이름 앞에 순번(001_)을 붙이고,
+    경로선을 out_dir/route.gpkg(또는 route_format='kml'이면 route.kml)로 저장합니다.
+    순번은 한 실행의 미션 전체로 매기므로 shard, 감시 모드와는 함께 쓸 수 없습니다. (route 모듈 참고)
+
+    report_formats('html,csv,jsonl,parquet' 중 선택, 기본 html)에서 csv/jsonl/parquet는 미션이
+    끝날 때마다 out_dir/report_<시각>.<형식>에 한 행씩 추가됩니다. HTML은 페이지 단위로 그리는
+    리포트이며 같은 이름을 씁니다. route로 출력 이름이 바뀌면 스트리밍 리포트는 실행 후 바뀐 이름으로
+    다시 씁니다. (reporter, report_sinks 모듈 참고)
+
+    단계(read, geometry, ...)와 세부 구간(GPKG 읽기, 병합, 좌표 변환, 압축, 디스크 쓰기 등)의
+    소요 시간은 파일별/배치별로 집계되어(count, total, p50/p95/max) 리포트의 처리 시간 표와
+    out_dir/report_<시각>_profile.json에 기록됩니다. (timings 모듈 참고)
+
+    cprofile=True이면 호출 스레드와 단계 워커 스레드의 cProfile 결과를 합쳐 out_dir/report_<시각>.pstats와
+    상위 함수 요약(_profile_top.txt)을, trace_memory=True이면 tracemalloc으로 단계별 최대 메모리 시점
+    스냅샷(_memory_<단계>.snapshot)과 할당 위치 요약(_memory_top.txt)을 저장합니다. 둘 다 끄면(기본)
+    수집기를 만들지 않습니다. (diagnostics 모듈 참고)
+
+    metrics_file(예: node_exporter textfile 폴더의 skymission.prom)을 지정하면 미션 수, 단계/사유별
+    실패 수, 단계 처리 시간 히스토그램, 출력 바이트 수, 최대 RSS, 엔진 캐시 적중률을 Prometheus 텍스트
+    형식으로 기록합니다. 실행 중에는 metrics_interval초마다, 끝나면 최종 값으로 파일을 원자적으로
+    교체합니다. (openmetrics 모듈 참고)
+
+    완료된 미션은 out_dir의 저널에 기록되며, resume=True이면 같은 설정으로
+    이미 완료된 피처를 건너뜁니다. (journal 모듈 참고)
+
+    진행 상황은 print 대신 progress 콜백으로 events 모듈의 이벤트를 전달합니다.
+    FeatureDone/Progress 이벤트는 progress_interval(초)마다 한 번으로 제한됩니다.
+
+    cancel(CancellationToken)이 취소되면 새 피처 공급을 멈추고 지금까지의 결과로
+    리포트를 만듭니다. feature_timeout(초)을 지정하면 지오메트리 처리를 별도 프로세스에서
+    실행하고, 제한 시간을 넘긴 피처는 종료 후 실패로 기록합니다. (timelimit 모듈 참고)
+
+    engine(MissionBatchEngine)을 넘기면 컴파일된 템플릿, 읽어 둔 GPKG, 피처별 지오메트리
+    결과를 실행 사이에 재사용합니다. 없으면 이번 실행 동안만 쓰는 엔진을 만듭니다.
+
+    shard=(i, N)이면 출력 이름의 안정 해시로 i번째 조각에 속한 피처만 처리합니다.
+    여러 장비가 같은 입력 폴더를 나눠 처리한 뒤 sharding.merge_shard_outputs로 합칩니다.
+    처리 결과와 출력 파일 목록은 out_dir의 매니페스트(manifest*.json)에 기록됩니다.
+
+    files를 지정하면 missions_dir를 훑지 않고 해당 파일만 처리합니다(watch 모드 등).
+    저널에는 피처 원본 해시도 기록되므로 resume=True이면 내용이 바뀐 피처만 다시 생성합니다.
+    이때 매니페스트는 기존 내용에서 해당 파일의 결과 행과 출력만 교체합니다.
+
+    variants(오버라이드 dict 리스트 또는 presets/의 매트릭스 파일)를 지정하면 지오메트리는
+    한 번만 처리하고 변형마다 렌더링하여 out_dir/<변형 이름>/에 저장합니다. (variants 모듈 참고)
+    리포트에는 변형 열과 변형별 GSD/Blur 비교표가 추가됩니다.
+
+    override_columns({'altitude': 'ALT_M'} 또는 'altitude=ALT_M,drone_model=MODEL')를 지정하면
+    GPKG 속성 열 값을 피처별 오버라이드로 사용합니다 (배치 < 속성 열 < 변형 순서로 적용).
+    실효 오버라이드가 같은 미션끼리는 컴파일된 템플릿과 WPML을 공유합니다. 안전 검증은 레이어마다
+    서로 다른 조합을 모아 validator.validate_missions_batch로 한 번에 수행합니다.
+
+    Returns:
+        Dict: {'ok', 'failed', 'skipped', 'duplicates', 'cancelled', 'results', 'report_path', 'stages',
+               'report_paths', 'manifest_path', 'overlaps', 'route', 'profile', 'profile_path',
+               'diagnostics', 'metrics_path'}
+    """
+    from .pipeline import StagedPipeline
+    from .events import ProgressEmitter, BatchStarted, BatchFinished, Notice, StageTimings
+    from .journal import atomic_write_bytes, config_fingerprint
+    from .sharding import write_manifest
+    from .timings import TimingRecorder
+
+    # 인자 검사는 out_dir(저널, 리포트)을 건드리기 전에 모두 끝냄
+    route_on, route_start, formats = _check_batch_args(shard, route, route_start, route_format, report_formats)
+
     missions_dir = Path(missions_dir)
     template_path = Path(template_path)
     waylines_path = Path(waylines_path)
@@ -474,116 +1647,345 @@ def batch_process_inputs(missions_dir: Path, template_path: Path, waylines_path:
         out_dir = missions_dir.parent / 'output'
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
-    
-    # 리포트용 결과 저장 리스트
-    batch_results = []
-
-    def save_result(lonlat, dynm, src_name):
-        if pack_kmz:
-            kml_bytes = generate_kml_bytes(template_path, lonlat, set_times=set_times,
-                                           set_takeoff_ref_point=set_takeoff_ref_point, overrides=overrides)
-            out_kmz = out_dir / f'{dynm}.kmz'
-            make_kmz_from_bytes(kml_bytes, waylines_path, out_kmz,
-                                arcname_kml='template.kml', arcname_wpml='waylines.wpml', overrides=overrides)
-            print(f'완료: {src_name} -> {out_kmz.name}')
-        else:
-            out_kml = out_dir / f'{dynm}.kml'
-            inject_coords_to_template(template_path, lonlat, out_kml, set_times=set_times,
-                                      set_takeoff_ref_point=set_takeoff_ref_point, overrides=overrides)
-            print(f'완료: {src_name} -> {out_kml.name}')
-
-        # 리포트 데이터 수집
-        v_res = validate_mission_config(overrides)
-        batch_results.append({
-            'name': dynm,
-            'success': True,
-            'status': v_res.get('status'),
-            'messages': v_res.get('messages'),
-            'metrics': v_res.get('metrics'),
-            'altitude': overrides.get('altitude') if overrides else None,
-            'speed': overrides.get('auto_flight_speed') if overrides else None
-        })
-
-    def process_one(file_path: Path, is_gpkg: bool):
-        try:
-            if is_gpkg:
-                # GPKG는 내부 피처별로 분할 처리 시도
-                gdf_all = read_gpkg_to_gdf(file_path, layer=layer)
-                # 폴리곤 계열만
-                gdf_poly = gdf_all[gdf_all.geometry.geom_type.isin(['Polygon', 'MultiPolygon'])].copy()
-                if gdf_poly.empty:
-                    print(f'건너뜀(폴리곤 없음): {file_path.name}')
-                    return False
-                
-                for idx, row in gdf_poly.iterrows():
-                    # 개별 피처 처리
-                    import geopandas as gpd
-                    single_gdf = gpd.GeoDataFrame([row], crs=gdf_all.crs)
-                    
-                    geo_buf = overrides.get('geometry_buffer_m', 0.0) if overrides else 0.0
-                    lonlat, _ = parse_polygon_coords_from_gpkg_direct(
-                        single_gdf, to_epsg=4326, 
-                        simplify_tolerance=simplify_tolerance,
-                        geometry_buffer_m=geo_buf
-                    )
-                    
-                    # 명명 필드 처리
-                    dynm = fallback_name = f"{file_path.stem}_{idx}"
-                    if naming_field and naming_field in row:
-                        val = str(row[naming_field]).strip()
-                        if val and val.lower() != 'none':
-                            dynm = sanitize_filename(val)
-                    
-                    save_result(lonlat, dynm, file_path.name)
-            else:
-                # KML은 기존대로 단일 파일 처리
-                lonlat = parse_polygon_coords_from_kml(file_path)
-                dynm = parse_name_value_from_kml(file_path, naming_field=naming_field)
-                save_result(lonlat, dynm, file_path.name)
-            
-            return True
-        except Exception as e:
-            msg = f'오류: {file_path.name}: {e}'
-            print(msg)
-            batch_results.append({
-                'name': file_path.name,
-                'success': False,
-                'status': 'danger',
-                'messages': [msg],
-                'metrics': {},
-                'altitude': overrides.get('altitude') if overrides else None,
-                'speed': overrides.get('auto_flight_speed') if overrides else None
-            })
-            return False
 
-    count_ok = 0
-    count_err = 0
+    workers = dict(DEFAULT_STAGE_WORKERS)
+    if stage_workers:
+        workers.update(stage_workers)
+
+    if engine is None:
+        from .engine import MissionBatchEngine
+        engine = MissionBatchEngine(template_path, waylines_path)
+
+    # 변형 목록 (지정하지 않으면 이름 없는 기본 변형 하나)
+    variant_list = _prepare_variants(variants, overrides, out_dir)
+    # 지오메트리 키는 모든 변형이 같으므로(load_variants 검사) 매트릭스 파일의 base까지 합친 값을 사용
+    geometry_base = variant_list[0]['overrides'] or {}
+    geo_buf = geometry_base.get('geometry_buffer_m') or 0.0
+    if variants and geometry_base.get('simplify_tolerance') is not None:
+        simplify_tolerance = float(geometry_base['simplify_tolerance'])
+
+    column_map = {}
+    if override_columns:
+        from .variants import parse_override_columns
+        column_map = parse_override_columns(override_columns)
+
+    # 단계별 자원: terrain(DEM), analyze(제한구역 색인), geometry(제외 레이어), read(그룹)
+    sampler, min_clearance = _terrain_setup(engine, dem, min_clearance)
+    zone_index = engine.zone_index(Path(zones), layer=zones_layer, name_field=zones_name_field) if zones else None
+    exclusion_layers, exclusion_sig = _exclusion_setup(engine, exclusions, exclusion_min_area)
+    grouping = group_by is not None or merge_distance is not None
+
+    # 저널: 출력에 영향을 주는 설정이 같을 때만 이전 완료 기록을 재사용
+    cfg_base = _journal_config(template_path, waylines_path, {
+        'set_times': set_times,
+        'set_takeoff_ref_point': set_takeoff_ref_point,
+        'pack_kmz': pack_kmz,
+        'simplify_tolerance': simplify_tolerance,
+        'layer': layer,
+        'naming_field': naming_field,
+    }, {
+        # 지형 검사 결과도 저널에 기록되므로 DEM이나 기준이 바뀌면 다시 검사
+        'dem': [_file_signature(Path(dem)), min_clearance] if sampler is not None else None,
+        'zones': [_file_signature(Path(zones)), zones_layer, zones_name_field, bool(clip_zones)]
+        if zone_index is not None else None,
+        'exclusions': exclusion_sig,
+        'group': [group_by, merge_distance, merge_max_area] if grouping else None,
+    })
+
+    emitter = ProgressEmitter(progress, min_interval=progress_interval)
+    # 실행 상태와 단계 함수. 만들 때 기본 프로필을 컴파일하므로 템플릿 오류는 저널을 열기 전에 드러남
+    run = _BatchRun(
+        engine=engine, template_path=template_path, waylines_path=waylines_path, out_dir=out_dir,
+        variant_list=variant_list, cfg_base=cfg_base, emitter=emitter,
+        naming_field=naming_field, layer=layer, set_times=set_times, set_takeoff_ref_point=set_takeoff_ref_point,
+        pack_kmz=pack_kmz, simplify_tolerance=simplify_tolerance, geo_buf=geo_buf, column_map=column_map,
+        shard=shard, skip_duplicates=skip_duplicates, overlap_ratio=overlap_ratio, route_on=route_on,
+        group_by=group_by, group_label=f'group:{group_by}' if group_by else 'group',
+        merge_distance=merge_distance, merge_max_area=merge_max_area,
+        exclusion_layers=exclusion_layers, exclusion_sig=exclusion_sig, exclusion_min_area=exclusion_min_area,
+        zone_index=zone_index, clip_zones=clip_zones, sampler=sampler, min_clearance=min_clearance,
+        feature_timeout=feature_timeout, cancel=cancel,
+    )
+    batch_results, counts = run.results, run.counts
+    if len(variant_list) == 1 and not column_map:
+        cfg = run.base_profiles[0]['cfg']
+    else:
+        cfg = config_fingerprint([p['cfg'] for p in run.base_profiles] + [column_map])
+
+    # 리포트: HTML은 실행 후 한 번, CSV/JSONL/Parquet는 미션이 끝날 때마다 바로 추가
+    stem = reporter.report_stem()
+    run.start(formats, stem, resume)
+
+    stages = run.stages(workers, analyze_batch)
+    # 단계/구간 시간 (파일별, 배치 전체). 그룹 입력은 그룹 이름으로 집계
+    timer = TimingRecorder()
+    # cProfile/tracemalloc은 요청했을 때만 (끄면 파이프라인 hooks가 None)
+    diagnostics = None
+    if cprofile or trace_memory:
+        from .diagnostics import RunDiagnostics
+        diagnostics = RunDiagnostics(out_dir, stem, cprofile=cprofile, trace_memory=trace_memory)
+    if metrics_file:
+        from .openmetrics import BatchMetrics
+        run.run_metrics = BatchMetrics(Path(metrics_file), counts, timer=timer, engine=engine,
+                                       stages=[s.name for s in stages], interval=metrics_interval)
+    pipeline = StagedPipeline(stages, queue_size=queue_size, on_error=run.on_error, timer=timer,
+                              source_of=run.source_of, hooks=diagnostics)
+
+    # files를 지정한 부분 실행은 기존 매니페스트에서 해당 입력의 항목만 교체
+    partial_sources = {Path(f).name for f in files} if files is not None else None
+    files = _batch_input_files(missions_dir, files, input_format, grouping)
+    run.total_files = len(files)
+    emitter.emit(BatchStarted(total_files=len(files), out_dir=str(out_dir)))
+    if diagnostics is not None:
+        diagnostics.start()
+    if run.run_metrics is not None:
+        run.run_metrics.start()
+    diagnostic_paths, diagnostic_error = {}, None
+    try:
+        pipeline.run(enumerate(files), cancel=cancel)
+    finally:
+        if run.run_metrics is not None:
+            run.run_metrics.stop()
+        run.close()
+        # 파이프라인이 예외로 끝나도 프로파일러/tracemalloc을 멈추고 그때까지의 결과를 저장
+        if diagnostics is not None:
+            try:
+                diagnostic_paths = diagnostics.finish()
+            except Exception as e:
+                diagnostic_error = e
+    stage_stats = pipeline.stats()
+    cancelled = bool(cancel is not None and cancel.cancelled)
+
+    emitter.emit(emitter.progress(), force=True)
+    emitter.emit(StageTimings(stages=stage_stats))
+    if cancelled:
+        emitter.emit(Notice(message='취소됨: 완료된 미션까지만 리포트에 기록합니다.', level='warning'))
+    if counts['skipped']:
+        emitter.emit(Notice(message=f"재개: 이전 실행에서 완료된 {counts['skipped']}건 건너뜀"))
+
+    overlap_pairs = []
+    if run.footprints:
+        overlap_pairs = _annotate_overlaps(batch_results, run.footprints, overlap_ratio)
+        if overlap_pairs:
+            emitter.emit(Notice(message=f'겹치는 미션 {len(overlap_pairs)}쌍 발견', level='warning'))
+    route_summary = None
+    if route_on and not cancelled:
+        route_summary = _finish_route(batch_results, run.route_centers, run.route_records, run.manifest_outputs,
+                                      out_dir, route_start, route_format, run.journal, emitter,
+                                      rewrite=(formats, stem) if run.sinks is not None else None)
+    duplicate_count = sum(1 for r in batch_results if r.get('duplicate_of') or
+                          (r.get('overlap') or {}).get('duplicate_of'))
+    if duplicate_count:
+        emitter.emit(Notice(message=f'지오메트리 중복 미션 {duplicate_count}건', level='warning'))
+
+    # 병렬 처리로 뒤섞인 순서를 입력 순서로 복원
+    batch_results.sort(key=lambda r: r.pop('_seq'))
+
+    # 실행 프로필: 단계/구간별 count, total, p50/p95/max (파일별, 배치 전체)
+    run_profile = timer.profile(missions=counts['ok'] - counts['skipped'], stages=stage_stats)
+    profile_path = None
+    try:
+        profile_path = out_dir / f'{stem}_profile.json'
+        atomic_write_bytes(profile_path, json.dumps(run_profile, ensure_ascii=False, indent=1).encode('utf-8'))
+    except Exception as e:
+        profile_path = None
+        emitter.emit(Notice(message=f'프로필 저장 실패: {e}', level='error'))
 
-    files = []
-    if input_format == 'gpkg':
-        files = sorted(missions_dir.glob('*.gpkg'))
-    elif input_format == 'kml':
-        files = sorted(missions_dir.glob('*.kml'))
-    else:  # auto
-        files = sorted(list(missions_dir.glob('*.gpkg')) + list(missions_dir.glob('*.kml')))
-
-    for src in files:
-        is_gpkg = src.suffix.lower() == '.gpkg'
-        ok = process_one(src, is_gpkg)
-        if ok:
-            count_ok += 1
-        else:
-            count_err += 1
+    # 매니페스트: 샤드 병합 시 결과 행과 출력 파일 목록을 합치는 데 사용
+    manifest_path = None
+    try:
+        manifest_path = write_manifest(out_dir, shard, batch_results, run.manifest_outputs,
+                                       extra={'cfg': cfg, 'cancelled': cancelled,
+                                              'variants': [v['name'] for v in variant_list if v['name']],
+                                              'overlaps': overlap_pairs, 'route': route_summary},
+                                       update_sources=partial_sources)
+    except Exception as e:
+        emitter.emit(Notice(message=f'매니페스트 저장 실패: {e}', level='error'))
 
-    print(f'총 처리: {count_ok} 성공, {count_err} 실패')
-    
     # 리포트 생성
-    if batch_results:
+    report_path, report_paths = _write_html_report(batch_results, out_dir, stem, formats, run_profile,
+                                                   run.sinks.paths() if run.sinks is not None else {}, emitter)
+
+    if diagnostic_error is not None:
+        emitter.emit(Notice(message=f'진단 파일 저장 실패: {diagnostic_error}', level='error'))
+    elif diagnostic_paths:
+        emitter.emit(Notice(message='진단 파일 저장: ' + ', '.join(p.name for p in diagnostic_paths.values())))
+
+    metrics_path = None
+    if run.run_metrics is not None:
         try:
-            report_path = reporter.generate_report(batch_results, out_dir)
-            print(f'리포트 생성 완료: {report_path.name}')
+            metrics_path = run.run_metrics.close()
         except Exception as e:
-            print(f'리포트 생성 실패: {e}')
+            emitter.emit(Notice(message=f'지표 파일 저장 실패: {e}', level='error'))
+
+    emitter.emit(BatchFinished(ok=counts['ok'], failed=counts['failed'], skipped=counts['skipped'],
+                               elapsed_s=round(emitter.elapsed(), 3), cancelled=cancelled,
+                               report_path=str(report_path) if report_path else None))
+
+    return {
+        'ok': counts['ok'],
+        'failed': counts['failed'],
+        'skipped': counts['skipped'],
+        'duplicates': counts['duplicates'],
+        'cancelled': cancelled,
+        'results': batch_results,
+        'report_path': report_path,
+        'report_paths': report_paths,
+        'stages': stage_stats,
+        'manifest_path': manifest_path,
+        'overlaps': overlap_pairs,
+        'route': route_summary,
+        'profile': run_profile,
+        'profile_path': profile_path,
+        'diagnostics': diagnostic_paths,
+        'metrics_path': metrics_path,
+    }
+
+
+def _finish_route(results: List[Dict], centers: Dict, records: Dict, outputs: List[Dict], out_dir: Path,
+                  start, route_format: str, journal, emitter, rewrite=None) -> Optional[Dict]:
+    """
+    실행이 끝난 뒤 _apply_route로 방문 순서를 매깁니다. rewrite=(형식, stem)이면 바뀐 출력 이름으로
+    스트리밍 리포트를 다시 씁니다. 실패는 실행 전체를 막지 않고 알림으로만 남깁니다.
+    """
+    from .events import Notice
+
+    try:
+        journal.open(resume=True)
+        try:
+            summary = _apply_route(results, centers, records, outputs, out_dir, start, route_format, journal)
+        finally:
+            journal.close()
+        if summary and rewrite is not None:
+            _rewrite_report_sinks(out_dir, rewrite[0], rewrite[1], results)
+        if summary:
+            emitter.emit(Notice(message=f"방문 순서 {summary['stops']}곳, 이동 거리 "
+                                        f"{summary['distance_m'] / 1000:.1f} km: {summary['path']}"))
+        return summary
+    except Exception as e:
+        emitter.emit(Notice(message=f'방문 순서 계산 실패: {e}', level='error'))
+        return None
+
+
+def _write_html_report(results: List[Dict], out_dir: Path, stem: str, formats, run_profile: Dict,
+                       report_paths: Dict, emitter):
+    """HTML 리포트를 만들고 (HTML 경로 또는 None, 형식별 리포트 경로)를 반환합니다."""
+    from .events import Notice
+
+    if not results or 'html' not in formats:
+        return None, report_paths
+    try:
+        report_path = reporter.generate_report(results, out_dir, stem=stem, profile=run_profile)
+    except Exception as e:
+        emitter.emit(Notice(message=f'리포트 생성 실패: {e}', level='error'))
+        return None, report_paths
+    emitter.emit(Notice(message=f'리포트 생성 완료: {report_path.name}'))
+    return report_path, {'html': report_path, **report_paths}
+
+
+def _rewrite_report_sinks(out_dir: Path, formats, stem: str, results: List[Dict]):
+    """
+    스트리밍 리포트(csv/jsonl/parquet)를 결과 전체로 입력 순서대로 다시 씁니다.
+    방문 순번으로 출력 이름이 바뀐 뒤, 실행 중에 쓴 행이 없는 파일을 가리키지 않도록 사용합니다.
+    """
+    from .report_sinks import open_report_sinks
+
+    sinks = open_report_sinks(out_dir, formats, stem)
+    if sinks is None:
+        return
+    try:
+        for record in sorted(results, key=lambda r: r['_seq']):
+            sinks.write(record)
+    finally:
+        sinks.close()
+
+
+# 방문 순번이 붙은 출력 이름 (예: 007_east.kmz → east.kmz)
+_ROUTE_PREFIX = re.compile(r'^\d{3,}_(.+)$')
+
+
+def _apply_route(results: List[Dict], centers: Dict, records: Dict, outputs: List[Dict], out_dir: Path,
+                 start, route_format: str, journal) -> Optional[Dict]:
+    """
+    성공한 미션을 방문 순서대로 정렬하여 출력 이름 앞에 순번을 붙이고 경로 파일을 저장합니다.
+    변형이 여러 개면 같은 피처의 출력은 같은 순번을 받습니다. 이름을 바꾼 출력은 저널에 다시
+    기록하므로(route_base에 원래 이름) resume 시에도 그대로 재사용되고 순번만 새로 매겨집니다.
+    이전 실행에서 다른 순번으로 남은 같은 미션의 출력(NNN_이름)은 지웁니다.
+    """
+    import os
+    from pathlib import PurePosixPath
+    from .route import plan_route, write_route
+
+    done = [r for r in results if r.get('success') and r.get('output') and r['_seq'][:2] in centers]
+    seqs = sorted({r['_seq'][:2] for r in done})
+    if not seqs:
+        return None
+    plan = plan_route([centers[s] for s in seqs], start)
+    rank = {seqs[i]: k + 1 for k, i in enumerate(plan['order'].tolist())}
+    width = max(3, len(str(len(seqs))))
+    by_out = {o.get('out'): o for o in outputs}
+
+    stops = {}
+    bases = {}  # 폴더 → 이번에 순번을 매긴 원래 이름
+    for r in done:
+        k = rank[r['_seq'][:2]]
+        old = r['output']
+        rec = records.get(old)
+        base = (rec or {}).get('route_base') or PurePosixPath(old).name
+        new = str(PurePosixPath(old).parent / f'{k:0{width}d}_{base}')
+        if new != old:
+            os.replace(out_dir / old, out_dir / new)
+            if rec is not None:
+                journal.append_record({**{f: v for f, v in rec.items() if f != '_tail_pos'},
+                                       'out': new, 'route_base': base})
+            if old in by_out:
+                by_out[old]['out'] = new
+        r['output'] = new
+        r['route_order'] = k
+        bases.setdefault(PurePosixPath(new).parent, set()).add(base)
+        if k not in stops:
+            lon, lat = centers[r['_seq'][:2]]
+            stops[k] = {'order': k, 'name': r['name'], 'output': new, 'lon': lon, 'lat': lat}
+
+    final = {r['output'] for r in done}
+    for parent, names in bases.items():
+        for path in (out_dir / parent).iterdir():
+            m = _ROUTE_PREFIX.match(path.name)
+            if m and m.group(1) in names and str(parent / path.name) not in final and path.is_file():
+                path.unlink()
+
+    path = write_route(Path(out_dir) / f'route.{route_format}', [stops[k] for k in sorted(stops)], start)
+    return {'path': str(path), 'stops': len(stops), 'distance_m': plan['distance_m'],
+            'nn_distance_m': plan['nn_distance_m']}
+
+
+def _annotate_overlaps(results: List[Dict], footprints: List[Tuple], min_ratio: float) -> List[Dict]:
+    """
+    배치 전체 폴리곤의 겹침 쌍을 찾아 해당 미션의 결과 레코드(모든 변형)에 경고를 붙이고
+    [{'a', 'b', 'ratio'}] 리스트를 반환합니다. 결과 레코드는 아직 '_seq'를 가지고 있어야 합니다.
+    """
+    from .overlaps import find_overlaps
+
+    footprints = sorted(footprints, key=lambda f: f[0])
+    pairs = []
+    notes = {}
+    for i, j, ratio in find_overlaps([f[2] for f in footprints], min_ratio):
+        (seq_a, name_a, _), (seq_b, name_b, _) = footprints[i], footprints[j]
+        pairs.append({'a': name_a, 'b': name_b, 'ratio': ratio})
+        notes.setdefault(seq_a, []).append({'name': name_b, 'ratio': ratio})
+        notes.setdefault(seq_b, []).append({'name': name_a, 'ratio': ratio})
+
+    for record in results:
+        others = notes.get(tuple(record['_seq'][:2]))
+        if not others or not record['success']:
+            continue
+        text = ', '.join(f"{o['name']}({o['ratio'] * 100:.0f}%)" for o in others)
+        record['overlap'] = dict(record.get('overlap') or {}, status='warning', overlaps=others)
+        if record['status'] == 'safe':
+            record['status'] = 'warning'
+            record['messages'] = [m for m in record['messages'] if m != validator.SAFE_MESSAGE]
+        record['messages'] = record['messages'] + [f'주의: 다른 미션과 영역이 겹칩니다: {text}']
+    return pairs
 
 
 # -----------------------------
@@ -611,6 +2013,9 @@ if __name__ == '__main__':
     base = Path(__file__).parent
 
     import argparse
+    import signal
+    from .events import print_event
+    from .pipeline import CancellationToken
     parser = argparse.ArgumentParser(description='KML 템플릿에 폴리곤 좌표를 주입하여 KMZ/KML 생성 (KML/GPKG 입력 지원)')
     parser.add_argument('--input-dir', type=str, default=str(base / 'input'), help='입력 폴더 경로 (KML 또는 GPKG)')
     parser.add_argument('--input-format', type=str, choices=['auto', 'kml', 'gpkg'], default='gpkg', help='입력 포맷 지정(auto/kml/gpkg)')
@@ -625,6 +2030,45 @@ if __name__ == '__main__':
     parser.add_argument('--naming-field', type=str, default=None, help='출력 파일명으로 사용할 필드명(KML의 SimpleData name 또는 GPKG 컬럼)')
     parser.add_argument('--simplify-tolerance', type=float, default=0.0, help='지오메트리 단순화 허용 오차(미터 단위, 예: 0.5)')
     parser.add_argument('--geometry-buffer', type=float, default=0.0, help='고정 버퍼 확장/축소(미터 단위, 예: 5.0 또는 -5.0)')
+    parser.add_argument('--stage-workers', type=str, default=None, help='단계별 워커 수 (예: geometry=4,pack=2)')
+    parser.add_argument('--resume', action='store_true', help='저널을 읽어 이전 실행에서 완료된 미션은 건너뛰고 이어서 처리')
+    parser.add_argument('--progress-interval', type=float, default=0.2, help='진행 메시지 최소 간격(초, 0이면 모든 미션 출력)')
+    parser.add_argument('--feature-timeout', type=float, default=None, help='피처별 지오메트리 처리 제한 시간(초). 초과 시 실패로 기록')
+    parser.add_argument('--queue-size', type=int, default=64, help='단계 사이 큐의 최대 길이')
+    parser.add_argument('--shard', type=str, default=None, help='i/N: N대 중 i번째(0부터) 조각만 처리 (예: 0/4)')
+    parser.add_argument('--merge-shards', type=str, nargs='+', default=None, metavar='DIR',
+                        help='샤드별 출력 폴더들의 매니페스트/리포트를 --out-dir로 병합하고 종료')
+    parser.add_argument('--variants', type=str, default=None,
+                        help='변형 매트릭스 JSON (예: presets/altitude_matrix.json). 변형별 하위 폴더에 출력')
+    parser.add_argument('--override-column', type=str, action='append', default=None, metavar='KEY=COLUMN',
+                        help='GPKG 속성 열을 피처별 오버라이드로 사용 (예: altitude=ALT_M, 여러 번 지정 가능)')
+    parser.add_argument('--dem', type=str, default=None, help='지형 여유고 검사용 DEM 경로 (GeoTIFF/VRT 또는 .npy)')
+    parser.add_argument('--min-clearance', type=float, default=None, help='최소 지형 여유고(m, 기본 30)')
+    parser.add_argument('--zones', type=str, default=None, help='비행 제한구역/보호구역 레이어 경로 (GPKG)')
+    parser.add_argument('--zones-layer', type=str, default=None, help='제한구역 GPKG 레이어 이름')
+    parser.add_argument('--zones-name-field', type=str, default=None, help='제한구역 이름 열 (리포트 표시용)')
+    parser.add_argument('--clip-zones', action='store_true', help='제한구역과 겹친 부분을 잘라내고 미션 생성 (기본: 위험 표시만)')
+    parser.add_argument('--overlap-ratio', type=float, default=None, help='이 비율(0~1) 이상 겹치는 미션 쌍을 리포트에 경고 (예: 0.5)')
+    parser.add_argument('--skip-duplicates', action='store_true', help='지오메트리가 같은 중복 피처는 처음 것만 생성')
+    parser.add_argument('--exclude', type=str, action='append', default=None, metavar='PATH[::LAYER]',
+                        help='미션 폴리곤에서 뺄 제외 레이어 (건물/수계 등, 여러 번 지정 가능)')
+    parser.add_argument('--exclude-min-area', type=float, default=0.0, help='제외 후 버릴 작은 조각 면적(m²)')
+    parser.add_argument('--group-by', type=str, default=None, help='같은 값의 피처를 합쳐 미션 하나로 만들 속성 열 (여러 GPKG에 걸쳐 적용)')
+    parser.add_argument('--merge-distance', type=float, default=None, help='이 거리(m) 안의 그룹을 한 비행으로 병합')
+    parser.add_argument('--merge-max-area', type=float, default=None, help='병합 대상 그룹의 최대 면적(m², 기본: 제한 없음)')
+    parser.add_argument('--route', action='store_true', help='현장 방문 순서로 출력 이름에 순번을 붙이고 경로 파일 저장')
+    parser.add_argument('--route-start', type=str, default=None, metavar='LON,LAT', help='방문 경로 출발점 (지정 시 --route 포함)')
+    parser.add_argument('--route-format', type=str, default='gpkg', choices=['gpkg', 'kml'], help='경로 파일 형식')
+    parser.add_argument('--report-format', type=str, default='html', metavar='FORMATS',
+                        help='리포트 형식 (쉼표로 구분: html,csv,jsonl,parquet)')
+    parser.add_argument('--metrics-file', type=str, default=None, metavar='PATH',
+                        help='Prometheus 텍스트 형식 지표 파일 (node_exporter textfile collector용 *.prom)')
+    parser.add_argument('--metrics-interval', type=float, default=15.0, help='실행 중 지표 파일 갱신 간격(초)')
+    parser.add_argument('--profile', action='store_true', help='cProfile 결과(.pstats)와 상위 함수 요약을 출력 폴더에 저장')
+    parser.add_argument('--trace-memory', action='store_true', help='tracemalloc으로 단계별 최대 메모리 스냅샷과 할당 위치 요약 저장')
+    parser.add_argument('--watch', action='store_true', help='입력 폴더를 감시하며 바뀐 파일만 계속 다시 생성 (Ctrl+C로 종료)')
+    parser.add_argument('--watch-interval', type=float, default=2.0, help='감시 모드 폴링 간격(초)')
+    parser.add_argument('--watch-settle', type=float, default=2.0, help='파일 쓰기가 끝났다고 볼 무변경 시간(초)')
 
     # 템플릿 오버라이드 인자
     parser.add_argument('--altitude', type=float, default=None, help='고도값(Placemark height/ellipsoidHeight, wayline globalShootHeight)')
@@ -642,6 +2086,30 @@ if __name__ == '__main__':
 
     args = parser.parse_args()
 
+    if args.merge_shards:
+        from .sharding import merge_shard_outputs
+        merged = merge_shard_outputs([Path(d) for d in args.merge_shards], Path(args.out_dir))
+        for w in merged['warnings']:
+            print(f'경고: {w}')
+        print(f"병합 완료: 결과 {len(merged['results'])}건, 출력 {len(merged['outputs'])}개 -> {merged['manifest_path']}")
+        raise SystemExit(0)
+
+    shard = None
+    if args.shard:
+        from .sharding import parse_shard_spec
+        shard = parse_shard_spec(args.shard)
+
+    # Ctrl+C: 진행 중인 미션까지만 마무리하고 리포트를 남긴 뒤 종료
+    cancel = CancellationToken()
+    signal.signal(signal.SIGINT, lambda *_: cancel.cancel())
+
+    stage_workers = {}
+    if args.stage_workers:
+        for tok in args.stage_workers.split(','):
+            key, _, val = tok.partition('=')
+            if key.strip() and val.strip():
+                stage_workers[key.strip()] = int(val)
+
     pack_kmz = True
     if args.no_pack_kmz:
         pack_kmz = False
@@ -664,10 +2132,56 @@ if __name__ == '__main__':
         'geometry_buffer_m': args.geometry_buffer,
     }
 
-    batch_process_inputs(
+    from .engine import MissionBatchEngine
+    engine = MissionBatchEngine(Path(args.template), Path(args.waylines))
+    if args.watch:
+        from .watcher import WatchDaemon
+        WatchDaemon(
+            engine, Path(args.input_dir), Path(args.out_dir),
+            poll_interval=args.watch_interval,
+            settle_s=args.watch_settle,
+            input_format=args.input_format,
+            progress=print_event,
+            cancel=cancel,
+            naming_field=args.naming_field,
+            layer=args.layer,
+            set_times=args.set_times,
+            set_takeoff_ref_point=args.set_takeoff_ref_point,
+            pack_kmz=pack_kmz,
+            overrides=overrides,
+            simplify_tolerance=args.simplify_tolerance,
+            stage_workers=stage_workers,
+            queue_size=args.queue_size,
+            progress_interval=args.progress_interval,
+            feature_timeout=args.feature_timeout,
+            shard=shard,
+            variants=args.variants,
+            override_columns=args.override_column,
+            dem=args.dem,
+            min_clearance=args.min_clearance,
+            zones=args.zones,
+            zones_layer=args.zones_layer,
+            zones_name_field=args.zones_name_field,
+            clip_zones=args.clip_zones,
+            overlap_ratio=args.overlap_ratio,
+            skip_duplicates=args.skip_duplicates,
+            exclusions=args.exclude,
+            exclusion_min_area=args.exclude_min_area,
+            group_by=args.group_by,
+            merge_distance=args.merge_distance,
+            merge_max_area=args.merge_max_area,
+            route=args.route,
+            route_start=args.route_start,
+            route_format=args.route_format,
+            report_formats=args.report_format,
+            cprofile=args.profile,
+            trace_memory=args.trace_memory,
+            metrics_file=args.metrics_file,
+            metrics_interval=args.metrics_interval,
+        ).run_forever()
+        raise SystemExit(0)
+    engine.run(
         missions_dir=Path(args.input_dir),
-        template_path=Path(args.template),
-        waylines_path=Path(args.waylines),
         out_dir=Path(args.out_dir),
         input_format=args.input_format,
         naming_field=args.naming_field,
@@ -677,4 +2191,35 @@ if __name__ == '__main__':
         pack_kmz=pack_kmz,
         overrides=overrides,
         simplify_tolerance=args.simplify_tolerance,
+        stage_workers=stage_workers,
+        queue_size=args.queue_size,
+        resume=args.resume,
+        progress=print_event,
+        progress_interval=args.progress_interval,
+        cancel=cancel,
+        feature_timeout=args.feature_timeout,
+        shard=shard,
+        variants=args.variants,
+        override_columns=args.override_column,
+        dem=args.dem,
+        min_clearance=args.min_clearance,
+        zones=args.zones,
+        zones_layer=args.zones_layer,
+        zones_name_field=args.zones_name_field,
+        clip_zones=args.clip_zones,
+        overlap_ratio=args.overlap_ratio,
+        skip_duplicates=args.skip_duplicates,
+        exclusions=args.exclude,
+        exclusion_min_area=args.exclude_min_area,
+        group_by=args.group_by,
+        merge_distance=args.merge_distance,
+        merge_max_area=args.merge_max_area,
+        route=args.route,
+        route_start=args.route_start,
+        route_format=args.route_format,
+        report_formats=args.report_format,
+        cprofile=args.profile,
+        trace_memory=args.trace_memory,
+        metrics_file=args.metrics_file,
+        metrics_interval=args.metrics_interval,
     )
\ No newline at end of file
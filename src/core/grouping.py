@@ -0,0 +1,161 @@
+"""
+SkyMission Builder - Feature Grouping Module
+같은 키(소유자 ID, 블록 번호 등)를 가진 피처를 하나 이상의 GPKG에 걸쳐 모아 하나의 미션으로 만듭니다.
+
+    - dissolve: 키로 정렬한 지오메트리 배열을 그룹 구간마다 shapely.union_all로 합칩니다.
+    - 근접 병합: merge_distance(m) 안에 있는 작은 그룹(merge_max_area m² 미만)을 STRtree
+      dwithin 질의와 union-find로 묶어 한 번의 비행으로 만들어 이륙 횟수를 줄입니다.
+
+DJI 매핑 폴리곤은 한 덩어리여야 하므로 떨어진 조각은 closing(버퍼 +d/2, -d/2)으로 잇고,
+그래도 떨어져 있으면 볼록 껍질(convex hull)로 감쌉니다. (조각 사이 빈 땅도 비행합니다)
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# 그룹 크기(합쳐진 피처 수)를 담는 열
+GROUP_SIZE_FIELD = 'group_size'
+
+
+def _key_codes(keys: Sequence) -> np.ndarray:
+    """키 배열을 정수 코드로. 키가 비어 있는 행은 각자 별도 그룹입니다."""
+    import pandas as pd
+
+    codes, uniques = pd.factorize(pd.Series(list(keys), dtype=object), use_na_sentinel=True)
+    codes = codes.astype(np.int64)
+    missing = codes < 0
+    codes[missing] = len(uniques) + np.arange(int(missing.sum()))
+    return codes
+
+
+def _split_groups(codes: np.ndarray) -> List[np.ndarray]:
+    """코드별 행 번호 배열 (입력 순서 유지, 그룹 순서는 첫 행 기준)"""
+    order = np.argsort(codes, kind='stable')
+    groups = np.split(order, np.flatnonzero(np.diff(codes[order])) + 1)
+    groups.sort(key=lambda g: g[0])
+    return groups
+
+
+def dissolve_by_key(geometries, keys: Sequence):
+    """
+    같은 키의 지오메트리를 합칩니다.
+
+    Returns:
+        (List[np.ndarray], np.ndarray): 그룹별 원본 행 번호, 합친 지오메트리 배열
+    """
+    import shapely
+
+    geoms = shapely.make_valid(np.asarray(list(geometries), dtype=object))
+    groups = _split_groups(_key_codes(keys))
+    merged = np.empty(len(groups), dtype=object)
+    for i, g in enumerate(groups):
+        merged[i] = geoms[g[0]] if len(g) == 1 else shapely.union_all(geoms[g])
+    return groups, merged
+
+
+def merge_nearby(geometries, distance: float, max_area: Optional[float] = None) -> List[np.ndarray]:
+    """
+    distance 안에 있는 지오메트리끼리 묶은 클러스터(입력 번호 배열) 리스트.
+    max_area를 지정하면 그보다 작은 지오메트리끼리만 묶습니다. (좌표 단위 그대로)
+    """
+    import shapely
+
+    geoms = np.asarray(geometries, dtype=object)
+    n = len(geoms)
+    parent = np.arange(n)
+    candidates = np.arange(n)
+    if max_area is not None:
+        candidates = np.flatnonzero(shapely.area(geoms) < max_area)
+    if len(candidates) > 1 and distance >= 0:
+        sub = geoms[candidates]
+        left, right = shapely.STRtree(sub).query(sub, predicate='dwithin', distance=distance)
+        keep = left < right
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for a, b in zip(candidates[left[keep]], candidates[right[keep]]):
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+        for i in range(n):
+            parent[i] = find(i)
+    return _split_groups(parent)
+
+
+def single_footprint(geom, gap: float = 0.0):
+    """여러 조각이면 gap만큼 closing으로 잇고, 그래도 떨어져 있으면 볼록 껍질로 감쌉니다."""
+    if geom.geom_type == 'Polygon':
+        return geom
+    if gap > 0:
+        closed = geom.buffer(gap / 2.0).buffer(-gap / 2.0)
+        if closed.geom_type == 'Polygon':
+            return closed
+    return geom.convex_hull
+
+
+def group_features(frames: Sequence, group_by: Optional[str] = None, merge_distance: Optional[float] = None,
+                   merge_max_area: Optional[float] = None):
+    """
+    여러 GeoDataFrame의 폴리곤 피처를 group_by 열 값으로 합치고, 필요하면 근접한 작은 그룹을 병합합니다.
+
+    좌표계는 첫 레이어를 따르며, 경위도 좌표계이면 미터 단위 계산을 위해 UTM으로 투영합니다.
+    속성은 그룹의 첫 피처 값을 쓰고, 병합된 그룹의 키는 '키1+키2' 형태가 됩니다.
+
+    Args:
+        frames: GeoDataFrame 리스트 (폴리곤 계열이 아닌 행은 무시)
+        group_by: 그룹 키 열 (None이면 피처마다 별도 그룹, 근접 병합만 수행)
+        merge_distance: 이 거리(m) 안의 그룹을 하나로 병합 (None이면 병합하지 않음)
+        merge_max_area: 이 면적(m²) 미만인 그룹만 병합 대상 (None이면 모두)
+
+    Returns:
+        GeoDataFrame: 그룹당 한 행 (group_size 열 포함)
+    """
+    import geopandas as gpd
+    import pandas as pd
+
+    frames = [f[f.geometry.geom_type.isin(['Polygon', 'MultiPolygon'])] for f in frames]
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        raise ValueError('폴리곤/멀티폴리곤 지오메트리가 없습니다.')
+    if group_by is not None:
+        missing = [i for i, f in enumerate(frames) if group_by not in f.columns]
+        if missing:
+            raise ValueError(f'그룹 열이 없습니다: {group_by}')
+
+    crs = frames[0].crs
+    if crs is not None and crs.is_geographic:
+        crs = frames[0].estimate_utm_crs()
+    frames = [f.to_crs(crs) if crs is not None and f.crs is not None and not f.crs.equals(crs) else f
+              for f in frames]
+    gdf = pd.concat(frames, ignore_index=True)
+
+    keys = gdf[group_by].tolist() if group_by is not None else [None] * len(gdf)
+    groups, merged = dissolve_by_key(gdf.geometry.values, keys)
+    sizes = np.array([len(g) for g in groups])
+    firsts = np.array([g[0] for g in groups])
+
+    clusters = None
+    if merge_distance is not None:
+        clusters = merge_nearby(merged, merge_distance, merge_max_area)
+
+    gap = merge_distance or 0.0
+    if clusters is None or all(len(c) == 1 for c in clusters):
+        rows = gdf.iloc[firsts].reset_index(drop=True)
+        geoms = [single_footprint(g, gap) for g in merged]
+        rows[GROUP_SIZE_FIELD] = sizes
+    else:
+        import shapely
+
+        rows = gdf.iloc[firsts[[c[0] for c in clusters]]].reset_index(drop=True)
+        geoms = [single_footprint(merged[c[0]] if len(c) == 1 else shapely.union_all(merged[c]), gap)
+                 for c in clusters]
+        rows[GROUP_SIZE_FIELD] = [int(sizes[c].sum()) for c in clusters]
+        if group_by is not None:
+            rows[group_by] = ['+'.join(str(keys[firsts[i]]) for i in c) if len(c) > 1 else keys[firsts[c[0]]]
+                              for c in clusters]
+    return gpd.GeoDataFrame(rows.drop(columns=rows.geometry.name), geometry=geoms, crs=crs)
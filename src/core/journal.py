@@ -0,0 +1,188 @@
+"""
+SkyMission Builder - Batch Journal Module
+완료된 미션을 out_dir의 append-only 저널(JSON Lines)에 기록하여
+중단된 배치를 처음부터 다시 돌리지 않고 이어서(resume) 처리할 수 있게 합니다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+JOURNAL_NAME = '.skymission_journal.jsonl'
+
+
+def config_fingerprint(settings: Dict) -> str:
+    """출력 결과에 영향을 주는 설정값의 지문(짧은 해시)을 계산합니다."""
+    raw = json.dumps(settings, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: Path) -> Optional[str]:
+    try:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        return h.hexdigest()
+    except OSError:
+        return None
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """임시 파일에 쓴 뒤 교체하여 반쯤 쓰인 출력 파일이 남지 않게 합니다."""
+    path = Path(path)
+    tmp = path.with_name(f'.{path.name}.{threading.get_ident()}.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _encode_line(record: Dict) -> bytes:
+    body = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    crc = zlib.crc32(body.encode('utf-8')) & 0xFFFFFFFF
+    return f'{crc:08x} {body}\n'.encode('utf-8')
+
+
+def _decode_line(line: bytes) -> Optional[Dict]:
+    """CRC가 맞는 완전한 줄만 레코드로 인정합니다 (부분 기록/손상 줄은 무시)."""
+    if not line.endswith(b'\n'):
+        return None
+    try:
+        text = line.decode('utf-8').rstrip('\n')
+        crc_hex, body = text.split(' ', 1)
+        if int(crc_hex, 16) != (zlib.crc32(body.encode('utf-8')) & 0xFFFFFFFF):
+            return None
+        return json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+class BatchJournal:
+    """
+    미션 완료 기록용 append-only 저널.
+
+    한 줄에 한 레코드(`<crc32> <json>`)를 추가만 하므로 미션마다 파일 전체를
+    다시 쓰지 않습니다. 각 줄은 flush되며, fsync는 `fsync_every`건마다 수행합니다.
+    마지막 fsync 이후의 레코드(tail)는 재개 시 출력 해시를 다시 검증합니다.
+    """
+
+    def __init__(self, out_dir: Path, fsync_every: int = 32):
+        self.path = Path(out_dir) / JOURNAL_NAME
+        self.fsync_every = max(1, int(fsync_every))
+        self._fh = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+    def load(self) -> Dict[str, Dict]:
+        """
+        저널을 읽어 키별 마지막 완료 레코드를 반환합니다.
+        각 레코드에는 파일 끝에서부터의 순번(`_tail_pos`, 0 = 마지막)이 붙습니다.
+        """
+        if not self.path.exists():
+            return {}
+        records = []
+        with open(self.path, 'rb') as f:
+            for line in f:
+                rec = _decode_line(line)
+                if rec is not None and rec.get('key'):
+                    records.append(rec)
+        latest = {}
+        total = len(records)
+        for i, rec in enumerate(records):
+            rec['_tail_pos'] = total - 1 - i
+            latest[rec['key']] = rec
+        return latest
+
+    def completed(self, out_dir: Path, cfg: Optional[str] = None,
+                  verify_tail: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        현재 설정(cfg)으로 완료되어 출력이 온전한 레코드만 반환합니다.
+        cfg가 None이면 설정 비교는 호출 측에 맡깁니다 (피처마다 설정이 다른 경우).
+        모든 레코드는 파일 존재/크기를, 마지막 `verify_tail`건은 SHA-256까지 확인합니다.
+        """
+        out_dir = Path(out_dir)
+        tail = self.fsync_every if verify_tail is None else verify_tail
+        done = {}
+        for key, rec in self.load().items():
+            if cfg is not None and rec.get('cfg') != cfg:
+                continue
+            out_path = out_dir / rec.get('out', '')
+            try:
+                if out_path.stat().st_size != rec.get('size'):
+                    continue
+            except OSError:
+                continue
+            if rec['_tail_pos'] < tail and sha256_file(out_path) != rec.get('sha256'):
+                continue
+            done[key] = rec
+        return done
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def open(self, resume: bool = False):
+        """저널을 연다. resume=False이면 새 배치로 보고 기존 기록을 비웁니다."""
+        mode = 'ab' if resume else 'wb'
+        self._fh = open(self.path, mode)
+        if resume and self._fh.tell() > 0:
+            # 충돌로 마지막 줄이 잘렸다면 다음 레코드가 새 줄에서 시작하도록 보정
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._fh.write(b'\n')
+        return self
+
+    def append(self, key: str, cfg: str, name: str, out: str, data: bytes, **extra) -> Dict:
+        """완료 레코드를 기록하고 반환합니다 (매니페스트 작성에 재사용)."""
+        record = {
+            'key': key,
+            'cfg': cfg,
+            'name': name,
+            'out': out,
+            'size': len(data),
+            'sha256': sha256_bytes(data),
+            'ts': round(time.time(), 3),
+        }
+        record.update(extra)
+        self.append_record(record)
+        return record
+
+    def append_record(self, record: Dict):
+        line = _encode_line(record)
+        with self._lock:
+            if self._fh is None:
+                return
+            self._fh.write(line)
+            self._fh.flush()
+            self._pending += 1
+            if self._pending >= self.fsync_every:
+                os.fsync(self._fh.fileno())
+                self._pending = 0
+
+    def close(self):
+        with self._lock:
+            if self._fh is None:
+                return
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._fh.close()
+            self._fh = None
+            self._pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
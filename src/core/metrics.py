@@ -0,0 +1,185 @@
+"""
+SkyMission Builder - Flight Metrics Module
+폴리곤과 카메라 촬영 폭으로 미션별 면적, 둘레, 비행 라인 수, 경로 길이, 예상 비행 시간,
+필요 배터리 수를 추정합니다. 배치 단위로 모아서 shapely/NumPy 배열 연산으로 계산합니다.
+
+경로 모델 (DJI 2D 매핑 경로의 근사):
+    - 폴리곤의 최소 외접 사각형(oriented envelope) 긴 변 방향으로 왕복 비행한다고 가정
+    - 라인 간격 = 촬영 폭(고도 × 센서 폭 / 초점거리) × (1 - 측면 중첩률)
+    - 라인 수 = ceil((짧은 변 + 2 × 마진) / 라인 간격) + 1
+    - 경로 길이 = 라인 수 × (긴 변 + 2 × 마진) + (라인 수 - 1) × 라인 간격
+    - 예상 시간 = 경로 길이 / 속도 × MISSION_TIME_MARGIN (가감속/선회 여유)
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .validator import (CAMERA_SPECS, DEFAULT_ALTITUDE, DEFAULT_MODEL, DEFAULT_SPEED, DEFAULT_SPEC,
+                        MISSION_TIME_MARGIN, estimate_mission_time)
+
+# 기체별 공칭 비행 시간(분, 무풍 호버링 기준 제조사 사양)
+DRONE_FLIGHT_TIME_MIN = {
+    'mavic3e': 45,
+    'mavic3t': 45,
+    'mavic3m': 43,
+    'm30': 41,
+    'm30t': 41,
+    'm300': 55,
+    'm350': 55,
+    'p4r': 30,
+}
+DEFAULT_FLIGHT_TIME_MIN = 30
+
+# 배터리당 실제 사용 비율 (복귀/바람/저전압 경고 여유)
+BATTERY_USABLE_RATIO = 0.7
+
+# 템플릿에 값이 없을 때 쓰는 측면 중첩률(%)과 마진(m)
+DEFAULT_SIDE_OVERLAP = 65
+DEFAULT_MARGIN_M = 0
+
+# 경위도 1도당 거리(m). 미션 폴리곤 크기(수 km)에서는 국지 등장방형 투영으로 충분합니다.
+_M_PER_DEG_LAT = 110_574.0
+_M_PER_DEG_LON = 111_320.0
+
+
+def polygon_measures(lonlat_list: Sequence[Sequence[Tuple]]) -> Dict[str, np.ndarray]:
+    """
+    WGS84 좌표 리스트 여러 개의 면적(m²), 둘레(m), 외접 사각형의 긴 변/짧은 변(m)을 한 번에 계산합니다.
+    각 폴리곤은 자기 중심 기준의 국지 평면 좌표로 변환한 뒤 shapely 배열 함수로 처리합니다.
+    """
+    import shapely
+
+    n = len(lonlat_list)
+    if n == 0:
+        empty = np.zeros(0)
+        return {'area_m2': empty, 'perimeter_m': empty, 'length_m': empty, 'width_m': empty}
+
+    counts = np.fromiter((len(c) for c in lonlat_list), dtype=np.int64, count=n)
+    if (counts < 3).any():
+        raise ValueError('폴리곤 좌표가 3개 미만입니다.')
+    coords = np.array([(float(lon), float(lat)) for c in lonlat_list for lon, lat, *_ in c], dtype=float)
+    index = np.repeat(np.arange(n), counts)
+
+    lon0 = np.bincount(index, weights=coords[:, 0], minlength=n) / counts
+    lat0 = np.bincount(index, weights=coords[:, 1], minlength=n) / counts
+    xy = np.empty_like(coords)
+    xy[:, 0] = (coords[:, 0] - lon0[index]) * np.cos(np.radians(lat0[index])) * _M_PER_DEG_LON
+    xy[:, 1] = (coords[:, 1] - lat0[index]) * _M_PER_DEG_LAT
+
+    polygons = shapely.polygons(shapely.linearrings(xy, indices=index))
+    area = shapely.area(polygons)
+    perimeter = shapely.length(polygons)
+
+    # 외접 사각형의 연속한 두 변 길이 (퇴화한 경우 선분/점이 되어 두 번째 변은 0)
+    env_xy, env_idx = shapely.get_coordinates(shapely.oriented_envelope(polygons), return_index=True)
+    env_counts = np.bincount(env_idx, minlength=n)
+    starts = np.concatenate(([0], np.cumsum(env_counts)[:-1]))
+    last = starts + np.maximum(env_counts - 1, 0)
+    p0 = env_xy[starts]
+    p1 = env_xy[np.minimum(starts + 1, last)]
+    p2 = env_xy[np.minimum(starts + 2, last)]
+    side_a = np.hypot(*(p1 - p0).T)
+    side_b = np.hypot(*(p2 - p1).T)
+    return {
+        'area_m2': area,
+        'perimeter_m': perimeter,
+        'length_m': np.maximum(side_a, side_b),
+        'width_m': np.minimum(side_a, side_b),
+    }
+
+
+def flight_plan_metrics(measures: Dict[str, np.ndarray], altitude, speed, side_overlap, margin,
+                        drone_model) -> Dict[str, np.ndarray]:
+    """
+    polygon_measures 결과와 미션별 파라미터 배열(같은 길이)로 라인 수, 경로 길이,
+    예상 시간, 배터리 수를 계산합니다.
+    """
+    altitude = np.asarray(altitude, dtype=float)
+    speed = np.asarray(speed, dtype=float)
+    side_overlap = np.clip(np.asarray(side_overlap, dtype=float), 0.0, 95.0)
+    margin = np.asarray(margin, dtype=float)
+    models = [str(m).lower() if m else DEFAULT_MODEL for m in drone_model]
+    ratio = np.array([(CAMERA_SPECS.get(m, DEFAULT_SPEC)['sensor_width'] /
+                       CAMERA_SPECS.get(m, DEFAULT_SPEC)['focal_length']) for m in models], dtype=float)
+    endurance_s = np.array([DRONE_FLIGHT_TIME_MIN.get(m, DEFAULT_FLIGHT_TIME_MIN) for m in models],
+                           dtype=float) * 60.0 * BATTERY_USABLE_RATIO
+
+    footprint = altitude * ratio
+    spacing = np.maximum(footprint * (1.0 - side_overlap / 100.0), 0.1)
+    length = np.maximum(measures['length_m'] + 2.0 * margin, 0.0)
+    width = np.maximum(measures['width_m'] + 2.0 * margin, 0.0)
+
+    lines = np.ceil(width / spacing).astype(np.int64) + 1
+    path = lines * length + (lines - 1) * spacing
+    with np.errstate(divide='ignore', invalid='ignore'):
+        duration = np.where(speed > 0, path / speed * MISSION_TIME_MARGIN, np.nan)
+    batteries = np.where(np.isnan(duration), 0,
+                         np.maximum(1, np.ceil(np.nan_to_num(duration) / endurance_s))).astype(np.int64)
+    return {
+        'footprint_m': footprint,
+        'spacing_m': spacing,
+        'lines': lines,
+        'path_m': path,
+        'duration_s': duration,
+        'batteries': batteries,
+    }
+
+
+def resolve_flight_params(template_params: Optional[Dict], overrides: Optional[Dict]) -> Dict:
+    """
+    오버라이드를 적용한 템플릿 값(CompiledKmlTemplate.flight_params)에서 경로 계산에 필요한
+    고도, 속도, 측면 중첩률, 마진, 기체를 고릅니다. 값이 없으면 validator 기본값을 씁니다.
+    """
+    tp = template_params or {}
+    ov = overrides or {}
+    return {
+        'altitude': tp.get('altitude') or DEFAULT_ALTITUDE,
+        'speed': tp.get('speed') or DEFAULT_SPEED,
+        'side_overlap': tp.get('side_overlap', DEFAULT_SIDE_OVERLAP),
+        'margin': tp.get('margin', DEFAULT_MARGIN_M),
+        'drone_model': ov.get('drone_model') or DEFAULT_MODEL,
+    }
+
+
+def compute_flight_metrics(lonlat_list: Sequence[Sequence[Tuple]], params_list: Sequence[Dict],
+                           measures: Optional[Dict[str, np.ndarray]] = None) -> List[Dict]:
+    """
+    미션 여러 개의 비행 지표를 한 번에 계산해 미션별 dict 리스트로 반환합니다.
+
+    Args:
+        lonlat_list: 미션별 WGS84 (lon, lat) 좌표 리스트
+        params_list: 미션별 resolve_flight_params 결과
+        measures: 이미 계산한 polygon_measures (같은 폴리곤을 여러 설정으로 계산할 때 재사용)
+
+    Returns:
+        List[Dict]: {'area_m2', 'area_ha', 'perimeter_m', 'lines', 'spacing_m', 'distance_m',
+                     'duration_s', 'duration', 'batteries'}
+    """
+    if measures is None:
+        measures = polygon_measures(lonlat_list)
+    plan = flight_plan_metrics(
+        measures,
+        altitude=[p['altitude'] for p in params_list],
+        speed=[p['speed'] for p in params_list],
+        side_overlap=[p['side_overlap'] for p in params_list],
+        margin=[p['margin'] for p in params_list],
+        drone_model=[p['drone_model'] for p in params_list],
+    )
+    out = []
+    for i, p in enumerate(params_list):
+        duration = float(plan['duration_s'][i])
+        distance = float(plan['path_m'][i])
+        out.append({
+            'area_m2': round(float(measures['area_m2'][i]), 1),
+            'area_ha': round(float(measures['area_m2'][i]) / 10_000.0, 2),
+            'perimeter_m': round(float(measures['perimeter_m'][i]), 1),
+            'lines': int(plan['lines'][i]),
+            'spacing_m': round(float(plan['spacing_m'][i]), 2),
+            'distance_m': round(distance, 1),
+            'duration_s': None if math.isnan(duration) else round(duration, 1),
+            'duration': estimate_mission_time(distance, float(p['speed'] or 0)),
+            'batteries': int(plan['batteries'][i]),
+        })
+    return out
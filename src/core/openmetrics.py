@@ -0,0 +1,210 @@
+"""
+SkyMission Builder - Metrics Textfile Module
+서버에서 야간 배치를 돌릴 때 node_exporter textfile collector가 읽을 수 있는 지표 파일(.prom)을 씁니다.
+
+    - 미션 수(결과별), 실패 수(단계/사유별), 출력 바이트 수
+    - 단계별 처리 시간 히스토그램 (timings.TimingRecorder 표본)
+    - 최대 RSS, 엔진 캐시 적중/미스와 적중률
+
+파일은 임시 파일에 쓴 뒤 교체(atomic_write_bytes)하므로 수집기가 반쯤 쓰인 파일을 읽지 않습니다.
+실행 중에는 interval초마다 다시 쓰고(skymission_batch_running 1), 끝나면 최종 값으로 한 번 더 씁니다.
+
+형식은 textfile collector가 파싱하는 Prometheus 텍스트 형식(0.0.4)이며, 지표 이름은 OpenMetrics
+규칙(카운터 _total, 단위 접미사 _seconds/_bytes, 히스토그램 _bucket/_sum/_count)을 따릅니다.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+METRIC_PREFIX = 'skymission'
+METRICS_INTERVAL_S = 15.0
+# 단계 처리 시간 히스토그램 경계(초)
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels: Optional[Dict]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+
+def _number(value) -> str:
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    value = float(value)
+    if value == float('inf'):
+        return '+Inf'
+    return repr(round(value, 6))
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """현재 프로세스의 최대 RSS(바이트). 알 수 없으면 None"""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KiB, macOS는 바이트 단위
+        return int(peak) if sys.platform == 'darwin' else int(peak) * 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return int(getattr(info, 'peak_wset', None) or info.rss)
+
+
+def histogram_lines(name: str, values: Sequence[float], labels: Dict,
+                    buckets: Sequence[float] = DURATION_BUCKETS) -> List[str]:
+    """값 리스트 → 누적 _bucket/_sum/_count 샘플 줄"""
+    arr = np.sort(np.asarray(values, dtype=float))
+    counts = np.searchsorted(arr, np.asarray(buckets, dtype=float), side='right')
+    lines = [f'{name}_bucket{_labels({**labels, "le": _number(b)})} {int(c)}' for b, c in zip(buckets, counts)]
+    lines.append(f'{name}_bucket{_labels({**labels, "le": "+Inf"})} {len(arr)}')
+    lines.append(f'{name}_sum{_labels(labels)} {_number(arr.sum() if len(arr) else 0.0)}')
+    lines.append(f'{name}_count{_labels(labels)} {len(arr)}')
+    return lines
+
+
+class BatchMetrics:
+    """
+    배치 한 번의 지표 모음과 textfile 기록기.
+
+        metrics = BatchMetrics(path, counts, timer=timer, engine=engine, stages=['read', ...])
+        metrics.start()             # interval초마다 파일 갱신
+        metrics.failure('geometry', 'timeout')
+        metrics.add_bytes(len(payload))
+        metrics.close()             # 주기 갱신 중지 후 최종 값 기록
+
+    Args:
+        path (Path): 지표 파일 경로 (textfile collector 폴더의 *.prom)
+        counts (Dict): 배치의 {'ok', 'failed', 'skipped', 'duplicates'} 카운터 (읽기만 함)
+        timer (timings.TimingRecorder): 단계 처리 시간 표본
+        engine (MissionBatchEngine): 캐시 통계(cache_stats)를 읽을 엔진
+        stages (Sequence[str]): 히스토그램으로 내보낼 단계 이름
+        interval (float): 실행 중 파일 갱신 간격(초, 0 이하이면 끝날 때만 기록)
+    """
+
+    def __init__(self, path: Path, counts: Dict, timer=None, engine=None, stages: Sequence[str] = (),
+                 interval: float = METRICS_INTERVAL_S):
+        self.path = Path(path)
+        self.counts = counts
+        self.timer = timer
+        self.engine = engine
+        self.stages = list(stages)
+        self.interval = float(interval or 0.0)
+        self.bytes_written = 0
+        self.failures: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._t0 = time.perf_counter()
+        self.running = False
+
+    # ------------------------------------------------------------------
+    # 수집 (워커 스레드에서 호출)
+    # ------------------------------------------------------------------
+    def failure(self, stage: str, reason: str):
+        key = (stage, reason)
+        with self._lock:
+            self.failures[key] = self.failures.get(key, 0) + 1
+
+    def add_bytes(self, n: int):
+        with self._lock:
+            self.bytes_written += int(n)
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def start(self):
+        """파일을 한 번 쓰고, interval이 있으면 주기 갱신 스레드를 시작합니다."""
+        self.running = True
+        self.write()
+        if self.interval > 0:
+            self._thread = threading.Thread(target=self._loop, name='metrics-writer', daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError:
+                # 일시적인 쓰기 실패는 다음 주기에 다시 시도
+                pass
+
+    def stop(self):
+        """주기 갱신만 멈춥니다. (최종 기록은 close)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> Path:
+        self.stop()
+        self.running = False
+        self.write()
+        return self.path
+
+    def write(self):
+        from .journal import atomic_write_bytes
+
+        data = self.render().encode('utf-8')
+        with self._write_lock:
+            atomic_write_bytes(self.path, data)
+
+    def render(self) -> str:
+        p = METRIC_PREFIX
+        lines: List[str] = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(samples)
+
+        family(f'{p}_missions_total', 'counter', '처리한 미션 수 (ok는 재개로 건너뛴 미션 포함)',
+               [f'{p}_missions_total{_labels({"result": k})} {int(self.counts.get(k, 0))}'
+                for k in ('ok', 'failed', 'skipped', 'duplicates')])
+        with self._lock:
+            failures = sorted(self.failures.items())
+            bytes_written = self.bytes_written
+        family(f'{p}_failures_total', 'counter', '단계/사유별 실패 수',
+               [f'{p}_failures_total{_labels({"stage": s, "reason": r})} {n}' for (s, r), n in failures])
+        family(f'{p}_output_bytes_total', 'counter', '기록한 미션 파일 바이트 수',
+               [f'{p}_output_bytes_total {bytes_written}'])
+
+        if self.timer is not None:
+            samples = self.timer.samples()
+            hist = []
+            for stage in self.stages:
+                hist += histogram_lines(f'{p}_stage_duration_seconds', samples.get(stage, ()), {'stage': stage})
+            family(f'{p}_stage_duration_seconds', 'histogram', '항목 하나의 단계 처리 시간 (출력 대기 제외)', hist)
+
+        rss = peak_rss_bytes()
+        if rss is not None:
+            family(f'{p}_peak_rss_bytes', 'gauge', '프로세스 최대 RSS', [f'{p}_peak_rss_bytes {rss}'])
+
+        if self.engine is not None:
+            stats = self.engine.cache_stats()
+            for suffix, key, kind, help_text in (('cache_hits_total', 'hits', 'counter', '엔진 캐시 적중 수'),
+                                                 ('cache_misses_total', 'misses', 'counter', '엔진 캐시 미스 수'),
+                                                 ('cache_hit_ratio', 'hit_rate', 'gauge', '엔진 캐시 적중률 (0~1)')):
+                family(f'{p}_{suffix}', kind, help_text,
+                       [f'{p}_{suffix}{_labels({"cache": c})} {_number(s[key])}' for c, s in stats.items()])
+
+        family(f'{p}_batch_running', 'gauge', '배치 실행 중이면 1', [f'{p}_batch_running {int(self.running)}'])
+        family(f'{p}_batch_elapsed_seconds', 'gauge', '배치 시작 후 경과 시간',
+               [f'{p}_batch_elapsed_seconds {_number(time.perf_counter() - self._t0)}'])
+        family(f'{p}_batch_last_update_timestamp_seconds', 'gauge', '지표 파일을 마지막으로 쓴 시각 (Unix)',
+               [f'{p}_batch_last_update_timestamp_seconds {_number(time.time())}'])
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,81 @@
+"""
+SkyMission Builder - Overlap Detection Module
+배치 안에서 같은 영역을 두 번 비행하게 되는 미션을 찾습니다.
+
+    - 완전 중복: WGS84로 맞춘 정규화 지오메트리의 WKB 해시가 같은 피처 (해시 dict 한 번 순회, O(N))
+    - 겹침: 모든 미션 폴리곤으로 STRtree를 만들고 벌크 질의로 후보 쌍을 찾은 뒤
+      겹친 면적 / 작은 폴리곤 면적 비율이 기준 이상인 쌍만 남깁니다.
+"""
+
+import hashlib
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# 겹침 판정 기준 (작은 폴리곤 면적 대비 겹친 면적 비율)
+DEFAULT_OVERLAP_RATIO = 0.5
+
+# 중복 해시 전에 좌표를 맞출 격자 (도, 약 0.1mm). 재투영 왕복 오차는 무시
+DUPLICATE_GRID_DEG = 1e-9
+
+
+def geometry_hash(wkb: bytes) -> str:
+    """지오메트리 WKB의 해시 (완전 중복 판정용)"""
+    return hashlib.blake2b(wkb, digest_size=16).hexdigest()
+
+
+def geometry_hashes(geometries: Sequence) -> List[str]:
+    """
+    WGS84 지오메트리 배열의 중복 판정용 해시. 입력 형식(GPKG/KML)과 좌표계와 관계없이 같은 모양이면
+    같은 해시가 되도록 Z를 버리고, 부분이 하나인 멀티폴리곤은 폴리곤으로 풀고, 좌표를
+    DUPLICATE_GRID_DEG 격자에 맞추고, 링의 시작점/방향을 shapely.normalize로 맞춘 뒤 WKB를 해시합니다.
+    """
+    import shapely
+
+    geoms = shapely.force_2d(np.asarray(geometries, dtype=object))
+    single = (shapely.get_type_id(geoms) == 6) & (shapely.get_num_geometries(geoms) == 1)
+    geoms[single] = shapely.get_geometry(geoms[single], 0)
+    geoms = shapely.normalize(shapely.set_precision(geoms, DUPLICATE_GRID_DEG, mode='pointwise'))
+    return [geometry_hash(wkb) for wkb in shapely.to_wkb(geoms)]
+
+
+class DuplicateTracker:
+    """
+    처음 본 지오메트리 해시를 기억해 두고 같은 해시가 다시 나오면 처음 피처의 이름을 돌려줍니다.
+    read 단계(단일 스레드, 입력 순서)에서 호출하므로 '처음'은 입력 순서 기준입니다.
+    """
+
+    def __init__(self):
+        self._first: Dict[str, Tuple[str, str]] = {}
+
+    def check(self, geom_hash: str, key: str, name: str):
+        """중복이면 (처음 피처 key, 이름), 아니면 None"""
+        first = self._first.setdefault(geom_hash, (key, name))
+        return None if first[0] == key else first
+
+
+def find_overlaps(polygons: Sequence, min_ratio: float = DEFAULT_OVERLAP_RATIO) -> List[Tuple[int, int, float]]:
+    """
+    폴리곤 배열에서 겹침 비율이 min_ratio 이상인 쌍 (i, j, 비율) 리스트 (i < j).
+    비율은 겹친 면적 / 두 폴리곤 중 작은 면적이며, 같은 위도대의 경위도 면적으로 계산해도
+    비율은 거의 같으므로 투영 없이 계산합니다.
+    """
+    import shapely
+
+    polys = np.asarray(polygons, dtype=object)
+    if len(polys) < 2:
+        return []
+    tree = shapely.STRtree(polys)
+    left, right = tree.query(polys, predicate='intersects')
+    keep = left < right
+    order = np.lexsort((right[keep], left[keep]))
+    left, right = left[keep][order], right[keep][order]
+    if not len(left):
+        return []
+    areas = shapely.area(polys)
+    inter = shapely.area(shapely.intersection(polys[left], polys[right]))
+    smaller = np.minimum(areas[left], areas[right])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(smaller > 0, inter / smaller, 0.0)
+    hit = ratio >= min_ratio
+    return [(int(i), int(j), round(float(r), 3)) for i, j, r in zip(left[hit], right[hit], ratio[hit])]
@@ -0,0 +1,296 @@
+"""
+SkyMission Builder - Staged Pipeline Module
+배치 작업을 단계(read → geometry → analyze → render → pack → write)로 나누고
+bounded queue로 연결하여 디스크 I/O와 연산이 겹쳐서 실행되도록 합니다.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from . import timings
+
+# 단계 종료 신호
+_END = object()
+
+
+class CancelledError(Exception):
+    """취소 요청으로 작업이 중단되었을 때 발생"""
+
+
+class CancellationToken:
+    """
+    협조적 취소 토큰. GUI/CLI가 cancel()을 호출하면 파이프라인은 새 항목 공급을 멈추고
+    큐에 남은 항목은 처리하지 않고 흘려보냅니다.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise CancelledError('작업이 취소되었습니다.')
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+
+class Stage:
+    """
+    파이프라인의 한 단계.
+
+    Args:
+        name (str): 단계 이름 (통계/에러 보고용)
+        fn (Callable): 항목 하나를 받아 결과를 반환하는 함수.
+            None을 반환하면 해당 항목은 다음 단계로 넘어가지 않습니다.
+        workers (int): 이 단계를 처리할 스레드 수
+        fan_out (bool): True이면 fn이 반환한 iterable의 각 원소를 다음 단계로 보냅니다.
+        batch_size (int): 1보다 크면 입력 큐에 쌓인 항목을 최대 batch_size개까지 모아
+            리스트로 fn에 넘깁니다(벡터 연산용). fn은 다음 단계로 보낼 항목의 iterable을 반환하며,
+            예외가 나면 묶인 항목 모두를 실패로 보고합니다. 큐가 비면 기다리지 않고 모인 만큼만 처리합니다.
+    """
+
+    def __init__(self, name: str, fn: Callable, workers: int = 1, fan_out: bool = False,
+                 batch_size: int = 1):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, int(workers))
+        self.fan_out = fan_out
+        self.batch_size = max(1, int(batch_size))
+
+
+class StageStats:
+    """단계별 처리 건수, 바쁜 시간(busy), 입력 큐 깊이 통계"""
+
+    def __init__(self, name: str, workers: int, in_queue: queue.Queue):
+        self.name = name
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0        # 취소되어 처리하지 않은 항목
+        self.busy_s = 0.0       # fn 실행 시간 합계
+        self.wait_in_s = 0.0    # 입력 대기(상위 단계가 느림)
+        self.wait_out_s = 0.0   # 출력 대기(하위 단계가 느림, backpressure)
+        self.queue_max = 0
+        self._in_queue = in_queue
+        self._lock = threading.Lock()
+
+    def observe_depth(self):
+        depth = self._in_queue.qsize()
+        if depth > self.queue_max:
+            self.queue_max = depth
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'stage': self.name,
+                'workers': self.workers,
+                'processed': self.processed,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'busy_s': round(self.busy_s, 4),
+                'wait_in_s': round(self.wait_in_s, 4),
+                'wait_out_s': round(self.wait_out_s, 4),
+                'queue_depth': self._in_queue.qsize(),
+                'queue_max': self.queue_max,
+                'queue_size': self._in_queue.maxsize,
+            }
+
+
+class StagedPipeline:
+    """
+    단계들을 bounded queue로 연결한 스레드 파이프라인.
+    하위 단계가 밀리면 put()이 블록되어 상위 단계가 자연스럽게 멈춥니다(backpressure).
+
+    Args:
+        stages (List[Stage]): 실행 순서대로 나열된 단계
+        queue_size (int): 단계 사이 큐의 최대 길이
+        on_error (Callable): (stage_name, item, exc)를 받는 에러 콜백.
+            에러가 난 항목은 이후 단계로 넘어가지 않습니다.
+        timer (timings.TimingRecorder): 지정하면 항목마다 단계 처리 시간(출력 대기 제외)을
+            기록하고, fn 실행 동안 timings.section 구간을 이 기록기에 묶습니다.
+        source_of (Callable): 항목 → 파일 이름 (파일별 집계용, 묶음 단계는 묶음 전체가 None)
+        hooks (diagnostics.RunDiagnostics): 지정하면 워커 스레드 전체를 hooks.worker(단계 이름)
+            블록 안에서 실행하고 항목마다 hooks.item_done(단계 이름)을 호출합니다 (cProfile/tracemalloc).
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 64,
+                 on_error: Optional[Callable] = None, timer: Optional['timings.TimingRecorder'] = None,
+                 source_of: Optional[Callable] = None, hooks=None):
+        if not stages:
+            raise ValueError('파이프라인 단계가 비어 있습니다.')
+        self.stages = stages
+        self.on_error = on_error
+        self.timer = timer
+        self.source_of = source_of or (lambda item: None)
+        self.hooks = hooks
+        self._queues = [queue.Queue(maxsize=max(1, queue_size)) for _ in stages]
+        self._stats = [StageStats(s.name, s.workers, q) for s, q in zip(stages, self._queues)]
+        self._alive = [s.workers for s in stages]
+        self._alive_lock = threading.Lock()
+        self._cancel: Optional[CancellationToken] = None
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def run(self, source: Iterable, cancel: Optional[CancellationToken] = None):
+        """
+        source의 항목을 첫 단계에 공급하고 모든 단계가 끝날 때까지 기다립니다.
+        cancel이 취소되면 공급을 멈추고 남은 항목은 처리하지 않은 채 종료합니다.
+        """
+        self._cancel = cancel
+        threads = []
+        for idx, stage in enumerate(self.stages):
+            for w in range(stage.workers):
+                t = threading.Thread(target=self._worker, args=(idx,),
+                                     name=f'{stage.name}-{w}', daemon=True)
+                t.start()
+                threads.append(t)
+
+        first_q = self._queues[0]
+        first_stats = self._stats[0]
+        try:
+            for item in source:
+                if cancel is not None and cancel.cancelled:
+                    break
+                first_q.put(item)
+                first_stats.observe_depth()
+        except Exception as e:
+            self._report_error('source', None, e)
+        finally:
+            for _ in range(self.stages[0].workers):
+                first_q.put(_END)
+
+        for t in threads:
+            t.join()
+
+    def stats(self) -> List[Dict]:
+        """단계별 통계 스냅샷 (실행 중에도 호출 가능)"""
+        return [s.snapshot() for s in self._stats]
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+    def _source(self, item) -> Optional[str]:
+        try:
+            return self.source_of(item)
+        except Exception:
+            return None
+
+    def _report_error(self, stage_name: str, item, exc: Exception):
+        if self.on_error is None:
+            return
+        try:
+            self.on_error(stage_name, item, exc)
+        except Exception:
+            pass
+
+    def _worker(self, idx: int):
+        if self.hooks is None:
+            self._work(idx)
+        else:
+            with self.hooks.worker(self.stages[idx].name):
+                self._work(idx)
+
+    def _work(self, idx: int):
+        stage = self.stages[idx]
+        stats = self._stats[idx]
+        in_q = self._queues[idx]
+        out_q = self._queues[idx + 1] if idx + 1 < len(self.stages) else None
+        out_stats = self._stats[idx + 1] if out_q is not None else None
+
+        def emit(result) -> float:
+            if result is None or out_q is None:
+                return 0.0
+            t = time.perf_counter()
+            out_q.put(result)
+            out_stats.observe_depth()
+            return time.perf_counter() - t
+
+        ended = False
+        while not ended:
+            t_wait = time.perf_counter()
+            item = in_q.get()
+            waited = time.perf_counter() - t_wait
+            if item is _END:
+                break
+            if self._cancel is not None and self._cancel.cancelled:
+                with stats._lock:
+                    stats.dropped += 1
+                continue
+
+            items = [item]
+            if stage.batch_size > 1:
+                # 이미 도착한 항목만 모음 (기다리지 않으므로 지연이 늘지 않음)
+                while len(items) < stage.batch_size:
+                    try:
+                        nxt = in_q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if nxt is _END:
+                        ended = True
+                        break
+                    items.append(nxt)
+
+            timer = self.timer
+            if timer is not None:
+                sources = [self._source(it) for it in items]
+                timings.bind(timer, sources[0] if len(items) == 1 else None)
+            t0 = time.perf_counter()
+            blocked = 0.0
+            outcome = 'processed'
+            try:
+                result = stage.fn(items if stage.batch_size > 1 else item)
+                if stage.fan_out or stage.batch_size > 1:
+                    for r in (result or ()):
+                        if self._cancel is not None and self._cancel.cancelled:
+                            break
+                        blocked += emit(r)
+                else:
+                    blocked += emit(result)
+            except CancelledError:
+                outcome = 'dropped'
+            except Exception as e:
+                outcome = 'failed'
+                for it in items:
+                    self._report_error(stage.name, it, e)
+            elapsed = time.perf_counter() - t0
+            if timer is not None:
+                timings.bind(None)
+                per_item = (elapsed - blocked) / len(items)
+                for src in sources:
+                    timer.add(stage.name, per_item, src)
+            if self.hooks is not None:
+                self.hooks.item_done(stage.name)
+
+            with stats._lock:
+                stats.wait_in_s += waited
+                stats.wait_out_s += blocked
+                stats.busy_s += elapsed - blocked
+                setattr(stats, outcome, getattr(stats, outcome) + len(items))
+
+        # 마지막으로 끝나는 워커가 다음 단계에 종료 신호 전달
+        with self._alive_lock:
+            self._alive[idx] -= 1
+            last = self._alive[idx] == 0
+        if last and out_q is not None:
+            for _ in range(self.stages[idx + 1].workers):
+                out_q.put(_END)
+
+
+def format_stage_stats(stats: List[Dict]) -> str:
+    """단계 통계를 한 줄 요약 문자열로 변환"""
+    parts = []
+    for s in stats:
+        parts.append(f"{s['stage']}[x{s['workers']}] busy={s['busy_s']:.2f}s "
+                     f"wait_in={s['wait_in_s']:.2f}s wait_out={s['wait_out_s']:.2f}s "
+                     f"q_max={s['queue_max']}/{s['queue_size']}")
+    return ' | '.join(parts)
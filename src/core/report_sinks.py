@@ -0,0 +1,205 @@
+"""
+SkyMission Builder - Streaming Report Sinks
+미션이 끝날 때마다 결과 행을 CSV / JSON Lines / Parquet 파일에 바로 추가합니다.
+배치 전체를 메모리에 모았다가 한 번에 쓰지 않으므로 수만 건 배치도 대시보드로 바로 가져갈 수 있습니다.
+
+    - csv: 고정 열(REPORT_COLUMNS), 중첩 값은 'flight.area_ha'처럼 펼치고 리스트는 ' | '로 연결
+    - jsonl: 결과 dict 그대로 한 줄에 하나
+    - parquet: pyarrow가 있으면 ROW_GROUP_SIZE행마다 row group으로 기록 (열은 csv와 동일)
+
+행은 미션이 완료된 시점의 값입니다. 실행 후에 붙는 겹침 경고와 방문 순번은
+HTML 리포트와 매니페스트에만 반영됩니다. 단, 방문 순번(route)으로 출력 이름이 바뀌면
+스트리밍 리포트도 바뀐 이름으로 결과 전체를 다시 씁니다.
+"""
+
+import csv
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+REPORT_FORMATS = ('html', 'csv', 'jsonl', 'parquet')
+STREAM_FORMATS = ('csv', 'jsonl', 'parquet')
+
+# CSV/Parquet 열 (이름, 타입). 타입은 Parquet 스키마에 사용
+REPORT_COLUMNS = (
+    ('name', 'string'), ('source', 'string'), ('output', 'string'), ('variant', 'string'),
+    ('success', 'bool'), ('status', 'string'),
+    ('metrics.gsd', 'double'), ('metrics.blur', 'double'), ('altitude', 'double'), ('speed', 'double'),
+    ('flight.area_ha', 'double'), ('flight.lines', 'int64'), ('flight.distance_m', 'double'),
+    ('flight.duration_s', 'double'), ('flight.batteries', 'int64'),
+    ('terrain.ground_min', 'double'), ('terrain.ground_max', 'double'), ('terrain.clearance_min', 'double'),
+    ('zones.zones', 'string'), ('duplicate_of', 'string'), ('messages', 'string'),
+)
+
+ROW_GROUP_SIZE = 4096
+
+
+def flatten_result(result: Dict) -> Dict:
+    """결과 dict를 REPORT_COLUMNS 열 값으로 펼칩니다 (없는 값은 None)."""
+    row = {}
+    for column, kind in REPORT_COLUMNS:
+        head, _, tail = column.partition('.')
+        value = result.get(head)
+        if tail:
+            value = value.get(tail) if isinstance(value, dict) else None
+        if head == 'duplicate_of' and value is None:
+            value = (result.get('overlap') or {}).get('duplicate_of')
+        if isinstance(value, (list, tuple)):
+            value = ' | '.join(str(v) for v in value)
+        elif value is not None and kind == 'double':
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                value = None
+        elif value is not None and kind == 'int64':
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                value = None
+        row[column] = value
+    return row
+
+
+class ReportSink:
+    """결과 행을 파일에 추가하는 싱크의 기본 클래스 (write는 여러 스레드에서 호출될 수 있음)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def write(self, result: Dict):
+        with self._lock:
+            self._write(result)
+            self.rows += 1
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _write(self, result: Dict):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class CsvSink(ReportSink):
+    def __init__(self, path: Path):
+        super().__init__(path)
+        # Excel에서 한글이 깨지지 않도록 BOM 포함
+        self._fh = open(self.path, 'w', encoding='utf-8-sig', newline='')
+        self._writer = csv.DictWriter(self._fh, fieldnames=[c for c, _ in REPORT_COLUMNS])
+        self._writer.writeheader()
+
+    def _write(self, result: Dict):
+        self._writer.writerow(flatten_result(result))
+        self._fh.flush()
+
+    def _close(self):
+        if not self._fh.closed:
+            self._fh.close()
+
+
+class JsonlSink(ReportSink):
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._fh = open(self.path, 'w', encoding='utf-8')
+
+    def _write(self, result: Dict):
+        row = {k: v for k, v in result.items() if not k.startswith('_')}
+        self._fh.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+        self._fh.flush()
+
+    def _close(self):
+        if not self._fh.closed:
+            self._fh.close()
+
+
+class ParquetSink(ReportSink):
+    """pyarrow ParquetWriter로 row_group_size행마다 기록합니다."""
+
+    def __init__(self, path: Path, row_group_size: int = ROW_GROUP_SIZE):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet 리포트를 쓰려면 pyarrow가 필요합니다. 'pip install pyarrow' 설치 후 다시 시도하세요.")
+        super().__init__(path)
+        self._pa = pa
+        self._schema = pa.schema([(c, getattr(pa, kind)()) for c, kind in REPORT_COLUMNS])
+        self._writer = pq.ParquetWriter(str(self.path), self._schema)
+        self._buffer: List[Dict] = []
+        self.row_group_size = max(1, int(row_group_size))
+
+    def _flush(self):
+        if self._buffer:
+            self._writer.write_table(self._pa.Table.from_pylist(self._buffer, schema=self._schema))
+            self._buffer = []
+
+    def _write(self, result: Dict):
+        self._buffer.append(flatten_result(result))
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _close(self):
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+
+
+SINK_TYPES = {'csv': CsvSink, 'jsonl': JsonlSink, 'parquet': ParquetSink}
+
+
+def parse_report_formats(formats) -> List[str]:
+    """'html,csv' 또는 ['html', 'csv'] → 검증된 형식 리스트 (순서 유지, 중복 제거)"""
+    if formats is None:
+        return ['html']
+    if isinstance(formats, str):
+        formats = formats.split(',')
+    out = []
+    for fmt in formats:
+        fmt = str(fmt).strip().lower()
+        if not fmt:
+            continue
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f'지원하지 않는 리포트 형식: {fmt} ({", ".join(REPORT_FORMATS)})')
+        if fmt not in out:
+            out.append(fmt)
+    return out
+
+
+class MultiSink:
+    """여러 싱크에 같은 행을 씁니다. 열 때 실패하면 이미 연 싱크를 닫고 예외를 전달합니다."""
+
+    def __init__(self, out_dir: Path, formats: Sequence[str], stem: str):
+        self.sinks: Dict[str, ReportSink] = {}
+        try:
+            for fmt in formats:
+                if fmt in SINK_TYPES:
+                    self.sinks[fmt] = SINK_TYPES[fmt](Path(out_dir) / f'{stem}.{fmt}')
+        except Exception:
+            self.close()
+            raise
+
+    def write(self, result: Dict):
+        for sink in self.sinks.values():
+            sink.write(result)
+
+    def close(self):
+        for sink in self.sinks.values():
+            sink.close()
+
+    def paths(self) -> Dict[str, Path]:
+        return {fmt: sink.path for fmt, sink in self.sinks.items()}
+
+    def __bool__(self):
+        return bool(self.sinks)
+
+
+def open_report_sinks(out_dir: Path, formats, stem: str) -> Optional[MultiSink]:
+    """스트리밍 형식이 하나라도 있으면 MultiSink, 없으면 None"""
+    formats = [f for f in parse_report_formats(formats) if f in STREAM_FORMATS]
+    return MultiSink(out_dir, formats, stem) if formats else None
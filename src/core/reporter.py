@@ -1,11 +1,23 @@
 """
 SkyMission Builder - Reporting Module
 배치 작업 결과를 시각적인 HTML 리포트로 변환합니다.
+
+표는 첫 페이지(PAGE_SIZE행)만 HTML로 그려 두고, 전체 행은 페이지 안의 JSON 데이터에서
+브라우저가 페이지 단위로 그립니다(검색/상태 필터 포함). 수만 건이어도 DOM에는 한 페이지만 올라갑니다.
+파일은 행 단위로 이어 쓰므로 HTML 전체를 하나의 문자열로 만들지 않습니다.
+CSV / JSON Lines / Parquet 스트리밍 출력은 report_sinks 모듈을 참고하세요.
 """
 
 import datetime
+import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+# 처음부터 HTML로 그려 두는 행 수이자 페이지 크기
+PAGE_SIZE = 200
+
+# 행 데이터가 들어갈 자리 (템플릿을 채운 뒤 이 표시로 나누어 앞/뒤를 따로 씀)
+_ROW_DATA_MARK = '\x00ROW_DATA\x00'
 
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -28,6 +40,8 @@ HTML_TEMPLATE = """
         .status-warning {{ color: #f39c12; font-weight: bold; }}
         .status-danger {{ color: #dc3545; font-weight: bold; }}
         .footer {{ margin-top: 30px; text-align: center; font-size: 0.8em; color: #777; }}
+        .pager {{ display: flex; gap: 8px; align-items: center; margin-bottom: 10px; }}
+        .pager input {{ flex: 1; padding: 6px; }}
     </style>
 </head>
 <body>
@@ -51,25 +65,43 @@ HTML_TEMPLATE = """
             <div class="metric">
                 <div>작업 시간</div>
                 <div>{timestamp}</div>
-            </div>
+            </div>{flight_summary}
         </div>
     </div>
 
-    <table>
+    {variant_summary}
+
+    <div class="pager">
+        <input id="report-filter" type="search" placeholder="이름/파일/메시지 검색">
+        <select id="report-status">
+            <option value="">전체 상태</option>
+            <option value="safe">SAFE</option>
+            <option value="warning">WARNING</option>
+            <option value="danger">DANGER</option>
+        </select>
+        <button id="report-prev" type="button">이전</button>
+        <span id="report-page">1 / {pages} 페이지 ({total}건)</span>
+        <button id="report-next" type="button">다음</button>
+    </div>
+
+    <table data-page-size="{page_size}">
         <thead>
             <tr>
-                <th>파일명</th>
+                <th>파일명</th>{variant_header}
                 <th>상태</th>
                 <th>GSD (cm)</th>
                 <th>Blur (cm)</th>
-                <th>속도/고도</th>
+                <th>속도/고도</th>{flight_header}{terrain_header}{zone_header}
                 <th>메시지</th>
             </tr>
         </thead>
-        <tbody>
+        <tbody id="report-rows">
             {table_rows}
         </tbody>
     </table>
+    <script type="application/json" id="report-data">{row_data}</script>
+    <script>{pager_script}</script>
+{profile_section}
 
     <div class="footer">
         Generated by SkyMission Builder v0.1.0 | DJI WPML 1.0.6 Standard
@@ -78,44 +110,255 @@ HTML_TEMPLATE = """
 </html>
 """
 
-def generate_report(results: List[Dict], output_dir: Path) -> Path:
+# 행 데이터([상태, 검색 문자열, 행 HTML])로 한 페이지씩 다시 그리는 스크립트
+PAGER_SCRIPT = """
+(function () {
+    var data = JSON.parse(document.getElementById('report-data').textContent);
+    var table = document.querySelector('table[data-page-size]');
+    var size = parseInt(table.getAttribute('data-page-size'), 10) || 200;
+    var body = document.getElementById('report-rows');
+    var filter = document.getElementById('report-filter');
+    var status = document.getElementById('report-status');
+    var info = document.getElementById('report-page');
+    var rows = data, page = 0;
+    function render() {
+        var pages = Math.max(1, Math.ceil(rows.length / size));
+        page = Math.min(Math.max(page, 0), pages - 1);
+        var html = [];
+        for (var i = page * size; i < Math.min(rows.length, (page + 1) * size); i++) html.push(rows[i][2]);
+        body.innerHTML = html.join('');
+        info.textContent = (page + 1) + ' / ' + pages + ' 페이지 (' + rows.length + '건)';
+    }
+    function apply() {
+        var q = filter.value.trim().toLowerCase(), s = status.value;
+        rows = data.filter(function (r) { return (!s || r[0] === s) && (!q || r[1].indexOf(q) >= 0); });
+        page = 0;
+        render();
+    }
+    filter.addEventListener('input', apply);
+    status.addEventListener('change', apply);
+    document.getElementById('report-prev').addEventListener('click', function () { page--; render(); });
+    document.getElementById('report-next').addEventListener('click', function () { page++; render(); });
+})();
+"""
+
+
+def report_stem() -> str:
+    """리포트 파일 이름 (확장자 제외). 스트리밍 싱크와 같은 이름을 쓰기 위해 분리"""
+    return f"report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+def generate_report(results: List[Dict], output_dir: Path, page_size: int = PAGE_SIZE,
+                    stem: Optional[str] = None, profile: Optional[Dict] = None) -> Path:
     """
     배치 결과를 바탕으로 HTML 리포트를 생성합니다.
+    profile(timings.TimingRecorder.profile 결과)을 넘기면 단계별 처리 시간 표를 덧붙입니다.
     """
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    file_timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    
+    page_size = max(1, int(page_size))
+
     total = len(results)
     success = sum(1 for r in results if r['success'])
     failure = total - success
     
-    rows = []
-    for r in results:
-        status_class = f"status-{r.get('status', 'safe')}"
-        metrics = r.get('metrics', {})
-        
-        row = f"""
-        <tr>
-            <td>{r['name']}</td>
-            <td class="{status_class}">{r.get('status', 'N/A').upper()}</td>
-            <td>{metrics.get('gsd', '-')}</td>
-            <td>{metrics.get('blur', '-')}</td>
-            <td>{r.get('speed', '-')}m/s / {r.get('altitude', '-')}m</td>
-            <td style="font-size: 0.85em;">{'<br>'.join(r.get('messages', []))}</td>
-        </tr>
-        """
-        rows.append(row)
-    
+    has_variants = any(r.get('variant') for r in results)
+    has_flight = any(r.get('flight') for r in results)
+    has_terrain = any(r.get('terrain') for r in results)
+    has_zones = any(r.get('zones') for r in results)
+    columns = (has_variants, has_flight, has_terrain, has_zones)
+
     html_content = HTML_TEMPLATE.format(
         total=total,
         success=success,
         failure=failure,
         timestamp=timestamp,
-        table_rows="".join(rows)
+        pages=max(1, -(-total // page_size)),
+        page_size=page_size,
+        variant_summary=_variant_summary(results),
+        variant_header="\n                <th>변형</th>" if has_variants else "",
+        flight_summary=_flight_summary(results) if has_flight else "",
+        flight_header=FLIGHT_HEADER if has_flight else "",
+        terrain_header=TERRAIN_HEADER if has_terrain else "",
+        zone_header="\n                <th>제한구역</th>" if has_zones else "",
+        table_rows="".join(_row_html(r, *columns) for r in results[:page_size]),
+        row_data=_ROW_DATA_MARK,
+        pager_script=PAGER_SCRIPT,
+        profile_section=_profile_section(profile) if profile else "",
     )
-    
-    report_path = output_dir / f"report_{file_timestamp}.html"
+    head, tail = html_content.split(_ROW_DATA_MARK)
+
+    report_path = output_dir / f"{stem or report_stem()}.html"
     with open(report_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
-    
+        f.write(head)
+        f.write('[')
+        for i, r in enumerate(results):
+            search = ' '.join([str(r.get('name', '')), str(r.get('source', '')), str(r.get('output', ''))]
+                              + [str(m) for m in r.get('messages') or []]).lower()
+            item = json.dumps([r.get('status', 'safe'), search, _row_html(r, *columns)], ensure_ascii=False)
+            # </script>로 스크립트 블록이 닫히지 않도록
+            f.write((',' if i else '') + item.replace('</', '<\\/'))
+        f.write(']')
+        f.write(tail)
+
     return report_path
+
+
+def _row_html(r: Dict, has_variants: bool, has_flight: bool, has_terrain: bool, has_zones: bool) -> str:
+    status_class = f"status-{r.get('status', 'safe')}"
+    metrics = r.get('metrics', {})
+    variant_cell = f"<td>{r.get('variant', '-')}</td>" if has_variants else ''
+    flight_cells = _flight_cells(r.get('flight') or {}) if has_flight else ''
+    terrain_cells = _terrain_cells(r.get('terrain') or {}) if has_terrain else ''
+    zone_cell = _zone_cell(r.get('zones') or {}) if has_zones else ''
+    return f"""
+        <tr>
+            <td>{r['name']}</td>{variant_cell}
+            <td class="{status_class}">{r.get('status', 'N/A').upper()}</td>
+            <td>{metrics.get('gsd', '-')}</td>
+            <td>{metrics.get('blur', '-')}</td>
+            <td>{r.get('speed', '-')}m/s / {r.get('altitude', '-')}m</td>{flight_cells}{terrain_cells}{zone_cell}
+            <td style="font-size: 0.85em;">{'<br>'.join(r.get('messages', []))}</td>
+        </tr>
+        """
+
+
+# 비행 지표 열 (metrics.compute_flight_metrics 결과가 있는 경우에만 표시)
+FLIGHT_HEADER = """
+                <th>면적 (ha)</th>
+                <th>라인</th>
+                <th>경로 (km)</th>
+                <th>예상 시간</th>
+                <th>배터리</th>"""
+
+
+def _flight_cells(flight: Dict) -> str:
+    if not flight:
+        return "<td>-</td>" * 5
+    distance = flight.get('distance_m')
+    values = [
+        flight.get('area_ha', '-'),
+        flight.get('lines', '-'),
+        f"{distance / 1000:.2f}" if distance is not None else '-',
+        flight.get('duration', '-'),
+        flight.get('batteries', '-'),
+    ]
+    return "".join(f"\n            <td>{v}</td>" for v in values)
+
+
+# 지형 검사 열 (terrain 모듈 결과가 있는 경우에만 표시)
+TERRAIN_HEADER = """
+                <th>지면 고도 (m)</th>
+                <th>최소 여유고 (m)</th>"""
+
+
+def _terrain_cells(terrain: Dict) -> str:
+    if 'ground_min' in terrain:
+        ground = f"{terrain['ground_min']} ~ {terrain['ground_max']}"
+    else:
+        ground = '-'
+    clearance = terrain.get('clearance_min')
+    status = terrain.get('status', 'safe')
+    return (f"\n            <td>{ground}</td>"
+            f"\n            <td class=\"status-{status}\">{'-' if clearance is None else clearance}</td>")
+
+
+def _zone_cell(zones: Dict) -> str:
+    if not zones:
+        return "\n            <td>-</td>"
+    return f"\n            <td class=\"status-{zones.get('status', 'danger')}\">{', '.join(zones.get('zones', []))}</td>"
+
+
+def _flight_summary(results: List[Dict]) -> str:
+    """성공한 미션의 총 면적, 총 예상 비행 시간, 총 배터리 수"""
+    flights = [r['flight'] for r in results if r['success'] and r.get('flight')]
+    area = sum(f.get('area_ha') or 0 for f in flights)
+    seconds = sum(f.get('duration_s') or 0 for f in flights)
+    batteries = sum(f.get('batteries') or 0 for f in flights)
+    return f"""
+            <div class="metric">
+                <div>총 면적</div>
+                <div class="metric-val">{area:.1f} ha</div>
+            </div>
+            <div class="metric">
+                <div>총 예상 비행</div>
+                <div class="metric-val">{int(seconds // 3600)}h {int(seconds % 3600 // 60):02d}m</div>
+            </div>
+            <div class="metric">
+                <div>필요 배터리</div>
+                <div class="metric-val">{batteries}</div>
+            </div>"""
+
+
+# 리포트에 보여 줄 가장 느린 파일 수
+SLOWEST_FILES = 10
+
+
+def _profile_section(profile: Dict) -> str:
+    """단계/구간별 처리 시간 표와 가장 느린 파일 목록"""
+    rows = []
+    for name, st in profile.get('batch', {}).items():
+        label = name if '.' not in name else f"&nbsp;&nbsp;└ {name.split('.', 1)[1]}"
+        rows.append(f"""
+            <tr><td>{label}</td><td>{st['count']}</td><td>{st['total_s']:.3f}</td>
+                <td>{st['p50_ms']:.1f}</td><td>{st['p95_ms']:.1f}</td><td>{st['max_ms']:.1f}</td></tr>""")
+    # 파일별 단계 시간 합계 (세부 구간은 단계 시간에 포함되므로 제외)
+    totals = sorted(((sum(st['total_s'] for n, st in stages.items() if '.' not in n), src)
+                     for src, stages in profile.get('files', {}).items()), reverse=True)[:SLOWEST_FILES]
+    slow = "".join(f"<tr><td>{src}</td><td>{total:.3f}</td></tr>" for total, src in totals)
+    return f"""
+    <div class="summary" style="margin-top: 20px;">
+        <h3>처리 시간 (총 {profile.get('elapsed_s', 0)}초, 초당 {profile.get('missions_per_s', 0)}건)</h3>
+        <table>
+            <thead>
+                <tr><th>단계</th><th>건수</th><th>합계 (s)</th><th>p50 (ms)</th><th>p95 (ms)</th><th>최대 (ms)</th></tr>
+            </thead>
+            <tbody>{"".join(rows)}
+            </tbody>
+        </table>
+        <h3>가장 느린 파일</h3>
+        <table>
+            <thead><tr><th>파일</th><th>단계 시간 합계 (s)</th></tr></thead>
+            <tbody>{slow}</tbody>
+        </table>
+    </div>"""
+
+
+def _variant_summary(results: List[Dict]) -> str:
+    """변형별 성공 수와 GSD/Blur/속도/고도를 나란히 비교하는 표"""
+    order, groups = [], {}
+    for r in results:
+        name = r.get('variant')
+        if name is None:
+            continue
+        if name not in groups:
+            order.append(name)
+            groups[name] = []
+        groups[name].append(r)
+    if not order:
+        return ''
+    rows = []
+    for name in order:
+        rs = groups[name]
+        ok = [r for r in rs if r['success']]
+        ref = ok[0] if ok else rs[0]
+        metrics = ref.get('metrics', {})
+        status = ref.get('status', 'N/A')
+        rows.append(f"""
+            <tr>
+                <td>{name}</td>
+                <td>{len(ok)} / {len(rs)}</td>
+                <td class="status-{status}">{status.upper()}</td>
+                <td>{metrics.get('gsd', '-')}</td>
+                <td>{metrics.get('blur', '-')}</td>
+                <td>{ref.get('speed', '-')}m/s / {ref.get('altitude', '-')}m</td>
+            </tr>""")
+    return f"""<div class="summary">
+        <h3>변형별 비교</h3>
+        <table>
+            <thead>
+                <tr><th>변형</th><th>성공</th><th>상태</th><th>GSD (cm)</th><th>Blur (cm)</th><th>속도/고도</th></tr>
+            </thead>
+            <tbody>{"".join(rows)}
+            </tbody>
+        </table>
+    </div>"""
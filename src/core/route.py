@@ -0,0 +1,313 @@
+"""
+SkyMission Builder - Field Route Module
+생성된 미션을 현장 이동 순서로 정렬합니다.
+
+    1. 미션 중심점(WGS84)을 평균 위도 기준 국지 평면(m)으로 변환
+    2. KD-tree(scipy가 있으면 cKDTree, 없으면 격자 색인 근사)로 점마다 가까운 이웃 k개를 구함
+    3. 출발점에서 최근접 이웃(nearest neighbour)으로 초기 경로를 만들고
+    4. 이웃 목록 안에서만 2-opt 개선 (O(N·k) 한 바퀴, 시간 제한)
+
+출발점은 고정이고 경로는 되돌아오지 않는 열린 경로입니다. 5만 개 미션도 수 초 안에 끝납니다.
+"""
+
+import math
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .metrics import _M_PER_DEG_LAT, _M_PER_DEG_LON
+
+# 2-opt 후보로 보는 이웃 수와 기본 시간 제한(초)
+ROUTE_NEIGHBORS = 8
+ROUTE_TIME_LIMIT_S = 3.0
+
+ROUTE_FORMATS = ('gpkg', 'kml')
+
+
+def parse_start(value) -> Optional[Tuple[float, float]]:
+    """'경도,위도' 문자열 또는 (경도, 위도) → (lon, lat). None이면 None"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        parts = [p for p in value.replace(' ', '').split(',') if p]
+        if len(parts) != 2:
+            raise ValueError(f'출발점은 "경도,위도" 형식이어야 합니다: {value}')
+        value = parts
+    lon, lat = float(value[0]), float(value[1])
+    if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+        raise ValueError(f'출발점 좌표가 범위를 벗어났습니다: {lon}, {lat}')
+    return lon, lat
+
+
+def project_local(lonlat: np.ndarray) -> np.ndarray:
+    """(경도, 위도) 배열 → 평균 위도 기준 등장방형 평면 좌표(m)"""
+    lonlat = np.asarray(lonlat, dtype=float).reshape(-1, 2)
+    lat0 = float(lonlat[:, 1].mean()) if len(lonlat) else 0.0
+    xy = np.empty_like(lonlat)
+    xy[:, 0] = lonlat[:, 0] * math.cos(math.radians(lat0)) * _M_PER_DEG_LON
+    xy[:, 1] = lonlat[:, 1] * _M_PER_DEG_LAT
+    return xy
+
+
+def _grid_neighbors(xy: np.ndarray, k: int) -> np.ndarray:
+    """
+    scipy가 없을 때의 근사 kNN: 점이 평균 2개 정도 들어가는 격자에서 주변 칸(최소 2칸 반경)의
+    후보를 모아 칸 단위로 한 번에 계산합니다. 2-opt 후보 목록 용도라 근사로 충분합니다.
+    """
+    n = len(xy)
+    lo = xy.min(axis=0)
+    extent = np.maximum(xy.max(axis=0) - lo, 1e-9)
+    cell = max(math.sqrt(float(extent[0] * extent[1]) * 2.0 / n), float(extent.max()) / max(n, 1), 1e-9)
+    cx = ((xy[:, 0] - lo[0]) // cell).astype(np.int64)
+    cy = ((xy[:, 1] - lo[1]) // cell).astype(np.int64)
+    ncx = int(cx.max()) + 1
+    cell_id = cy * ncx + cx
+    order = np.argsort(cell_id, kind='stable')
+    sorted_ids = cell_id[order]
+    uniq, starts = np.unique(sorted_ids, return_index=True)
+    ends = np.append(starts[1:], n)
+    members = {int(c): order[s:e] for c, s, e in zip(uniq, starts, ends)}
+
+    out = np.empty((n, k), dtype=np.int64)
+    for c, idx in members.items():
+        gx, gy = c % ncx, c // ncx
+        ring = 1
+        while True:
+            cand = [members[yy * ncx + xx]
+                    for yy in range(gy - ring, gy + ring + 1) for xx in range(gx - ring, gx + ring + 1)
+                    if 0 <= xx < ncx and (yy * ncx + xx) in members]
+            cand = np.concatenate(cand)
+            # 후보가 k+1개 이상이고 한 칸 더 넓힌 상태면 링 밖의 점이 더 가까울 수 없음
+            if len(cand) > k and ring >= 2 or len(cand) >= n:
+                break
+            ring += 1
+        d = ((xy[idx, None, :] - xy[None, cand, :]) ** 2).sum(axis=2)
+        d[cand[None, :] == idx[:, None]] = np.inf
+        kk = min(k, len(cand) - 1)
+        nearest = np.argsort(d, axis=1)[:, :kk]
+        res = cand[nearest]
+        if kk < k:
+            res = np.concatenate([res, np.repeat(res[:, -1:], k - kk, axis=1)], axis=1)
+        out[idx] = res
+    return out
+
+
+def neighbor_lists(xy: np.ndarray, k: int = ROUTE_NEIGHBORS) -> np.ndarray:
+    """점마다 가까운 순서의 이웃 번호 (n, k) 배열 (자기 자신 제외)"""
+    n = len(xy)
+    k = max(1, min(k, n - 1))
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return _grid_neighbors(xy, k)
+    _, idx = cKDTree(xy).query(xy, k=k + 1)
+    return np.asarray(idx[:, 1:], dtype=np.int64)
+
+
+class _UnvisitedGrid:
+    """최근접 이웃 경로에서 이웃 목록이 모두 방문됐을 때 쓰는 미방문 점 격자 (칸마다 평균 2개)"""
+
+    def __init__(self, xy: np.ndarray):
+        n = len(xy)
+        self.lo = xy.min(axis=0)
+        extent = np.maximum(xy.max(axis=0) - self.lo, 1e-9)
+        self.cell = max(math.sqrt(float(extent[0] * extent[1]) * 2.0 / n), float(extent.max()) / n, 1e-9)
+        cells = ((xy - self.lo) // self.cell).astype(np.int64)
+        self.nx, self.ny = int(cells[:, 0].max()) + 1, int(cells[:, 1].max()) + 1
+        self.cx, self.cy = cells[:, 0].tolist(), cells[:, 1].tolist()
+        self.members: Dict[Tuple[int, int], set] = {}
+        for i, key in enumerate(zip(self.cx, self.cy)):
+            self.members.setdefault(key, set()).add(i)
+        self.xs, self.ys = xy[:, 0].tolist(), xy[:, 1].tolist()
+
+    def remove(self, i: int):
+        key = (self.cx[i], self.cy[i])
+        cell = self.members[key]
+        cell.discard(i)
+        if not cell:
+            del self.members[key]
+
+    def nearest(self, i: int) -> int:
+        gx, gy, x, y = self.cx[i], self.cy[i], self.xs[i], self.ys[i]
+        best, best_d = -1, math.inf
+        ring = 0
+        while ring <= max(self.nx, self.ny):
+            # ring번째 고리의 점은 적어도 (ring - 1) * cell 만큼 떨어져 있음
+            if best >= 0 and (ring - 1) * self.cell > best_d:
+                break
+            for xx in range(gx - ring, gx + ring + 1):
+                for yy in range(gy - ring, gy + ring + 1):
+                    if max(abs(xx - gx), abs(yy - gy)) != ring:
+                        continue
+                    for j in self.members.get((xx, yy), ()):
+                        d = math.hypot(self.xs[j] - x, self.ys[j] - y)
+                        if d < best_d:
+                            best, best_d = j, d
+            ring += 1
+        return best
+
+
+def nearest_neighbor_tour(xy: np.ndarray, nbrs: np.ndarray, start: int = 0) -> np.ndarray:
+    """
+    start에서 출발해 가장 가까운 미방문 점으로 이동하는 경로.
+    이웃 목록이 모두 방문됐을 때만 미방문 점 격자를 주변 칸부터 넓혀 가며 찾습니다.
+    """
+    n = len(xy)
+    visited = [False] * n
+    tour = np.empty(n, dtype=np.int64)
+    grid = _UnvisitedGrid(xy)
+    nbr = nbrs.tolist()
+    cur = start
+    for step in range(n):
+        tour[step] = cur
+        visited[cur] = True
+        grid.remove(cur)
+        if step == n - 1:
+            break
+        nxt = -1
+        for c in nbr[cur]:
+            if not visited[c]:
+                nxt = c
+                break
+        if nxt < 0:
+            nxt = grid.nearest(cur)
+        cur = nxt
+    return tour
+
+
+def two_opt(xy: np.ndarray, tour: np.ndarray, nbrs: np.ndarray,
+            time_limit: float = ROUTE_TIME_LIMIT_S, max_passes: int = 10) -> np.ndarray:
+    """
+    이웃 목록 기반 2-opt. tour[0](출발점)은 고정하고, 새 간선 (a, c)가 이웃 관계인 교환만 검사합니다.
+    열린 경로이므로 마지막 점 뒤에는 간선이 없습니다.
+    """
+    tour = np.array(tour, dtype=np.int64)
+    n = len(tour)
+    if n < 4:
+        return tour
+    xs, ys = xy[:, 0].tolist(), xy[:, 1].tolist()
+    pos = np.empty(n, dtype=np.int64)
+    pos[tour] = np.arange(n)
+    nbr = nbrs.tolist()
+
+    def dist(a, b):
+        return math.hypot(xs[a] - xs[b], ys[a] - ys[b])
+
+    deadline = time.monotonic() + time_limit
+    for _ in range(max_passes):
+        improved = False
+        for i in range(n - 1):
+            scan = True
+            while scan:
+                scan = False
+                a = int(tour[i])
+                for c in nbr[a]:
+                    j = int(pos[c])
+                    lo, hi = (i, j) if i < j else (j, i)
+                    if hi - lo < 2:
+                        continue
+                    p, q = int(tour[lo]), int(tour[lo + 1])
+                    r = int(tour[hi])
+                    gain = dist(p, q) - dist(p, r)
+                    if hi + 1 < n:
+                        s = int(tour[hi + 1])
+                        gain += dist(r, s) - dist(q, s)
+                    if gain > 1e-9:
+                        seg = tour[lo + 1:hi + 1][::-1].copy()
+                        tour[lo + 1:hi + 1] = seg
+                        pos[seg] = np.arange(lo + 1, hi + 1)
+                        improved = True
+                        # j < i이면 뒤집기로 tour[i]가 바뀌므로 새 점의 이웃 목록으로 다시 검사
+                        scan = j < i
+                        if scan:
+                            break
+            if (i & 1023) == 0 and time.monotonic() > deadline:
+                return tour
+        if not improved:
+            break
+    return tour
+
+
+def path_length(xy: np.ndarray, tour: np.ndarray) -> float:
+    if len(tour) < 2:
+        return 0.0
+    return float(np.hypot(*np.diff(xy[tour], axis=0).T).sum())
+
+
+def plan_route(points: Sequence[Tuple[float, float]], start: Optional[Tuple[float, float]] = None,
+               k: int = ROUTE_NEIGHBORS, time_limit: float = ROUTE_TIME_LIMIT_S) -> Dict:
+    """
+    미션 중심점(경도, 위도)의 방문 순서를 계산합니다.
+
+    Args:
+        points: 미션 중심점 리스트
+        start: 출발점 (경도, 위도). None이면 첫 번째 미션에서 출발
+
+    Returns:
+        Dict: {'order'(points 번호 배열), 'distance_m'(2-opt 후), 'nn_distance_m'(초기 경로)}
+    """
+    pts = np.asarray(points, dtype=float).reshape(-1, 2)
+    n = len(pts)
+    if n == 0:
+        return {'order': np.zeros(0, dtype=np.int64), 'distance_m': 0.0, 'nn_distance_m': 0.0}
+    if start is not None:
+        pts = np.vstack([pts, [start]])
+    xy = project_local(pts)
+    first = n if start is not None else 0
+    if len(xy) < 2:
+        tour = np.array([first], dtype=np.int64)
+        nn_len = 0.0
+    else:
+        nbrs = neighbor_lists(xy, k)
+        tour = nearest_neighbor_tour(xy, nbrs, start=first)
+        nn_len = path_length(xy, tour)
+        tour = two_opt(xy, tour, nbrs, time_limit=time_limit)
+    dist = path_length(xy, tour)
+    order = tour[1:] if start is not None else tour
+    return {'order': order, 'distance_m': round(dist, 1), 'nn_distance_m': round(nn_len, 1)}
+
+
+def write_route(path: Path, stops: List[Dict], start: Optional[Tuple[float, float]] = None) -> Path:
+    """
+    방문 순서의 경로선과 정류점을 GPKG(route/stops 레이어) 또는 KML로 저장합니다.
+
+    Args:
+        stops: 순서대로 {'order', 'name', 'output', 'lon', 'lat'}
+    """
+    path = Path(path)
+    coords = ([tuple(start)] if start is not None else []) + [(s['lon'], s['lat']) for s in stops]
+    if path.suffix.lower() == '.gpkg':
+        import geopandas as gpd
+        from shapely.geometry import LineString, Point
+
+        if path.exists():
+            path.unlink()
+        if len(coords) >= 2:
+            gpd.GeoDataFrame({'stops': [len(stops)]}, geometry=[LineString(coords)], crs='EPSG:4326').to_file(
+                path, layer='route', driver='GPKG')
+        gpd.GeoDataFrame({k: [s[k] for s in stops] for k in ('order', 'name', 'output')},
+                         geometry=[Point(s['lon'], s['lat']) for s in stops], crs='EPSG:4326').to_file(
+            path, layer='stops', driver='GPKG')
+        return path
+
+    from .journal import atomic_write_bytes
+
+    kml = ET.Element('kml', xmlns='http://www.opengis.net/kml/2.2')
+    doc = ET.SubElement(kml, 'Document')
+    ET.SubElement(doc, 'name').text = '미션 방문 경로'
+    if len(coords) >= 2:
+        route_pm = ET.SubElement(doc, 'Placemark')
+        ET.SubElement(route_pm, 'name').text = '경로'
+        line = ET.SubElement(route_pm, 'LineString')
+        ET.SubElement(line, 'tessellate').text = '1'
+        ET.SubElement(line, 'coordinates').text = ' '.join(f'{lon:.7f},{lat:.7f},0' for lon, lat in coords)
+    for s in stops:
+        pm = ET.SubElement(doc, 'Placemark')
+        ET.SubElement(pm, 'name').text = f"{s['order']}. {s['name']}"
+        ET.SubElement(pm, 'description').text = s['output']
+        ET.SubElement(ET.SubElement(pm, 'Point'), 'coordinates').text = f"{s['lon']:.7f},{s['lat']:.7f},0"
+    atomic_write_bytes(path, ET.tostring(kml, encoding='utf-8', xml_declaration=True))
+    return path
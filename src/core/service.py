@@ -0,0 +1,431 @@
+"""
+SkyMission Builder - Batch HTTP Service
+웹 GIS 등 외부 도구에서 미션 생성을 호출할 수 있도록 표준 라이브러리만으로 만든 HTTP 서비스입니다.
+
+API (.agent/skills/_shared/api-contracts/batch_api.md 참고)
+    POST /batch/tasks                배치 작업 등록 → {batch_id, total_files, status}
+    GET  /batch/tasks/{id}           진행 상황/결과 조회
+    POST /batch/tasks/{id}/retry     실패한 파일만 다시 처리
+    POST /missions/kmz               폴리곤 하나를 디스크를 거치지 않고 KMZ 바이트로 반환
+    GET  /health                     상태 확인
+
+작업 목록은 SQLite에 저장되므로 서비스를 다시 시작해도 대기/처리 중이던 작업이 이어서 실행됩니다.
+"""
+
+import datetime
+import json
+import queue
+import re
+import sqlite3
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .engine import MissionBatchEngine
+from .events import Progress
+from .generator import build_mission_kmz, sanitize_filename
+
+# 요청의 options 중 batch_process_inputs로 전달을 허용하는 키
+BATCH_OPTION_KEYS = (
+    'input_format', 'naming_field', 'layer', 'set_times', 'set_takeoff_ref_point', 'pack_kmz',
+    'overrides', 'simplify_tolerance', 'stage_workers', 'queue_size', 'feature_timeout', 'variants',
+    'override_columns', 'dem', 'min_clearance', 'zones', 'zones_layer', 'zones_name_field', 'clip_zones',
+    'overlap_ratio', 'skip_duplicates', 'exclusions', 'exclusion_min_area', 'group_by', 'merge_distance',
+    'merge_max_area', 'route', 'route_start', 'route_format', 'report_formats',
+)
+
+KMZ_MIME = 'application/vnd.google-earth.kmz'
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(timespec='seconds')
+
+
+# -----------------------------
+# 작업 저장소 (SQLite)
+# -----------------------------
+
+class JobStore:
+    """배치 작업 상태를 SQLite에 보관합니다. 여러 스레드에서 호출해도 안전합니다."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS batches ('
+                ' batch_id TEXT PRIMARY KEY, status TEXT NOT NULL, request TEXT NOT NULL,'
+                ' progress TEXT NOT NULL, jobs TEXT NOT NULL, error TEXT,'
+                ' created TEXT NOT NULL, updated TEXT NOT NULL)'
+            )
+
+    def create(self, request: Dict) -> Dict:
+        batch_id = str(uuid.uuid4())
+        # progress는 jobs와 같은 단위(미션, 또는 찾을 수 없는 파일)로 셈. 미션 수는 읽은 뒤에 알 수 있음
+        progress = {'total': 0, 'processed': 0, 'success': 0, 'failed': 0}
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO batches VALUES (?, ?, ?, ?, ?, NULL, ?, ?)',
+                (batch_id, 'queued', json.dumps(request, ensure_ascii=False), json.dumps(progress),
+                 '[]', _now(), _now()),
+            )
+        return self.get(batch_id)
+
+    def get(self, batch_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM batches WHERE batch_id = ?', (batch_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'batch_id': row['batch_id'],
+            'status': row['status'],
+            'request': json.loads(row['request']),
+            'progress': json.loads(row['progress']),
+            'jobs': json.loads(row['jobs']),
+            'error': row['error'],
+            'created': row['created'],
+            'updated': row['updated'],
+        }
+
+    def update(self, batch_id: str, **fields):
+        sets, values = [], []
+        for key, value in fields.items():
+            sets.append(f'{key} = ?')
+            values.append(json.dumps(value, ensure_ascii=False, default=str)
+                          if key in ('progress', 'jobs', 'request') else value)
+        sets.append('updated = ?')
+        values.extend([_now(), batch_id])
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE batches SET {', '.join(sets)} WHERE batch_id = ?", values)
+
+    def active(self) -> List[Dict]:
+        """대기/처리 중인 작업 ({batch_id, request})"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT batch_id, request FROM batches WHERE status IN ('queued', 'processing')"
+            ).fetchall()
+        return [{'batch_id': r['batch_id'], 'request': json.loads(r['request'])} for r in rows]
+
+    def unfinished(self) -> List[str]:
+        """대기 중이거나 처리 도중 서비스가 종료된 작업 (재시작 시 다시 큐에 넣음)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT batch_id FROM batches WHERE status IN ('queued', 'processing') ORDER BY created"
+            ).fetchall()
+        return [r['batch_id'] for r in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# -----------------------------
+# 서비스
+# -----------------------------
+
+class BatchService:
+    """
+    작업 큐와 워커 풀. HTTP 핸들러는 이 객체에 작업을 등록/조회만 합니다.
+
+    Args:
+        db_path (Path): 작업 저장용 SQLite 파일
+        template_path, waylines_path (Path): 기본 템플릿/WPML
+        workers (int): 동시에 실행할 배치 수
+        default_out_dir (Path): options.output_dir가 없을 때 사용할 출력 폴더
+    """
+
+    def __init__(self, db_path: Path, template_path: Path, waylines_path: Path, workers: int = 2,
+                 default_out_dir: Optional[Path] = None, engine: Optional[MissionBatchEngine] = None):
+        self.store = JobStore(db_path)
+        self.engine = engine or MissionBatchEngine(template_path, waylines_path)
+        self.default_out_dir = Path(default_out_dir) if default_out_dir else None
+        self.workers = max(1, int(workers))
+        self._queue = queue.Queue()
+        self._threads = []
+        self._stopping = threading.Event()
+        # 출력 폴더 중복 검사와 등록을 한 번에 (같은 out_dir에 동시에 두 작업이 들어가지 않도록)
+        self._submit_lock = threading.Lock()
+
+    def start(self):
+        for batch_id in self.store.unfinished():
+            self.store.update(batch_id, status='queued')
+            self._queue.put(batch_id)
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker, name=f'batch-service-{i}', daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self):
+        self._stopping.set()
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+        self._threads = []
+        self.store.close()
+
+    # ------------------------------------------------------------------
+    # 작업 등록/조회
+    # ------------------------------------------------------------------
+    def submit(self, body: Dict) -> Dict:
+        file_paths = body.get('file_paths')
+        if not isinstance(file_paths, list) or not file_paths:
+            raise ValueError('file_paths(입력 파일 경로 목록)가 필요합니다.')
+        options = body.get('options') or {}
+        if not options.get('output_dir') and self.default_out_dir is None:
+            raise ValueError('options.output_dir가 필요합니다.')
+        unknown = set(options) - set(BATCH_OPTION_KEYS) - {'output_dir'}
+        if unknown:
+            raise ValueError(f'지원하지 않는 옵션: {sorted(unknown)}')
+        # 결과 행의 source는 파일 이름뿐이고 같은 출력 폴더/저널을 쓰므로 이름이 같은 입력은 받지 않음
+        names = {}
+        for p in file_paths:
+            other = names.setdefault(Path(p).name, str(p))
+            if other != str(p):
+                raise ValueError(f'파일 이름이 같은 입력은 한 작업에 넣을 수 없습니다: {other}, {p}')
+        request = {'file_paths': [str(p) for p in file_paths], 'options': options}
+        with self._submit_lock:
+            self._check_out_dir_free(request)
+            batch = self.store.create(request)
+        self._queue.put(batch['batch_id'])
+        return {'batch_id': batch['batch_id'], 'total_files': len(file_paths), 'status': 'queued'}
+
+    def status(self, batch_id: str) -> Optional[Dict]:
+        batch = self.store.get(batch_id)
+        if batch is None:
+            return None
+        out = {k: batch[k] for k in ('batch_id', 'status', 'progress', 'jobs', 'created', 'updated')}
+        if batch['error']:
+            out['error'] = batch['error']
+        return out
+
+    def retry(self, batch_id: str) -> Optional[Dict]:
+        batch = self.store.get(batch_id)
+        if batch is None:
+            return None
+        if batch['status'] in ('queued', 'processing'):
+            raise ValueError('아직 처리 중인 작업입니다.')
+        failed = [j for j in batch['jobs'] if j.get('status') == 'failed']
+        if not failed and batch['status'] != 'failed':
+            return {'batch_id': batch_id, 'retried_count': 0, 'status': batch['status']}
+        request = dict(batch['request'], retry=True)
+        with self._submit_lock:
+            self._check_out_dir_free(request)
+            self.store.update(batch_id, status='queued', request=request, error=None)
+        self._queue.put(batch_id)
+        return {'batch_id': batch_id, 'retried_count': len(failed), 'status': 'queued'}
+
+    def _out_dir(self, request: Dict) -> Path:
+        return Path((request.get('options') or {}).get('output_dir') or self.default_out_dir).resolve()
+
+    def _check_out_dir_free(self, request: Dict):
+        """
+        같은 출력 폴더를 쓰는 작업이 대기/처리 중이면 ValueError.
+        저널, 매니페스트, 출력 파일을 공유하므로 한 폴더에는 한 번에 한 작업만 허용합니다.
+        """
+        out_dir = self._out_dir(request)
+        for other in self.store.active():
+            if self._out_dir(other['request']) == out_dir:
+                raise ValueError(f"출력 폴더를 사용 중인 작업이 있습니다: {other['batch_id']} ({out_dir})")
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def _worker(self):
+        while not self._stopping.is_set():
+            batch_id = self._queue.get()
+            if batch_id is None:
+                break
+            try:
+                self._run_batch(batch_id)
+            except Exception as e:
+                self.store.update(batch_id, status='failed', error=str(e))
+
+    def _run_batch(self, batch_id: str):
+        batch = self.store.get(batch_id)
+        request = batch['request']
+        options = dict(request.get('options') or {})
+        out_dir = Path(options.pop('output_dir', None) or self.default_out_dir)
+        files = [Path(p) for p in request['file_paths']]
+        retry = bool(request.get('retry'))
+        if retry:
+            # 실패한 피처가 있는 파일만 다시 처리 (완료된 피처는 저널로 건너뜀)
+            failed_src = {j['file_path'] for j in batch['jobs'] if j.get('status') == 'failed'}
+            files = [f for f in files if str(f) in failed_src] or files
+
+        existing = [f for f in files if f.exists()]
+        missing = [f for f in files if not f.exists()]
+        # 재시도에서 다시 처리하지 않는 파일의 결과는 그대로 유지
+        jobs = [j for j in batch['jobs'] if j['file_path'] not in {str(f) for f in files}] if retry else []
+        kept_success = sum(1 for j in jobs if j['status'] == 'completed')
+        kept = len(jobs) + len(missing)
+        self.store.update(batch_id, status='processing')
+
+        def sink(event):
+            if isinstance(event, Progress):
+                finished = event.done + event.failed
+                self.store.update(batch_id, progress={
+                    'total': kept + max(event.discovered, finished),
+                    'processed': kept + finished,
+                    'success': kept_success + event.done,
+                    'failed': kept - kept_success + event.failed,
+                })
+
+        results = []
+        if existing:
+            summary = self.engine.run(existing[0].parent, out_dir, files=existing, resume=True,
+                                      progress=sink, progress_interval=0.5, **options)
+            results = summary['results']
+
+        # 입력 이름은 작업 안에서 유일하므로(submit 검사) 결과의 source로 전체 경로를 찾음
+        by_name = {f.name: str(f) for f in files}
+        for r in results:
+            job = {'file_path': by_name.get(r.get('source'), r.get('source')), 'name': r['name']}
+            if r['success']:
+                job.update(status='completed', output_path=str(out_dir / r['output']),
+                           validation=r.get('status'))
+            else:
+                job.update(status='failed', error='; '.join(r.get('messages') or []))
+            jobs.append(job)
+        for f in missing:
+            jobs.append({'file_path': str(f), 'status': 'failed', 'error': '파일을 찾을 수 없습니다.'})
+
+        success = sum(1 for j in jobs if j['status'] == 'completed')
+        failed = len(jobs) - success
+        progress = {'total': len(jobs), 'processed': len(jobs), 'success': success, 'failed': failed}
+        status = 'completed' if success or not failed else 'failed'
+        self.store.update(batch_id, status=status, progress=progress, jobs=jobs,
+                          error=None if status == 'completed' else '모든 미션 생성에 실패했습니다.')
+
+    # ------------------------------------------------------------------
+    # 단일 폴리곤 (메모리 내 처리)
+    # ------------------------------------------------------------------
+    def mission_kmz(self, body: Dict):
+        """GeoJSON 폴리곤(WGS84) 하나를 KMZ 바이트로 변환합니다. (파일명, bytes) 반환"""
+        geometry = body.get('geometry')
+        if not geometry:
+            raise ValueError('geometry(GeoJSON Polygon/MultiPolygon)가 필요합니다.')
+        data = build_mission_kmz(
+            geometry, overrides=body.get('overrides') or None, naming=body.get('layout') or 'flat',
+            simplify_tolerance=float(body.get('simplify_tolerance') or 0.0),
+            set_times=bool(body.get('set_times', True)),
+            set_takeoff_ref_point=bool(body.get('set_takeoff_ref_point', False)),
+            engine=self.engine,
+        )
+        name = sanitize_filename(body.get('name') or 'mission') or 'mission'
+        return f'{name}.kmz', data
+
+
+# -----------------------------
+# HTTP
+# -----------------------------
+
+_TASK_RE = re.compile(r'^/batch/tasks/([0-9a-fA-F-]{36})(/retry)?$')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: BatchService = None
+    max_body = 16 * 1024 * 1024
+
+    def log_message(self, fmt, *args):
+        pass  # 기본 stderr 접근 로그 끄기
+
+    def _send_json(self, code: int, data: Dict):
+        body = json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > self.max_body:
+            raise ValueError('요청 본문이 너무 큽니다.')
+        raw = self.rfile.read(length) if length else b'{}'
+        data = json.loads(raw.decode('utf-8'))
+        if not isinstance(data, dict):
+            raise ValueError('JSON 객체가 필요합니다.')
+        return data
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/health':
+            return self._send_json(200, {'status': 'ok'})
+        m = _TASK_RE.match(path)
+        if m and not m.group(2):
+            data = self.service.status(m.group(1))
+            if data is None:
+                return self._send_json(404, {'error': '작업을 찾을 수 없습니다.'})
+            return self._send_json(200, data)
+        self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        path = self.path.split('?', 1)[0]
+        try:
+            body = self._read_json()
+            if path == '/batch/tasks':
+                return self._send_json(202, self.service.submit(body))
+            m = _TASK_RE.match(path)
+            if m and m.group(2):
+                data = self.service.retry(m.group(1))
+                if data is None:
+                    return self._send_json(404, {'error': '작업을 찾을 수 없습니다.'})
+                return self._send_json(202, data)
+            if path == '/missions/kmz':
+                filename, data = self.service.mission_kmz(body)
+                self.send_response(200)
+                self.send_header('Content-Type', KMZ_MIME)
+                self.send_header('Content-Length', str(len(data)))
+                self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+                self.end_headers()
+                self.wfile.write(data)
+                return
+            self._send_json(404, {'error': 'not found'})
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+
+
+def make_server(service: BatchService, host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    """서비스에 연결된 HTTP 서버를 만듭니다. port=0이면 빈 포트를 사용합니다."""
+    handler = type('BatchHandler', (_Handler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+# -----------------------------
+# CLI 엔트리포인트
+# -----------------------------
+if __name__ == '__main__':
+    import argparse
+
+    base = Path(__file__).resolve().parent.parent
+    parser = argparse.ArgumentParser(description='미션 생성 배치 HTTP 서비스')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='바인드 주소 (기본: 로컬만)')
+    parser.add_argument('--port', type=int, default=8765, help='포트')
+    parser.add_argument('--db', type=str, default='skymission_jobs.sqlite3', help='작업 저장용 SQLite 파일')
+    parser.add_argument('--workers', type=int, default=2, help='동시에 실행할 배치 수')
+    parser.add_argument('--template', type=str, default=str(base / 'templates' / 'template.kml'), help='템플릿 KML 경로')
+    parser.add_argument('--waylines', type=str, default=str(base / 'templates' / 'waylines.wpml'), help='waylines.wpml 경로')
+    parser.add_argument('--out-dir', type=str, default=None, help='options.output_dir가 없을 때 사용할 출력 폴더')
+    args = parser.parse_args()
+
+    service = BatchService(Path(args.db), Path(args.template), Path(args.waylines),
+                           workers=args.workers, default_out_dir=args.out_dir)
+    service.start()
+    server = make_server(service, args.host, args.port)
+    print(f'서비스 시작: http://{args.host}:{server.server_address[1]}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
@@ -0,0 +1,166 @@
+"""
+SkyMission Builder - Sharding Module
+여러 대의 렌더링 장비가 같은 입력을 읽고 서로 겹치지 않는 미션 조각(shard)을
+만들 수 있도록 피처를 안정적인 해시로 배정하고, 조각별 결과를 하나로 합칩니다.
+"""
+
+import datetime
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import reporter
+
+MANIFEST_VERSION = 1
+# manifest_name()이 만드는 샤드 매니페스트 이름 (병합 결과인 manifest.json은 제외)
+_SHARD_MANIFEST = re.compile(r'manifest_shard\d+of\d+\.json')
+
+
+def parse_shard_spec(spec: str) -> Tuple[int, int]:
+    """
+    'i/N' 형식의 샤드 지정을 (i, N)으로 변환합니다. i는 0부터 N-1까지입니다.
+    """
+    try:
+        idx_s, total_s = str(spec).split('/', 1)
+        idx, total = int(idx_s), int(total_s)
+    except ValueError:
+        raise ValueError(f"샤드 형식이 올바르지 않습니다: '{spec}' (예: 0/4)")
+    if total < 1 or not (0 <= idx < total):
+        raise ValueError(f'샤드 번호는 0 이상 {total - 1} 이하여야 합니다: {spec}')
+    return idx, total
+
+
+def shard_of(key: str, total: int) -> int:
+    """
+    키(피처 이름 등)의 샤드 번호. 파이썬 hash()와 달리 실행/장비가 달라도 항상 같습니다.
+    """
+    digest = hashlib.blake2b(str(key).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % total
+
+
+def in_shard(key: str, shard: Optional[Tuple[int, int]]) -> bool:
+    if shard is None:
+        return True
+    idx, total = shard
+    return shard_of(key, total) == idx
+
+
+# -----------------------------
+# 매니페스트
+# -----------------------------
+
+def manifest_name(shard: Optional[Tuple[int, int]]) -> str:
+    if shard is None:
+        return 'manifest.json'
+    return f'manifest_shard{shard[0]}of{shard[1]}.json'
+
+
+def write_manifest(out_dir: Path, shard: Optional[Tuple[int, int]], results: List[Dict],
+                   outputs: List[Dict], extra: Optional[Dict] = None,
+                   update_sources: Optional[Iterable[str]] = None) -> Path:
+    """
+    배치 결과(리포트 행)와 출력 파일 목록(이름, 해시, 크기)을 JSON으로 저장합니다.
+
+    update_sources(이번 실행에서 처리한 입력 파일 이름)를 지정하면 기존 매니페스트를 읽어
+    그 밖의 입력에서 나온 결과 행과 출력은 그대로 두고 해당 입력의 항목만 교체합니다 (watch 모드).
+    """
+    path = Path(out_dir) / manifest_name(shard)
+    if update_sources is not None and path.exists():
+        sources = set(update_sources)
+        try:
+            old = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            old = {}
+        results = [r for r in old.get('results', []) if r.get('source') not in sources] + list(results)
+        outputs = [o for o in old.get('outputs', []) if o.get('source') not in sources] + list(outputs)
+    data = {
+        'version': MANIFEST_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'shard': list(shard) if shard else None,
+        'results': results,
+        'outputs': sorted(outputs, key=lambda o: o.get('out', '')),
+    }
+    if extra:
+        data.update(extra)
+    tmp = path.with_suffix('.json.tmp')
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1, default=str), encoding='utf-8')
+    tmp.replace(path)
+    return path
+
+
+def load_manifests(dirs: List[Path]) -> List[Dict]:
+    """폴더들의 샤드 매니페스트(manifest_shard{i}of{N}.json)만 읽습니다."""
+    manifests = []
+    for d in dirs:
+        for path in sorted(Path(d).glob('manifest_shard*of*.json')):
+            if not _SHARD_MANIFEST.fullmatch(path.name):
+                continue
+            data = json.loads(path.read_text(encoding='utf-8'))
+            data['_path'] = str(path)
+            manifests.append(data)
+    return manifests
+
+
+def merge_shard_outputs(shard_dirs: List[Path], out_dir: Path) -> Dict:
+    """
+    조각별 out_dir의 샤드 매니페스트를 읽어 하나의 매니페스트와 HTML 리포트로 합칩니다.
+    같은 (source, name, variant) 결과 행과 같은 해시의 출력은 한 번만 남기고(성공 행 우선),
+    빠진 샤드나 중복된 샤드, 여러 샤드에 나온 서로 다른 같은 이름의 출력은 warnings로 보고합니다.
+
+    Returns:
+        Dict: {'manifest_path', 'report_path', 'results', 'outputs', 'warnings'}
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifests = load_manifests(shard_dirs)
+    if not manifests:
+        raise ValueError('병합할 샤드 매니페스트(manifest_shard*of*.json)를 찾지 못했습니다.')
+
+    warnings = []
+    totals = {tuple(m['shard'])[1] for m in manifests if m.get('shard')}
+    if len(totals) > 1:
+        warnings.append(f'샤드 개수(N)가 서로 다릅니다: {sorted(totals)}')
+    if len(totals) == 1:
+        total = totals.pop()
+        seen = [m['shard'][0] for m in manifests if m.get('shard')]
+        missing = sorted(set(range(total)) - set(seen))
+        dup = sorted({i for i in seen if seen.count(i) > 1})
+        if missing:
+            warnings.append(f'누락된 샤드: {missing} (전체 {total})')
+        if dup:
+            warnings.append(f'중복된 샤드: {dup}')
+
+    results, outputs, owner = [], [], {}
+    row_index: Dict[tuple, int] = {}
+    for m in manifests:
+        label = '{}/{}'.format(*m['shard'])
+        for r in m.get('results', []):
+            key = (r.get('source'), r.get('name'), r.get('variant'))
+            if key not in row_index:
+                row_index[key] = len(results)
+                results.append(r)
+            elif r.get('success') and not results[row_index[key]].get('success'):
+                results[row_index[key]] = r
+        for o in m.get('outputs', []):
+            prev = owner.get(o.get('out'))
+            if prev is not None:
+                if prev[1] == o.get('sha256'):
+                    continue
+                warnings.append(f"출력 이름 충돌: {o['out']} ({prev[0]}, {label})")
+            owner[o.get('out')] = (label, o.get('sha256'))
+            outputs.append(dict(o, shard=label))
+
+    manifest_path = write_manifest(out_dir, None, results, outputs, extra={
+        'merged_from': [m['_path'] for m in manifests],
+        'warnings': warnings,
+    })
+    report_path = reporter.generate_report(results, out_dir) if results else None
+    return {
+        'manifest_path': manifest_path,
+        'report_path': report_path,
+        'results': results,
+        'outputs': outputs,
+        'warnings': warnings,
+    }
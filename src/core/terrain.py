@@ -0,0 +1,279 @@
+"""
+SkyMission Builder - Terrain Clearance Module
+로컬 DEM(GeoTIFF/VRT 또는 메모리 매핑 .npy)을 미션 폴리곤 위에서 샘플링하여
+지면 고도(최소/최대)와 최소 지형 여유고를 계산합니다.
+
+DEM은 고정 크기 블록 단위로 읽고 디코딩한 블록을 LRU 캐시에 보관하므로,
+서로 가까운 폴리곤 수천 개가 같은 타일을 다시 읽지 않습니다.
+
+지원 형식:
+    - .tif/.tiff/.vrt 등 rasterio가 여는 래스터 (rasterio 필요)
+    - .npy + 같은 이름의 .json 사이드카 ({"transform": [a, b, c, d, e, f], "crs": "EPSG:5186",
+      "nodata": -9999}) → np.load(mmap_mode='r')로 메모리 매핑. 큰 DEM을 한 번 변환해 두면
+      rasterio 없이 OS 페이지 캐시만으로 빠르게 읽을 수 있습니다.
+
+여유고 계산 (DJI 템플릿 고도는 이륙 지점 기준):
+    - 지형 팔로우 끔: 여유고 = 고도 - (폴리곤 내 최고 지면 - 이륙 지점 지면)
+      이륙 지점은 꼭짓점 평균(set_takeoff_ref_point와 같은 기준)으로 봅니다.
+    - 지형 팔로우 켬: 기체가 지면 기준 고도를 유지하므로 여유고 = 고도
+"""
+
+import json
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 경고/위험 판정 기준 여유고(m)
+TERRAIN_MIN_CLEARANCE_M = 30.0
+
+# 폴리곤 내부 샘플 간격(m)과 미션당 최대 샘플 수
+DEFAULT_SAMPLE_SPACING_M = 30.0
+MAX_SAMPLES_PER_MISSION = 4096
+
+# 블록 256×256 float32 = 256KB, 기본 256블록이면 최대 약 64MB
+DEFAULT_BLOCK_SIZE = 256
+DEFAULT_MAX_BLOCKS = 256
+
+_M_PER_DEG_LAT = 110_574.0
+_M_PER_DEG_LON = 111_320.0
+
+
+class ArrayDemReader:
+    """NumPy 배열(메모리 매핑 포함)을 DEM으로 사용하는 리더"""
+
+    def __init__(self, array: np.ndarray, transform: Sequence[float], crs, nodata=None):
+        if array.ndim != 2:
+            raise ValueError('DEM 배열은 2차원이어야 합니다.')
+        self.array = array
+        self.transform = tuple(float(v) for v in transform[:6])
+        self.crs = crs
+        self.nodata = nodata
+        self.height, self.width = array.shape
+
+    def read_block(self, row_off: int, col_off: int, height: int, width: int) -> np.ndarray:
+        return np.array(self.array[row_off:row_off + height, col_off:col_off + width], dtype=np.float32)
+
+    def close(self):
+        pass
+
+
+class RasterioDemReader:
+    """rasterio 데이터셋의 창(window) 읽기. 데이터셋 핸들은 스레드 간 공유하지 않도록 lock으로 보호합니다."""
+
+    def __init__(self, path: Path, band: int = 1):
+        try:
+            import rasterio
+            from rasterio.windows import Window
+        except ImportError:
+            raise ImportError("GeoTIFF/VRT DEM을 읽으려면 rasterio가 필요합니다. 'pip install rasterio' 설치 후 다시 시도하세요.")
+        self._window = Window
+        self._ds = rasterio.open(path)
+        self._band = band
+        self._lock = threading.Lock()
+        t = self._ds.transform
+        self.transform = (t.a, t.b, t.c, t.d, t.e, t.f)
+        self.crs = self._ds.crs.to_wkt() if self._ds.crs else None
+        self.nodata = self._ds.nodata
+        self.height, self.width = self._ds.height, self._ds.width
+
+    def read_block(self, row_off: int, col_off: int, height: int, width: int) -> np.ndarray:
+        with self._lock:
+            data = self._ds.read(self._band, window=self._window(col_off, row_off, width, height))
+        return data.astype(np.float32, copy=False)
+
+    def close(self):
+        self._ds.close()
+
+
+def open_dem_reader(path: Path):
+    """확장자에 맞는 DEM 리더를 엽니다."""
+    path = Path(path)
+    if path.suffix.lower() == '.npy':
+        meta_path = path.with_suffix('.json')
+        if not meta_path.exists():
+            raise ValueError(f'.npy DEM에는 transform/crs를 담은 사이드카가 필요합니다: {meta_path.name}')
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return ArrayDemReader(np.load(path, mmap_mode='r'), meta['transform'], meta.get('crs'), meta.get('nodata'))
+    return RasterioDemReader(path)
+
+
+@lru_cache(maxsize=16)
+def _lonlat_transformer(dst_crs: str):
+    from pyproj import CRS, Transformer
+    return Transformer.from_crs(CRS.from_epsg(4326), CRS.from_user_input(dst_crs), always_xy=True)
+
+
+class DemSampler:
+    """
+    DEM 블록 캐시와 좌표 샘플링.
+
+    Args:
+        path: DEM 파일 경로 (또는 reader를 직접 지정)
+        cache (LRUCache): 디코딩된 블록 캐시. None이면 max_blocks 크기로 새로 만듭니다.
+            엔진의 캐시를 넘기면 배치 실행 사이에도 블록을 재사용합니다.
+        block_size (int): 블록 한 변의 픽셀 수
+    """
+
+    def __init__(self, path: Optional[Path] = None, reader=None, cache=None,
+                 block_size: int = DEFAULT_BLOCK_SIZE, max_blocks: int = DEFAULT_MAX_BLOCKS):
+        if reader is None:
+            if path is None:
+                raise ValueError('DEM 경로 또는 reader가 필요합니다.')
+            reader = open_dem_reader(path)
+        a, b, c, d, e, f = reader.transform
+        if b or d:
+            raise ValueError('회전된 DEM(transform에 회전 성분이 있는 경우)은 지원하지 않습니다.')
+        if cache is None:
+            from .engine import LRUCache
+            cache = LRUCache(max_blocks)
+        self.reader = reader
+        self.cache = cache
+        self.block_size = max(16, int(block_size))
+        self._origin = (c, f)
+        self._res = (a, e)
+        if path is not None:
+            from .engine import file_signature
+            self._id = (file_signature(path), self.block_size)
+        else:
+            self._id = (id(reader), self.block_size)
+        self._to_dem = _lonlat_transformer(str(reader.crs)) if reader.crs else None
+
+    def close(self):
+        self.reader.close()
+
+    def _block(self, brow: int, bcol: int) -> np.ndarray:
+        key = (self._id, brow, bcol)
+        block = self.cache.get(key)
+        if block is None:
+            size = self.block_size
+            row_off, col_off = brow * size, bcol * size
+            block = self.reader.read_block(row_off, col_off, min(size, self.reader.height - row_off),
+                                           min(size, self.reader.width - col_off))
+            if self.reader.nodata is not None:
+                block[block == self.reader.nodata] = np.nan
+            block.setflags(write=False)
+            self.cache.put(key, block)
+        return block
+
+    def sample_xy(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """DEM 좌표계의 점들의 지면 고도. DEM 밖이나 nodata는 NaN입니다."""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        cols = np.floor((xs - self._origin[0]) / self._res[0]).astype(np.int64)
+        rows = np.floor((ys - self._origin[1]) / self._res[1]).astype(np.int64)
+        out = np.full(xs.shape, np.nan)
+        inside = (rows >= 0) & (rows < self.reader.height) & (cols >= 0) & (cols < self.reader.width)
+        if not inside.any():
+            return out
+        idx = np.nonzero(inside)[0]
+        size = self.block_size
+        brow, bcol = rows[idx] // size, cols[idx] // size
+        # 같은 블록에 속한 점끼리 묶어서 블록당 한 번만 조회
+        block_ids = brow * ((self.reader.width + size - 1) // size) + bcol
+        order = np.argsort(block_ids, kind='stable')
+        uniq, starts = np.unique(block_ids[order], return_index=True)
+        bounds = np.append(starts, len(order))
+        for i in range(len(uniq)):
+            sel = idx[order[bounds[i]:bounds[i + 1]]]
+            r0, c0 = brow[order[bounds[i]]], bcol[order[bounds[i]]]
+            block = self._block(int(r0), int(c0))
+            out[sel] = block[rows[sel] - r0 * size, cols[sel] - c0 * size]
+        return out
+
+    def sample_lonlat(self, lons, lats) -> np.ndarray:
+        lons = np.asarray(lons, dtype=float)
+        lats = np.asarray(lats, dtype=float)
+        if self._to_dem is None:
+            return self.sample_xy(lons, lats)
+        xs, ys = self._to_dem.transform(lons, lats)
+        return self.sample_xy(np.asarray(xs), np.asarray(ys))
+
+
+def footprint_samples(lonlat: Sequence[Tuple], spacing_m: float = DEFAULT_SAMPLE_SPACING_M,
+                      max_samples: int = MAX_SAMPLES_PER_MISSION) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    폴리곤 꼭짓점과 내부 격자점(간격 spacing_m)의 경위도 배열.
+    격자점이 max_samples를 넘으면 간격을 늘립니다.
+    """
+    import shapely
+
+    coords = np.array([(float(lon), float(lat)) for lon, lat, *_ in lonlat], dtype=float)
+    lon0, lat0 = coords.mean(axis=0)
+    m_lon = _M_PER_DEG_LON * np.cos(np.radians(lat0))
+    (minx, miny), (maxx, maxy) = coords.min(axis=0), coords.max(axis=0)
+    area_m2 = max((maxx - minx) * m_lon * (maxy - miny) * _M_PER_DEG_LAT, 1.0)
+    spacing = max(float(spacing_m), float(np.sqrt(area_m2 / max_samples)))
+
+    gx = np.arange(minx + spacing / m_lon / 2, maxx, spacing / m_lon)
+    gy = np.arange(miny + spacing / _M_PER_DEG_LAT / 2, maxy, spacing / _M_PER_DEG_LAT)
+    lons, lats = coords[:, 0], coords[:, 1]
+    if len(gx) and len(gy):
+        mx, my = np.meshgrid(gx, gy)
+        mx, my = mx.ravel(), my.ravel()
+        keep = shapely.contains_xy(shapely.polygons(coords), mx, my)
+        lons = np.concatenate([lons, mx[keep]])
+        lats = np.concatenate([lats, my[keep]])
+    return lons, lats
+
+
+def ground_profile(sampler: DemSampler, lonlat: Sequence[Tuple],
+                   spacing_m: float = DEFAULT_SAMPLE_SPACING_M) -> Optional[Dict]:
+    """
+    폴리곤 위 지면 고도 요약. DEM이 폴리곤을 덮지 않으면 None.
+
+    Returns:
+        Dict: {'ground_min', 'ground_max', 'ground_ref'(중심 지면), 'samples', 'coverage'(DEM 안 비율)}
+    """
+    lons, lats = footprint_samples(lonlat, spacing_m)
+    center = np.array([np.mean([float(p[0]) for p in lonlat]), np.mean([float(p[1]) for p in lonlat])])
+    heights = sampler.sample_lonlat(np.append(lons, center[0]), np.append(lats, center[1]))
+    ref, heights = heights[-1], heights[:-1]
+    valid = ~np.isnan(heights)
+    if not valid.any():
+        return None
+    ground = heights[valid]
+    ground_min, ground_max = float(ground.min()), float(ground.max())
+    if np.isnan(ref):
+        ref = float(np.median(ground))
+    return {
+        'ground_min': round(ground_min, 1),
+        'ground_max': round(ground_max, 1),
+        'ground_ref': round(float(ref), 1),
+        'samples': int(valid.sum()),
+        'coverage': round(float(valid.mean()), 3),
+    }
+
+
+def terrain_clearance(profile: Optional[Dict], altitude: float, use_terrain_follow: bool = False,
+                      min_clearance: float = TERRAIN_MIN_CLEARANCE_M) -> Dict:
+    """
+    지면 요약과 비행 고도로 최소 여유고와 판정(safe/warning/danger), 메시지를 만듭니다.
+    """
+    if profile is None:
+        return {'status': 'warning', 'clearance_min': None,
+                'messages': ['주의: DEM이 미션 영역을 덮지 않아 지형 여유고를 확인하지 못했습니다.']}
+    altitude = float(altitude)
+    if use_terrain_follow:
+        clearance = altitude
+    else:
+        clearance = altitude - (profile['ground_max'] - profile['ground_ref'])
+    clearance = round(clearance, 1)
+    messages = []
+    if clearance <= 0:
+        status = 'danger'
+        messages.append(f"위험: 지형 여유고가 없습니다 (최소 {clearance:.1f}m). "
+                        f"이륙 지점보다 {profile['ground_max'] - profile['ground_ref']:.1f}m 높은 지면이 있습니다.")
+    elif clearance < min_clearance:
+        status = 'warning'
+        messages.append(f"주의: 최소 지형 여유고({clearance:.1f}m)가 기준({min_clearance:g}m)보다 낮습니다. "
+                        "고도를 높이거나 지형 팔로우를 사용하세요.")
+    else:
+        status = 'safe'
+    if profile.get('coverage', 1.0) < 1.0 and status == 'safe':
+        status = 'warning'
+        messages.append(f"주의: DEM이 미션 영역의 {profile['coverage'] * 100:.0f}%만 덮습니다.")
+    return dict(profile, status=status, clearance_min=clearance, messages=messages)
@@ -0,0 +1,174 @@
+"""
+SkyMission Builder - Time Limit Module
+피처 하나의 지오메트리 처리(unary_union, buffer 등)가 멈추지 않도록
+별도 프로세스에서 실행하고 제한 시간을 넘기면 프로세스를 종료합니다.
+"""
+
+import importlib
+import multiprocessing
+import threading
+import time
+from typing import Callable, Optional, Sequence, Tuple
+
+from .pipeline import CancellationToken, CancelledError
+
+# 취소 여부를 확인하는 간격(초)
+_POLL_INTERVAL = 0.1
+
+
+class FeatureTimeoutError(TimeoutError):
+    """피처 처리가 제한 시간을 초과했을 때 발생"""
+
+
+def _worker_main(conn, preload: Sequence[str] = ()):
+    """
+    자식 프로세스 루프: preload 모듈을 먼저 임포트하고 준비 응답을 보낸 뒤
+    (fn, args)를 받아 실행하고 (ok, 결과/예외)를 돌려줍니다.
+    """
+    try:
+        for name in preload:
+            importlib.import_module(name)
+        conn.send((True, None))
+    except Exception as e:
+        conn.send((False, RuntimeError(f'처리 프로세스 준비 실패: {e!r}')))
+        return
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None:
+            break
+        fn, args = msg
+        try:
+            conn.send((True, fn(*args)))
+        except Exception as e:
+            try:
+                conn.send((False, e))
+            except Exception:
+                conn.send((False, RuntimeError(repr(e))))
+
+
+class KillableWorker:
+    """
+    제한 시간을 넘기면 강제 종료할 수 있는 단일 자식 프로세스.
+    종료된 뒤 다음 호출에서 자동으로 새 프로세스를 띄웁니다.
+
+    새 프로세스는 preload 모듈(예: geopandas, shapely)을 임포트한 뒤 준비 응답을 보내고,
+    제한 시간은 그 응답을 받은 다음부터 잽니다 (기동/임포트 시간은 제한 시간에 포함되지 않음).
+    """
+
+    def __init__(self, start_method: str = 'spawn', preload: Sequence[str] = ()):
+        self._ctx = multiprocessing.get_context(start_method)
+        self._preload = tuple(preload)
+        self._proc = None
+        self._conn = None
+
+    def _ensure_started(self, cancel: Optional[CancellationToken] = None):
+        if self._proc is not None and self._proc.is_alive():
+            return
+        self.kill()
+        parent_conn, child_conn = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_worker_main, args=(child_conn, self._preload), daemon=True)
+        proc.start()
+        child_conn.close()
+        self._proc, self._conn = proc, parent_conn
+        # 준비 응답(ping/ack) 대기: 취소만 확인하고 제한 시간은 적용하지 않음
+        while True:
+            try:
+                ready = parent_conn.poll(_POLL_INTERVAL)
+            except (EOFError, OSError):
+                ready = True
+            if ready:
+                try:
+                    ok, payload = parent_conn.recv()
+                except (EOFError, OSError):
+                    self.kill()
+                    raise RuntimeError('지오메트리 처리 프로세스를 시작하지 못했습니다.')
+                if ok:
+                    return
+                self.kill()
+                raise payload
+            if cancel is not None and cancel.cancelled:
+                self.kill()
+                raise CancelledError('작업이 취소되었습니다.')
+
+    def call(self, fn: Callable, args: Tuple, timeout: Optional[float] = None,
+             cancel: Optional[CancellationToken] = None):
+        """
+        fn(*args)를 자식 프로세스에서 실행합니다. fn과 args는 pickle 가능해야 합니다.
+
+        Raises:
+            FeatureTimeoutError: timeout(초)을 넘긴 경우 (자식 프로세스는 종료됨)
+            CancelledError: 실행 중 취소된 경우
+        """
+        self._ensure_started(cancel)
+        self._conn.send((fn, args))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = _POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            try:
+                ready = self._conn.poll(wait)
+            except (EOFError, OSError):
+                ready = True
+            if ready:
+                try:
+                    ok, payload = self._conn.recv()
+                except (EOFError, OSError):
+                    self.kill()
+                    raise RuntimeError('지오메트리 처리 프로세스가 비정상 종료되었습니다.')
+                if ok:
+                    return payload
+                raise payload
+            if cancel is not None and cancel.cancelled:
+                self.kill()
+                raise CancelledError('작업이 취소되었습니다.')
+            if deadline is not None and time.monotonic() >= deadline:
+                self.kill()
+                raise FeatureTimeoutError(f'처리 시간 초과 ({timeout:g}초)')
+
+    def kill(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.join(timeout=5)
+        if self._conn is not None:
+            self._conn.close()
+        self._proc = self._conn = None
+
+    def close(self):
+        if self._proc is not None and self._proc.is_alive():
+            try:
+                self._conn.send(None)
+                self._proc.join(timeout=2)
+            except (OSError, ValueError):
+                pass
+        self.kill()
+
+
+class KillableWorkerPool:
+    """스레드마다 전용 KillableWorker를 하나씩 배정하는 풀 (파이프라인 단계 워커용)"""
+
+    def __init__(self, start_method: str = 'spawn', preload: Sequence[str] = ()):
+        self.start_method = start_method
+        self.preload = tuple(preload)
+        self._local = threading.local()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable, args: Tuple, timeout: Optional[float] = None,
+             cancel: Optional[CancellationToken] = None):
+        worker = getattr(self._local, 'worker', None)
+        if worker is None:
+            worker = KillableWorker(self.start_method, self.preload)
+            self._local.worker = worker
+            with self._lock:
+                self._workers.append(worker)
+        return worker.call(fn, args, timeout=timeout, cancel=cancel)
+
+    def close(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for w in workers:
+            w.close()
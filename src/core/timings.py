@@ -0,0 +1,123 @@
+"""
+SkyMission Builder - Stage Timing Module
+배치의 단계(read, geometry, render, ...)와 세부 구간(GPKG 읽기, 병합, 좌표 변환, XML 렌더링,
+압축, 디스크 쓰기)의 소요 시간을 단조 시계(perf_counter)로 재어 파일별/배치별로 집계합니다.
+
+    - 단계 시간: StagedPipeline이 항목마다 기록 (출력 대기 시간 제외, 묶음 단계는 항목 수로 나눔)
+    - 구간 시간: 코드 안의 `with section('geometry.union'):` 블록. 파이프라인 워커가
+      bind()로 기록기와 현재 파일을 스레드에 묶어 두었을 때만 기록하고, 그 밖(단독 호출,
+      제한 시간 자식 프로세스)에서는 아무것도 하지 않습니다.
+
+집계는 구간마다 count, total_s, p50_ms, p95_ms, max_ms입니다.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+PROFILE_VERSION = 1
+
+_local = threading.local()
+
+
+def summarize(values: List[float]) -> Dict:
+    """소요 시간(초) 리스트 → count/total_s/p50_ms/p95_ms/max_ms"""
+    arr = np.asarray(values, dtype=float)
+    if not len(arr):
+        return {'count': 0, 'total_s': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+    p50, p95 = np.percentile(arr, [50, 95])
+    return {
+        'count': int(len(arr)),
+        'total_s': round(float(arr.sum()), 4),
+        'p50_ms': round(float(p50) * 1000, 3),
+        'p95_ms': round(float(p95) * 1000, 3),
+        'max_ms': round(float(arr.max()) * 1000, 3),
+    }
+
+
+class TimingRecorder:
+    """(구간, 파일)별 소요 시간 표본. add는 여러 워커 스레드에서 호출됩니다."""
+
+    def __init__(self):
+        self._samples: Dict[tuple, List[float]] = {}
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+
+    def add(self, name: str, seconds: float, source: Optional[str] = None):
+        key = (name, source)
+        samples = self._samples.get(key)
+        if samples is None:
+            with self._lock:
+                samples = self._samples.setdefault(key, [])
+        samples.append(seconds)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._t0
+
+    def samples(self) -> Dict[str, List[float]]:
+        """구간별 표본 (파일 구분 없이 합침, 실행 중에도 호출 가능)"""
+        with self._lock:
+            items = list(self._samples.items())
+        merged: Dict[str, List[float]] = {}
+        for (name, _), values in items:
+            merged.setdefault(name, []).extend(values)
+        return merged
+
+    def summary(self) -> Dict:
+        """{'batch': {구간: 집계}, 'files': {파일: {구간: 집계}}} (구간은 처음 기록된 순서)"""
+        with self._lock:
+            items = list(self._samples.items())
+        merged: Dict[str, List[float]] = {}
+        files: Dict[str, Dict[str, Dict]] = {}
+        for (name, source), values in items:
+            merged.setdefault(name, []).extend(values)
+            if source is not None:
+                files.setdefault(source, {})[name] = summarize(values)
+        return {'batch': {name: summarize(v) for name, v in merged.items()}, 'files': files}
+
+    def profile(self, missions: int = 0, stages: Optional[List[Dict]] = None) -> Dict:
+        """JSON으로 저장할 실행 프로필 (전체 시간, 처리량, 단계 큐 통계 포함)"""
+        elapsed = self.elapsed()
+        data = {
+            'version': PROFILE_VERSION,
+            'elapsed_s': round(elapsed, 3),
+            'missions': missions,
+            'missions_per_s': round(missions / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+        data.update(self.summary())
+        if stages is not None:
+            data['stages'] = stages
+        return data
+
+
+def bind(recorder: Optional[TimingRecorder], source: Optional[str] = None):
+    """현재 스레드의 구간 기록 대상을 지정합니다 (None이면 해제)."""
+    _local.recorder = recorder
+    _local.source = source
+
+
+class section:
+    """
+    구간 시간 측정 블록. 바인딩된 기록기가 없으면 시계를 읽지 않습니다.
+
+        with section('geometry.transform'):
+            ...
+    """
+
+    __slots__ = ('name', '_rec', '_t0')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self._rec = getattr(_local, 'recorder', None)
+        if self._rec is not None:
+            self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._rec is not None:
+            self._rec.add(self.name, time.perf_counter() - self._t0, _local.source)
+        return False
@@ -3,6 +3,7 @@ SkyMission Builder - Safety Validation Module
 고도, 카메라 사양, 비행 속도 등에 기반한 미션 안전 및 품질 검증 로직을 제공합니다.
 """
 
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 import math
 
@@ -62,9 +63,76 @@ def calculate_motion_blur(velocity_ms: float, shutter_speed: float) -> float:
     """
     return velocity_ms * shutter_speed * 100
 
+# 법적 허용 고도 (m)
+ALTITUDE_LIMIT_M = 150
+
+# 비행 시간 추정 시 가감속 및 턴 시간을 고려한 여유 배율 (15%)
+MISSION_TIME_MARGIN = 1.15
+
+# 검증 규칙 표
+# - metric: 비교할 값 ('gsd', 'blur', 'altitude', 'speed')
+# - op: '>' 또는 '<'
+# - ref: 기준 지표 이름(그 값 x factor와 비교) 또는 None(factor 자체가 임계값)
+# - group: 같은 그룹에서는 위에서부터 처음 걸린 규칙 하나만 적용 (if/elif)
+# - message: metric 값과 threshold로 format되는 메시지
+VALIDATION_RULES = [
+    # 데이터 품질: 규정상 보통 블러는 GSD의 50% 이내여야 이상적
+    {'id': 'blur_over_gsd', 'group': 'blur', 'level': 'danger', 'metric': 'blur', 'op': '>', 'ref': 'gsd', 'factor': 1.0,
+     'message': "위험: 모션 블러({blur:.2f}cm)가 GSD({gsd:.2f}cm)를 초과합니다. 속도를 줄이거나 셔터 스피드를 높이세요."},
+    {'id': 'blur_over_half_gsd', 'group': 'blur', 'level': 'warning', 'metric': 'blur', 'op': '>', 'ref': 'gsd', 'factor': 0.5,
+     'message': "주의: 모션 블러({blur:.2f}cm)가 GSD의 50%를 초과하여 이미지가 흐려질 수 있습니다."},
+    # 고도 및 물리적 제한
+    {'id': 'altitude_low', 'group': 'altitude', 'level': 'danger', 'metric': 'altitude', 'op': '<', 'ref': None, 'factor': 10,
+     'message': "위험: 비행 고도가 너무 낮습니다 (10m 미만). 충돌 위험이 매우 높습니다."},
+    {'id': 'altitude_high', 'group': 'altitude', 'level': 'warning', 'metric': 'altitude', 'op': '>', 'ref': None,
+     'factor': ALTITUDE_LIMIT_M,
+     'message': "주의: 법적 허용 고도({threshold:g}m)를 초과했습니다. 승인 여부를 확인하세요."},
+    {'id': 'speed_high', 'group': 'speed', 'level': 'danger', 'metric': 'speed', 'op': '>', 'ref': None, 'factor': 15,
+     'message': "위험: 비행 속도가 너무 빠릅니다 (15m/s 초과). 기체 제어가 어려울 수 있습니다."},
+]
+
+STATUS_LEVELS = ('safe', 'warning', 'danger')
+SAFE_MESSAGE = "미션 설정이 안전하며 양호한 데이터 품질이 예상됩니다."
+
+DEFAULT_ALTITUDE = 50
+DEFAULT_SPEED = 5
+DEFAULT_MODEL = 'mavic3e'
+
+
+def _apply_rules(values: Dict[str, float]) -> Tuple[str, List[str]]:
+    """규칙 표를 값 하나에 적용하여 (상태, 메시지 목록)을 반환"""
+    level = 0
+    messages = []
+    taken = set()
+    for rule in VALIDATION_RULES:
+        if rule['group'] in taken:
+            continue
+        threshold = rule['factor'] * (values[rule['ref']] if rule['ref'] else 1)
+        value = values[rule['metric']]
+        hit = value > threshold if rule['op'] == '>' else value < threshold
+        if hit:
+            taken.add(rule['group'])
+            level = max(level, STATUS_LEVELS.index(rule['level']))
+            messages.append(rule['message'].format(threshold=threshold, **values))
+    if not messages:
+        messages.append(SAFE_MESSAGE)
+    return STATUS_LEVELS[level], messages
+
+
+@lru_cache(maxsize=4096)
+def _validate_cached(drone_model: str, altitude: float, velocity: float) -> Tuple:
+    spec = CAMERA_SPECS.get(drone_model.lower(), DEFAULT_SPEC)
+    shutter = spec['shutter_speed']
+    gsd = calculate_gsd(altitude, drone_model)
+    blur = calculate_motion_blur(velocity, shutter)
+    status, messages = _apply_rules({'gsd': gsd, 'blur': blur, 'altitude': altitude, 'speed': velocity})
+    return status, tuple(messages), round(gsd, 2), round(blur, 2), f"1/{int(1/shutter)}"
+
+
 def validate_mission(config_dict: Dict) -> Dict:
     """
     미션 설정값을 검증하고 안전 상태와 메시지를 반환합니다.
+    같은 (기체, 고도, 속도) 조합은 한 번만 계산합니다.
     
     Returns:
         {
@@ -73,65 +141,124 @@ def validate_mission(config_dict: Dict) -> Dict:
             'metrics': { 'gsd': float, 'blur': float, 'est_time': str }
         }
     """
-    status = 'safe'
-    messages = []
-    
-    drone_model = config_dict.get('drone_model', 'mavic3e')
-    altitude = float(config_dict.get('altitude') or 50)
-    velocity = float(config_dict.get('auto_flight_speed') or 5)
-    
-    # 1. GSD 계산
-    gsd = calculate_gsd(altitude, drone_model)
-    
-    # 2. 모션 블러 계산
-    spec = CAMERA_SPECS.get(drone_model.lower(), DEFAULT_SPEC)
-    shutter = spec['shutter_speed']
-    blur = calculate_motion_blur(velocity, shutter)
-    
-    # 3. 데이터 품질 판정
-    # 규정상 보통 블러는 GSD의 50% 이내여야 이상적, 100% 초과시 Warning
-    if blur > gsd:
-        status = 'danger'
-        messages.append(f"위험: 모션 블러({blur:.2f}cm)가 GSD({gsd:.2f}cm)를 초과합니다. 속도를 줄이거나 셔터 스피드를 높이세요.")
-    elif blur > gsd * 0.5:
-        if status != 'danger':
-            status = 'warning'
-        messages.append(f"주의: 모션 블러({blur:.2f}cm)가 GSD의 50%를 초과하여 이미지가 흐려질 수 있습니다.")
-    
-    # 4. 고도 및 물리적 제한
-    if altitude < 10:
-        status = 'danger'
-        messages.append("위험: 비행 고도가 너무 낮습니다 (10m 미만). 충돌 위험이 매우 높습니다.")
-    elif altitude > 150:
-        if status != 'danger':
-            status = 'warning'
-        messages.append("주의: 법적 허용 고도(150m)를 초과했습니다. 승인 여부를 확인하세요.")
-        
-    if velocity > 15:
-        status = 'danger'
-        messages.append("위험: 비행 속도가 너무 빠릅니다 (15m/s 초과). 기체 제어가 어려울 수 있습니다.")
-
-    # 5. 결과 요약
-    if not messages:
-        messages.append("미션 설정이 안전하며 양호한 데이터 품질이 예상됩니다.")
-        
+    drone_model = config_dict.get('drone_model') or DEFAULT_MODEL
+    altitude = float(config_dict.get('altitude') or DEFAULT_ALTITUDE)
+    velocity = float(config_dict.get('auto_flight_speed') or DEFAULT_SPEED)
+
+    status, messages, gsd, blur, shutter = _validate_cached(drone_model, altitude, velocity)
     return {
         'status': status,
-        'messages': messages,
+        'messages': list(messages),
         'metrics': {
-            'gsd': round(gsd, 2),
-            'blur': round(blur, 2),
-            'shutter': f"1/{int(1/shutter)}"
+            'gsd': gsd,
+            'blur': blur,
+            'shutter': shutter
         }
     }
 
+
+def validate_missions_batch(altitude=None, speed=None, drone_model=None, frame=None) -> Dict:
+    """
+    여러 미션을 한 번에 검증합니다. GSD/블러 계산과 규칙 판정은 NumPy 배열 연산으로 수행하고,
+    메시지는 서로 다른 (기체, 고도, 속도) 조합마다 한 번만 만듭니다.
+
+    Args:
+        altitude, speed, drone_model: 같은 길이의 배열(또는 리스트). 비어 있는 값은 기본값 사용
+        frame: 'altitude', 'auto_flight_speed', 'drone_model' 열을 가진 DataFrame (배열 대신 사용)
+
+    Returns:
+        Dict: 미션별 'status'(ndarray), 'gsd', 'blur'(ndarray, cm), 'messages'(List[List[str]]),
+              'records'(validate_mission과 같은 형식의 dict 리스트, 같은 조합은 같은 dict를 공유)
+    """
+    import numpy as np
+
+    if frame is not None:
+        altitude = frame['altitude'] if 'altitude' in frame else None
+        speed = frame['auto_flight_speed'] if 'auto_flight_speed' in frame else None
+        drone_model = frame['drone_model'] if 'drone_model' in frame else None
+    n = max(len(x) for x in (altitude, speed, drone_model) if x is not None) if any(
+        x is not None for x in (altitude, speed, drone_model)) else 0
+
+    def numeric(values, default):
+        if values is None:
+            return np.full(n, float(default))
+        arr = np.asarray([np.nan if v is None else v for v in values], dtype=float)
+        arr[np.isnan(arr) | (arr == 0)] = default   # 기존 `or 기본값` 동작과 동일
+        return arr
+
+    alt = numeric(altitude, DEFAULT_ALTITUDE)
+    vel = numeric(speed, DEFAULT_SPEED)
+    models = np.asarray([(m if isinstance(m, str) and m else DEFAULT_MODEL).lower()
+                         for m in (drone_model if drone_model is not None else [DEFAULT_MODEL] * n)], dtype=object)
+
+    # 기체별 카메라 사양을 배열로 전개
+    uniq_models, model_idx = np.unique(models, return_inverse=True)
+    specs = [CAMERA_SPECS.get(m, DEFAULT_SPEC) for m in uniq_models]
+    sw = np.array([s['sensor_width'] for s in specs])[model_idx]
+    fl = np.array([s['focal_length'] for s in specs])[model_idx]
+    iw = np.array([s['image_width'] for s in specs])[model_idx]
+    shutter = np.array([s['shutter_speed'] for s in specs])[model_idx]
+
+    values = {
+        'gsd': alt * sw / (fl * iw) * 100,
+        'blur': vel * shutter * 100,
+        'altitude': alt,
+        'speed': vel,
+    }
+
+    # 규칙 판정 (그룹별로 먼저 걸린 규칙만)
+    level = np.zeros(n, dtype=int)
+    hits = []
+    taken = {}
+    for rule in VALIDATION_RULES:
+        threshold = rule['factor'] * (values[rule['ref']] if rule['ref'] else 1)
+        metric = values[rule['metric']]
+        mask = metric > threshold if rule['op'] == '>' else metric < threshold
+        group_taken = taken.get(rule['group'], np.zeros(n, dtype=bool))
+        mask &= ~group_taken
+        taken[rule['group']] = group_taken | mask
+        level = np.maximum(level, np.where(mask, STATUS_LEVELS.index(rule['level']), 0))
+        hits.append((rule, mask, threshold))
+    status = np.asarray(STATUS_LEVELS, dtype=object)[level]
+
+    # 메시지는 고유 조합마다 한 번만 생성
+    keys = np.stack([model_idx.astype(float), alt, vel], axis=1) if n else np.zeros((0, 3))
+    uniq_keys, first_idx, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = np.asarray(inverse).reshape(-1)
+    uniq_records = []
+    for i in first_idx:
+        msgs = []
+        row = {k: float(v[i]) for k, v in values.items()}
+        for rule, mask, threshold in hits:
+            if mask[i]:
+                t = float(threshold[i]) if isinstance(threshold, np.ndarray) else threshold
+                msgs.append(rule['message'].format(threshold=t, **row))
+        if not msgs:
+            msgs.append(SAFE_MESSAGE)
+        uniq_records.append({
+            'status': status[i],
+            'messages': msgs,
+            'metrics': {
+                'gsd': round(row['gsd'], 2),
+                'blur': round(row['blur'], 2),
+                'shutter': f"1/{int(1/shutter[i])}",
+            },
+        })
+    records = [uniq_records[j] for j in inverse]
+    return {
+        'status': status,
+        'gsd': values['gsd'],
+        'blur': values['blur'],
+        'messages': [r['messages'] for r in records],
+        'records': records,
+    }
+
 def estimate_mission_time(total_distance_m: float, velocity_ms: float) -> str:
     """단순 거리 기반 비행 시간 추정 (분:초)"""
     if velocity_ms <= 0:
         return "N/A"
     
-    # 가감속 및 턴 시간을 고려하여 15% 여유 가산
-    seconds = (total_distance_m / velocity_ms) * 1.15
+    seconds = (total_distance_m / velocity_ms) * MISSION_TIME_MARGIN
     minutes = int(seconds // 60)
     remain_seconds = int(seconds % 60)
     
@@ -0,0 +1,168 @@
+"""
+SkyMission Builder - Override Variants Module
+한 번 읽고 처리한 지오메트리를 여러 설정(고도, 기체, 중첩률 등)으로 동시에 렌더링하기 위한
+변형(variant) 목록을 만듭니다. 목록은 직접 넘기거나 presets/의 매트릭스 파일로 지정합니다.
+
+피처 속성 열에서 오버라이드를 읽는 매핑(override_columns)도 여기서 처리합니다.
+우선순위는 배치 전체 오버라이드 < 속성 열 < 변형 입니다.
+
+매트릭스 파일 예 (presets/altitude_matrix.json):
+    {
+        "base": {"drone_model": "mavic3e", "auto_flight_speed": 5},
+        "matrix": {"altitude": [60, 80, 100]},
+        "variants": [{"name": "m3m_80", "drone_model": "mavic3m", "altitude": 80}]
+    }
+matrix는 각 키 값의 모든 조합(데카르트 곱)으로, variants는 그대로 추가됩니다.
+"""
+
+import itertools
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .generator import sanitize_filename
+
+# 지오메트리 처리 결과를 바꾸는 키. 변형마다 다르면 지오메트리를 한 번만 처리할 수 없습니다.
+GEOMETRY_KEYS = ('geometry_buffer_m', 'simplify_tolerance')
+
+# 속성 열로 지정할 수 있는 오버라이드와 값 타입 (CLI 인자 타입과 동일)
+OVERRIDE_TYPES = {
+    'altitude': float,
+    'shoot_height': float,
+    'gimbal_pitch': float,
+    'margin': int,
+    'overlap_camera_h': int,
+    'overlap_camera_w': int,
+    'overlap_lidar_h': int,
+    'overlap_lidar_w': int,
+    'auto_flight_speed': int,
+    'global_transitional_speed': int,
+    'takeoff_security_height': int,
+    'drone_model': str,
+    'use_terrain_follow': bool,
+}
+
+_TRUE_STRINGS = {'1', 'true', 'yes', 'y', 'on', 't'}
+
+
+def expand_matrix(matrix: Dict[str, List]) -> List[Dict]:
+    """{'altitude': [60, 80], 'drone_model': ['a', 'b']} → 조합 4개의 오버라이드 리스트"""
+    if not matrix:
+        return []
+    keys = list(matrix)
+    values = [v if isinstance(v, list) else [v] for v in (matrix[k] for k in keys)]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def variant_name(diff: Dict) -> str:
+    """변형에서 바뀐 값으로 폴더 이름을 만듭니다. 예: {'altitude': 80} → 'altitude-80'"""
+    parts = []
+    for key, value in diff.items():
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        parts.append(f'{key}-{value}')
+    return sanitize_filename('_'.join(parts)) or 'base'
+
+
+def load_variants(spec: Union[str, Path, List[Dict], Dict],
+                  base_overrides: Optional[Dict] = None) -> List[Dict]:
+    """
+    변형 지정을 [{'name', 'overrides'}] 리스트로 변환합니다.
+
+    Args:
+        spec: 오버라이드 dict 리스트, 매트릭스 dict, 또는 매트릭스 JSON 파일 경로.
+            dict의 'name' 키는 변형 이름(출력 하위 폴더)으로 사용되고 오버라이드에서 빠집니다.
+        base_overrides (Dict): 배치 전체 오버라이드. 우선순위는 base_overrides < 파일의 base < 변형입니다.
+
+    Raises:
+        ValueError: 변형이 없거나, 이름이 겹치거나, 변형이 지오메트리 관련 키를 바꾸는 경우
+    """
+    if isinstance(spec, (str, Path)):
+        path = Path(spec)
+        with open(path, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+
+    base = {k: v for k, v in (base_overrides or {}).items() if v is not None}
+    if isinstance(spec, dict):
+        base.update(spec.get('base') or {})
+        raw = expand_matrix(spec.get('matrix') or {}) + list(spec.get('variants') or [])
+    else:
+        raw = list(spec)
+    if not raw:
+        raise ValueError('variants가 비어 있습니다.')
+
+    variants, names = [], set()
+    for item in raw:
+        diff = dict(item)
+        name = diff.pop('name', None)
+        for key in GEOMETRY_KEYS:
+            if key in diff and diff[key] != base.get(key):
+                raise ValueError(f"변형마다 '{key}'를 바꿀 수 없습니다 (지오메트리는 한 번만 처리됩니다).")
+        name = sanitize_filename(name) if name else variant_name(diff)
+        if name in names:
+            raise ValueError(f'변형 이름이 중복됩니다: {name}')
+        names.add(name)
+        variants.append({'name': name, 'overrides': dict(base, **diff), 'diff': diff})
+    return variants
+
+
+# -----------------------------
+# 속성 열 → 피처별 오버라이드
+# -----------------------------
+
+def parse_override_columns(specs) -> Dict[str, str]:
+    """
+    'altitude=ALT_M' 형식(쉼표 구분 또는 리스트)을 {'altitude': 'ALT_M'}로 변환합니다.
+    """
+    if isinstance(specs, dict):
+        items = list(specs.items())
+    else:
+        if isinstance(specs, str):
+            specs = [specs]
+        items = []
+        for spec in specs or []:
+            for tok in str(spec).split(','):
+                key, sep, col = tok.partition('=')
+                if not sep or not key.strip() or not col.strip():
+                    raise ValueError(f"열 매핑 형식이 올바르지 않습니다: '{tok}' (예: altitude=ALT_M)")
+                items.append((key.strip(), col.strip()))
+    mapping = {}
+    for key, col in items:
+        if key in GEOMETRY_KEYS:
+            raise ValueError(f"'{key}'는 피처별로 지정할 수 없습니다 (지오메트리 캐시와 충돌).")
+        if key not in OVERRIDE_TYPES:
+            raise ValueError(f"지원하지 않는 오버라이드 키: '{key}' (가능: {', '.join(OVERRIDE_TYPES)})")
+        mapping[key] = col
+    return mapping
+
+
+def column_overrides(df, mapping: Dict[str, str]) -> List[Dict]:
+    """
+    DataFrame의 속성 열을 타입 변환하여 행별 오버라이드 dict 리스트로 만듭니다.
+    열 단위(pandas)로 변환하며, 비어 있거나 변환할 수 없는 값은 빠져서 배치 전체 값이 쓰입니다.
+    """
+    import pandas as pd
+
+    if not mapping:
+        return [{} for _ in range(len(df))]
+    missing = [col for col in mapping.values() if col not in df.columns]
+    if missing:
+        raise ValueError(f'오버라이드 열이 없습니다: {missing}')
+
+    cols = {}
+    for key, col in mapping.items():
+        series = df[col]
+        kind = OVERRIDE_TYPES[key]
+        if kind is float:
+            series = pd.to_numeric(series, errors='coerce')
+        elif kind is int:
+            series = pd.to_numeric(series, errors='coerce').round().astype('Int64')
+        elif kind is bool:
+            series = series.map(lambda v: None if pd.isna(v)
+                                else str(v).strip().lower() in _TRUE_STRINGS)
+        else:
+            series = series.astype('string').str.strip().replace('', pd.NA)
+        cols[key] = series
+    frame = pd.DataFrame(cols, index=df.index).astype(object)
+    frame = frame.where(frame.notna(), None)
+    return [{k: v for k, v in rec.items() if v is not None} for rec in frame.to_dict('records')]
@@ -0,0 +1,216 @@
+"""
+SkyMission Builder - Watch Folder Module
+입력 폴더를 주기적으로 확인하여 새로 들어오거나 수정된 KML/GPKG만 미션으로 다시 생성합니다.
+복사 중인 파일은 크기/수정 시각이 일정 시간 변하지 않을 때까지 기다렸다가 처리합니다.
+"""
+
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .events import Notice, ProgressEvent
+from .generator import collect_input_files
+from .pipeline import CancellationToken
+
+
+def scan_inputs(input_dir: Path, input_format: str = 'auto') -> Dict[Path, Tuple[int, int]]:
+    """입력 폴더의 파일별 (크기, 수정 시각) 서명"""
+    sigs = {}
+    for path in collect_input_files(input_dir, input_format):
+        try:
+            st = path.stat()
+        except OSError:
+            continue  # 스캔 도중 삭제/이동된 파일
+        sigs[path] = (st.st_size, st.st_mtime_ns)
+    return sigs
+
+
+class WatchDaemon:
+    """
+    입력 폴더 감시 데몬.
+
+    - 폴링 주기(poll_interval)마다 폴더를 훑어 서명이 바뀐 파일을 찾습니다.
+    - 서명이 settle_s초 동안 그대로인 파일만 안정된 것으로 보고 작업 큐에 넣습니다.
+    - 작업 큐는 max_pending 크기로 제한되며, 이미 대기 중이거나 처리 중인 파일은 다시 넣지 않습니다.
+      큐가 가득 차면 해당 파일은 다음 폴링에서 다시 시도합니다.
+    - 처리한 서명은 배치가 끝난 뒤에 기록하므로, 배치가 오류로 끝나면 다음 폴링에서 다시 시도합니다.
+    - 작업 스레드는 대기 중인 파일을 모아 engine.run(files=..., resume=True)로 처리하므로
+      템플릿/데이터셋/지오메트리 캐시가 이벤트 사이에 유지되고 바뀐 피처만 다시 생성됩니다.
+
+    Args:
+        engine (MissionBatchEngine): 템플릿/WPML 경로가 설정된 엔진
+        input_dir (Path): 감시할 입력 폴더
+        out_dir (Path): 출력 폴더
+        poll_interval (float): 폴링 간격(초)
+        settle_s (float): 쓰기가 끝났다고 판단할 무변경 시간(초)
+        max_pending (int): 작업 큐 최대 길이
+        progress (Callable): 이벤트 sink (배치 이벤트와 감시 Notice를 함께 받음)
+        **batch_options: batch_process_inputs에 그대로 전달할 옵션
+    """
+
+    def __init__(self, engine, input_dir: Path, out_dir: Path, poll_interval: float = 2.0,
+                 settle_s: float = 2.0, max_pending: int = 64, input_format: str = 'auto',
+                 progress: Optional[Callable[[ProgressEvent], None]] = None,
+                 cancel: Optional[CancellationToken] = None, **batch_options):
+        self.engine = engine
+        self.input_dir = Path(input_dir)
+        self.out_dir = Path(out_dir)
+        self.poll_interval = max(0.05, float(poll_interval))
+        self.settle_s = max(0.0, float(settle_s))
+        self.input_format = input_format
+        self.progress = progress
+        self.cancel = cancel or CancellationToken()
+        self.batch_options = batch_options
+        self.batch_options.pop('resume', None)
+        if batch_options.get('route') or batch_options.get('route_start') is not None:
+            # 이벤트마다 바뀐 파일만 처리하므로 방문 순번이 실행마다 따로 매겨짐
+            raise ValueError('감시 모드에서는 route(방문 순서)를 사용할 수 없습니다.')
+
+        self._queue = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._pending: Dict[Path, Tuple[int, int]] = {}     # 대기/처리 중인 파일과 큐에 넣을 때의 서명
+        self._pending_lock = threading.Lock()
+        self._queued = set()   # _pending 중 아직 큐에 있는(꺼내지 않은) 파일
+        self._processed: Dict[Path, Tuple[int, int]] = {}   # 마지막으로 처리를 마친 서명
+        self._candidates: Dict[Path, Tuple[Tuple[int, int], float]] = {}  # 서명, 처음 관측 시각
+        self._worker = None
+        self.runs = 0
+
+    # ------------------------------------------------------------------
+    # 감시
+    # ------------------------------------------------------------------
+    def poll_once(self, now: Optional[float] = None) -> List[Path]:
+        """폴더를 한 번 훑어 안정된 변경 파일을 큐에 넣고, 넣은 파일 목록을 반환합니다."""
+        now = time.monotonic() if now is None else now
+        queued = []
+        current = scan_inputs(self.input_dir, self.input_format)
+        for path in list(self._candidates):
+            if path not in current:
+                del self._candidates[path]
+        for path in list(self._processed):
+            if path not in current:
+                del self._processed[path]
+
+        for path, sig in current.items():
+            if self._processed.get(path) == sig:
+                continue
+            with self._pending_lock:
+                if self._pending.get(path) == sig:
+                    continue
+            seen = self._candidates.get(path)
+            if seen is None or seen[0] != sig:
+                # 새로 나타났거나 아직 쓰는 중: 관측 시각을 갱신하고 기다림
+                self._candidates[path] = (sig, now)
+                if self.settle_s > 0:
+                    continue
+            elif now - seen[1] < self.settle_s:
+                continue
+            if self._enqueue(path, sig):
+                self._candidates.pop(path, None)
+                queued.append(path)
+        return queued
+
+    def _enqueue(self, path: Path, sig: Tuple[int, int]) -> bool:
+        with self._pending_lock:
+            if path in self._pending:
+                # 대기 중이면 처리할 서명만 갱신 (처리 중이면 끝난 뒤 서명이 달라 다시 잡힘)
+                if path in self._queued:
+                    self._pending[path] = sig
+                    return True
+                return False
+            try:
+                self._queue.put_nowait(path)
+            except queue.Full:
+                return False
+            self._pending[path] = sig
+            self._queued.add(path)
+            return True
+
+    # ------------------------------------------------------------------
+    # 처리
+    # ------------------------------------------------------------------
+    def _drain(self, first: Path) -> Dict[Path, Tuple[int, int]]:
+        """큐에 쌓인 파일을 모두 꺼냅니다 ({파일: 큐에 넣을 때의 서명}, 처리가 끝날 때까지 대기 목록에 남김)"""
+        files = [first]
+        while True:
+            try:
+                files.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        with self._pending_lock:
+            for f in files:
+                self._queued.discard(f)
+            return {f: self._pending[f] for f in sorted(set(files))}
+
+    def _finish(self, files: Dict[Path, Tuple[int, int]], done: bool):
+        with self._pending_lock:
+            for f in files:
+                self._pending.pop(f, None)
+        if done:
+            self._processed.update(files)
+
+    def process_pending(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """대기 중인 파일을 한 번의 배치로 처리합니다. 대기 파일이 없으면 None."""
+        try:
+            first = self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait()
+        except queue.Empty:
+            return None
+        drained = self._drain(first)
+        files = {f: sig for f, sig in drained.items() if f.exists()}
+        if not files:
+            self._finish(drained, done=False)
+            return None
+        self._notice(f"변경 감지: {', '.join(f.name for f in files)}")
+        done = False
+        try:
+            summary = self.engine.run(self.input_dir, self.out_dir, files=list(files), resume=True,
+                                      progress=self.progress, cancel=self.cancel, **self.batch_options)
+            done = not summary.get('cancelled')
+        finally:
+            self._finish(drained, done)
+        self.runs += 1
+        return summary
+
+    def _worker_loop(self):
+        while not self.cancel.cancelled:
+            try:
+                self.process_pending(timeout=self.poll_interval)
+            except Exception as e:
+                self._notice(f'감시 배치 오류: {e}', level='error')
+
+    def _notice(self, message: str, level: str = 'info'):
+        if self.progress is None:
+            return
+        try:
+            self.progress(Notice(message=message, level=level))
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # 실행 제어
+    # ------------------------------------------------------------------
+    def start(self):
+        """작업 스레드를 시작합니다. 폴링은 run_forever() 또는 poll_once()로 수행합니다."""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._worker_loop, name='watch-worker', daemon=True)
+            self._worker.start()
+
+    def run_forever(self):
+        """cancel이 취소될 때까지 폴링합니다 (CLI --watch)."""
+        self.start()
+        self._notice(f'감시 시작: {self.input_dir} (간격 {self.poll_interval:g}초)')
+        while not self.cancel.cancelled:
+            try:
+                self.poll_once()
+            except Exception as e:
+                self._notice(f'폴더 확인 오류: {e}', level='error')
+            self.cancel.wait(self.poll_interval)
+        self.stop()
+        self._notice('감시 종료')
+
+    def stop(self):
+        self.cancel.cancel()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
@@ -0,0 +1,231 @@
+"""
+SkyMission Builder - Restricted Zone Screening Module
+비행 제한구역/보호구역 레이어(GPKG 등)로 STRtree 공간 색인을 한 번 만들고,
+미션 폴리곤 묶음을 한 번의 벌크 질의(query + predicate)로 검사합니다.
+폴리곤 N개 × 구역 M개를 모두 비교하지 않고 색인 후보만 정밀 검사합니다.
+
+겹치는 미션은 위험(danger)으로 표시하거나, clip=True이면 겹친 부분을 잘라냅니다.
+DJI 매핑 폴리곤은 구멍(inner ring)을 가질 수 없으므로 미션 안쪽에 완전히 들어간
+구역은 잘라낼 수 없고 위험으로 남습니다. 잘라낸 결과가 여러 조각이면 가장 큰 조각만 씁니다.
+
+제외 레이어(ExclusionLayers)는 같은 색인으로 geometry 단계에서 버퍼 다음, 단순화 전에
+미션 폴리곤에서 건물/수계 등을 빼는 데 씁니다. (subtract_exclusions 참고)
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 구역 이름으로 쓸 열 후보 (name_field를 지정하지 않은 경우)
+ZONE_NAME_FIELDS = ('name', 'NAME', 'Name', '이름', '명칭')
+
+
+def lonlat_polygons(lonlat_list: Sequence[Sequence]) -> np.ndarray:
+    """(lon, lat) 좌표 리스트 여러 개를 shapely Polygon 배열로 만듭니다."""
+    import shapely
+
+    counts = np.fromiter((len(c) for c in lonlat_list), dtype=np.int64, count=len(lonlat_list))
+    coords = np.array([(float(lon), float(lat)) for c in lonlat_list for lon, lat, *_ in c], dtype=float)
+    index = np.repeat(np.arange(len(lonlat_list)), counts)
+    return shapely.polygons(shapely.linearrings(coords, indices=index))
+
+
+class ZoneIndex:
+    """
+    제한구역 지오메트리(WGS84)와 이름, STRtree 색인.
+
+    Args:
+        geometries: shapely 지오메트리 배열 (WGS84 경위도)
+        names: 구역 이름 리스트 (None이면 'zone_<번호>')
+    """
+
+    def __init__(self, geometries, names: Optional[Sequence[str]] = None):
+        import shapely
+
+        geoms = np.asarray(list(geometries), dtype=object)
+        valid = ~(shapely.is_missing(geoms) | shapely.is_empty(geoms))
+        names = list(names) if names is not None else [f'zone_{i}' for i in range(len(geoms))]
+        self.geometries = shapely.make_valid(geoms[valid])
+        self.names = [str(n) for n, ok in zip(names, valid) if ok]
+        self.tree = shapely.STRtree(self.geometries)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_file(cls, path: Path, layer: Optional[str] = None, name_field: Optional[str] = None,
+                  gdf=None) -> 'ZoneIndex':
+        """GPKG/SHP 등 벡터 레이어를 읽어 WGS84로 변환한 뒤 색인을 만듭니다."""
+        if gdf is None:
+            from .generator import read_gpkg_to_gdf
+            gdf = read_gpkg_to_gdf(Path(path), layer=layer)
+        if gdf.crs is not None and not (gdf.crs.to_epsg() == 4326):
+            gdf = gdf.to_crs(epsg=4326)
+        field = name_field or next((f for f in ZONE_NAME_FIELDS if f in gdf.columns), None)
+        if name_field and name_field not in gdf.columns:
+            raise ValueError(f'제한구역 레이어에 이름 열이 없습니다: {name_field}')
+        if field:
+            names = [str(v) if v is not None and v == v else f'zone_{i}' for i, v in enumerate(gdf[field])]
+        else:
+            names = [f'zone_{i}' for i in range(len(gdf))]
+        return cls(gdf.geometry.values, names)
+
+    def subset(self, bounds) -> 'ZoneIndex':
+        """bounds(minx, miny, maxx, maxy)와 겹치는 구역만 담은 작은 색인 (자식 프로세스 전달용)"""
+        import shapely
+
+        cand = np.sort(self.tree.query(shapely.box(*bounds)))
+        return ZoneIndex(self.geometries[cand], [self.names[i] for i in cand])
+
+    def query(self, polygons) -> List[np.ndarray]:
+        """폴리곤별로 겹치는 구역 번호 배열 (벌크 질의 한 번)"""
+        n = len(polygons)
+        if n == 0 or len(self) == 0:
+            return [np.zeros(0, dtype=np.int64) for _ in range(n)]
+        src, dst = self.tree.query(polygons, predicate='intersects')
+        order = np.argsort(src, kind='stable')
+        src, dst = src[order], dst[order]
+        bounds = np.searchsorted(src, np.arange(n + 1))
+        return [dst[bounds[i]:bounds[i + 1]] for i in range(n)]
+
+    def screen(self, polygons, clip: bool = False) -> List[Optional[Dict]]:
+        """
+        폴리곤 배열을 검사합니다. 겹치지 않는 폴리곤은 None입니다.
+
+        Returns:
+            List[Optional[Dict]]: {'zones'(이름 리스트), 'status', 'messages',
+                                   'geometry'(clip=True이고 잘라낸 경우 Polygon, 모두 잘리면 빈 지오메트리)}
+        """
+        import shapely
+
+        polygons = np.asarray(polygons, dtype=object)
+        hits = self.query(polygons)
+        out: List[Optional[Dict]] = [None] * len(polygons)
+        hit_idx = [i for i, h in enumerate(hits) if len(h)]
+        if not hit_idx:
+            return out
+
+        clipped = None
+        if clip:
+            masks = np.array([shapely.union_all(self.geometries[hits[i]]) for i in hit_idx], dtype=object)
+            clipped = shapely.difference(polygons[hit_idx], masks)
+
+        for k, i in enumerate(hit_idx):
+            names = [self.names[j] for j in hits[i]]
+            label = ', '.join(names)
+            result = {'zones': names, 'geometry': None}
+            if clipped is None:
+                result['status'] = 'danger'
+                result['messages'] = [f'위험: 제한구역과 겹칩니다: {label}']
+                out[i] = result
+                continue
+
+            geom = clipped[k]
+            parts = [] if geom.is_empty else [g for g in getattr(geom, 'geoms', [geom]) if g.geom_type == 'Polygon']
+            if not parts:
+                result.update(status='danger', geometry=shapely.Polygon(),
+                              messages=[f'위험: 미션 전체가 제한구역 안에 있습니다: {label}'])
+                out[i] = result
+                continue
+            largest = max(parts, key=lambda p: p.area)
+            removed = 1.0 - largest.area / polygons[i].area if polygons[i].area else 0.0
+            messages = [f'주의: 제한구역({label})과 겹친 부분을 잘라냈습니다 (면적 {removed * 100:.1f}% 감소).']
+            status = 'warning'
+            if len(parts) > 1:
+                messages.append(f'주의: 잘라낸 뒤 떨어진 조각 {len(parts) - 1}개는 제외했습니다.')
+            if largest.interiors:
+                # 매핑 폴리곤은 구멍을 표현할 수 없으므로 외곽선만 쓰면 구역 위를 비행하게 됨
+                status = 'danger'
+                messages.append('위험: 미션 안쪽의 제한구역은 잘라낼 수 없습니다. 미션을 나누어 주세요.')
+                largest = shapely.Polygon(largest.exterior)
+            result.update(status=status, messages=messages, geometry=largest)
+            out[i] = result
+        return out
+
+
+# -----------------------------
+# 제외 영역 빼기 (건물, 수계, 제외 버퍼 등)
+# -----------------------------
+
+def parse_exclusion_spec(spec) -> tuple:
+    """'path.gpkg' 또는 'path.gpkg::레이어' (또는 (경로, 레이어) 튜플) → (Path, 레이어)"""
+    if isinstance(spec, (tuple, list)):
+        path, layer = spec[0], (spec[1] if len(spec) > 1 else None)
+    else:
+        path, sep, layer = str(spec).partition('::')
+        layer = layer if sep and layer else None
+    return Path(path), layer
+
+
+class ExclusionLayers:
+    """
+    하나 이상의 제외 레이어. 미션 폴리곤의 좌표계마다 한 번씩 재투영한 STRtree 색인을 만들어 둡니다.
+    (버퍼와 단순화 사이, 원본 좌표계에서 빼기 위함)
+    """
+
+    def __init__(self, frames: Sequence):
+        import threading
+
+        frames = [f for f in frames if len(f)]
+        self._frames = frames
+        self._indexes: Dict[str, ZoneIndex] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_files(cls, specs) -> 'ExclusionLayers':
+        from .generator import read_gpkg_to_gdf
+
+        if isinstance(specs, (str, Path)):
+            specs = [specs]
+        frames = []
+        for spec in specs:
+            path, layer = parse_exclusion_spec(spec)
+            gdf = read_gpkg_to_gdf(path, layer=layer)
+            frames.append(gdf[gdf.geometry.geom_type.isin(['Polygon', 'MultiPolygon'])])
+        return cls(frames)
+
+    def for_crs(self, crs) -> ZoneIndex:
+        """crs(pyproj CRS 또는 None=WGS84) 좌표의 색인"""
+        from pyproj import CRS
+
+        target = CRS.from_user_input(crs) if crs is not None else CRS.from_epsg(4326)
+        key = target.to_wkt()
+        index = self._indexes.get(key)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is None:
+                    geoms = []
+                    for gdf in self._frames:
+                        g = gdf.geometry
+                        if gdf.crs is not None and not gdf.crs.equals(target):
+                            g = g.to_crs(target)
+                        geoms.extend(g.values)
+                    index = ZoneIndex(geoms)
+                    self._indexes[key] = index
+        return index
+
+
+def subtract_exclusions(geom, index: ZoneIndex, min_part_area: float = 0.0):
+    """
+    geom에서 주변 제외 영역(색인 후보만)을 빼고 min_part_area(좌표 단위²)보다 작은 조각은 버립니다.
+    겹치는 후보가 없으면 geom을 그대로 반환합니다.
+
+    Raises:
+        ValueError: 빼고 남은 조각이 없는 경우
+    """
+    import shapely
+
+    cand = index.tree.query(geom, predicate='intersects')
+    if len(cand) == 0:
+        return geom
+    rest = shapely.difference(geom, shapely.union_all(index.geometries[cand]))
+    parts = np.asarray([] if rest.is_empty else shapely.get_parts(rest), dtype=object)
+    if len(parts):
+        parts = parts[shapely.get_type_id(parts) == 3]      # Polygon만 (경계에 남은 선/점 제외)
+    if len(parts) and min_part_area > 0:
+        parts = parts[shapely.area(parts) >= min_part_area]
+    if not len(parts):
+        raise ValueError('제외 영역을 빼고 남은 폴리곤이 없습니다.')
+    return parts[0] if len(parts) == 1 else shapely.multipolygons(parts)
@@ -17,8 +17,11 @@ from tkinter import filedialog, messagebox
 
 import customtkinter as ctk  # NEW: CustomTkinter
 # 내부 로직 호출
-from src.core.generator import batch_process_inputs, validate_mission_config, parse_polygon_coords_from_kml, parse_polygon_coords_from_gpkg, read_gpkg_to_gdf, parse_polygon_coords_from_gpkg_direct
+from src.core.generator import validate_mission_config, parse_polygon_coords_from_kml, parse_polygon_coords_from_gpkg, read_gpkg_to_gdf, parse_polygon_coords_from_gpkg_direct
 from src.core import enums
+from src.core.events import ProgressEvent, Progress, BatchFinished, Notice, format_event
+from src.core.pipeline import CancellationToken
+from src.core.engine import MissionBatchEngine
 
 try:
     import tkintermapview
@@ -48,17 +51,6 @@ def to_int(v: str):
     try: return int(s)
     except Exception: return None
 
-# ------------------------------------------------------------------------------
-# stdout 리다이렉터
-# ------------------------------------------------------------------------------
-class LogRedirector:
-    def __init__(self, q: queue.Queue):
-        self.q = q
-    def write(self, s):
-        if s: self.q.put(s)
-    def flush(self):
-        pass
-
 # ------------------------------------------------------------------------------
 # 다국어 번역 데이터 (Default: KO)
 # ------------------------------------------------------------------------------
@@ -84,6 +76,11 @@ TRANSLATIONS = {
         "tf_follow": "지형 팔로우 (Terrain Follow)",
         "overlap": "중첩도 Cam/Lidar",
         "run_batch": "미션 생성 실행 (Batch Run)",
+        "stop_batch": "작업 중지 (Stop)",
+        "stopping": "중지 중...",
+        "feature_timeout": "피처 제한 시간 (s)",
+        "cprofile": "함수 프로파일 저장 (cProfile)",
+        "trace_memory": "메모리 추적 저장 (tracemalloc)",
         "load_preset": "불러오기",
         "save_preset": "저장하기",
         "system_logs": "작업 로그 (System Logs)",
@@ -120,6 +117,11 @@ TRANSLATIONS = {
         "tf_follow": "Terrain Follow",
         "overlap": "Overlap Cam/Lidar",
         "run_batch": "RUN BATCH MISSION",
+        "stop_batch": "STOP BATCH",
+        "stopping": "Stopping...",
+        "feature_timeout": "Feature Timeout (s)",
+        "cprofile": "Save Function Profile (cProfile)",
+        "trace_memory": "Save Memory Trace (tracemalloc)",
         "load_preset": "Load Preset",
         "save_preset": "Save Preset",
         "system_logs": "System Logs",
@@ -156,6 +158,9 @@ class App(ctk.CTk):
         # 데이터 관리
         self.queue = queue.Queue()
         self.worker = None
+        self.cancel_token = None
+        # 실행 사이에 템플릿/GPKG/지오메트리 캐시를 유지하는 배치 엔진
+        self.engine = MissionBatchEngine()
         
         # 변수 초기화 (StringVar 등은 tk/ctk 혼용 가능하지만 ctk 위젯엔 ctk.StringVar 권장)
         self._init_variables()
@@ -195,7 +200,10 @@ class App(ctk.CTk):
         self.var_set_takeoff_ref_point = ctk.BooleanVar(value=True)
         self.var_use_terrain_follow = ctk.BooleanVar(value=False)
         self.var_simplify_tolerance = ctk.StringVar(value="0.0")
+        self.var_feature_timeout = ctk.StringVar(value="")
         self.var_pack_kmz = ctk.BooleanVar(value=True)
+        self.var_cprofile = ctk.BooleanVar(value=False)
+        self.var_trace_memory = ctk.BooleanVar(value=False)
         
         # Overlap
         self.var_overlap_camera_h = ctk.StringVar(value="80")
@@ -412,6 +420,14 @@ class App(ctk.CTk):
         ctk.CTkLabel(sub2, text="|").pack(side="left", padx=5)
         ctk.CTkEntry(sub2, textvariable=self.var_overlap_lidar_h, width=35).pack(side="left", padx=2)
         ctk.CTkEntry(sub2, textvariable=self.var_overlap_lidar_w, width=35).pack(side="left", padx=2)
+
+        # Feature Timeout (빈 값이면 제한 없음)
+        ctk.CTkLabel(card, text=self._tr("feature_timeout")).grid(row=5, column=0, sticky="w", padx=10, pady=2)
+        ctk.CTkEntry(card, textvariable=self.var_feature_timeout).grid(row=5, column=1, sticky="ew", padx=10, pady=2)
+
+        # Diagnostics (출력 폴더에 .pstats / tracemalloc 스냅샷 저장)
+        ctk.CTkCheckBox(card, text=self._tr("cprofile"), variable=self.var_cprofile).grid(row=6, column=0, columnspan=2, sticky="w", padx=10, pady=2)
+        ctk.CTkCheckBox(card, text=self._tr("trace_memory"), variable=self.var_trace_memory).grid(row=7, column=0, columnspan=2, sticky="w", padx=10, pady=2)
         
         ctk.CTkLabel(card, text="").grid(row=99, column=0) # Spacer
 
@@ -509,7 +525,7 @@ class App(ctk.CTk):
             try:
                 coords = []
                 if f.suffix.lower() == '.gpkg':
-                    gdf = read_gpkg_to_gdf(f)
+                    gdf = self.engine.load_dataset(f)
                     lonlat, _ = parse_polygon_coords_from_gpkg_direct(gdf, geometry_buffer_m=to_float(self.var_geometry_buffer.get()) or 0.0)
                     coords = [(float(lat), float(lon)) for lon, lat in lonlat]
                 elif f.suffix.lower() == '.kmz':
@@ -530,7 +546,7 @@ class App(ctk.CTk):
                 
                 if coords:
                     # Fix: Ensure outline_color is hex
-                    print(f"[Map] Drawing polygon for {f.name} with {len(coords)} points.")
+                    self._log(f"[Map] Drawing polygon for {f.name} with {len(coords)} points.")
                     # Use a fill color with transparency-like hex if supported, or just distinct color
                     # tkintermapview polygons: outline_color, fill_color (hex)
                     # Note: fill_color=None might be invisible if outline is thin. Let's use a fill.
@@ -546,9 +562,7 @@ class App(ctk.CTk):
                     
                     points_for_zoom.extend(coords)
             except Exception as e:
-                print(f"[Map] Error loading {f.name}: {e}")
-                import traceback
-                traceback.print_exc()
+                self._log(f"[Map] Error loading {f.name}: {e}")
 
         if points_for_zoom:
             lats = [p[0] for p in points_for_zoom]
@@ -694,19 +708,27 @@ class App(ctk.CTk):
             messagebox.showerror("Error", f"Failed: {e}")
 
     def _on_run(self):
+        # 실행 중에는 같은 버튼이 중지 버튼으로 동작
         if self.worker and self.worker.is_alive():
-            messagebox.showinfo("Info", "Already running.")
+            if self.cancel_token is not None:
+                self.cancel_token.cancel()
+            self.var_status.set(self._tr("stopping"))
+            self.btn_run.configure(state="disabled", text=self._tr("stopping"))
             return
         self.txt_log.delete("1.0", "end")
         self.var_status.set(self._tr("running"))
-        self.btn_run.configure(state="disabled")
+        self.btn_run.configure(text=self._tr("stop_batch"), fg_color="#A31010", hover_color="#750D0D")
+        self.cancel_token = CancellationToken()
         self.worker = threading.Thread(target=self._run_job, daemon=True)
         self.worker.start()
 
+    def _log(self, text: str):
+        """메인 스레드에서 로그 창에 한 줄 추가"""
+        self.txt_log.insert("end", text + "\n")
+        self.txt_log.see("end")
+
     def _run_job(self):
-        qredir = LogRedirector(self.queue)
-        backup_stdout = sys.stdout
-        sys.stdout = qredir
+        # 배치 이벤트는 워커 스레드에서 큐로만 전달하고, 표시는 _poll_queue(메인 스레드)에서 처리
         try:
             alt_val = to_float(self.var_altitude.get())
             overrides = {
@@ -726,7 +748,7 @@ class App(ctk.CTk):
                 "geometry_buffer_m": to_float(self.var_geometry_buffer.get()),
             }
             
-            batch_process_inputs(
+            self.engine.run(
                 missions_dir=Path(self.var_input_dir.get()),
                 template_path=Path(self.var_template.get()),
                 waylines_path=Path(self.var_waylines.get()),
@@ -738,13 +760,17 @@ class App(ctk.CTk):
                 set_takeoff_ref_point=bool(self.var_set_takeoff_ref_point.get()),
                 overrides=overrides,
                 simplify_tolerance=to_float(self.var_simplify_tolerance.get()) or 0.0,
+                progress=self.queue.put,
+                progress_interval=0.25,
+                cancel=self.cancel_token,
+                feature_timeout=to_float(self.var_feature_timeout.get()),
+                cprofile=bool(self.var_cprofile.get()),
+                trace_memory=bool(self.var_trace_memory.get()),
             )
         except Exception as e:
-            print(f"Error: {e}")
             import traceback
-            traceback.print_exc()
+            self.queue.put(Notice(message=f"Error: {e}\n{traceback.format_exc()}", level="error"))
         finally:
-            sys.stdout = backup_stdout
             self.queue.put("<<DONE>>")
 
     def _poll_queue(self):
@@ -752,11 +778,18 @@ class App(ctk.CTk):
             while True:
                 msg = self.queue.get_nowait()
                 if msg == "<<DONE>>":
-                    self.btn_run.configure(state="normal")
+                    self.btn_run.configure(state="normal", text=self._tr("run_batch"),
+                                           fg_color="#106BA3", hover_color="#0D4F75")
                     self.var_status.set(self._tr("done"))
-                else:
-                    self.txt_log.insert("end", msg)
-                    self.txt_log.see("end")
+                elif isinstance(msg, Progress):
+                    # 진행률은 로그 대신 상태 표시줄에만 갱신
+                    self.var_status.set(f"{self._tr('running')} {format_event(msg)}")
+                elif isinstance(msg, ProgressEvent):
+                    text = format_event(msg)
+                    if text:
+                        self._log(text)
+                    if isinstance(msg, BatchFinished):
+                        self.var_status.set(f"{self._tr('done')}: {msg.ok} / {msg.ok + msg.failed}")
         except queue.Empty:
             pass
         finally:
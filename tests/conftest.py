@@ -0,0 +1,44 @@
+"""
+테스트 공용 픽스처
+    templates: 번들 템플릿 (template.kml, waylines.wpml) 경로 튜플
+    square: (x, y)에서 시작하는 정사각형 폴리곤을 만드는 함수
+    write_squares: 이름 열(NAME)과 정사각형 폴리곤으로 GPKG를 쓰는 함수
+"""
+
+from pathlib import Path
+
+import pytest
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / 'src' / 'templates'
+
+
+def _square(x, y, d=0.01):
+    from shapely.geometry import Polygon
+
+    return Polygon([(x, y), (x + d, y), (x + d, y + d), (x, y + d), (x, y)])
+
+
+@pytest.fixture
+def templates():
+    return TEMPLATE_DIR / 'template.kml', TEMPLATE_DIR / 'waylines.wpml'
+
+
+@pytest.fixture
+def square():
+    return _square
+
+
+@pytest.fixture
+def write_squares():
+    """write_squares(path, names, origins, crs='EPSG:4326', d=0.01, **열) → path (origins는 (경도, 위도) 목록)"""
+    import geopandas as gpd
+
+    def write(path, names, origins, crs='EPSG:4326', d=0.01, **columns):
+        gdf = gpd.GeoDataFrame(dict({'NAME': list(names)}, **columns),
+                               geometry=[_square(x, y, d) for x, y in origins], crs='EPSG:4326')
+        if crs != 'EPSG:4326':
+            gdf = gdf.to_crs(crs)
+        gdf.to_file(path, driver='GPKG')
+        return path
+
+    return write
@@ -0,0 +1,141 @@
+import zipfile
+
+import geopandas as gpd
+import pytest
+
+from src.core.generator import batch_process_inputs
+
+
+@pytest.fixture
+def input_dir(tmp_path, write_squares):
+    d = tmp_path / 'input'
+    d.mkdir()
+    write_squares(d / 'parcels.gpkg', ['a', 'b', 'c'], [(127.0, 36.0), (127.1, 36.0), (127.2, 36.0)])
+    return d
+
+
+def test_batch_writes_one_kmz_per_feature(input_dir, tmp_path, templates):
+    out_dir = tmp_path / 'output'
+    summary = batch_process_inputs(
+        input_dir, *templates, out_dir,
+        input_format='gpkg', naming_field='NAME',
+        overrides={'altitude': 80, 'auto_flight_speed': 5, 'drone_model': 'mavic3e'},
+    )
+    assert summary['ok'] == 3
+    assert summary['failed'] == 0
+    assert [r['name'] for r in summary['results']] == ['a', 'b', 'c']
+    assert {s['stage'] for s in summary['stages']} == {'read', 'geometry', 'analyze', 'render', 'pack', 'write'}
+
+    with zipfile.ZipFile(out_dir / 'a.kmz') as z:
+        assert sorted(z.namelist()) == ['template.kml', 'waylines.wpml']
+        assert b'127.000000000,36.000000000,0' in z.read('template.kml')
+    assert summary['report_path'].exists()
+
+
+def test_batch_records_failures_per_file(input_dir, tmp_path, templates):
+    (input_dir / 'broken.gpkg').write_bytes(b'not a geopackage')
+    summary = batch_process_inputs(
+        input_dir, *templates, tmp_path / 'output',
+        input_format='gpkg',
+    )
+    assert summary['ok'] == 3
+    assert summary['failed'] == 1
+    failed = [r for r in summary['results'] if not r['success']]
+    assert failed[0]['name'] == 'broken.gpkg'
+
+
+def test_batch_reports_empty_and_partially_read_files_as_rows(input_dir, tmp_path, monkeypatch, templates):
+    from shapely.geometry import LineString
+
+    from src.core import generator
+
+    gpd.GeoDataFrame({'NAME': ['l']}, geometry=[LineString([(127.0, 36.0), (127.01, 36.01)])],
+                     crs='EPSG:4326').to_file(input_dir / 'lines.gpkg', driver='GPKG')
+    real_hash = generator._source_hash
+
+    def flaky_hash(*parts):
+        if parts[-1] == 'b':
+            raise OSError('read error')
+        return real_hash(*parts)
+
+    monkeypatch.setattr(generator, '_source_hash', flaky_hash)
+    summary = batch_process_inputs(
+        input_dir, *templates, tmp_path / 'output',
+        input_format='gpkg', naming_field='NAME',
+    )
+    assert (summary['ok'], summary['failed']) == (2, 2)
+    assert len(summary['results']) == 4
+    failed = {r['name']: r['messages'][0] for r in summary['results'] if not r['success']}
+    assert set(failed) == {'lines.gpkg', 'b'}
+    assert 'read error' in failed['b']
+
+
+def test_batch_resume_skips_completed_features(input_dir, tmp_path, templates):
+    out_dir = tmp_path / 'output'
+    args = (input_dir, *templates, out_dir)
+    first = batch_process_inputs(*args, input_format='gpkg', naming_field='NAME', set_times=False)
+    assert first['ok'] == 3
+
+    (out_dir / 'b.kmz').unlink()
+    second = batch_process_inputs(*args, input_format='gpkg', naming_field='NAME', set_times=False, resume=True)
+    assert second['ok'] == 3
+    assert second['skipped'] == 2
+    assert (out_dir / 'b.kmz').exists()
+
+
+def test_batch_emits_progress_events(input_dir, tmp_path, templates):
+    events = []
+    batch_process_inputs(
+        input_dir, *templates, tmp_path / 'output',
+        input_format='gpkg', progress=events.append, progress_interval=0,
+    )
+    kinds = [e.kind for e in events]
+    assert kinds[0] == 'batch_started'
+    assert kinds[-1] == 'batch_finished'
+    assert kinds.count('feature_done') == 3
+    assert 'stage_timings' in kinds
+    assert events[-1].ok == 3
+
+
+def test_batch_emits_file_skipped_events(input_dir, tmp_path, templates, write_squares):
+    from shapely.geometry import LineString
+
+    from src.core.sharding import shard_of
+
+    gpd.GeoDataFrame({'NAME': ['l']}, geometry=[LineString([(127.0, 36.0), (127.01, 36.01)])],
+                     crs='EPSG:4326').to_file(input_dir / 'lines.gpkg', driver='GPKG')
+    write_squares(input_dir / 'solo.gpkg', ['solo'], [(127.5, 36.0)])
+    args = (input_dir, *templates, tmp_path / 'output')
+
+    def skipped(**kwargs):
+        events = []
+        batch_process_inputs(*args, input_format='gpkg', naming_field='NAME', progress=events.append, **kwargs)
+        return {e.src_name: e.reason for e in events if e.kind == 'file_skipped'}
+
+    assert skipped() == {'lines.gpkg': 'no_polygons'}
+    assert skipped(resume=True) == {'lines.gpkg': 'no_polygons', 'parcels.gpkg': 'resumed', 'solo.gpkg': 'resumed'}
+    other = 1 - shard_of('solo', 2)
+    assert skipped(shard=(other, 2))['solo.gpkg'] == 'shard'
+
+
+def test_batch_with_feature_timeout_uses_worker_process(input_dir, tmp_path, templates):
+    summary = batch_process_inputs(
+        input_dir, *templates, tmp_path / 'output',
+        input_format='gpkg', feature_timeout=60,
+    )
+    assert summary['ok'] == 3
+    assert summary['cancelled'] is False
+
+
+def test_batch_cancelled_before_start_writes_nothing(input_dir, tmp_path, templates):
+    from src.core.pipeline import CancellationToken
+
+    token = CancellationToken()
+    token.cancel()
+    summary = batch_process_inputs(
+        input_dir, *templates, tmp_path / 'output',
+        input_format='gpkg', cancel=token,
+    )
+    assert summary['cancelled'] is True
+    assert summary['ok'] == 0
+    assert not list((tmp_path / 'output').glob('*.kmz'))
@@ -0,0 +1,67 @@
+from benchmarks.cases import CASES, BenchContext
+from benchmarks.run import format_table, run_cases
+from benchmarks.synthetic import make_dataset
+from src.core.generator import parse_name_value_from_kml, parse_polygon_coords_from_kml, read_gpkg_to_gdf
+
+
+def test_synthetic_dataset(tmp_path):
+    data = make_dataset(tmp_path, features=40, vertices=12, crs='EPSG:5186', multipolygon_share=0.5,
+                        formats=('gpkg', 'kml'), files=3)
+    assert len(data['gpkg']) == 3 and len(data['kml']) == 40
+    gdfs = [read_gpkg_to_gdf(p) for p in data['gpkg']]
+    assert sum(len(g) for g in gdfs) == 40
+    assert all(g.crs.to_epsg() == 5186 for g in gdfs)
+    types = data['gdf'].geom_type.value_counts()
+    assert 10 < types['MultiPolygon'] < 30 and types['Polygon'] == 40 - types['MultiPolygon']
+    assert data['gdf'].is_valid.all()
+    # 피처끼리 겹치지 않음
+    assert abs(data['gdf'].geometry.union_all().area - data['gdf'].area.sum()) < 1e-3
+
+    kml = data['kml'][0]
+    assert parse_name_value_from_kml(kml) == 'F000000'
+    assert len(parse_polygon_coords_from_kml(kml)) == 13
+
+
+def test_runner_measures_every_case(tmp_path):
+    ctx = BenchContext(tmp_path, features=6, vertices=8)
+    results = run_cases(ctx, repeat=1, warmup=0)
+    assert [r['case'] for r in results] == list(CASES)
+    assert all(r['median_s'] > 0 and r['units'] >= 1 for r in results)
+    assert 'batch_process_inputs' in format_table(results)
+    assert len(list((tmp_path / 'scratch' / 'batch').glob('*.kmz'))) == 6
+
+
+def test_baseline_compare_normalises_and_gates(tmp_path):
+    import json
+
+    import pytest
+
+    from benchmarks.baseline import BASELINE_VERSION, _metric, compare, format_diff, load_baseline
+
+    def snapshot(cal, mps, elapsed, mem, render):
+        return {'version': BASELINE_VERSION, 'calibration_s': cal, 'metrics': {
+            'batch.missions_per_s': _metric(mps, 'missions/s', 'higher'),
+            'batch.elapsed_s': _metric(elapsed, 's', 'lower'),
+            'stage.render.total_s': _metric(render, 's', 'lower', gate=render >= 0.05),
+            'memory.peak_traced_mb': _metric(mem, 'MiB', 'lower'),
+        }}
+
+    base = snapshot(0.05, 200.0, 50.0, 100.0, 0.01)
+    # 두 배 느린 기계에서 같은 코드: 보정 후 변화 없음
+    rows = {r['metric']: r for r in compare(base, snapshot(0.10, 100.0, 100.0, 104.0, 0.03))}
+    assert {m: r['status'] for m, r in rows.items()} == {
+        'batch.missions_per_s': 'ok', 'batch.elapsed_s': 'ok', 'stage.render.total_s': 'noise',
+        'memory.peak_traced_mb': 'ok'}
+    assert rows['batch.missions_per_s']['normalized'] == 200.0
+
+    slower = snapshot(0.05, 150.0, 66.0, 130.0, 0.01)
+    rows = {r['metric']: r['status'] for r in compare(base, slower, tolerance=0.1,
+                                                      tolerances={'memory.*': 0.5})}
+    assert rows['batch.missions_per_s'] == 'regression' and rows['batch.elapsed_s'] == 'regression'
+    assert rows['memory.peak_traced_mb'] == 'ok'
+    assert 'REGRESSION' in format_diff(compare(base, slower), base, slower)
+
+    path = tmp_path / 'old.json'
+    path.write_text(json.dumps(dict(base, version=0)), encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_baseline(path)
@@ -0,0 +1,65 @@
+import pstats
+import tracemalloc
+
+import geopandas as gpd
+from shapely.geometry import box
+
+from src.core.diagnostics import RunDiagnostics
+from src.core.generator import batch_process_inputs
+from src.core.pipeline import Stage, StagedPipeline
+
+
+def test_pipeline_hooks_collect_per_stage(tmp_path):
+    diag = RunDiagnostics(tmp_path, 'run', cprofile=True, trace_memory=True, top_n=5)
+    diag.start()
+    kept = []
+    StagedPipeline([Stage('grow', lambda i: kept.append(bytearray(200_000)) or i, 2),
+                    Stage('sink', lambda i: None)], hooks=diag).run(range(20))
+    paths = diag.finish()
+
+    assert not tracemalloc.is_tracing()
+    assert {'pstats', 'profile_top', 'memory_grow', 'memory_sink', 'memory_top'} <= set(paths)
+    assert pstats.Stats(str(paths['pstats'])).total_calls > 0
+    assert '## 누적 시간(cumulative) 순' in paths['profile_top'].read_text(encoding='utf-8')
+    snap = tracemalloc.Snapshot.load(str(paths['memory_grow']))
+    assert sum(s.size for s in snap.statistics('filename')) > 20 * 200_000 / 2
+    assert '## 단계 grow' in paths['memory_top'].read_text(encoding='utf-8')
+
+
+def test_batch_diagnostics_are_opt_in(tmp_path, templates):
+    src = tmp_path / 'input'
+    src.mkdir()
+    gpd.GeoDataFrame({'NAME': ['a', 'b']}, geometry=[box(127.0, 36.0, 127.01, 36.01), box(127.1, 36.0, 127.11, 36.01)],
+                     crs='EPSG:4326').to_file(src / 'a.gpkg', driver='GPKG')
+    args = (src, *templates)
+
+    plain = batch_process_inputs(*args, tmp_path / 'plain', input_format='gpkg')
+    assert plain['diagnostics'] == {}
+    assert not list((tmp_path / 'plain').glob('*.pstats'))
+
+    summary = batch_process_inputs(*args, tmp_path / 'diag', input_format='gpkg', cprofile=True, trace_memory=True)
+    assert summary['ok'] == 2
+    paths = summary['diagnostics']
+    assert paths['pstats'].suffix == '.pstats' and paths['pstats'].parent == tmp_path / 'diag'
+    top = paths['profile_top'].read_text(encoding='utf-8')
+    assert 'stage_geometry' in top and 'stage_write' in top
+    assert 'memory_geometry' in paths and paths['memory_top'].exists()
+
+
+def test_batch_diagnostics_finish_when_pipeline_raises(tmp_path, monkeypatch, templates):
+    import pytest
+
+    src = tmp_path / 'input'
+    src.mkdir()
+    gpd.GeoDataFrame({'NAME': ['a']}, geometry=[box(127.0, 36.0, 127.01, 36.01)],
+                     crs='EPSG:4326').to_file(src / 'a.gpkg', driver='GPKG')
+
+    def broken_run(self, items, cancel=None):
+        raise RuntimeError('pipeline crashed')
+
+    monkeypatch.setattr(StagedPipeline, 'run', broken_run)
+    with pytest.raises(RuntimeError):
+        batch_process_inputs(src, *templates, tmp_path / 'out',
+                             input_format='gpkg', cprofile=True, trace_memory=True)
+    assert not tracemalloc.is_tracing()
+    assert list((tmp_path / 'out').glob('*.pstats'))
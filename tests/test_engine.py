@@ -0,0 +1,85 @@
+import zipfile
+
+import pytest
+
+from src.core.engine import MissionBatchEngine
+from src.core.generator import compile_kml_template, generate_kml_bytes
+
+
+LONLAT = [('127.0', '36.0'), ('127.01', '36.0'), ('127.01', '36.01'), ('127.0', '36.0')]
+
+
+def test_compiled_template_matches_generate_kml_bytes(templates):
+    overrides = {'altitude': 80, 'auto_flight_speed': 7, 'drone_model': 'm30t', 'use_terrain_follow': True}
+    expected = generate_kml_bytes(templates[0], LONLAT, set_takeoff_ref_point=True,
+                                  overrides=overrides)
+    compiled = compile_kml_template(templates[0], set_takeoff_ref_point=True, overrides=overrides)
+    assert compiled.render(LONLAT) == expected
+
+
+def test_compiled_template_sets_times(templates):
+    compiled = compile_kml_template(templates[0], set_times=True)
+    out = compiled.render(LONLAT, now_ms=1234)
+    assert b'<wpml:createTime>1234</wpml:createTime>' in out
+    assert b'<wpml:updateTime>1234</wpml:updateTime>' in out
+
+
+@pytest.fixture
+def engine_dirs(tmp_path, write_squares):
+    src = tmp_path / 'input'
+    src.mkdir()
+    write_squares(src / 'parcels.gpkg', ['a', 'b'], [(127.0, 36.0), (127.1, 36.0)])
+    return src, tmp_path / 'output'
+
+
+def test_engine_rerun_only_redoes_rendering(engine_dirs, templates):
+    src, out = engine_dirs
+    engine = MissionBatchEngine(*templates)
+    engine.run(src, out, input_format='gpkg', naming_field='NAME', overrides={'altitude': 60})
+    first = engine.cache_stats()
+    assert first['geometries']['entries'] == 2
+
+    summary = engine.run(src, out, input_format='gpkg', naming_field='NAME', overrides={'altitude': 90})
+    stats = engine.cache_stats()
+    assert summary['ok'] == 2
+    assert stats['datasets']['hits'] == first['datasets']['hits'] + 1
+    assert stats['geometries']['hits'] == first['geometries']['hits'] + 2
+    # 설정이 바뀐 템플릿은 새로 컴파일
+    assert stats['templates']['entries'] == 2
+    with zipfile.ZipFile(out / 'a.kmz') as z:
+        assert b'<wpml:height>90</wpml:height>' in z.read('template.kml')
+
+
+def test_engine_reloads_modified_dataset(engine_dirs, templates, write_squares):
+    src, out = engine_dirs
+    engine = MissionBatchEngine(*templates)
+    engine.run(src, out, input_format='gpkg')
+
+    write_squares(src / 'parcels.gpkg', ['c'], [(127.3, 36.0)])
+    summary = engine.run(src, out, input_format='gpkg', naming_field='NAME')
+    assert [r['name'] for r in summary['results']] == ['c']
+
+
+def test_build_mission_kmz_in_memory(templates, square):
+    import io
+    from src.core.generator import build_mission_kmz
+
+    engine = MissionBatchEngine(*templates)
+    field = square(127.0, 36.0)
+    data = build_mission_kmz(field, overrides={'altitude': 80}, set_times=False, engine=engine)
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        assert sorted(z.namelist()) == ['template.kml', 'waylines.wpml']
+        assert b'127.000000000,36.000000000,0' in z.read('template.kml')
+
+    # GeoJSON/좌표 리스트 입력과 wpmz 배치, 캐시 재사용
+    geojson = {'type': 'Feature', 'geometry': field.__geo_interface__}
+    again = build_mission_kmz(geojson, overrides={'altitude': 80}, set_times=False, engine=engine)
+    assert again == data
+    coords = build_mission_kmz(list(field.exterior.coords), overrides={'altitude': 80}, set_times=False,
+                               naming='wpmz', engine=engine)
+    with zipfile.ZipFile(io.BytesIO(coords)) as z:
+        assert sorted(z.namelist()) == ['wpmz/template.kml', 'wpmz/waylines.wpml']
+    assert engine.templates.stats()['misses'] == 1
+
+    with pytest.raises(ValueError):
+        build_mission_kmz(field, naming='zip', engine=engine)
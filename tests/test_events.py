@@ -0,0 +1,21 @@
+from src.core.events import (ProgressEmitter, FeatureDone, FeatureFailed, Progress,
+                             format_event)
+
+
+def test_emitter_throttles_feature_events_but_not_errors():
+    events = []
+    emitter = ProgressEmitter(events.append, min_interval=60)
+    emitter.discover(3)
+    emitter.feature_done('a', 'src.gpkg', 'a.kmz')
+    emitter.feature_done('b', 'src.gpkg', 'b.kmz')
+    emitter.feature_failed('c', 'src.gpkg', '오류: c')
+
+    assert [type(e) for e in events] == [FeatureDone, Progress, FeatureFailed]
+    final = emitter.progress()
+    assert (final.done, final.failed, final.discovered) == (2, 1, 3)
+    assert final.eta_s == 0
+
+
+def test_format_event_matches_cli_wording():
+    assert format_event(FeatureDone(name='a', src_name='src.gpkg', out_name='a.kmz')) == '완료: src.gpkg -> a.kmz'
+    assert FeatureDone(name='a', src_name='s', out_name='a.kmz').to_dict()['kind'] == 'feature_done'
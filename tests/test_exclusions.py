@@ -0,0 +1,54 @@
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+
+from src.core.generator import batch_process_inputs, parse_polygon_coords_from_gpkg_direct
+from src.core.zones import ExclusionLayers, ZoneIndex, subtract_exclusions
+
+
+def test_subtract_drops_small_parts():
+    field = box(0, 0, 100, 100)
+    # 가운데 띠(x 40~60)로 둘로 나누고 동쪽 조각의 북쪽을 조금 더 깎는 제외 영역, 멀리 떨어진 영역 하나
+    index = ZoneIndex([box(40, -10, 60, 110), box(60, 95, 110, 110), box(500, 500, 600, 600)])
+    rest = subtract_exclusions(field, index)
+    assert rest.geom_type == 'MultiPolygon' and rest.area == pytest.approx(40 * 100 + 40 * 95)
+
+    west = subtract_exclusions(field, index, min_part_area=3900)
+    assert west.geom_type == 'Polygon' and west.bounds == (0, 0, 40, 100)
+    with pytest.raises(ValueError):
+        subtract_exclusions(field, index, min_part_area=5000)
+    with pytest.raises(ValueError):
+        subtract_exclusions(field, ZoneIndex([box(-1, -1, 101, 101)]))
+    assert subtract_exclusions(field, ZoneIndex([box(500, 500, 600, 600)])) is field
+
+
+def test_exclusion_is_reprojected_per_crs(square):
+    layers = ExclusionLayers([gpd.GeoDataFrame(geometry=[box(127.005, 35.99, 127.02, 36.02)], crs='EPSG:4326')])
+    gdf = gpd.GeoDataFrame(geometry=[square(127.0, 36.0)], crs='EPSG:4326').to_crs(epsg=5186)
+    lonlat, _ = parse_polygon_coords_from_gpkg_direct(gdf, exclusions=layers)
+    assert max(float(x) for x, _ in lonlat) == pytest.approx(127.005, abs=1e-6)
+    assert layers.for_crs(gdf.crs) is layers.for_crs(gdf.crs)
+
+
+def test_batch_subtracts_exclusion_layers(tmp_path, templates, write_squares):
+    src = tmp_path / 'input'
+    src.mkdir()
+    write_squares(src / 'fields.gpkg', ['a', 'b', 'gone'], [(127.0, 36.0), (127.1, 36.0), (127.2, 36.0)],
+                  crs='EPSG:5186')
+    excl = tmp_path / 'exclude.gpkg'
+    gpd.GeoDataFrame(geometry=[box(127.005, 35.99, 127.02, 36.02)], crs='EPSG:4326').to_file(
+        excl, layer='buildings', driver='GPKG')
+    gpd.GeoDataFrame(geometry=[box(127.19, 35.99, 127.22, 36.02)], crs='EPSG:4326').to_file(
+        excl, layer='water', driver='GPKG')
+
+    kwargs = dict(input_format='gpkg', naming_field='NAME', overrides={'altitude': 80, 'auto_flight_speed': 5})
+    plain = batch_process_inputs(src, *templates,
+                                 tmp_path / 'plain', **kwargs)
+    cut = batch_process_inputs(src, *templates, tmp_path / 'cut',
+                               exclusions=[f'{excl}::buildings', f'{excl}::water'], exclusion_min_area=100,
+                               **kwargs)
+    assert cut['ok'] == 2 and cut['failed'] == 1
+    a_plain, b_plain = plain['results'][:2]
+    a_cut, b_cut = [r for r in cut['results'] if r['name'] in ('a', 'b')]
+    assert abs(a_cut['flight']['area_ha'] - a_plain['flight']['area_ha'] / 2) < 0.5
+    assert b_cut['flight']['area_ha'] == b_plain['flight']['area_ha']
@@ -0,0 +1,53 @@
+import geopandas as gpd
+from shapely.geometry import box
+
+from src.core.generator import batch_process_inputs
+from src.core.grouping import dissolve_by_key, group_features, merge_nearby
+
+
+def test_dissolve_and_merge_nearby():
+    geoms = [box(0, 0, 10, 10), box(10, 0, 20, 10), box(100, 0, 110, 10), box(25, 0, 30, 10), box(500, 0, 510, 10)]
+    groups, merged = dissolve_by_key(geoms, ['a', 'a', 'b', None, 'b'])
+    assert [g.tolist() for g in groups] == [[0, 1], [2, 4], [3]]
+    assert merged[0].equals(box(0, 0, 20, 10))
+
+    clusters = merge_nearby(geoms, distance=6)
+    assert [c.tolist() for c in clusters] == [[0, 1, 3], [2], [4]]
+    assert [c.tolist() for c in merge_nearby(geoms, distance=6, max_area=60)] == [[0], [1], [2], [3], [4]]
+
+
+def test_group_features_across_layers():
+    west = gpd.GeoDataFrame({'OWNER': ['kim', 'lee']},
+                            geometry=[box(127.0, 36.0, 127.01, 36.01), box(127.05, 36.0, 127.051, 36.001)],
+                            crs='EPSG:4326')
+    east = gpd.GeoDataFrame({'OWNER': ['kim', 'park']},
+                            geometry=[box(127.01, 36.0, 127.02, 36.01), box(127.0514, 36.0, 127.0524, 36.001)],
+                            crs='EPSG:4326').to_crs(epsg=5186)
+
+    grouped = group_features([west, east], 'OWNER')
+    assert grouped['OWNER'].tolist() == ['kim', 'lee', 'park']
+    assert grouped['group_size'].tolist() == [2, 1, 1]
+    assert (grouped.geom_type == 'Polygon').all()
+
+    merged = group_features([west, east], 'OWNER', merge_distance=50, merge_max_area=100_000)
+    assert merged['OWNER'].tolist() == ['kim', 'lee+park']
+    assert merged['group_size'].tolist() == [2, 2]
+    assert (merged.geom_type == 'Polygon').all()
+
+
+def test_batch_groups_features_by_key(tmp_path, templates):
+    src = tmp_path / 'input'
+    src.mkdir()
+    gpd.GeoDataFrame({'OWNER': ['kim', 'lee']}, geometry=[box(127.0, 36.0, 127.01, 36.01), box(127.1, 36.0, 127.11, 36.01)],
+                     crs='EPSG:4326').to_file(src / 'a.gpkg', driver='GPKG')
+    gpd.GeoDataFrame({'OWNER': ['kim']}, geometry=[box(127.01, 36.0, 127.02, 36.01)],
+                     crs='EPSG:4326').to_file(src / 'b.gpkg', driver='GPKG')
+
+    summary = batch_process_inputs(src, *templates, tmp_path / 'out',
+                                   input_format='gpkg', group_by='OWNER',
+                                   overrides={'altitude': 80, 'auto_flight_speed': 5})
+    assert summary['ok'] == 2
+    kim, lee = summary['results']
+    assert (kim['name'], lee['name']) == ('kim', 'lee')
+    assert abs(kim['flight']['area_ha'] - 2 * lee['flight']['area_ha']) < 1.0
+    assert sorted(p.name for p in (tmp_path / 'out').glob('*.kmz')) == ['kim.kmz', 'lee.kmz']
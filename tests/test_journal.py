@@ -0,0 +1,33 @@
+from src.core.journal import BatchJournal, JOURNAL_NAME, atomic_write_bytes
+
+
+def test_journal_ignores_partial_last_line(tmp_path):
+    with BatchJournal(tmp_path).open() as j:
+        j.append('a.gpkg#0', 'cfg', 'a', 'a.kmz', b'aaa')
+        j.append('a.gpkg#1', 'cfg', 'b', 'b.kmz', b'bbb')
+    path = tmp_path / JOURNAL_NAME
+    # 충돌로 마지막 줄이 잘린 상황
+    path.write_bytes(path.read_bytes()[:-10])
+
+    records = BatchJournal(tmp_path).load()
+    assert list(records) == ['a.gpkg#0']
+
+    # 재개 후 추가된 레코드는 깨진 줄과 섞이지 않아야 함
+    with BatchJournal(tmp_path).open(resume=True) as j:
+        j.append('a.gpkg#2', 'cfg', 'c', 'c.kmz', b'ccc')
+    assert sorted(BatchJournal(tmp_path).load()) == ['a.gpkg#0', 'a.gpkg#2']
+
+
+def test_completed_verifies_outputs(tmp_path):
+    atomic_write_bytes(tmp_path / 'a.kmz', b'aaa')
+    atomic_write_bytes(tmp_path / 'b.kmz', b'bbb')
+    with BatchJournal(tmp_path).open() as j:
+        j.append('k0', 'cfg', 'a', 'a.kmz', b'aaa')
+        j.append('k1', 'cfg', 'b', 'b.kmz', b'bbb')
+        j.append('k2', 'cfg', 'c', 'c.kmz', b'ccc')  # 출력 파일 없음
+
+    # 같은 크기지만 내용이 바뀐 tail 출력은 해시 검증에서 걸러짐
+    (tmp_path / 'b.kmz').write_bytes(b'xxx')
+    done = BatchJournal(tmp_path).completed(tmp_path, 'cfg')
+    assert sorted(done) == ['k0']
+    assert BatchJournal(tmp_path).completed(tmp_path, 'other-cfg') == {}
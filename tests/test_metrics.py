@@ -0,0 +1,131 @@
+import re
+import zipfile
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import Polygon
+
+from src.core.generator import batch_process_inputs
+from src.core.metrics import compute_flight_metrics, polygon_measures, resolve_flight_params
+from src.core.pipeline import Stage, StagedPipeline
+
+
+def _rect(x, y, dx, dy):
+    return [(x, y), (x + dx, y), (x + dx, y + dy), (x, y + dy), (x, y)]
+
+
+def test_polygon_measures_vectorized():
+    # 위도 36도에서 경도 0.01도 ≈ 900.6m, 위도 0.005도 ≈ 552.9m
+    m = polygon_measures([_rect(127.0, 36.0, 0.01, 0.005), _rect(127.0, 36.0, 0.001, 0.002)])
+    assert m['area_m2'][0] == pytest.approx(900.6 * 552.9, rel=1e-3)
+    assert m['length_m'][0] == pytest.approx(900.6, rel=1e-3)
+    assert m['width_m'][0] == pytest.approx(552.9, rel=1e-3)
+    assert m['length_m'][1] == pytest.approx(221.1, rel=1e-3)
+    assert m['perimeter_m'][1] == pytest.approx(2 * (90.06 + 221.15), rel=1e-3)
+
+
+def test_flight_lines_distance_and_batteries():
+    lonlat = _rect(127.0, 36.0, 0.01, 0.005)
+    # mavic3e 100m: 촬영 폭 = 100 * 17.3 / 12.3 = 140.65m, 간격 = 42.2m (측면 70%)
+    params = {'altitude': 100, 'speed': 10, 'side_overlap': 70, 'margin': 0, 'drone_model': 'mavic3e'}
+    low = dict(params, altitude=50, speed=5)
+    high, slow = compute_flight_metrics([lonlat, lonlat], [params, low])
+
+    assert high['spacing_m'] == pytest.approx(42.2, abs=0.01)
+    assert high['lines'] == 15                                  # ceil(552.9 / 42.2) + 1
+    assert high['distance_m'] == pytest.approx(15 * 900.6 + 14 * 42.2, rel=1e-3)
+    assert high['duration_s'] == pytest.approx(high['distance_m'] / 10 * 1.15, rel=1e-3)
+    assert high['duration'] == '27:01' and high['batteries'] == 1
+    assert slow['lines'] == 28 and slow['batteries'] == 4          # 5927s / (45분 × 0.7)
+
+
+def test_resolve_flight_params_prefers_template_values():
+    params = resolve_flight_params({'altitude': 160.0, 'speed': 15.0, 'side_overlap': 65.0, 'margin': 40.0},
+                                   {'drone_model': 'm30t'})
+    assert params == {'altitude': 160.0, 'speed': 15.0, 'side_overlap': 65.0, 'margin': 40.0,
+                      'drone_model': 'm30t'}
+    assert resolve_flight_params({}, None)['altitude'] == 50
+
+
+def test_batched_stage_receives_lists():
+    out, sizes = [], []
+
+    def analyze(items):
+        sizes.append(len(items))
+        return [x * 10 for x in items]
+
+    pipeline = StagedPipeline([
+        Stage('src', lambda x: x),
+        Stage('analyze', analyze, batch_size=8),
+        Stage('sink', out.append),
+    ], queue_size=64)
+    pipeline.run(range(40))
+    assert sorted(out) == [x * 10 for x in range(40)]
+    assert max(sizes) <= 8
+    assert {s['stage']: s['processed'] for s in pipeline.stats()}['analyze'] == 40
+
+
+def test_batch_writes_flight_metrics_to_wpml_and_report(tmp_path, templates):
+    src = tmp_path / 'input'
+    src.mkdir()
+    gpd.GeoDataFrame({'NAME': ['small', 'large']},
+                     geometry=[Polygon(_rect(127.0, 36.0, 0.002, 0.002)), Polygon(_rect(127.1, 36.0, 0.01, 0.01))],
+                     crs='EPSG:4326').to_file(src / 'fields.gpkg', driver='GPKG')
+
+    summary = batch_process_inputs(src, *templates,
+                                   tmp_path / 'out', input_format='gpkg', naming_field='NAME',
+                                   overrides={'altitude': 80, 'auto_flight_speed': 8})
+    small, large = summary['results']
+    assert large['flight']['area_ha'] > 20 * small['flight']['area_ha']
+    assert large['flight']['distance_m'] > small['flight']['distance_m']
+
+    with zipfile.ZipFile(tmp_path / 'out' / 'large.kmz') as z:
+        wpml = z.read('waylines.wpml').decode('utf-8')
+    assert re.search(r'<wpml:distance>([^<]+)<', wpml).group(1) == str(large['flight']['distance_m'])
+    assert re.search(r'<wpml:duration>([^<]+)<', wpml).group(1) == str(large['flight']['duration_s'])
+
+    html = summary['report_path'].read_text(encoding='utf-8')
+    assert '예상 시간' in html and large['flight']['duration'] in html
+
+    # 재개 시 저널에 기록된 지표를 그대로 사용
+    resumed = batch_process_inputs(src, *templates,
+                                   tmp_path / 'out', input_format='gpkg', naming_field='NAME',
+                                   overrides={'altitude': 80, 'auto_flight_speed': 8}, resume=True)
+    assert resumed['skipped'] == 2
+    assert [r['flight'] for r in resumed['results']] == [small['flight'], large['flight']]
+
+
+def test_batch_falls_back_to_per_mission_metrics_on_batch_error(tmp_path, monkeypatch, templates):
+    from src.core import generator
+
+    src = tmp_path / 'input'
+    src.mkdir()
+    gpd.GeoDataFrame({'NAME': ['a', 'b']},
+                     geometry=[Polygon(_rect(127.0, 36.0, 0.002, 0.002)), Polygon(_rect(127.1, 36.0, 0.01, 0.01))],
+                     crs='EPSG:4326').to_file(src / 'fields.gpkg', driver='GPKG')
+
+    def broken(*args, **kwargs):
+        raise MemoryError('batch too large')
+
+    monkeypatch.setattr(generator, 'polygon_measures', broken)
+    summary = batch_process_inputs(src, *templates,
+                                   tmp_path / 'out', input_format='gpkg', naming_field='NAME')
+    assert summary['ok'] == 2 and summary['failed'] == 0
+    assert all(r['flight']['distance_m'] > 0 for r in summary['results'])
+
+
+def test_kmz_packer_keeps_entry_order_and_renders_flight_values(templates):
+    import io
+
+    from src.core.generator import KmzPacker
+
+    wpml = templates[1].read_bytes()
+    packer = KmzPacker(wpml)
+    flight = {'distance_m': 1234.5, 'duration_s': 321.0}
+    for data, expected in ((packer.pack(b'<kml/>'), wpml), (packer.pack(b'<kml/>', flight), packer.render_wpml(flight))):
+        with zipfile.ZipFile(io.BytesIO(data)) as z:
+            assert z.testzip() is None
+            assert z.namelist() == ['template.kml', 'waylines.wpml']
+            assert z.read('waylines.wpml') == expected
+            assert z.read('template.kml') == b'<kml/>'
+    assert b'<wpml:distance>1234.5</wpml:distance>' in packer.render_wpml(flight)
@@ -0,0 +1,73 @@
+import re
+
+import geopandas as gpd
+from shapely.geometry import LineString, box
+
+from src.core.generator import batch_process_inputs
+from src.core.openmetrics import BatchMetrics, histogram_lines
+from src.core.timings import TimingRecorder
+
+
+SAMPLE = re.compile(r'^[a-z_]+(\{[^}]*\})? [-+0-9.eInf]+$')
+
+
+def _values(text):
+    out = {}
+    for line in text.splitlines():
+        if line.startswith('#'):
+            continue
+        assert SAMPLE.match(line), line
+        key, value = line.rsplit(' ', 1)
+        out[key] = value
+    return out
+
+
+def test_histogram_and_render(tmp_path):
+    lines = histogram_lines('x_seconds', [0.002, 0.02, 0.2, 120.0], {'stage': 'read'}, buckets=(0.01, 1.0))
+    assert lines == ['x_seconds_bucket{stage="read",le="0.01"} 1', 'x_seconds_bucket{stage="read",le="1.0"} 3',
+                     'x_seconds_bucket{stage="read",le="+Inf"} 4', 'x_seconds_sum{stage="read"} 120.222',
+                     'x_seconds_count{stage="read"} 4']
+
+    timer = TimingRecorder()
+    timer.add('geometry', 0.03, 'a.gpkg')
+    metrics = BatchMetrics(tmp_path / 'batch.prom', {'ok': 3, 'failed': 1, 'skipped': 0}, timer=timer,
+                           stages=['read', 'geometry'], interval=0)
+    metrics.failure('geometry', 'timeout')
+    metrics.failure('read', 'say "no"\n')
+    metrics.add_bytes(1024)
+    metrics.start()
+    assert _values(metrics.path.read_text(encoding='utf-8'))['skymission_batch_running'] == '1'
+    metrics.close()
+    values = _values(metrics.path.read_text(encoding='utf-8'))
+    assert values['skymission_missions_total{result="ok"}'] == '3'
+    assert values['skymission_failures_total{stage="geometry",reason="timeout"}'] == '1'
+    assert values['skymission_failures_total{stage="read",reason="say \\"no\\"\\n"}'] == '1'
+    assert values['skymission_output_bytes_total'] == '1024'
+    assert values['skymission_stage_duration_seconds_count{stage="geometry"}'] == '1'
+    assert values['skymission_stage_duration_seconds_count{stage="read"}'] == '0'
+    assert values['skymission_batch_running'] == '0'
+    assert int(values['skymission_peak_rss_bytes']) > 0
+    assert not [p for p in tmp_path.iterdir() if p.name != 'batch.prom']
+
+
+def test_batch_writes_metrics_file(tmp_path, templates):
+    src = tmp_path / 'input'
+    src.mkdir()
+    gpd.GeoDataFrame({'NAME': ['a', 'b']}, geometry=[box(127.0, 36.0, 127.01, 36.01), box(127.1, 36.0, 127.11, 36.01)],
+                     crs='EPSG:4326').to_file(src / 'a.gpkg', driver='GPKG')
+    gpd.GeoDataFrame({'NAME': ['p']}, geometry=[LineString([(127.0, 36.0), (127.01, 36.01)])],
+                     crs='EPSG:4326').to_file(src / 'lines.gpkg', driver='GPKG')
+    prom = tmp_path / 'textfile' / 'skymission.prom'
+    prom.parent.mkdir()
+
+    summary = batch_process_inputs(src, *templates, tmp_path / 'out',
+                                   input_format='gpkg', metrics_file=prom, metrics_interval=0.05)
+    assert summary['metrics_path'] == prom
+    values = _values(prom.read_text(encoding='utf-8'))
+    assert values['skymission_missions_total{result="ok"}'] == '2'
+    assert values['skymission_failures_total{stage="read",reason="no_polygons"}'] == '1'
+    written = sum(p.stat().st_size for p in (tmp_path / 'out').glob('*.kmz'))
+    assert values['skymission_output_bytes_total'] == str(written)
+    assert values['skymission_stage_duration_seconds_count{stage="write"}'] == '2'
+    assert 'skymission_cache_hit_ratio{cache="geometries"}' in values
+    assert [p.name for p in prom.parent.iterdir()] == ['skymission.prom']
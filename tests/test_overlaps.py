@@ -0,0 +1,64 @@
+
+from src.core.generator import batch_process_inputs
+from src.core.overlaps import find_overlaps
+
+
+def test_find_overlaps_uses_smaller_area(square):
+    polys = [square(127.0, 36.0), square(127.006, 36.0), square(127.002, 36.002, 0.002), square(127.5, 36.0)]
+    pairs = find_overlaps(polys, min_ratio=0.5)
+    assert [(i, j) for i, j, _ in pairs] == [(0, 2)]          # 0-1은 40%만 겹침, 2는 0 안에 포함
+    assert pairs[0][2] == 1.0
+    assert [(i, j) for i, j, _ in find_overlaps(polys, min_ratio=0.3)] == [(0, 1), (0, 2)]
+
+
+def test_batch_reports_duplicates_and_overlaps(tmp_path, templates, write_squares):
+    src = tmp_path / 'input'
+    src.mkdir()
+    write_squares(src / 'fields.gpkg', ['a', 'a_copy', 'b', 'far'],
+                  [(127.0, 36.0), (127.0, 36.0), (127.002, 36.0), (127.5, 36.0)], crs='EPSG:5186')
+    kwargs = dict(input_format='gpkg', naming_field='NAME', overrides={'altitude': 80, 'auto_flight_speed': 5},
+                  overlap_ratio=0.5)
+
+    summary = batch_process_inputs(src, *templates,
+                                   tmp_path / 'out', **kwargs)
+    a, a_copy, b, far = summary['results']
+    assert a_copy['overlap']['duplicate_of'] == 'a'
+    assert summary['overlaps'] == [{'a': 'a', 'b': 'b', 'ratio': 0.8}]
+    assert a['status'] == b['status'] == 'warning' and far['status'] == 'safe'
+    assert any('영역이 겹칩니다: b(80%)' in m for m in a['messages'])
+
+    skipped = batch_process_inputs(src, *templates,
+                                   tmp_path / 'skip', skip_duplicates=True, **kwargs)
+    assert skipped['ok'] == 3 and skipped['skipped'] == 0 and skipped['duplicates'] == 1
+    assert not (tmp_path / 'skip' / 'a_copy.kmz').exists()
+    assert skipped['results'][1]['duplicate_of'] == 'a'
+
+
+def test_duplicates_are_found_across_shards(tmp_path, templates, write_squares):
+    src = tmp_path / 'input'
+    src.mkdir()
+    # a는 샤드 1/2, a_copy는 샤드 0/2에 배정됨
+    write_squares(src / 'fields.gpkg', ['a', 'a_copy'], [(127.0, 36.0), (127.0, 36.0)])
+    summary = batch_process_inputs(src, *templates,
+                                   tmp_path / 'shard0', input_format='gpkg', naming_field='NAME',
+                                   shard=(0, 2), skip_duplicates=True)
+    assert (summary['ok'], summary['duplicates']) == (0, 1)
+    assert summary['results'][0]['duplicate_of'] == 'a'
+
+
+def test_duplicates_match_between_gpkg_and_kml(tmp_path, templates, write_squares):
+    src = tmp_path / 'input'
+    src.mkdir()
+    write_squares(src / 'fields.gpkg', ['a'], [(127.0, 36.0)], crs='EPSG:5186')
+    # 같은 사각형을 다른 시작점, 반대 방향, 고도 포함 좌표로 기록한 KML
+    (src / 'copy.kml').write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n<kml xmlns="http://www.opengis.net/kml/2.2"><Document>'
+        '<Placemark><name>copy</name><Polygon><outerBoundaryIs><LinearRing><coordinates>'
+        '127.01,36.01,0 127.01,36.0,0 127.0,36.0,0 127.0,36.01,0 127.01,36.01,0'
+        '</coordinates></LinearRing></outerBoundaryIs></Polygon></Placemark></Document></kml>', encoding='utf-8')
+    summary = batch_process_inputs(src, *templates,
+                                   tmp_path / 'out', input_format='auto', naming_field='NAME',
+                                   skip_duplicates=True)
+    assert (summary['ok'], summary['duplicates']) == (1, 1)
+    kml, gpkg = summary['results']
+    assert kml['source'] == 'copy.kml' and gpkg['duplicate_of'] == kml['name']
@@ -0,0 +1,85 @@
+import threading
+import time
+
+from src.core.pipeline import Stage, StagedPipeline
+
+
+def test_pipeline_runs_all_stages_in_order():
+    out = []
+    lock = threading.Lock()
+
+    def sink(x):
+        with lock:
+            out.append(x)
+
+    pipeline = StagedPipeline([
+        Stage('double', lambda x: x * 2, workers=3),
+        Stage('inc', lambda x: x + 1, workers=2),
+        Stage('sink', sink),
+    ], queue_size=2)
+    pipeline.run(range(50))
+
+    assert sorted(out) == [x * 2 + 1 for x in range(50)]
+    stats = {s['stage']: s for s in pipeline.stats()}
+    assert stats['double']['processed'] == 50
+    assert stats['sink']['processed'] == 50
+    assert all(s['queue_max'] <= 2 for s in stats.values())
+
+
+def test_pipeline_fan_out_and_filter():
+    out = []
+    pipeline = StagedPipeline([
+        Stage('split', lambda n: range(n), fan_out=True),
+        Stage('even', lambda x: x if x % 2 == 0 else None),
+        Stage('sink', out.append),
+    ])
+    pipeline.run([3, 4])
+    assert sorted(out) == [0, 0, 2, 2]
+
+
+def test_pipeline_errors_are_reported_and_skipped():
+    errors = []
+    out = []
+
+    def boom(x):
+        if x == 2:
+            raise ValueError('bad')
+        return x
+
+    pipeline = StagedPipeline([
+        Stage('boom', boom),
+        Stage('sink', out.append),
+    ], on_error=lambda stage, item, exc: errors.append((stage, item, str(exc))))
+    pipeline.run(range(4))
+
+    assert sorted(out) == [0, 1, 3]
+    assert errors == [('boom', 2, 'bad')]
+    assert pipeline.stats()[0]['failed'] == 1
+
+
+def test_pipeline_backpressure_records_downstream_wait():
+    pipeline = StagedPipeline([
+        Stage('fast', lambda x: x),
+        Stage('slow', lambda x: time.sleep(0.01)),
+    ], queue_size=1)
+    pipeline.run(range(10))
+    fast = pipeline.stats()[0]
+    assert fast['wait_out_s'] > 0
+
+
+def test_pipeline_stops_feeding_after_cancel():
+    from src.core.pipeline import CancellationToken
+
+    token = CancellationToken()
+    seen = []
+
+    def work(x):
+        seen.append(x)
+        if x == 3:
+            token.cancel()
+        return x
+
+    pipeline = StagedPipeline([Stage('work', work)], queue_size=1)
+    pipeline.run(range(1000), cancel=token)
+    assert len(seen) < 10
+    assert pipeline.stats()[0]['processed'] == len(seen)
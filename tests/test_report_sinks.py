@@ -0,0 +1,72 @@
+import csv
+import json
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+
+from src.core.generator import batch_process_inputs
+from src.core.report_sinks import ParquetSink, flatten_result, parse_report_formats
+
+
+def test_flatten_and_formats():
+    row = flatten_result({'name': 'a', 'success': True, 'status': 'warning', 'messages': ['x', 'y'],
+                          'metrics': {'gsd': 2.5}, 'flight': {'area_ha': 3, 'lines': 4.0},
+                          'zones': {'zones': ['airport', 'base']}, 'overlap': {'duplicate_of': 'b'}})
+    assert row['metrics.gsd'] == 2.5 and row['flight.area_ha'] == 3.0 and row['flight.lines'] == 4
+    assert row['zones.zones'] == 'airport | base' and row['messages'] == 'x | y'
+    assert row['duplicate_of'] == 'b' and row['terrain.clearance_min'] is None
+
+    assert parse_report_formats('HTML, csv,csv') == ['html', 'csv']
+    with pytest.raises(ValueError):
+        parse_report_formats('xlsx')
+
+
+def test_batch_streams_csv_and_jsonl(tmp_path, templates):
+    src = tmp_path / 'input'
+    src.mkdir()
+    gpd.GeoDataFrame({'NAME': ['a', 'b']}, geometry=[box(127.0, 36.0, 127.01, 36.01), box(127.1, 36.0, 127.11, 36.01)],
+                     crs='EPSG:4326').to_file(src / 'fields.gpkg', driver='GPKG')
+    summary = batch_process_inputs(src, *templates, tmp_path / 'out',
+                                   input_format='gpkg', naming_field='NAME', report_formats='csv,jsonl',
+                                   overrides={'altitude': 80, 'auto_flight_speed': 5})
+    paths = summary['report_paths']
+    assert set(paths) == {'csv', 'jsonl'} and summary['report_path'] is None
+    with open(paths['csv'], encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert sorted(r['name'] for r in rows) == ['a', 'b']
+    assert all(float(r['flight.area_ha']) > 0 for r in rows)
+    lines = [json.loads(line) for line in paths['jsonl'].read_text(encoding='utf-8').splitlines()]
+    assert sorted(r['name'] for r in lines) == ['a', 'b'] and not any('_seq' in r for r in lines)
+
+
+def test_parquet_sink(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    sink = ParquetSink(tmp_path / 'r.parquet', row_group_size=2)
+    for i in range(5):
+        sink.write({'name': f'm{i}', 'success': True, 'status': 'safe', 'messages': []})
+    sink.close()
+    table = pq.read_table(tmp_path / 'r.parquet')
+    assert table.num_rows == 5 and pq.ParquetFile(tmp_path / 'r.parquet').num_row_groups == 3
+
+
+def test_streamed_rows_include_duplicates_and_routed_names(tmp_path, templates):
+    src = tmp_path / 'input'
+    src.mkdir()
+    gpd.GeoDataFrame({'NAME': ['east', 'west', 'west_copy']},
+                     geometry=[box(127.2, 36.0, 127.21, 36.01), box(127.0, 36.0, 127.01, 36.01),
+                               box(127.0, 36.0, 127.01, 36.01)],
+                     crs='EPSG:4326').to_file(src / 'fields.gpkg', driver='GPKG')
+    out = tmp_path / 'out'
+    summary = batch_process_inputs(src, *templates, out,
+                                   input_format='gpkg', naming_field='NAME', report_formats='csv,jsonl',
+                                   skip_duplicates=True, route_start='126.9,36.0',
+                                   overrides={'altitude': 80, 'auto_flight_speed': 5})
+    assert (summary['ok'], summary['duplicates']) == (2, 1)
+    lines = [json.loads(line) for line in summary['report_paths']['jsonl'].read_text(encoding='utf-8').splitlines()]
+    assert [r['name'] for r in lines] == ['east', 'west', 'west_copy']
+    assert [r.get('output') for r in lines] == ['002_east.kmz', '001_west.kmz', None]
+    assert all((out / r['output']).exists() for r in lines if r.get('output'))
+    assert lines[2]['duplicate_of'] == 'west'
+    with open(summary['report_paths']['csv'], encoding='utf-8-sig', newline='') as f:
+        assert [r['output'] for r in csv.DictReader(f)] == ['002_east.kmz', '001_west.kmz', '']
@@ -1,3 +1,4 @@
+import json
 import pytest
 from pathlib import Path
 from src.core.reporter import generate_report
@@ -44,3 +45,16 @@ def test_generate_report(tmp_path):
     assert 'SAFE' in content
     assert 'WARNING' in content
     assert 'DANGER' in content
+
+
+def test_report_paginates_from_embedded_rows(tmp_path):
+    results = [{'name': f'm{i}', 'success': True, 'status': 'safe', 'messages': ['</script> ok'],
+                'metrics': {}, 'altitude': 80, 'speed': 5} for i in range(450)]
+    content = generate_report(results, tmp_path, page_size=100).read_text(encoding='utf-8')
+    table = content.split('<tbody id="report-rows">')[1].split('</tbody>')[0]
+    assert table.count('<tr>') == 100                       # 첫 페이지만 HTML로
+    assert '1 / 5 페이지 (450건)' in content
+
+    data = content.split('<script type="application/json" id="report-data">')[1].split('</script>')[0]
+    rows = json.loads(data)
+    assert len(rows) == 450 and rows[449][0] == 'safe' and 'm449' in rows[449][2]
@@ -0,0 +1,99 @@
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import box
+
+from src.core.generator import batch_process_inputs
+from src.core.journal import BatchJournal
+from src.core.route import _grid_neighbors, neighbor_lists, plan_route, project_local
+
+
+def test_plan_route_visits_line_in_order():
+    # 동서로 늘어선 점을 뒤섞어 두어도 서쪽 출발점에서 동쪽으로 차례로 방문
+    lons = np.array([127.05, 127.01, 127.09, 127.03, 127.07, 127.02, 127.08, 127.04, 127.06])
+    pts = np.column_stack([lons, np.full(len(lons), 36.0)])
+    plan = plan_route(pts, start=(127.0, 36.0))
+    assert lons[plan['order']].tolist() == sorted(lons.tolist())
+    assert plan['distance_m'] <= plan['nn_distance_m']
+    assert abs(plan['distance_m'] - 0.09 * 111320 * np.cos(np.radians(36.0))) < 10
+
+
+def test_grid_neighbors_match_brute_force():
+    rng = np.random.default_rng(1)
+    xy = project_local(np.column_stack([127 + rng.random(500) * 0.1, 36 + rng.random(500) * 0.1]))
+    grid = _grid_neighbors(xy, 4)
+    d = ((xy[:, None] - xy[None]) ** 2).sum(axis=2)
+    np.fill_diagonal(d, np.inf)
+    exact = np.argsort(d, axis=1)[:, :4]
+    assert (grid[:, 0] == exact[:, 0]).mean() > 0.99
+    assert neighbor_lists(xy, 4).shape == (500, 4)
+
+
+def test_batch_prefixes_outputs_with_visit_order(tmp_path, templates):
+    src = tmp_path / 'input'
+    src.mkdir()
+    gpd.GeoDataFrame({'NAME': ['east', 'west', 'middle']},
+                     geometry=[box(127.2, 36.0, 127.21, 36.01), box(127.0, 36.0, 127.01, 36.01),
+                               box(127.1, 36.0, 127.11, 36.01)],
+                     crs='EPSG:4326').to_file(src / 'fields.gpkg', driver='GPKG')
+    kwargs = dict(input_format='gpkg', naming_field='NAME', overrides={'altitude': 80, 'auto_flight_speed': 5},
+                  route_start='126.9,36.0')
+    out = tmp_path / 'out'
+    summary = batch_process_inputs(src, *templates, out, **kwargs)
+    assert [r['output'] for r in summary['results']] == ['003_east.kmz', '001_west.kmz', '002_middle.kmz']
+    assert sorted(p.name for p in out.glob('*.kmz')) == ['001_west.kmz', '002_middle.kmz', '003_east.kmz']
+    assert summary['route']['stops'] == 3
+    stops = gpd.read_file(out / 'route.gpkg', layer='stops')
+    assert stops['name'].tolist() == ['west', 'middle', 'east']
+    assert len(gpd.read_file(out / 'route.gpkg', layer='route').geometry[0].coords) == 4
+
+    # 재개 시 이름이 바뀐 출력도 재사용하고 순번을 다시 매김
+    resumed = batch_process_inputs(src, *templates, out,
+                                   resume=True, **dict(kwargs, route_start='127.3,36.0', route_format='kml'))
+    assert resumed['skipped'] == 3
+    assert sorted(p.name for p in out.glob('*.kmz')) == ['001_east.kmz', '002_middle.kmz', '003_west.kmz']
+    assert {r['out'] for r in BatchJournal(out).load().values()} == {'001_east.kmz', '002_middle.kmz',
+                                                                      '003_west.kmz'}
+    assert (out / 'route.kml').exists()
+
+
+def test_route_cleans_stale_prefixes_and_rejects_shard(tmp_path, templates):
+    src = tmp_path / 'input'
+    src.mkdir()
+    gpd.GeoDataFrame({'NAME': ['east', 'west']},
+                     geometry=[box(127.2, 36.0, 127.21, 36.01), box(127.0, 36.0, 127.01, 36.01)],
+                     crs='EPSG:4326').to_file(src / 'fields.gpkg', driver='GPKG')
+    kwargs = dict(input_format='gpkg', naming_field='NAME', overrides={'altitude': 80, 'auto_flight_speed': 5})
+    out = tmp_path / 'out'
+    batch_process_inputs(src, *templates, out,
+                         route_start='126.9,36.0', **kwargs)
+    assert sorted(p.name for p in out.glob('*.kmz')) == ['001_west.kmz', '002_east.kmz']
+
+    # 재개 없이 반대 방향에서 다시 실행하면 이전 순번의 출력은 남지 않음
+    (out / '009_other.kmz').write_bytes(b'')
+    batch_process_inputs(src, *templates, out,
+                         route_start='127.3,36.0', **kwargs)
+    assert sorted(p.name for p in out.glob('*.kmz')) == ['001_east.kmz', '002_west.kmz', '009_other.kmz']
+
+    # 잘못된 인자는 저널/리포트를 건드리기 전에 거부
+    journal_before = BatchJournal(out).path.read_bytes()
+    reports_before = sorted(p.name for p in out.glob('report_*'))
+    for bad in (dict(route=True, shard=(0, 2)), dict(route=True, route_format='shp'),
+                dict(route_start='east of here')):
+        with pytest.raises(ValueError):
+            batch_process_inputs(src, *templates, out,
+                                 report_formats='csv', **bad, **kwargs)
+    assert BatchJournal(out).path.read_bytes() == journal_before
+    assert sorted(p.name for p in out.glob('report_*')) == reports_before
+
+
+def test_two_opt_never_lengthens_the_tour():
+    from src.core.route import nearest_neighbor_tour, path_length, two_opt
+
+    rng = np.random.default_rng(3)
+    xy = rng.random((300, 2))
+    nbrs = neighbor_lists(xy, 8)
+    start = nearest_neighbor_tour(xy, nbrs)
+    improved = two_opt(xy, start, nbrs)
+    assert sorted(improved.tolist()) == list(range(300)) and improved[0] == start[0]
+    assert path_length(xy, improved) < path_length(xy, start)
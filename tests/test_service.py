@@ -0,0 +1,125 @@
+import io
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from src.core.service import BatchService, make_server
+
+
+@pytest.fixture
+def service_url(tmp_path, templates):
+    service = BatchService(tmp_path / 'jobs.sqlite3', *templates,
+                           workers=1)
+    service.start()
+    server = make_server(service, '127.0.0.1', 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+    service.stop()
+
+
+def _request(url, body=None):
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    req = urllib.request.Request(url, data=data, method='POST' if data is not None else 'GET',
+                                 headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return resp.status, resp.headers.get('Content-Type'), resp.read()
+
+
+def _wait_done(url, batch_id):
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        _, _, raw = _request(f'{url}/batch/tasks/{batch_id}')
+        data = json.loads(raw)
+        if data['status'] not in ('queued', 'processing'):
+            return data
+        time.sleep(0.05)
+    raise AssertionError('배치가 끝나지 않았습니다.')
+
+
+def test_batch_task_lifecycle(service_url, tmp_path, write_squares):
+    src = tmp_path / 'parcels.gpkg'
+    write_squares(src, ['a', 'b'], [(127.0, 36.0), (127.1, 36.0)])
+    missing = tmp_path / 'missing.gpkg'
+
+    code, _, raw = _request(f'{service_url}/batch/tasks', {
+        'file_paths': [str(src), str(missing)],
+        'options': {'output_dir': str(tmp_path / 'out'), 'naming_field': 'NAME'},
+    })
+    assert code == 202
+    created = json.loads(raw)
+    assert created['status'] == 'queued' and created['total_files'] == 2
+
+    data = _wait_done(service_url, created['batch_id'])
+    assert data['status'] == 'completed'
+    assert data['progress'] == {'total': 3, 'processed': 3, 'success': 2, 'failed': 1}
+    done = sorted(j['output_path'] for j in data['jobs'] if j['status'] == 'completed')
+    assert [Path(p).name for p in done] == ['a.kmz', 'b.kmz']
+
+    # 누락 파일이 생기면 재시도로 해당 파일만 다시 처리
+    write_squares(missing, ['c'], [(127.2, 36.0)])
+    code, _, raw = _request(f"{service_url}/batch/tasks/{created['batch_id']}/retry", {})
+    assert code == 202 and json.loads(raw)['retried_count'] == 1
+    data = _wait_done(service_url, created['batch_id'])
+    assert data['progress']['success'] == 3 and data['progress']['failed'] == 0
+
+
+def test_single_polygon_kmz_from_memory(service_url, square):
+    code, ctype, raw = _request(f'{service_url}/missions/kmz', {
+        'geometry': {'type': 'Polygon', 'coordinates': [list(square(127.0, 36.0).exterior.coords)]},
+        'overrides': {'altitude': 80},
+        'name': 'field',
+    })
+    assert code == 200 and ctype == 'application/vnd.google-earth.kmz'
+    with zipfile.ZipFile(io.BytesIO(raw)) as z:
+        assert sorted(z.namelist()) == ['template.kml', 'waylines.wpml']
+
+
+def test_bad_requests(service_url):
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _request(f'{service_url}/batch/tasks', {'file_paths': []})
+    assert e.value.code == 400
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _request(f'{service_url}/batch/tasks/00000000-0000-0000-0000-000000000000')
+    assert e.value.code == 404
+
+
+def test_same_named_inputs_are_rejected_and_output_dir_is_exclusive(tmp_path, templates, write_squares):
+    service = BatchService(tmp_path / 'jobs.sqlite3', *templates)
+    paths = []
+    for i, sub in enumerate(('east', 'west')):
+        (tmp_path / sub).mkdir()
+        src = tmp_path / sub / f'{sub}.gpkg'
+        write_squares(src, [f'{sub}1', f'{sub}2'], [(127.0 + 0.1 * i, 36.0), (127.0 + 0.1 * i, 36.1)])
+        paths.append(str(src))
+    same_name = tmp_path / 'west' / 'east.gpkg'
+    same_name.write_bytes(Path(paths[0]).read_bytes())
+    try:
+        options = {'output_dir': str(tmp_path / 'out'), 'naming_field': 'NAME'}
+        # 이름이 같은 입력은 결과를 구분할 수 없으므로 거절
+        with pytest.raises(ValueError, match='파일 이름이 같은'):
+            service.submit({'file_paths': [paths[0], str(same_name)], 'options': dict(options)})
+
+        created = service.submit({'file_paths': paths, 'options': options})
+        assert service.status(created['batch_id'])['progress']['total'] == 0
+        # 같은 출력 폴더에 대기 중인 작업이 있으면 거절
+        with pytest.raises(ValueError, match='사용 중'):
+            service.submit({'file_paths': paths[:1], 'options': dict(options)})
+
+        service._run_batch(created['batch_id'])
+        status = service.status(created['batch_id'])
+        assert sorted((j['file_path'], j['name']) for j in status['jobs']) == [
+            (paths[0], 'east1'), (paths[0], 'east2'), (paths[1], 'west1'), (paths[1], 'west2')]
+        # progress는 파일이 아니라 jobs(미션) 단위
+        assert status['progress'] == {'total': 4, 'processed': 4, 'success': 4, 'failed': 0}
+        assert service.submit({'file_paths': paths[:1], 'options': dict(options)})['status'] == 'queued'
+    finally:
+        service.store.close()
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from src.core.generator import batch_process_inputs
+from src.core.sharding import merge_shard_outputs, parse_shard_spec, shard_of
+
+NAMES = [f'p{i:02d}' for i in range(12)]
+
+
+@pytest.fixture
+def input_dir(tmp_path, write_squares):
+    d = tmp_path / 'input'
+    d.mkdir()
+    write_squares(d / 'parcels.gpkg', NAMES, [(127.0 + 0.02 * i, 36.0) for i in range(len(NAMES))])
+    return d
+
+
+def test_parse_shard_spec():
+    assert parse_shard_spec('0/4') == (0, 4)
+    assert parse_shard_spec('3/4') == (3, 4)
+    for bad in ('4/4', '-1/2', 'a/b', '1', '0/0'):
+        with pytest.raises(ValueError):
+            parse_shard_spec(bad)
+
+
+def test_shard_of_is_stable():
+    # 프로세스/장비가 달라도 같은 값이어야 하므로 고정값으로 확인
+    assert [shard_of(n, 4) for n in ('a', 'b', 'c', 'd', 'e')] == [3, 1, 3, 3, 3]
+    assert shard_of('p00', 1) == 0
+
+
+def test_shards_are_disjoint_and_merge(input_dir, tmp_path, templates):
+    dirs = []
+    for i in range(3):
+        out_dir = tmp_path / f'shard{i}'
+        summary = batch_process_inputs(
+            input_dir, *templates, out_dir,
+            input_format='gpkg', naming_field='NAME', shard=(i, 3),
+        )
+        assert summary['manifest_path'].name == f'manifest_shard{i}of3.json'
+        assert {r['name'] for r in summary['results']} == {n for n in NAMES if shard_of(n, 3) == i}
+        dirs.append(out_dir)
+
+    produced = [p.stem for d in dirs for p in d.glob('*.kmz')]
+    assert sorted(produced) == NAMES
+
+    merged = merge_shard_outputs(dirs, tmp_path / 'merged')
+    assert merged['warnings'] == []
+    assert sorted(r['name'] for r in merged['results']) == NAMES
+    assert sorted(o['out'] for o in merged['outputs']) == [f'{n}.kmz' for n in NAMES]
+    assert merged['report_path'].exists()
+    data = json.loads(merged['manifest_path'].read_text(encoding='utf-8'))
+    assert len(data['merged_from']) == 3
+
+
+def test_merge_reports_missing_shard(input_dir, tmp_path, templates):
+    out_dir = tmp_path / 'shard0'
+    batch_process_inputs(
+        input_dir, *templates, out_dir,
+        input_format='gpkg', naming_field='NAME', shard=(0, 2),
+    )
+    merged = merge_shard_outputs([out_dir], tmp_path / 'merged')
+    assert any('누락된 샤드' in w for w in merged['warnings'])
+
+
+def test_merge_ignores_plain_manifest_and_dedupes_rows(input_dir, tmp_path, templates):
+    dirs = []
+    for i in range(2):
+        out_dir = tmp_path / f'shard{i}'
+        batch_process_inputs(
+            input_dir, *templates, out_dir,
+            input_format='gpkg', naming_field='NAME', shard=(i, 2),
+        )
+        dirs.append(out_dir)
+    # 이전 비샤드 실행이 남긴 manifest.json은 병합 대상이 아님
+    (dirs[0] / 'manifest.json').write_text(json.dumps({
+        'shard': None, 'results': [{'source': 'old.gpkg', 'name': 'stale', 'success': True}], 'outputs': [],
+    }), encoding='utf-8')
+
+    merged = merge_shard_outputs(dirs + [dirs[0]], tmp_path / 'merged')
+    assert sorted(r['name'] for r in merged['results']) == NAMES
+    assert sorted(o['out'] for o in merged['outputs']) == [f'{n}.kmz' for n in NAMES]
+    assert not any('출력 이름 충돌' in w for w in merged['warnings'])
+    assert any('중복된 샤드' in w for w in merged['warnings'])
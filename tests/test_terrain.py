@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.core.engine import MissionBatchEngine
+from src.core.terrain import DemSampler, ground_profile, terrain_clearance
+
+
+# 127.0~127.1E, 36.0~36.05N, 0.0001도 격자. 127.05E 서쪽은 평지(0m), 동쪽은 열마다 2m씩 오르막
+RES = 0.0001
+
+
+@pytest.fixture
+def dem_path(tmp_path):
+    cols = np.arange(1000)
+    row = np.where(cols < 500, 0.0, (cols - 500) * 2.0).astype(np.float32)
+    dem = np.tile(row, (500, 1))
+    dem[:10, :10] = -9999
+    path = tmp_path / 'dem.npy'
+    np.save(path, dem)
+    path.with_suffix('.json').write_text(json.dumps({
+        'transform': [RES, 0, 127.0, 0, -RES, 36.05], 'crs': 'EPSG:4326', 'nodata': -9999,
+    }))
+    return path
+
+
+def test_sampler_reads_blocks_once(dem_path):
+    sampler = DemSampler(dem_path, block_size=128)
+    lons = np.array([127.0 + RES * 0.5, 127.06 + RES * 0.5, 127.2])
+    lats = np.array([36.0 + RES * 0.5, 36.01, 36.01])
+    heights = sampler.sample_lonlat(lons, lats)
+    assert heights[0] == 0.0
+    assert heights[1] == pytest.approx(200.0)
+    assert np.isnan(heights[2])                  # DEM 밖
+    assert np.isnan(sampler.sample_lonlat([127.0 + RES * 0.5], [36.05 - RES * 0.5])[0])   # nodata
+
+    misses = sampler.cache.misses
+    sampler.sample_lonlat(lons, lats)
+    assert sampler.cache.misses == misses        # 같은 블록은 캐시에서
+
+
+def test_clearance_against_slope(dem_path, square):
+    sampler = DemSampler(dem_path)
+    flat = ground_profile(sampler, list(square(127.01, 36.01).exterior.coords))
+    slope = ground_profile(sampler, list(square(127.06, 36.01).exterior.coords))
+    assert flat['ground_min'] == flat['ground_max'] == 0.0
+    assert 100 < slope['ground_max'] - slope['ground_ref'] < 130      # 이륙 기준점(꼭짓점 평균)보다 높은 지면
+
+    assert terrain_clearance(flat, 80)['status'] == 'safe'
+    assert terrain_clearance(slope, 140)['status'] == 'warning'
+    assert terrain_clearance(slope, 80)['status'] == 'danger'
+    assert terrain_clearance(slope, 80, use_terrain_follow=True)['status'] == 'safe'
+    assert terrain_clearance(None, 80)['status'] == 'warning'
+
+
+def test_batch_reports_terrain(tmp_path, dem_path, templates, write_squares):
+    src = tmp_path / 'input'
+    src.mkdir()
+    write_squares(src / 'fields.gpkg', ['flat', 'slope'], [(127.01, 36.01), (127.06, 36.01)])
+    engine = MissionBatchEngine(*templates)
+    summary = engine.run(src, tmp_path / 'out', input_format='gpkg', naming_field='NAME',
+                         overrides={'altitude': 80, 'auto_flight_speed': 5}, dem=dem_path)
+
+    flat, slope = summary['results']
+    assert flat['status'] == 'safe' and flat['terrain']['clearance_min'] == 80
+    assert slope['status'] == 'danger'
+    assert any('지형 여유고' in m for m in slope['messages'])
+    assert 'terrain' in {s['stage'] for s in summary['stages']}
+    assert '최소 여유고' in summary['report_path'].read_text(encoding='utf-8')
+    assert engine.cache_stats()['dem_blocks']['entries'] > 0
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+from src.core.pipeline import CancellationToken, CancelledError
+from src.core.timelimit import FeatureTimeoutError, KillableWorker
+
+
+def test_worker_returns_result_and_propagates_errors():
+    worker = KillableWorker()
+    try:
+        assert worker.call(divmod, (7, 2), timeout=30) == (3, 1)
+        with pytest.raises(ZeroDivisionError):
+            worker.call(divmod, (1, 0), timeout=30)
+    finally:
+        worker.close()
+
+
+def test_worker_is_killed_on_timeout_and_restarts():
+    worker = KillableWorker()
+    try:
+        worker.call(abs, (-1,), timeout=30)  # 자식 프로세스 기동
+        with pytest.raises(FeatureTimeoutError):
+            worker.call(time.sleep, (30,), timeout=0.3)
+        assert worker.call(abs, (-2,), timeout=30) == 2
+    finally:
+        worker.close()
+
+
+def test_worker_call_honours_cancellation():
+    worker = KillableWorker()
+    token = CancellationToken()
+    try:
+        worker.call(abs, (-1,), timeout=30)
+        threading.Timer(0.2, token.cancel).start()
+        with pytest.raises(CancelledError):
+            worker.call(time.sleep, (30,), cancel=token)
+    finally:
+        worker.close()
+
+
+def test_worker_clock_starts_after_preload_and_respawn():
+    worker = KillableWorker(preload=('geopandas', 'shapely'))
+    try:
+        # 자식의 geopandas 임포트 시간은 제한 시간에 포함되지 않음
+        assert worker.call(abs, (-1,), timeout=0.5) == 1
+        with pytest.raises(FeatureTimeoutError):
+            worker.call(time.sleep, (30,), timeout=0.3)
+        assert worker.call(abs, (-2,), timeout=0.5) == 2
+    finally:
+        worker.close()
+
+
+def test_worker_preload_failure_is_reported():
+    worker = KillableWorker(preload=('no_such_module_for_skymission',))
+    try:
+        with pytest.raises(RuntimeError, match='준비 실패'):
+            worker.call(abs, (-1,), timeout=30)
+    finally:
+        worker.close()
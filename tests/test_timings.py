@@ -0,0 +1,51 @@
+import json
+import threading
+
+import geopandas as gpd
+from shapely.geometry import box
+
+from src.core.generator import batch_process_inputs
+from src.core.timings import TimingRecorder, bind, section, summarize
+
+
+def test_summarize_and_sections():
+    st = summarize([0.001 * i for i in range(1, 101)])
+    assert st['count'] == 100 and st['max_ms'] == 100.0
+    assert abs(st['p50_ms'] - 50.5) < 1e-6 and abs(st['p95_ms'] - 95.05) < 1e-6
+
+    rec = TimingRecorder()
+    with section('unbound'):            # 바인딩 전에는 기록하지 않음
+        pass
+
+    def work():
+        bind(rec, 'a.gpkg')
+        with section('geometry.union'):
+            pass
+        bind(None)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    summary = rec.summary()
+    assert list(summary['batch']) == ['geometry.union'] and summary['batch']['geometry.union']['count'] == 4
+    assert summary['files']['a.gpkg']['geometry.union']['count'] == 4
+
+
+def test_batch_writes_profile(tmp_path, templates):
+    src = tmp_path / 'input'
+    src.mkdir()
+    gpd.GeoDataFrame({'NAME': ['a', 'b']}, geometry=[box(127.0, 36.0, 127.01, 36.01), box(127.1, 36.0, 127.11, 36.01)],
+                     crs='EPSG:4326').to_crs(epsg=5186).to_file(src / 'fields.gpkg', driver='GPKG')
+    summary = batch_process_inputs(src, *templates, tmp_path / 'out',
+                                   input_format='gpkg', naming_field='NAME')
+    profile = json.loads(summary['profile_path'].read_text(encoding='utf-8'))
+    assert profile['missions'] == 2
+    for name in ('read', 'read.gpkg', 'geometry', 'geometry.union', 'geometry.transform', 'render', 'pack',
+                 'write', 'write.file'):
+        assert name in profile['batch'], name
+    assert profile['batch']['geometry']['count'] == 2
+    assert profile['files']['fields.gpkg']['write']['count'] == 2
+    assert summary['profile_path'].name == summary['report_path'].stem + '_profile.json'
+    assert '처리 시간' in summary['report_path'].read_text(encoding='utf-8')
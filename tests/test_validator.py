@@ -40,9 +40,36 @@ def test_validate_mission_danger_blur():
 def test_validate_mission_altitude_warning():
     config = {
         'drone_model': 'mavic3e',
-        'altitude': 150,
+        'altitude': 160,
         'auto_flight_speed': 5
     }
     result = validate_mission(config)
     assert result['status'] == 'warning'
-    assert any("고도(120m)를 초과" in m for m in result['messages'])
+    assert any("고도(150m)를 초과" in m for m in result['messages'])
+    # 한계 고도 자체는 허용
+    assert validate_mission(dict(config, altitude=150))['status'] == 'safe'
+
+def test_validate_missions_batch_matches_scalar():
+    import itertools
+    from src.core.validator import validate_missions_batch
+
+    models = ['mavic3e', 'mavic3t', 'M30T', 'unknown', None]
+    altitudes = [5, 20, 100, 150, None]
+    speeds = [3, 10, 16, None]
+    combos = list(itertools.product(models, altitudes, speeds))
+    batch = validate_missions_batch(altitude=[c[1] for c in combos], speed=[c[2] for c in combos],
+                                    drone_model=[c[0] for c in combos])
+    for (model, alt, speed), record in zip(combos, batch['records']):
+        expected = validate_mission({'drone_model': model, 'altitude': alt, 'auto_flight_speed': speed})
+        assert record == expected
+    assert list(batch['status']) == [r['status'] for r in batch['records']]
+
+def test_validate_missions_batch_dataframe_and_sharing():
+    import pandas as pd
+    from src.core.validator import validate_missions_batch
+
+    df = pd.DataFrame({'altitude': [100, 100, 200], 'auto_flight_speed': [5, 5, 5], 'drone_model': ['mavic3e'] * 3})
+    batch = validate_missions_batch(frame=df)
+    assert list(batch['status']) == ['safe', 'safe', 'warning']
+    assert batch['records'][0] is batch['records'][1]
+    assert 2.6 < batch['gsd'][0] < 2.7
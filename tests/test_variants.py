@@ -0,0 +1,152 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from src.core.engine import MissionBatchEngine
+from src.core.variants import column_overrides, expand_matrix, load_variants, parse_override_columns
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_expand_matrix_and_names():
+    assert expand_matrix({'altitude': [60, 80], 'drone_model': ['a', 'b']}) == [
+        {'altitude': 60, 'drone_model': 'a'}, {'altitude': 60, 'drone_model': 'b'},
+        {'altitude': 80, 'drone_model': 'a'}, {'altitude': 80, 'drone_model': 'b'},
+    ]
+    variants = load_variants([{'altitude': 60.0}, {'name': 'fast', 'auto_flight_speed': 10}],
+                             {'altitude': 80, 'auto_flight_speed': 5, 'margin': None})
+    assert [v['name'] for v in variants] == ['altitude-60', 'fast']
+    assert variants[1]['overrides'] == {'altitude': 80, 'auto_flight_speed': 10}
+
+
+def test_load_variants_from_preset_matrix():
+    variants = load_variants(ROOT / 'presets' / 'altitude_matrix.json')
+    assert [v['overrides']['altitude'] for v in variants] == [60, 80, 100]
+    assert all(v['overrides']['drone_model'] == 'mavic3e' for v in variants)
+
+
+def test_variants_reject_geometry_changes():
+    with pytest.raises(ValueError):
+        load_variants([{'geometry_buffer_m': 5}])
+    with pytest.raises(ValueError):
+        load_variants([{'name': 'x', 'altitude': 1}, {'name': 'x', 'altitude': 2}])
+
+
+def test_batch_renders_every_variant_from_one_geometry_pass(tmp_path, templates, write_squares):
+    src = tmp_path / 'input'
+    src.mkdir()
+    write_squares(src / 'parcels.gpkg', ['a', 'b'], [(127.0, 36.0), (127.1, 36.0)])
+    out_dir = tmp_path / 'output'
+    engine = MissionBatchEngine(*templates)
+    summary = engine.run(src, out_dir, input_format='gpkg', naming_field='NAME', set_times=False,
+                         overrides={'drone_model': 'mavic3e', 'auto_flight_speed': 5},
+                         variants=[{'altitude': 60}, {'altitude': 120}])
+
+    assert summary['ok'] == 4
+    assert [(r['name'], r['variant']) for r in summary['results']] == [
+        ('a', 'altitude-60'), ('a', 'altitude-120'), ('b', 'altitude-60'), ('b', 'altitude-120')]
+    # 지오메트리는 피처마다 한 번만 처리
+    assert engine.geometries.stats()['entries'] == 2
+    geometry_stage = next(s for s in summary['stages'] if s['stage'] == 'geometry')
+    assert geometry_stage['processed'] == 2
+
+    with zipfile.ZipFile(out_dir / 'altitude-120' / 'a.kmz') as z:
+        assert b'<wpml:height>120<' in z.read('template.kml')
+    html = summary['report_path'].read_text(encoding='utf-8')
+    assert '변형별 비교' in html and 'altitude-120' in html
+
+    again = engine.run(src, out_dir, input_format='gpkg', naming_field='NAME', set_times=False,
+                       overrides={'drone_model': 'mavic3e', 'auto_flight_speed': 5},
+                       variants=[{'altitude': 60}, {'altitude': 120}], resume=True)
+    assert again['skipped'] == 4
+
+
+def test_parse_override_columns():
+    assert parse_override_columns(['altitude=ALT_M', 'drone_model=MODEL,auto_flight_speed=SPD']) == {
+        'altitude': 'ALT_M', 'drone_model': 'MODEL', 'auto_flight_speed': 'SPD'}
+    for bad in ('altitude', 'geometry_buffer_m=BUF', 'colour=C'):
+        with pytest.raises(ValueError):
+            parse_override_columns(bad)
+
+
+def test_column_overrides_convert_types_and_skip_blanks():
+    import pandas as pd
+    df = pd.DataFrame({'ALT': ['80', None, 'x'], 'SPD': [7.6, 5, None], 'MODEL': [' m3m ', '', None]})
+    rows = column_overrides(df, {'altitude': 'ALT', 'auto_flight_speed': 'SPD', 'drone_model': 'MODEL'})
+    assert rows == [{'altitude': 80.0, 'auto_flight_speed': 8, 'drone_model': 'm3m'},
+                    {'auto_flight_speed': 5}, {}]
+
+
+def test_column_overrides_bool_column_with_pd_na():
+    import pandas as pd
+    df = pd.DataFrame({'TF': pd.array([True, pd.NA, False], dtype='boolean')})
+    assert column_overrides(df, {'use_terrain_follow': 'TF'}) == [
+        {'use_terrain_follow': True}, {}, {'use_terrain_follow': False}]
+
+
+def test_batch_applies_per_feature_column_overrides(tmp_path, templates, write_squares):
+    src = tmp_path / 'input'
+    src.mkdir()
+    write_squares(src / 'parcels.gpkg', ['a', 'b', 'c'], [(127.0, 36.0), (127.1, 36.0), (127.2, 36.0)],
+                  ALT_M=[60, 90, 60])
+    out_dir = tmp_path / 'output'
+    engine = MissionBatchEngine(*templates)
+    summary = engine.run(src, out_dir, input_format='gpkg', naming_field='NAME', set_times=False,
+                         overrides={'altitude': 100, 'auto_flight_speed': 5},
+                         override_columns='altitude=ALT_M')
+
+    assert [r['altitude'] for r in summary['results']] == [60.0, 90.0, 60.0]
+    with zipfile.ZipFile(out_dir / 'b.kmz') as z:
+        assert b'<wpml:height>90<' in z.read('template.kml')
+    # 기본(100m) + 60m + 90m: 같은 실효 오버라이드는 WPML을 공유
+    assert engine.packers.stats()['entries'] == 3
+
+    # 변형이 속성 열보다 우선
+    summary = engine.run(src, tmp_path / 'out2', input_format='gpkg', naming_field='NAME',
+                         overrides={'altitude': 100}, override_columns={'altitude': 'ALT_M'},
+                         variants=[{'name': 'col'}, {'name': 'fixed', 'altitude': 120}])
+    assert [(r['variant'], r['altitude']) for r in summary['results'][:2]] == [('col', 60.0), ('fixed', 120)]
+
+
+def test_batch_validates_column_overrides_in_one_vectorized_call(tmp_path, monkeypatch, templates, write_squares):
+    from src.core import validator
+
+    src = tmp_path / 'input'
+    src.mkdir()
+    write_squares(src / 'parcels.gpkg', ['a', 'b', 'c'], [(127.0, 36.0), (127.1, 36.0), (127.2, 36.0)],
+                  ALT_M=[60, 200, 60])
+    calls = []
+    batch = validator.validate_missions_batch
+
+    def counting(**kwargs):
+        calls.append(len(kwargs['altitude']))
+        return batch(**kwargs)
+
+    def scalar(config):
+        raise AssertionError('배치 경로에서 미션별 검증을 호출함')
+
+    monkeypatch.setattr(validator, 'validate_missions_batch', counting)
+    monkeypatch.setattr(validator, 'validate_mission', scalar)
+    engine = MissionBatchEngine(*templates)
+    summary = engine.run(src, tmp_path / 'output', input_format='gpkg', naming_field='NAME', set_times=False,
+                         overrides={'altitude': 100, 'auto_flight_speed': 5}, override_columns='altitude=ALT_M')
+
+    # 기본 프로필 1회 + 레이어의 서로 다른 조합(60m, 200m) 1회
+    assert calls == [1, 2]
+    assert [r['status'] for r in summary['results']] == ['safe', 'warning', 'safe']
+    assert any('고도(150m)를 초과' in m for m in summary['results'][1]['messages'])
+
+
+def test_matrix_base_geometry_buffer_is_applied(tmp_path, templates, write_squares):
+    src = tmp_path / 'input'
+    src.mkdir()
+    write_squares(src / 'parcels.gpkg', ['a'], [(127.0, 36.0)])
+    engine = MissionBatchEngine(*templates)
+    areas = []
+    for buffer_m in (0, 100):
+        summary = engine.run(src, tmp_path / f'out{buffer_m}', input_format='gpkg', naming_field='NAME',
+                             set_times=False, variants={'base': {'geometry_buffer_m': buffer_m},
+                                                        'variants': [{'altitude': 60}]})
+        areas.append(summary['results'][0]['flight']['area_ha'])
+    assert areas[1] > areas[0] * 1.2
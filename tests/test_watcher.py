@@ -0,0 +1,100 @@
+import pytest
+
+from src.core.engine import MissionBatchEngine
+from src.core.watcher import WatchDaemon
+
+
+@pytest.fixture
+def write(write_squares):
+    """NAME별 정사각형 GPKG. shift는 첫 피처만 동쪽으로 옮김"""
+    def _write(path, names, shift=0.0):
+        write_squares(path, names, [(127.0 + 0.1 * i + (shift if i == 0 else 0.0), 36.0) for i in range(len(names))])
+    return _write
+
+
+@pytest.fixture
+def daemon_for(templates):
+    def _daemon(tmp_path, **kwargs):
+        engine = MissionBatchEngine(*templates)
+        return WatchDaemon(engine, tmp_path / 'input', tmp_path / 'output', input_format='gpkg',
+                           naming_field='NAME', set_times=False, **kwargs)
+    return _daemon
+
+
+def test_watch_waits_for_stable_files(tmp_path, write, daemon_for):
+    (tmp_path / 'input').mkdir()
+    write(tmp_path / 'input' / 'a.gpkg', ['a1', 'a2'])
+    daemon = daemon_for(tmp_path, settle_s=5.0)
+
+    assert daemon.poll_once(now=0.0) == []      # 처음 관측: 안정화 대기
+    assert daemon.poll_once(now=2.0) == []
+    assert [p.name for p in daemon.poll_once(now=6.0)] == ['a.gpkg']
+    assert daemon.poll_once(now=20.0) == []     # 변경 없음
+
+
+def test_watch_regenerates_only_changed_features(tmp_path, write, daemon_for):
+    (tmp_path / 'input').mkdir()
+    src = tmp_path / 'input' / 'a.gpkg'
+    write(src, ['a1', 'a2', 'a3'])
+    daemon = daemon_for(tmp_path, settle_s=0.0)
+
+    daemon.poll_once()
+    first = daemon.process_pending()
+    assert first['ok'] == 3 and first['skipped'] == 0
+
+    # 첫 번째 피처만 이동
+    write(src, ['a1', 'a2', 'a3'], shift=0.05)
+    assert [p.name for p in daemon.poll_once()] == ['a.gpkg']
+    second = daemon.process_pending()
+    assert second['ok'] == 3
+    assert second['skipped'] == 2
+    assert daemon.process_pending() is None
+
+
+def test_watch_queue_is_bounded_and_deduplicated(tmp_path, write, daemon_for):
+    (tmp_path / 'input').mkdir()
+    for name in ('a', 'b', 'c'):
+        write(tmp_path / 'input' / f'{name}.gpkg', [name])
+    daemon = daemon_for(tmp_path, settle_s=0.0, max_pending=2)
+
+    assert [p.name for p in daemon.poll_once()] == ['a.gpkg', 'b.gpkg']
+    assert daemon.poll_once() == []             # 큐가 가득 차 c는 다음으로 미룸
+    daemon.process_pending()
+    assert [p.name for p in daemon.poll_once()] == ['c.gpkg']
+    assert sorted(p.name for p in (tmp_path / 'output').glob('*.kmz')) == ['a.kmz', 'b.kmz']
+
+
+def test_watch_retries_after_failed_run_and_merges_manifest(tmp_path, write, daemon_for):
+    import json
+
+    (tmp_path / 'input').mkdir()
+    write(tmp_path / 'input' / 'a.gpkg', ['a1'])
+    daemon = daemon_for(tmp_path, settle_s=0.0)
+    real_run = daemon.engine.run
+
+    def broken_run(*args, **kwargs):
+        raise RuntimeError('disk full')
+
+    daemon.engine.run = broken_run
+    daemon.poll_once()
+    with pytest.raises(RuntimeError):
+        daemon.process_pending()
+    # 처리하지 못한 파일은 서명이 기록되지 않아 다시 큐에 들어감
+    daemon.engine.run = real_run
+    assert [p.name for p in daemon.poll_once()] == ['a.gpkg']
+    assert daemon.poll_once() == []             # 대기 중인 파일은 다시 넣지 않음
+    daemon.process_pending()
+    assert daemon.poll_once() == []
+
+    write(tmp_path / 'input' / 'b.gpkg', ['b1'])
+    assert [p.name for p in daemon.poll_once()] == ['b.gpkg']
+    daemon.process_pending()
+    manifest = json.loads((tmp_path / 'output' / 'manifest.json').read_text(encoding='utf-8'))
+    assert sorted(r['name'] for r in manifest['results']) == ['a1', 'b1']
+    assert sorted(o['out'] for o in manifest['outputs']) == ['a1.kmz', 'b1.kmz']
+
+
+def test_watch_rejects_route(tmp_path, daemon_for):
+    (tmp_path / 'input').mkdir()
+    with pytest.raises(ValueError):
+        daemon_for(tmp_path, route=True)
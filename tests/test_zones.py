@@ -0,0 +1,64 @@
+import geopandas as gpd
+from shapely.geometry import box
+
+from src.core.generator import batch_process_inputs
+from src.core.zones import ZoneIndex
+
+
+def test_screen_flags_and_clips(square):
+    index = ZoneIndex([box(127.005, 35.99, 127.02, 36.02), box(127.203, 36.003, 127.206, 36.006),
+                       box(127.29, 35.99, 127.32, 36.02)], names=['edge', 'inner', 'cover'])
+    missions = [square(127.0, 36.0), square(127.1, 36.0), square(127.2, 36.0), square(127.3, 36.0)]
+
+    flagged = index.screen(missions)
+    assert flagged[1] is None
+    assert [r['zones'] for r in (flagged[0], flagged[2], flagged[3])] == [['edge'], ['inner'], ['cover']]
+    assert all(r['status'] == 'danger' and r['geometry'] is None for r in (flagged[0], flagged[2], flagged[3]))
+
+    clipped = index.screen(missions, clip=True)
+    assert clipped[0]['status'] == 'warning'
+    assert abs(clipped[0]['geometry'].area - 0.005 * 0.01) < 1e-9       # 동쪽 절반이 잘림
+    assert clipped[2]['status'] == 'danger'                               # 내부 구역은 잘라낼 수 없음
+    assert clipped[3]['geometry'].is_empty
+
+
+def test_batch_flags_or_clips_missions(tmp_path, templates, write_squares):
+    src = tmp_path / 'input'
+    src.mkdir()
+    write_squares(src / 'fields.gpkg', ['a', 'b'], [(127.0, 36.0), (127.1, 36.0)])
+    zones = tmp_path / 'zones.gpkg'
+    gpd.GeoDataFrame({'name': ['airport']}, geometry=[box(127.005, 35.99, 127.02, 36.02)],
+                     crs='EPSG:4326').to_crs(epsg=5186).to_file(zones, driver='GPKG')
+
+    kwargs = dict(input_format='gpkg', naming_field='NAME', overrides={'altitude': 80, 'auto_flight_speed': 5},
+                  zones=zones)
+    flagged = batch_process_inputs(src, *templates,
+                                   tmp_path / 'flag', **kwargs)
+    a, b = flagged['results']
+    assert a['status'] == 'danger' and a['zones']['zones'] == ['airport']
+    assert 'zones' not in b
+    assert '제한구역' in flagged['report_path'].read_text(encoding='utf-8')
+
+    clipped = batch_process_inputs(src, *templates,
+                                   tmp_path / 'clip', clip_zones=True, **kwargs)
+    a_clip = clipped['results'][0]
+    assert a_clip['status'] == 'warning'
+    assert abs(a_clip['flight']['area_ha'] - a['flight']['area_ha'] / 2) < 0.5
+
+
+def test_batch_with_only_degenerate_polygons_skips_zone_screening(tmp_path, templates):
+    src = tmp_path / 'input'
+    src.mkdir()
+    (src / 'thin.kml').write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n<kml xmlns="http://www.opengis.net/kml/2.2"><Document>'
+        '<Placemark><name>thin</name><Polygon><outerBoundaryIs><LinearRing>'
+        '<coordinates>127.0,36.0,0 127.01,36.0,0</coordinates>'
+        '</LinearRing></outerBoundaryIs></Polygon></Placemark></Document></kml>', encoding='utf-8')
+    zones = tmp_path / 'zones.gpkg'
+    gpd.GeoDataFrame({'name': ['airport']}, geometry=[box(126.0, 35.0, 126.1, 35.1)],
+                     crs='EPSG:4326').to_file(zones, driver='GPKG')
+
+    summary = batch_process_inputs(src, *templates,
+                                   tmp_path / 'out', input_format='kml', zones=zones)
+    assert (summary['ok'], summary['failed']) == (1, 0)
+    assert 'zones' not in summary['results'][0]